@@ -33,6 +33,10 @@ class UserFileURLAndThumbnailsSerializerMixin(serializers.Serializer):
         if not self.get_instance_attr(instance, "is_image"):
             return None
 
+        # The thumbnails don't exist yet while they're generated in the background.
+        if self.get_instance_attr(instance, "thumbnails_pending"):
+            return None
+
         name = self.get_instance_attr(instance, "name")
 
         return {
@@ -63,6 +67,7 @@ class UserFileSerializer(
             "uploaded_at",
             "url",
             "thumbnails",
+            "thumbnails_pending",
             "name",
             "original_name",
         )
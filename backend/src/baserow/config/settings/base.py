@@ -135,6 +135,11 @@ CELERY_TASK_ROUTES = {
     "baserow.core.trash.tasks.permanently_delete_marked_trash": {"queue": "export"},
     "baserow.core.usage.tasks": {"queue": BASEROW_GROUP_STORAGE_USAGE_QUEUE},
     "baserow.contrib.database.table.tasks.run_row_count_job": {"queue": "export"},
+    "baserow.contrib.database.fields.tasks.run_field_index_advisor": {
+        "queue": "export"
+    },
+    "baserow.contrib.database.fields.tasks.create_field_index": {"queue": "export"},
+    "baserow.contrib.database.rows.tasks.clean_up_row_tombstones": {"queue": "export"},
     "baserow.core.jobs.tasks.clean_up_jobs": {"queue": "export"},
 }
 CELERY_SOFT_TIME_LIMIT = 60 * 5  # 5 minutes
@@ -190,6 +195,28 @@ else:
         }
     }
 
+# Optional read replicas of the database. The read only queries of the user tables,
+# like listing the rows of a view, are distributed over them. Multiple replicas can be
+# provided by separating the database urls with a comma.
+DATABASE_READ_REPLICAS = []
+for replica_index, replica_url in enumerate(
+    filter(None, os.getenv("DATABASE_READ_REPLICA_URLS", "").split(","))
+):
+    replica_alias = f"read_replica_{replica_index}"
+    DATABASES[replica_alias] = dj_database_url.parse(
+        replica_url.strip(), conn_max_age=600
+    )
+    DATABASES[replica_alias]["TEST"] = {"MIRROR": "default"}
+    DATABASE_READ_REPLICAS.append(replica_alias)
+
+# The number of seconds the reads of a table are sent to the primary database after it
+# has been changed, so that the changes are visible even if the replicas are lagging
+# behind. Should be higher than the expected replication lag.
+DATABASE_READ_REPLICA_STICKY_SECONDS = int(
+    os.getenv("DATABASE_READ_REPLICA_STICKY_SECONDS", 10)
+)
+DATABASE_ROUTERS = ["baserow.core.db_routers.ReadReplicaRouter"]
+
 GENERATED_MODEL_CACHE_NAME = "generated-models"
 CACHES = {
     "default": {
@@ -506,6 +533,14 @@ EXPORT_FILE_EXPIRE_MINUTES = 60
 USAGE_CALCULATION_INTERVAL = crontab(minute=0, hour=0)  # Midnight
 
 ROW_COUNT_INTERVAL = crontab(minute=0, hour=0)  # Midnight
+# Tables estimated to contain more rows than this are not counted with a sequential
+# scan when reconciling the row counts.
+ROW_COUNT_EXACT_COUNT_THRESHOLD = int(
+    os.getenv("BASEROW_ROW_COUNT_EXACT_COUNT_THRESHOLD", 100000)
+)
+# The maintained row counts of the larger tables are still counted exactly when they
+# haven't been for this many days, to correct any drift.
+ROW_COUNT_RECONCILE_DAYS = int(os.getenv("BASEROW_ROW_COUNT_RECONCILE_DAYS", 7))
 
 EMAIL_BACKEND = "djcelery_email.backends.CeleryEmailBackend"
 
@@ -543,6 +578,10 @@ HOURS_UNTIL_TRASH_PERMANENTLY_DELETED = os.getenv(
     "HOURS_UNTIL_TRASH_PERMANENTLY_DELETED", 24 * 3
 )
 OLD_TRASH_CLEANUP_CHECK_INTERVAL_MINUTES = 5
+# The maximum number of trash entries permanently deleted in a single transaction.
+TRASH_PERMANENT_DELETION_BATCH_SIZE = int(
+    os.getenv("BASEROW_TRASH_PERMANENT_DELETION_BATCH_SIZE", 1000)
+)
 
 MAX_ROW_COMMENT_LENGTH = 10000
 
@@ -685,9 +724,70 @@ BASEROW_SYNC_TEMPLATES_TIME_LIMIT = int(
 APPEND_SLASH = False
 
 BASEROW_DISABLE_MODEL_CACHE = bool(os.getenv("BASEROW_DISABLE_MODEL_CACHE", ""))
+# Disables serializing the rows of listings directly from their values when all the
+# fields support it.
+BASEROW_DISABLE_FAST_ROW_LISTING = bool(
+    os.getenv("BASEROW_DISABLE_FAST_ROW_LISTING", "")
+)
+# Disables the `ETag` headers of the row listings and answering the requests of which
+# the response hasn't changed with `304 Not Modified`.
+BASEROW_DISABLE_ROW_LISTING_ETAGS = bool(
+    os.getenv("BASEROW_DISABLE_ROW_LISTING_ETAGS", "")
+)
+# Disables generating the models of the tables related via link row fields with only
+# the fields that are needed to serialize and look up the related rows.
+BASEROW_DISABLE_PROJECTED_RELATED_MODELS = bool(
+    os.getenv("BASEROW_DISABLE_PROJECTED_RELATED_MODELS", "")
+)
+# The number of rows that are converted per transaction when the type of a field is
+# changed online by the `convert_field_type` job.
+BASEROW_ONLINE_FIELD_CONVERSION_CHUNK_SIZE = int(
+    os.getenv("BASEROW_ONLINE_FIELD_CONVERSION_CHUNK_SIZE", 10000)
+)
 BASEROW_NOWAIT_FOR_LOCKS = not bool(
     os.getenv("BASEROW_WAIT_INSTEAD_OF_409_CONFLICT_ERROR", False)
 )
+# The number of days the permanently deleted rows are still reported by the row
+# changes endpoint. Clients with an older cursor must fetch all the rows again.
+BASEROW_ROW_TOMBSTONES_RETENTION_DAYS = int(
+    os.getenv("BASEROW_ROW_TOMBSTONES_RETENTION_DAYS", 30)
+)
+BASEROW_ROW_TOMBSTONES_CLEANUP_INTERVAL_MINUTES = int(
+    os.getenv("BASEROW_ROW_TOMBSTONES_CLEANUP_INTERVAL_MINUTES", 60)
+)
+# The row changes endpoint only returns the changes that are at least this number of
+# seconds old, so that the changes of transactions that commit later, but got an
+# earlier timestamp, aren't skipped.
+BASEROW_ROW_CHANGES_SETTLE_SECONDS = int(
+    os.getenv("BASEROW_ROW_CHANGES_SETTLE_SECONDS", 5)
+)
+# Transactions that have been idle for longer than this number of seconds don't hold
+# back the row changes endpoint, because they're most likely abandoned.
+BASEROW_ROW_CHANGES_IDLE_TRANSACTION_SECONDS = int(
+    os.getenv("BASEROW_ROW_CHANGES_IDLE_TRANSACTION_SECONDS", 60)
+)
+# A warning is logged when a long running transaction holds back the row changes
+# endpoint by more than this number of seconds.
+BASEROW_ROW_CHANGES_LAG_WARNING_SECONDS = int(
+    os.getenv("BASEROW_ROW_CHANGES_LAG_WARNING_SECONDS", 60)
+)
+# Periodically creates indexes on the columns of the fields that are often sorted or
+# filtered by in the views and via the API, and drops the ones that aren't used
+# anymore.
+BASEROW_INDEX_ADVISOR_ENABLED = (
+    os.getenv("BASEROW_INDEX_ADVISOR_ENABLED", "false") == "true"
+)
+BASEROW_INDEX_ADVISOR_INTERVAL_MINUTES = int(
+    os.getenv("BASEROW_INDEX_ADVISOR_INTERVAL_MINUTES", 60)
+)
+# Tables with fewer rows are fast enough without indexes.
+BASEROW_INDEX_ADVISOR_MIN_ROWS = int(os.getenv("BASEROW_INDEX_ADVISOR_MIN_ROWS", 10000))
+BASEROW_INDEX_ADVISOR_MAX_INDEXES_PER_TABLE = int(
+    os.getenv("BASEROW_INDEX_ADVISOR_MAX_INDEXES_PER_TABLE", 5)
+)
+# The number of days the sorting and filtering by a field via the API is taken into
+# account.
+BASEROW_INDEX_ADVISOR_USAGE_DAYS = int(os.getenv("BASEROW_INDEX_ADVISOR_USAGE_DAYS", 7))
 
 # Indicates whether we are running the tests or not. Set to True in the test.py settings
 # file used by pytest.ini
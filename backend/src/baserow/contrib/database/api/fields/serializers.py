@@ -167,9 +167,16 @@ class FileFieldResponseSerializer(
     image_width = serializers.IntegerField()
     image_height = serializers.IntegerField()
     uploaded_at = serializers.DateTimeField()
+    thumbnails_pending = serializers.BooleanField(
+        default=False,
+        help_text="Indicates whether the thumbnails are still being generated. They "
+        "are left out until then.",
+    )
 
     def get_instance_attr(self, instance, name):
-        return instance[name]
+        # The values stored before the thumbnails were generated in the background
+        # don't contain `thumbnails_pending`.
+        return instance.get(name)
 
 
 @extend_schema_field(OpenApiTypes.NONE)
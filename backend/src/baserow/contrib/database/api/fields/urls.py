@@ -2,7 +2,12 @@ from django.urls import re_path
 
 from baserow.contrib.database.fields.registries import field_type_registry
 
-from .views import FieldsView, FieldView, UniqueRowValueFieldView
+from .views import (
+    AsyncUpdateFieldView,
+    FieldsView,
+    FieldView,
+    UniqueRowValueFieldView,
+)
 
 
 app_name = "baserow.contrib.database.api.fields"
@@ -15,4 +20,9 @@ urlpatterns = field_type_registry.api_urls + [
         name="unique_row_values",
     ),
     re_path(r"(?P<field_id>[0-9]+)/$", FieldView.as_view(), name="item"),
+    re_path(
+        r"(?P<field_id>[0-9]+)/async/$",
+        AsyncUpdateFieldView.as_view(),
+        name="async_update",
+    ),
 ]
@@ -2,6 +2,7 @@ from django.conf import settings
 from django.db import transaction
 from drf_spectacular.openapi import OpenApiParameter, OpenApiTypes
 from drf_spectacular.utils import extend_schema
+from rest_framework import status
 from rest_framework.decorators import permission_classes as method_permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
@@ -13,6 +14,8 @@ from baserow.api.decorators import (
     validate_query_parameters,
 )
 from baserow.api.errors import ERROR_USER_NOT_IN_GROUP
+from baserow.api.jobs.errors import ERROR_MAX_JOB_COUNT_EXCEEDED
+from baserow.api.jobs.serializers import JobSerializer
 from baserow.api.schemas import (
     get_error_schema,
     CLIENT_SESSION_ID_SCHEMA_PARAMETER,
@@ -61,6 +64,7 @@ from baserow.contrib.database.fields.exceptions import (
     FailedToLockFieldDueToConflict,
 )
 from baserow.contrib.database.fields.handler import FieldHandler
+from baserow.contrib.database.fields.job_types import ConvertFieldTypeJobType
 from baserow.contrib.database.fields.models import Field
 from baserow.contrib.database.fields.registries import field_type_registry
 from baserow.contrib.database.table.exceptions import (
@@ -73,6 +77,9 @@ from baserow.contrib.database.tokens.handler import TokenHandler
 from baserow.core.action.registries import action_type_registry
 from baserow.core.db import specific_iterator
 from baserow.core.exceptions import UserNotInGroup
+from baserow.core.jobs.exceptions import MaxJobCountExceeded
+from baserow.core.jobs.handler import JobHandler
+from baserow.core.jobs.registries import job_type_registry
 from baserow.core.trash.exceptions import CannotDeleteAlreadyDeletedItem
 from .serializers import (
     FieldSerializer,
@@ -436,6 +443,80 @@ class FieldView(APIView):
         return Response(RelatedFieldsSerializer({}, related_fields=updated_fields).data)
 
 
+class AsyncUpdateFieldView(APIView):
+    permission_classes = (IsAuthenticated,)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="field_id",
+                location=OpenApiParameter.PATH,
+                type=OpenApiTypes.INT,
+                description="Updates the field related to the provided value.",
+            ),
+            CLIENT_SESSION_ID_SCHEMA_PARAMETER,
+            CLIENT_UNDO_REDO_ACTION_GROUP_ID_SCHEMA_PARAMETER,
+        ],
+        tags=["Database table fields"],
+        operation_id="update_database_table_field_async",
+        description=(
+            "Starts a job that updates the existing field if the authorized user has "
+            "access to the related database's group. It accepts the same properties "
+            "as the `update_database_table_field` endpoint. If the values of the "
+            "field must be converted to the new type, they're converted in the "
+            "background without blocking the table, which is recommended for large "
+            "tables."
+        ),
+        request=DiscriminatorCustomFieldsMappingSerializer(
+            field_type_registry, UpdateFieldSerializer
+        ),
+        responses={
+            202: ConvertFieldTypeJobType().get_serializer_class(),
+            400: get_error_schema(
+                [
+                    "ERROR_USER_NOT_IN_GROUP",
+                    "ERROR_REQUEST_BODY_VALIDATION",
+                    "ERROR_MAX_JOB_COUNT_EXCEEDED",
+                ]
+            ),
+            404: get_error_schema(["ERROR_FIELD_DOES_NOT_EXIST"]),
+        },
+    )
+    @transaction.atomic
+    @map_exceptions(
+        {
+            FieldDoesNotExist: ERROR_FIELD_DOES_NOT_EXIST,
+            UserNotInGroup: ERROR_USER_NOT_IN_GROUP,
+            MaxJobCountExceeded: ERROR_MAX_JOB_COUNT_EXCEEDED,
+        }
+    )
+    def post(self, request, field_id):
+        """Creates a job to update the field and convert its values."""
+
+        field = FieldHandler().get_field(field_id).specific
+        field.table.database.group.has_user(request.user, raise_error=True)
+        type_name = type_from_data_or_registry(request.data, field_type_registry, field)
+        data = validate_data_custom_fields(
+            type_name,
+            field_type_registry,
+            request.data,
+            base_serializer_class=UpdateFieldSerializer,
+        )
+
+        # The validated values can contain instances, so the provided values are
+        # stored and they're prepared again when the job updates the field.
+        job = JobHandler().create_and_start_job(
+            request.user,
+            ConvertFieldTypeJobType.type,
+            field_id=field.id,
+            new_type=type_name,
+            field_values={key: request.data[key] for key in data.keys()},
+        )
+
+        serializer = job_type_registry.get_serializer(job, JobSerializer)
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+
 class UniqueRowValueFieldView(APIView):
     permission_classes = (IsAuthenticated,)
 
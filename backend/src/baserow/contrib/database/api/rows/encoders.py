@@ -0,0 +1,176 @@
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Expression, QuerySet
+from rest_framework.pagination import BasePagination
+from rest_framework.request import Request
+from rest_framework.serializers import ModelSerializer
+
+# The columns of a row that are not table fields, but are serialized by default.
+ROW_VALUES_BASE_COLUMNS = ("id", "order")
+
+
+def _serialized_value(value: Any) -> Any:
+    return value
+
+
+class RowValuesEncoder:
+    """
+    Serializes rows fetched with `values_list` into exactly the same data as the row
+    serializer class it has been compiled for would for the model instances. The
+    values are converted by the serializer fields, but all the per row and per field
+    overhead of the serializer, like building the model instances and binding the
+    fields, is skipped. Can only be compiled if every field type of the serializer
+    supports it, see `FieldType.can_serialize_from_values` and
+    `FieldType.get_serialize_from_values`.
+    """
+
+    def __init__(
+        self,
+        columns: List[str],
+        encoders: List[Tuple[str, Callable[[Any], Any]]],
+        annotations: Optional[Dict[str, Expression]] = None,
+    ):
+        """
+        :param columns: The names of the columns that must be fetched, in the same
+            order as the encoders. The first column is always the id.
+        :param encoders: The response key and the function converting the value for
+            every column.
+        :param annotations: The expressions computing the values of the fields that
+            can't be serialized from their column by name.
+        """
+
+        self.columns = columns
+        self.encoders = encoders
+        self.annotations = annotations or {}
+
+    def get_values_queryset(self, queryset: QuerySet) -> QuerySet:
+        """
+        Returns a queryset fetching the values of the rows that must be encoded. The
+        related objects prefetched by the field types aren't needed anymore.
+        """
+
+        return (
+            queryset.prefetch_related(None)
+            .annotate(**self.annotations)
+            .values_list(*self.columns)
+        )
+
+    def encode(self, values_rows: List[Tuple]) -> List[Dict[str, Any]]:
+        """
+        Encodes the provided values into the serialized rows.
+
+        :param values_rows: The row values fetched by the `get_values_queryset`.
+        :return: The serialized rows.
+        """
+
+        encoders = self.encoders
+        return [
+            {
+                key: None if value is None else encoder(value)
+                for (key, encoder), value in zip(encoders, values)
+            }
+            for values in values_rows
+        ]
+
+
+@lru_cache(maxsize=256)
+def get_row_values_encoder(serializer_class) -> Optional[RowValuesEncoder]:
+    """
+    Compiles a `RowValuesEncoder` for the provided row serializer class. This is
+    cached per serializer class because the same class is reused for the same fields
+    of the same version of a table.
+
+    :param serializer_class: The row serializer class generated by
+        `get_row_serializer_class`.
+    :return: The compiled encoder or None if not all the fields of the serializer can
+        be serialized from their values.
+    """
+
+    model = serializer_class.Meta.model
+    field_objects_by_name = {
+        field_object["name"]: field_object
+        for field_object in model._field_objects.values()
+    }
+
+    columns = []
+    encoders = []
+    annotations = {}
+    for serializer_field in serializer_class().fields.values():
+        if serializer_field.write_only:
+            continue
+
+        source_attrs = serializer_field.source_attrs
+        if len(source_attrs) != 1:
+            return None
+
+        column = source_attrs[0]
+        field_object = field_objects_by_name.get(column)
+        if column in ROW_VALUES_BASE_COLUMNS or (
+            field_object is not None and field_object["type"].can_serialize_from_values
+        ):
+            columns.append(column)
+            encoders.append(
+                (serializer_field.field_name, serializer_field.to_representation)
+            )
+            continue
+
+        serialize_from_values = (
+            field_object["type"].get_serialize_from_values(
+                model, field_object["field"], column
+            )
+            if field_object is not None
+            else None
+        )
+        if serialize_from_values is None:
+            return None
+
+        source, encoder = serialize_from_values
+        if not isinstance(source, str):
+            annotation_name = f"{column}_serialized_value"
+            annotations[annotation_name] = source
+            source = annotation_name
+        columns.append(source)
+        encoders.append((serializer_field.field_name, encoder or _serialized_value))
+
+    if not columns or columns[0] != "id":
+        return None
+
+    return RowValuesEncoder(columns, encoders, annotations)
+
+
+def paginate_and_serialize_rows(
+    paginator: BasePagination,
+    queryset: QuerySet,
+    request: Request,
+    view,
+    serializer_class: ModelSerializer,
+) -> Tuple[List[Dict[str, Any]], List[int]]:
+    """
+    Paginates the queryset and serializes the rows of the requested page with the
+    provided row serializer class. If possible, the rows are serialized directly from
+    their values with a `RowValuesEncoder`, which is a lot faster for wide tables,
+    otherwise the serializer is used.
+
+    :param paginator: The paginator that must be used to paginate the queryset.
+    :param queryset: The queryset of the rows that must be listed.
+    :param request: The request containing the pagination parameters.
+    :param view: The view handling the request.
+    :param serializer_class: The row serializer class generated by
+        `get_row_serializer_class`.
+    :return: The serialized rows of the page and the ids of those rows.
+    """
+
+    encoder = None
+    if not settings.BASEROW_DISABLE_FAST_ROW_LISTING and not queryset.query.distinct:
+        encoder = get_row_values_encoder(serializer_class)
+
+    if encoder is None:
+        page = paginator.paginate_queryset(queryset, request, view)
+        return serializer_class(page, many=True).data, [row.id for row in page]
+
+    page = paginator.paginate_queryset(
+        encoder.get_values_queryset(queryset), request, view
+    )
+    return encoder.encode(page), [values[0] for values in page]
@@ -11,3 +11,28 @@ ERROR_ROW_IDS_NOT_UNIQUE = (
     HTTP_400_BAD_REQUEST,
     "The provided row ids {e.ids} are not unique.",
 )
+
+ERROR_INVALID_UPSERT_KEY_FIELD = (
+    "ERROR_INVALID_UPSERT_KEY_FIELD",
+    HTTP_400_BAD_REQUEST,
+    "The field {e.field_id} can't be used to upsert rows.",
+)
+
+ERROR_UPSERT_KEY_VALUES_NOT_UNIQUE = (
+    "ERROR_UPSERT_KEY_VALUES_NOT_UNIQUE",
+    HTTP_400_BAD_REQUEST,
+    "The values {e.values} of the upsert field are not unique.",
+)
+
+ERROR_INVALID_ROW_CHANGES_CURSOR = (
+    "ERROR_INVALID_ROW_CHANGES_CURSOR",
+    HTTP_400_BAD_REQUEST,
+    "The provided row changes cursor is invalid.",
+)
+
+ERROR_ROW_CHANGES_CURSOR_EXPIRED = (
+    "ERROR_ROW_CHANGES_CURSOR_EXPIRED",
+    HTTP_400_BAD_REQUEST,
+    "The provided row changes cursor has expired, all the rows must be fetched "
+    "again.",
+)
@@ -0,0 +1,134 @@
+import hashlib
+import json
+from typing import List, Optional
+
+from django.conf import settings
+from django.utils.http import http_date, parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from baserow.contrib.database.table.models import GeneratedTableModel, Table
+from baserow.contrib.database.views.models import View
+from baserow.contrib.database.views.signals import get_view_settings_version_name
+from baserow.core.cache import get_versions
+from baserow.core.db_routers import get_table_data_version_name
+
+
+class RowsETag:
+    """
+    Computes the ETag of a row listing without querying the user table. The ETag is
+    derived from the data versions of the table and of the tables related via link
+    row fields, which are bumped whenever their rows or fields change, the version of
+    the settings of the view, the schema version of the table and the query
+    parameters. If the client already has the response, it can be answered with
+    `304 Not Modified` before the rows are filtered, sorted and serialized.
+
+    etag = RowsETag(request, table, model, view)
+    if etag.is_not_modified():
+        return etag.get_not_modified_response()
+    ...
+    return etag.apply(response)
+    """
+
+    def __init__(
+        self,
+        request: Request,
+        table: Table,
+        model: GeneratedTableModel,
+        view: Optional[View] = None,
+        enabled: bool = True,
+    ):
+        """
+        :param request: The request listing the rows.
+        :param table: The table of which the rows are listed.
+        :param model: The generated model containing the fields of the listing.
+        :param view: The view of which the filters, sortings and field options are
+            applied, if any.
+        :param enabled: Can be set to False if the response also contains data
+            that doesn't change the versions, like the row metadata.
+        """
+
+        self.request = request
+        self.enabled = enabled and not settings.BASEROW_DISABLE_ROW_LISTING_ETAGS
+        self.value = None
+        self.last_modified = None
+
+        if self.enabled:
+            self._compute(table, model, view)
+
+    @staticmethod
+    def _get_table_ids(table: Table, model: GeneratedTableModel) -> List[int]:
+        related_table_ids = {
+            field_object["field"].link_row_table_id
+            for field_object in model._field_objects.values()
+            if getattr(field_object["field"], "link_row_table_id", None) is not None
+        }
+        related_table_ids.discard(table.id)
+        return [table.id, *sorted(related_table_ids)]
+
+    def _compute(self, table: Table, model: GeneratedTableModel, view: Optional[View]):
+        version_names = [
+            get_table_data_version_name(table_id)
+            for table_id in self._get_table_ids(table, model)
+        ]
+        if view is not None:
+            version_names.append(get_view_settings_version_name(view.id))
+
+        versions = get_versions(version_names)
+        renderer = getattr(self.request, "accepted_renderer", None)
+        key = json.dumps(
+            [
+                self.request.path,
+                table.id,
+                table.version,
+                [versions[name][0] for name in version_names],
+                sorted(self.request.GET.lists()),
+                getattr(renderer, "media_type", None),
+            ],
+            default=str,
+        )
+
+        self.value = quote_etag(hashlib.sha256(key.encode()).hexdigest())
+        modified = [
+            modified for _, modified in versions.values() if modified is not None
+        ]
+        if modified:
+            self.last_modified = http_date(max(modified))
+
+    def is_not_modified(self) -> bool:
+        """
+        Checks if the ETag matches one of the ETags in the `If-None-Match` header
+        using the weak comparison, like Django's conditional GET handling does.
+        """
+
+        if not self.enabled:
+            return False
+
+        if_none_match = self.request.META.get("HTTP_IF_NONE_MATCH")
+        if not if_none_match:
+            return False
+
+        etags = parse_etags(if_none_match)
+        return "*" in etags or any(
+            etag.strip("W/") == self.value.strip("W/") for etag in etags
+        )
+
+    def apply(self, response: Response) -> Response:
+        """
+        Adds the `ETag` and `Last-Modified` headers to the response. The response
+        must be revalidated before being reused and is private because it's only
+        available to the users that have access to the table.
+        """
+
+        if not self.enabled:
+            return response
+
+        response["ETag"] = self.value
+        if self.last_modified:
+            response["Last-Modified"] = self.last_modified
+        response["Cache-Control"] = "private, no-cache"
+        return response
+
+    def get_not_modified_response(self) -> Response:
+        return self.apply(Response(status=status.HTTP_304_NOT_MODIFIED))
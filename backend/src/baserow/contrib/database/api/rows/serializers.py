@@ -1,6 +1,8 @@
 import logging
+import threading
+from collections import OrderedDict
 from copy import deepcopy
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 from django.conf import settings
 from rest_framework import serializers
@@ -9,10 +11,20 @@ from django.db.models.base import ModelBase
 from baserow.api.serializers import get_example_pagination_serializer_class
 from baserow.api.utils import get_serializer_class
 from baserow.contrib.database.fields.registries import field_type_registry
+from baserow.contrib.database.rows.constants import (
+    ROW_OPERATION_CREATE,
+    ROW_OPERATION_TYPES,
+    ROW_OPERATION_UPDATE,
+)
 from baserow.contrib.database.rows.registries import row_metadata_registry
 
 logger = logging.getLogger(__name__)
 
+# The maximum number of generated row serializer classes that are kept in memory.
+ROW_SERIALIZER_CLASS_CACHE_SIZE = 256
+_row_serializer_class_cache = OrderedDict()
+_row_serializer_class_cache_lock = threading.Lock()
+
 
 class RowSerializer(serializers.ModelSerializer):
     class Meta:
@@ -71,6 +83,93 @@ def get_row_serializer_class(
     :rtype: ModelSerializer
     """
 
+    cache_key = _get_row_serializer_class_cache_key(
+        model,
+        base_class,
+        is_response,
+        field_ids,
+        field_names_to_include,
+        user_field_names,
+        field_kwargs,
+        include_id,
+        required_fields,
+    )
+
+    if cache_key is not None:
+        with _row_serializer_class_cache_lock:
+            serializer_class = _row_serializer_class_cache.get(cache_key)
+            if serializer_class is not None:
+                _row_serializer_class_cache.move_to_end(cache_key)
+                return serializer_class
+
+    serializer_class = _generate_row_serializer_class(
+        model,
+        base_class,
+        is_response,
+        field_ids,
+        field_names_to_include,
+        user_field_names,
+        field_kwargs,
+        include_id,
+        required_fields,
+    )
+
+    if cache_key is not None:
+        with _row_serializer_class_cache_lock:
+            _row_serializer_class_cache[cache_key] = serializer_class
+            while len(_row_serializer_class_cache) > ROW_SERIALIZER_CLASS_CACHE_SIZE:
+                _row_serializer_class_cache.popitem(last=False)
+
+    return serializer_class
+
+
+def _get_row_serializer_class_cache_key(
+    model,
+    base_class,
+    is_response,
+    field_ids,
+    field_names_to_include,
+    user_field_names,
+    field_kwargs,
+    include_id,
+    required_fields,
+) -> Optional[Tuple]:
+    """
+    Returns the key under which the generated row serializer class can be cached or
+    None if it can't be cached. That's only possible if the model has been generated
+    for a known version of the table, because the version changes every time the
+    fields of the table change.
+    """
+
+    table_version = getattr(model, "_table_version", None)
+    if table_version is None or field_kwargs:
+        return None
+
+    return (
+        model._table_id,
+        table_version,
+        tuple(model._field_objects.keys()),
+        base_class,
+        is_response,
+        None if field_ids is None else frozenset(field_ids),
+        None if field_names_to_include is None else frozenset(field_names_to_include),
+        user_field_names,
+        include_id,
+        None if required_fields is None else tuple(required_fields),
+    )
+
+
+def _generate_row_serializer_class(
+    model,
+    base_class,
+    is_response,
+    field_ids,
+    field_names_to_include,
+    user_field_names,
+    field_kwargs,
+    include_id,
+    required_fields,
+):
     if not field_kwargs:
         field_kwargs = {}
 
@@ -149,6 +248,101 @@ class BatchDeleteRowsSerializer(serializers.Serializer):
     )
 
 
+class RowOperationSerializer(serializers.Serializer):
+    type = serializers.ChoiceField(
+        choices=ROW_OPERATION_TYPES, help_text="The kind of operation."
+    )
+    id = serializers.IntegerField(
+        required=False,
+        help_text="The id of the row that must be updated, moved or deleted.",
+    )
+    before_id = serializers.IntegerField(
+        required=False,
+        allow_null=True,
+        help_text="The id of the row before which the row must be created or moved. "
+        "The row is placed at the end of the table if not provided.",
+    )
+    values = serializers.DictField(
+        required=False,
+        help_text="The values of the row that must be created or updated, in the same "
+        "format as the single row create and update endpoints expect them.",
+    )
+
+    # The row serializer class that's used to validate the values. Set by
+    # `get_batch_row_operations_serializer_class`.
+    row_serializer_class = None
+
+    def validate(self, data):
+        operation_type = data["type"]
+        if operation_type != ROW_OPERATION_CREATE and "id" not in data:
+            raise serializers.ValidationError(
+                {"id": "This field is required."}, code="required"
+            )
+
+        if operation_type in (ROW_OPERATION_CREATE, ROW_OPERATION_UPDATE):
+            values = data.get("values", {})
+            if self.row_serializer_class is not None:
+                values_serializer = self.row_serializer_class(data=values, partial=True)
+                if not values_serializer.is_valid():
+                    raise serializers.ValidationError(
+                        {"values": values_serializer.errors}
+                    )
+                values = values_serializer.validated_data
+            data["values"] = values
+
+        return data
+
+
+class BatchRowOperationsSerializer(serializers.Serializer):
+    items = serializers.ListField(
+        child=RowOperationSerializer(),
+        min_length=1,
+        max_length=settings.BATCH_ROWS_SIZE_LIMIT,
+        help_text="The operations in the order they must be executed.",
+    )
+
+
+def get_batch_row_operations_serializer_class(row_serializer_class):
+    """
+    Generates a serializer that validates a list of row operations, where the values
+    of the create and update operations are validated with the provided row serializer
+    class.
+
+    :param row_serializer_class: The row serializer class generated by
+        `get_row_serializer_class` for the table.
+    :return: The generated serializer class.
+    """
+
+    operation_serializer_class = type(
+        "RowOperationSerializer",
+        (RowOperationSerializer,),
+        {"row_serializer_class": row_serializer_class},
+    )
+    fields = {
+        "items": serializers.ListField(
+            child=operation_serializer_class(),
+            min_length=1,
+            max_length=settings.BATCH_ROWS_SIZE_LIMIT,
+        ),
+    }
+    return type("BatchRowOperationsSerializer", (serializers.Serializer,), fields)
+
+
+class RowOperationResultSerializer(serializers.Serializer):
+    type = serializers.ChoiceField(choices=ROW_OPERATION_TYPES)
+    id = serializers.IntegerField(help_text="The id of the row of the operation.")
+    row = serializers.DictField(
+        allow_null=True,
+        help_text="The row after all the operations have been executed, in the same "
+        "format as the list rows endpoint responds with. Null if the row has been "
+        "deleted.",
+    )
+
+
+class BatchRowOperationsResultSerializer(serializers.Serializer):
+    items = RowOperationResultSerializer(many=True)
+
+
 def get_example_row_serializer_class(example_type="get", user_field_names=False):
     """
     Generates a serializer containing a field for each field type. It is only used for
@@ -340,6 +534,7 @@ class CreateRowQueryParamsSerializer(serializers.Serializer):
 
 class BatchCreateRowsQueryParamsSerializer(serializers.Serializer):
     before = serializers.IntegerField(required=False)
+    upsert_field = serializers.IntegerField(required=False)
 
 
 class ListRowsQueryParamsSerializer(serializers.Serializer):
@@ -352,6 +547,33 @@ class ListRowsQueryParamsSerializer(serializers.Serializer):
     view_id = serializers.IntegerField(required=False)
 
 
+class RowChangesQueryParamsSerializer(serializers.Serializer):
+    user_field_names = serializers.BooleanField(required=False, default=False)
+    cursor = serializers.CharField(required=False)
+    size = serializers.IntegerField(
+        required=False,
+        default=100,
+        min_value=1,
+        max_value=settings.ROW_PAGE_SIZE_LIMIT,
+    )
+
+
+class RowChangesSerializer(serializers.Serializer):
+    items = get_example_row_serializer_class(example_type="get", user_field_names=True)(
+        many=True, help_text="The rows that have been created or updated."
+    )
+    deleted = serializers.ListField(
+        child=serializers.IntegerField(),
+        help_text="The ids of the rows that have been deleted.",
+    )
+    cursor = serializers.CharField(
+        help_text="The cursor that must be provided to fetch the next changes."
+    )
+    has_more = serializers.BooleanField(
+        help_text="Indicates whether more changes can be fetched right away."
+    )
+
+
 class BatchUpdateRowsSerializer(serializers.Serializer):
     items = serializers.ListField(
         child=RowSerializer(),
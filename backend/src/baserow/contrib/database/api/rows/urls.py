@@ -8,6 +8,8 @@ from .views import (
     RowNamesView,
     BatchRowsView,
     BatchDeleteRowsView,
+    BatchRowOperationsView,
+    RowChangesView,
 )
 
 
@@ -30,6 +32,16 @@ urlpatterns = [
         BatchDeleteRowsView.as_view(),
         name="batch-delete",
     ),
+    re_path(
+        r"table/(?P<table_id>[0-9]+)/batch-operations/$",
+        BatchRowOperationsView.as_view(),
+        name="batch-operations",
+    ),
+    re_path(
+        r"table/(?P<table_id>[0-9]+)/changes/$",
+        RowChangesView.as_view(),
+        name="changes",
+    ),
     re_path(
         r"table/(?P<table_id>[0-9]+)/(?P<row_id>[0-9]+)/move/$",
         RowMoveView.as_view(),
@@ -21,6 +21,7 @@ from baserow.api.exceptions import (
     QueryParameterValidationException,
 )
 from baserow.api.pagination import PageNumberPagination
+from baserow.api.renderers import FastJSONRenderer
 from baserow.api.schemas import (
     get_error_schema,
     CLIENT_SESSION_ID_SCHEMA_PARAMETER,
@@ -38,6 +39,10 @@ from baserow.contrib.database.api.fields.errors import (
 from baserow.contrib.database.api.rows.errors import (
     ERROR_ROW_DOES_NOT_EXIST,
     ERROR_ROW_IDS_NOT_UNIQUE,
+    ERROR_INVALID_UPSERT_KEY_FIELD,
+    ERROR_UPSERT_KEY_VALUES_NOT_UNIQUE,
+    ERROR_INVALID_ROW_CHANGES_CURSOR,
+    ERROR_ROW_CHANGES_CURSOR_EXPIRED,
 )
 from baserow.contrib.database.api.rows.serializers import (
     example_pagination_row_serializer_class,
@@ -56,6 +61,7 @@ from baserow.contrib.database.fields.exceptions import (
     FilterFieldNotFound,
     FieldDoesNotExist,
 )
+from baserow.contrib.database.fields.index_advisor import FieldIndexAdvisor
 from baserow.contrib.database.rows.actions import (
     CreateRowActionType,
     CreateRowsActionType,
@@ -64,9 +70,22 @@ from baserow.contrib.database.rows.actions import (
     MoveRowActionType,
     UpdateRowActionType,
     UpdateRowsActionType,
+    UpsertRowsActionType,
+    execute_row_operations,
+)
+from baserow.contrib.database.rows.constants import (
+    ROW_OPERATION_CREATE,
+    ROW_OPERATION_DELETE,
 )
 from baserow.core.action.registries import action_type_registry
-from baserow.contrib.database.rows.exceptions import RowDoesNotExist, RowIdsNotUnique
+from baserow.contrib.database.rows.exceptions import (
+    InvalidRowChangesCursor,
+    InvalidUpsertKeyField,
+    RowChangesCursorExpired,
+    RowDoesNotExist,
+    RowIdsNotUnique,
+    UpsertKeyValuesNotUnique,
+)
 from baserow.contrib.database.rows.handler import RowHandler
 from baserow.contrib.database.table.exceptions import TableDoesNotExist
 from baserow.contrib.database.table.handler import TableHandler
@@ -79,8 +98,11 @@ from baserow.contrib.database.views.exceptions import (
     ViewDoesNotExist,
 )
 from baserow.contrib.database.views.registries import view_filter_type_registry
+from baserow.core.db_routers import read_replica
 from baserow.core.exceptions import UserNotInGroup
 from baserow.core.trash.exceptions import CannotDeleteAlreadyDeletedItem
+from .encoders import paginate_and_serialize_rows
+from .etags import RowsETag
 from .serializers import (
     ListRowsQueryParamsSerializer,
     MoveRowQueryParamsSerializer,
@@ -88,6 +110,11 @@ from .serializers import (
     RowSerializer,
     BatchCreateRowsQueryParamsSerializer,
     BatchDeleteRowsSerializer,
+    BatchRowOperationsResultSerializer,
+    BatchRowOperationsSerializer,
+    RowChangesQueryParamsSerializer,
+    RowChangesSerializer,
+    get_batch_row_operations_serializer_class,
     get_batch_row_serializer_class,
     get_example_row_serializer_class,
     get_row_serializer_class,
@@ -104,6 +131,7 @@ from .schemas import row_names_response_schema
 class RowsView(APIView):
     authentication_classes = APIView.authentication_classes + [TokenAuthentication]
     permission_classes = (IsAuthenticated,)
+    renderer_classes = (FastJSONRenderer,)
 
     @extend_schema(
         parameters=[
@@ -284,6 +312,7 @@ class RowsView(APIView):
         }
     )
     @validate_query_parameters(ListRowsQueryParamsSerializer)
+    @read_replica()
     def get(self, request, table_id, query_params):
         """
         Lists all the rows of the given table id paginated. It is also possible to
@@ -310,6 +339,7 @@ class RowsView(APIView):
         )
         queryset = model.objects.all().enhance_by_fields()
 
+        view = None
         if view_id:
             view_handler = ViewHandler()
             view = view_handler.get_view(view_id)
@@ -317,6 +347,11 @@ class RowsView(APIView):
             if view.table_id != table.id:
                 raise ViewDoesNotExist()
 
+        etag = RowsETag(request, table, model, view)
+        if etag.is_not_modified():
+            return etag.get_not_modified_response()
+
+        if view is not None:
             queryset = view_handler.apply_filters(view, queryset)
             queryset = view_handler.apply_sorting(view, queryset)
 
@@ -335,14 +370,22 @@ class RowsView(APIView):
         filter_object = {key: request.GET.getlist(key) for key in request.GET.keys()}
         queryset = queryset.filter_by_fields_object(filter_object, filter_type)
 
+        index_advisor = FieldIndexAdvisor()
+        index_advisor.record_field_usages(
+            index_advisor.get_api_field_usages(
+                queryset, order_by, user_field_names, filter_object
+            )
+        )
+
         paginator = PageNumberPagination(limit_page_size=settings.ROW_PAGE_SIZE_LIMIT)
-        page = paginator.paginate_queryset(queryset, request, self)
         serializer_class = get_row_serializer_class(
             model, RowSerializer, is_response=True, user_field_names=user_field_names
         )
-        serializer = serializer_class(page, many=True)
+        serialized_rows, _ = paginate_and_serialize_rows(
+            paginator, queryset, request, self, serializer_class
+        )
 
-        return paginator.get_paginated_response(serializer.data)
+        return etag.apply(paginator.get_paginated_response(serialized_rows))
 
     @extend_schema(
         parameters=[
@@ -949,6 +992,19 @@ class BatchRowsView(APIView):
                 description="If provided then the newly created rows will be "
                 "positioned before the row with the provided id.",
             ),
+            OpenApiParameter(
+                name="upsert_field",
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.INT,
+                description=(
+                    "If the id of a text, long text, url, email, phone number or "
+                    "number field is provided, the rows are upserted by the value of "
+                    "that field. A row of which the value already exists is updated "
+                    "with the provided values instead of created. Rows without a "
+                    "value are always created. Fails if multiple existing rows have "
+                    "the same value as a provided row."
+                ),
+            ),
             OpenApiParameter(
                 name="user_field_names",
                 location=OpenApiParameter.QUERY,
@@ -993,6 +1049,8 @@ class BatchRowsView(APIView):
                     "ERROR_REQUEST_BODY_VALIDATION",
                     "ERROR_ROW_IDS_NOT_UNIQUE",
                     "ERROR_REQUEST_BODY_VALIDATION",
+                    "ERROR_INVALID_UPSERT_KEY_FIELD",
+                    "ERROR_UPSERT_KEY_VALUES_NOT_UNIQUE",
                 ]
             ),
             401: get_error_schema(["ERROR_NO_PERMISSION_TO_TABLE"]),
@@ -1009,17 +1067,23 @@ class BatchRowsView(APIView):
             RowDoesNotExist: ERROR_ROW_DOES_NOT_EXIST,
             RowIdsNotUnique: ERROR_ROW_IDS_NOT_UNIQUE,
             NoPermissionToTable: ERROR_NO_PERMISSION_TO_TABLE,
+            InvalidUpsertKeyField: ERROR_INVALID_UPSERT_KEY_FIELD,
+            UpsertKeyValuesNotUnique: ERROR_UPSERT_KEY_VALUES_NOT_UNIQUE,
         }
     )
     @validate_query_parameters(BatchCreateRowsQueryParamsSerializer)
     def post(self, request: Request, table_id: int, query_params) -> Response:
         """
         Creates new rows for the given table_id. Also the post data is validated
-        according to the tables field types.
+        according to the tables field types. If an upsert field is provided, the
+        existing rows with the same value of that field are updated instead.
         """
 
         table = TableHandler().get_table(table_id)
         TokenHandler().check_table_permissions(request, "create", table, False)
+        upsert_field_id = query_params.get("upsert_field")
+        if upsert_field_id is not None:
+            TokenHandler().check_table_permissions(request, "update", table, False)
         model = table.get_model()
 
         user_field_names = "user_field_names" in request.GET
@@ -1041,9 +1105,19 @@ class BatchRowsView(APIView):
         )
 
         try:
-            rows = action_type_registry.get_by_type(CreateRowsActionType).do(
-                request.user, table, data["items"], before_row, model
-            )
+            if upsert_field_id is None:
+                rows = action_type_registry.get_by_type(CreateRowsActionType).do(
+                    request.user, table, data["items"], before_row, model
+                )
+            else:
+                rows = action_type_registry.get_by_type(UpsertRowsActionType).do(
+                    request.user,
+                    table,
+                    data["items"],
+                    upsert_field_id,
+                    before_row,
+                    model,
+                )
         except ValidationError as exc:
             raise RequestBodyValidationException(detail=exc.message)
 
@@ -1234,3 +1308,243 @@ class BatchDeleteRowsView(APIView):
         )
 
         return Response(status=204)
+
+
+class BatchRowOperationsView(APIView):
+    authentication_classes = APIView.authentication_classes + [TokenAuthentication]
+    permission_classes = (IsAuthenticated,)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="table_id",
+                location=OpenApiParameter.PATH,
+                type=OpenApiTypes.INT,
+                description="Executes the operations on the rows of this table.",
+            ),
+            OpenApiParameter(
+                name="user_field_names",
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.BOOL,
+                description=(
+                    "A flag query parameter which if provided this endpoint will "
+                    "expect and return the user specified field names instead of "
+                    "internal Baserow field names (field_123 etc)."
+                ),
+            ),
+            CLIENT_SESSION_ID_SCHEMA_PARAMETER,
+            CLIENT_UNDO_REDO_ACTION_GROUP_ID_SCHEMA_PARAMETER,
+        ],
+        tags=["Database table rows"],
+        operation_id="batch_database_table_row_operations",
+        description=(
+            "Executes a list of create, update, move and delete operations on the "
+            "rows of the table in the provided order in a single transaction. If one "
+            "of the operations fails, none of them are executed. The values of the "
+            "create and update operations are expected in the same format as the "
+            "create and update row endpoints expect them. The cells of the fields "
+            "depending on the changed rows are updated only once after all the "
+            "operations have been executed, and the real time and webhook events are "
+            "combined per kind of change. Undoing reverts all the operations at once. "
+            "The response contains the id of the row of every operation and the row "
+            "as it is after all the operations have been executed."
+        ),
+        request=BatchRowOperationsSerializer,
+        responses={
+            200: BatchRowOperationsResultSerializer,
+            400: get_error_schema(
+                [
+                    "ERROR_USER_NOT_IN_GROUP",
+                    "ERROR_REQUEST_BODY_VALIDATION",
+                    "ERROR_ROW_IDS_NOT_UNIQUE",
+                ]
+            ),
+            401: get_error_schema(["ERROR_NO_PERMISSION_TO_TABLE"]),
+            404: get_error_schema(
+                ["ERROR_TABLE_DOES_NOT_EXIST", "ERROR_ROW_DOES_NOT_EXIST"]
+            ),
+        },
+    )
+    @transaction.atomic
+    @map_exceptions(
+        {
+            UserNotInGroup: ERROR_USER_NOT_IN_GROUP,
+            TableDoesNotExist: ERROR_TABLE_DOES_NOT_EXIST,
+            RowDoesNotExist: ERROR_ROW_DOES_NOT_EXIST,
+            RowIdsNotUnique: ERROR_ROW_IDS_NOT_UNIQUE,
+            NoPermissionToTable: ERROR_NO_PERMISSION_TO_TABLE,
+        }
+    )
+    def post(self, request: Request, table_id: int) -> Response:
+        """
+        Executes the provided row operations in the given order for the table with
+        the given table_id.
+        """
+
+        table = TableHandler().get_table(table_id)
+        model = table.get_model()
+        user_field_names = "user_field_names" in request.GET
+
+        row_validation_serializer = get_row_serializer_class(
+            model, user_field_names=user_field_names
+        )
+        data = validate_data(
+            get_batch_row_operations_serializer_class(row_validation_serializer),
+            request.data,
+            return_validated=True,
+        )
+        operations = data["items"]
+
+        permission_types = {
+            {ROW_OPERATION_CREATE: "create", ROW_OPERATION_DELETE: "delete"}.get(
+                operation["type"], "update"
+            )
+            for operation in operations
+        }
+        for permission_type in sorted(permission_types):
+            TokenHandler().check_table_permissions(
+                request, permission_type, table, False
+            )
+
+        try:
+            row_ids = execute_row_operations(request.user, table, operations, model)
+        except ValidationError as exc:
+            raise RequestBodyValidationException(detail=exc.message)
+
+        response_row_serializer_class = get_row_serializer_class(
+            model, RowSerializer, is_response=True, user_field_names=user_field_names
+        )
+        rows = model.objects.all().enhance_by_fields().filter(id__in=row_ids)
+        serialized_rows = {
+            row["id"]: row
+            for row in response_row_serializer_class(rows, many=True).data
+        }
+
+        return Response(
+            {
+                "items": [
+                    {
+                        "type": operation["type"],
+                        "id": row_id,
+                        "row": serialized_rows.get(row_id),
+                    }
+                    for operation, row_id in zip(operations, row_ids)
+                ]
+            }
+        )
+
+
+class RowChangesView(APIView):
+    authentication_classes = APIView.authentication_classes + [TokenAuthentication]
+    permission_classes = (IsAuthenticated,)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="table_id",
+                location=OpenApiParameter.PATH,
+                type=OpenApiTypes.INT,
+                description="Returns the changes of the rows of this table.",
+            ),
+            OpenApiParameter(
+                name="cursor",
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.STR,
+                description=(
+                    "The cursor returned by the previous request. If not provided, "
+                    "all the rows of the table are returned first."
+                ),
+            ),
+            OpenApiParameter(
+                name="size",
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.INT,
+                description=(
+                    "The maximum number of changes to return, defaults to 100 with "
+                    f"a maximum of {settings.ROW_PAGE_SIZE_LIMIT}."
+                ),
+            ),
+            OpenApiParameter(
+                name="user_field_names",
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.BOOL,
+                description=(
+                    "A flag query parameter which if provided the returned json "
+                    "will use the user specified field names instead of internal "
+                    "Baserow field names (field_123 etc). "
+                ),
+            ),
+        ],
+        tags=["Database table rows"],
+        operation_id="list_database_table_row_changes",
+        description=(
+            "Lists the rows of the table that have been created, updated or deleted "
+            "since the request that returned the provided cursor, in the order in "
+            "which they changed. This can be used to keep a copy of the rows in sync "
+            "without fetching all of them again. The created and updated rows are "
+            "returned in `items`, the ids of the trashed and deleted rows in "
+            "`deleted`. The returned cursor must be provided to the next request, "
+            "which can be done right away while `has_more` is true. Only the changes "
+            "that are a few seconds old are returned, so that no change of a "
+            "transaction that commits later is missed. While a long running "
+            "transaction, like a large import, is in progress, no newer changes "
+            "are returned until it finishes. If the cursor is older than "
+            "the retention period of the deleted rows, then the "
+            "`ERROR_ROW_CHANGES_CURSOR_EXPIRED` error is returned and all the rows "
+            "must be fetched again by not providing a cursor. After a field has "
+            "changed, all the rows must be fetched again as well. Rows of which "
+            "the link row field values change because rows of the related table "
+            "are linked, unlinked, trashed or deleted are returned as updated."
+        ),
+        responses={
+            200: RowChangesSerializer,
+            400: get_error_schema(
+                [
+                    "ERROR_USER_NOT_IN_GROUP",
+                    "ERROR_QUERY_PARAMETER_VALIDATION",
+                    "ERROR_INVALID_ROW_CHANGES_CURSOR",
+                    "ERROR_ROW_CHANGES_CURSOR_EXPIRED",
+                ]
+            ),
+            401: get_error_schema(["ERROR_NO_PERMISSION_TO_TABLE"]),
+            404: get_error_schema(["ERROR_TABLE_DOES_NOT_EXIST"]),
+        },
+    )
+    @map_exceptions(
+        {
+            UserNotInGroup: ERROR_USER_NOT_IN_GROUP,
+            TableDoesNotExist: ERROR_TABLE_DOES_NOT_EXIST,
+            NoPermissionToTable: ERROR_NO_PERMISSION_TO_TABLE,
+            InvalidRowChangesCursor: ERROR_INVALID_ROW_CHANGES_CURSOR,
+            RowChangesCursorExpired: ERROR_ROW_CHANGES_CURSOR_EXPIRED,
+        }
+    )
+    @validate_query_parameters(RowChangesQueryParamsSerializer)
+    def get(self, request: Request, table_id: int, query_params) -> Response:
+        """
+        Responds with the rows of the table that have changed since the provided
+        cursor.
+        """
+
+        table = TableHandler().get_table(table_id)
+        TokenHandler().check_table_permissions(request, "read", table, False)
+
+        model = table.get_model()
+        changes = RowHandler().get_row_changes(
+            request.user, table, query_params.get("cursor"), query_params["size"], model
+        )
+
+        serializer_class = get_row_serializer_class(
+            model,
+            RowSerializer,
+            is_response=True,
+            user_field_names=query_params["user_field_names"],
+        )
+        return Response(
+            {
+                "items": serializer_class(changes.rows, many=True).data,
+                "deleted": changes.deleted_row_ids,
+                "cursor": changes.cursor,
+                "has_more": changes.has_more,
+            }
+        )
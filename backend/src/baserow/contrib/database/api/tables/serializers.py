@@ -1,5 +1,12 @@
+import codecs
+
 from rest_framework import serializers
 
+from baserow.contrib.database.file_import.constants import (
+    FILE_TYPE_CSV,
+    FILE_TYPE_JSON_LINES,
+    FILE_TYPE_TSV,
+)
 from baserow.contrib.database.table.models import Table
 
 
@@ -34,13 +41,20 @@ class TableCreateSerializer(serializers.ModelSerializer):
         "field names are going to be the values of the first row. Otherwise "
         'they will be called "Field N"',
     )
+    detect_field_types = serializers.BooleanField(
+        default=False,
+        help_text="Indicates if the type of each field is detected from the data. "
+        "Number, boolean, date, email, URL and single select fields are created "
+        "when all the values of a column match. Otherwise text fields are created.",
+    )
 
     class Meta:
         model = Table
-        fields = ("name", "data", "first_row_header")
+        fields = ("name", "data", "first_row_header", "detect_field_types")
         extra_kwargs = {
             "data": {"required": False},
             "first_row_header": {"required": False},
+            "detect_field_types": {"required": False},
         }
 
 
@@ -64,6 +78,57 @@ class TableImportSerializer(serializers.Serializer):
         fields = ("data",)
 
 
+class TableImportFileSerializer(serializers.Serializer):
+    file = serializers.FileField(
+        help_text="The file containing the rows to import. It's parsed by the "
+        "background job, so it can be much bigger than a regular request body."
+    )
+    file_type = serializers.ChoiceField(
+        choices=[FILE_TYPE_CSV, FILE_TYPE_TSV, FILE_TYPE_JSON_LINES],
+        help_text="The format of the file. A `jsonl` file must contain one JSON "
+        "array of values per line.",
+    )
+    encoding = serializers.CharField(
+        max_length=32,
+        required=False,
+        allow_blank=True,
+        default="",
+        help_text="The encoding of the file. Detected if not provided.",
+    )
+    csv_delimiter = serializers.CharField(
+        max_length=1,
+        required=False,
+        allow_blank=True,
+        default="",
+        trim_whitespace=False,
+        help_text="The delimiter of a `csv` file. Detected if not provided.",
+    )
+
+    def validate_encoding(self, value):
+        if value:
+            try:
+                codecs.lookup(value)
+            except LookupError:
+                raise serializers.ValidationError(f"Unknown encoding {value}.")
+        return value
+
+
+class TableCreateFromFileSerializer(TableImportFileSerializer):
+    name = serializers.CharField(max_length=255)
+    first_row_header = serializers.BooleanField(
+        default=False,
+        help_text="Indicates if the first row of the file is the header. If true the "
+        "field names are going to be the values of the first row. Otherwise "
+        'they will be called "Field N"',
+    )
+    detect_field_types = serializers.BooleanField(
+        default=False,
+        help_text="Indicates if the type of each field is detected from the data. "
+        "Number, boolean, date, email, URL and single select fields are created "
+        "when all the values of a column match. Otherwise text fields are created.",
+    )
+
+
 class TableUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Table
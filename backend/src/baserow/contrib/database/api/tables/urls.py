@@ -5,7 +5,9 @@ from .views import (
     TableView,
     OrderTablesView,
     AsyncCreateTableView,
+    AsyncCreateTableFromFileView,
     AsyncTableImportView,
+    AsyncTableImportFromFileView,
     AsyncDuplicateTableView,
 )
 
@@ -19,6 +21,11 @@ urlpatterns = [
         AsyncCreateTableView.as_view(),
         name="async_create",
     ),
+    re_path(
+        r"database/(?P<database_id>[0-9]+)/async/file/$",
+        AsyncCreateTableFromFileView.as_view(),
+        name="async_create_from_file",
+    ),
     re_path(
         r"database/(?P<database_id>[0-9]+)/order/$",
         OrderTablesView.as_view(),
@@ -35,4 +42,9 @@ urlpatterns = [
         AsyncTableImportView.as_view(),
         name="import_async",
     ),
+    re_path(
+        r"(?P<table_id>[0-9]+)/import/async/file/$",
+        AsyncTableImportFromFileView.as_view(),
+        name="import_file_async",
+    ),
 ]
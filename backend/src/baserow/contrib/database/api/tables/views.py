@@ -3,6 +3,7 @@ from django.db import transaction
 from drf_spectacular.openapi import OpenApiParameter, OpenApiTypes
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -66,7 +67,9 @@ from .errors import (
 from .serializers import (
     TableSerializer,
     TableCreateSerializer,
+    TableCreateFromFileSerializer,
     TableImportSerializer,
+    TableImportFileSerializer,
     TableUpdateSerializer,
     OrderTablesSerializer,
 )
@@ -197,6 +200,7 @@ class TablesView(APIView):
             name=data["name"],
             data=data["data"],
             first_row_header=data["first_row_header"],
+            detect_field_types=data["detect_field_types"],
         )
 
         serializer = TableSerializer(table)
@@ -260,6 +264,7 @@ class AsyncCreateTableView(APIView):
             name=data["name"],
             data=data["data"],
             first_row_header=data["first_row_header"],
+            detect_field_types=data["detect_field_types"],
             sync=True if data["data"] is None else False,
         )
 
@@ -267,6 +272,77 @@ class AsyncCreateTableView(APIView):
         return Response(serializer.data)
 
 
+class AsyncCreateTableFromFileView(APIView):
+    permission_classes = (IsAuthenticated,)
+    parser_classes = (MultiPartParser,)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="database_id",
+                location=OpenApiParameter.PATH,
+                type=OpenApiTypes.INT,
+                description="Creates a table for the database related to the provided "
+                "value.",
+            ),
+            CLIENT_SESSION_ID_SCHEMA_PARAMETER,
+        ],
+        tags=["Database tables"],
+        operation_id="create_database_table_from_file_async",
+        description=(
+            "Creates a job that creates a new table for the database related to the "
+            "provided `database_id` parameter and fills it with the rows of the "
+            "uploaded CSV, TSV or JSON lines file. Contrary to "
+            "`create_database_table_async`, the file is parsed by the job itself, "
+            "which makes it possible to import much bigger files. This endpoint is "
+            "asynchronous and return the created job to track the progress of the "
+            "task."
+        ),
+        request=TableCreateFromFileSerializer,
+        responses={
+            202: FileImportJobSerializerClass,
+            400: get_error_schema(
+                [
+                    "ERROR_USER_NOT_IN_GROUP",
+                    "ERROR_REQUEST_BODY_VALIDATION",
+                    "ERROR_MAX_JOB_COUNT_EXCEEDED",
+                ]
+            ),
+            404: get_error_schema(["ERROR_APPLICATION_DOES_NOT_EXIST"]),
+        },
+    )
+    @transaction.atomic
+    @map_exceptions(
+        {
+            ApplicationDoesNotExist: ERROR_APPLICATION_DOES_NOT_EXIST,
+            UserNotInGroup: ERROR_USER_NOT_IN_GROUP,
+            MaxJobCountExceeded: ERROR_MAX_JOB_COUNT_EXCEEDED,
+        }
+    )
+    @validate_body(TableCreateFromFileSerializer)
+    def post(self, request, data, database_id):
+        """Creates a job to create a new table from an uploaded file."""
+
+        database = DatabaseHandler().get_database(database_id)
+        database.group.has_user(request.user, raise_error=True)
+
+        file_import_job = JobHandler().create_and_start_job(
+            request.user,
+            "file_import",
+            database=database,
+            name=data["name"],
+            file=request.FILES["file"],
+            file_type=data["file_type"],
+            encoding=data["encoding"],
+            csv_delimiter=data["csv_delimiter"],
+            first_row_header=data["first_row_header"],
+            detect_field_types=data["detect_field_types"],
+        )
+
+        serializer = job_type_registry.get_serializer(file_import_job, JobSerializer)
+        return Response(serializer.data)
+
+
 class TableView(APIView):
     permission_classes = (IsAuthenticated,)
 
@@ -451,6 +527,71 @@ class AsyncTableImportView(APIView):
         return Response(serializer.data)
 
 
+class AsyncTableImportFromFileView(APIView):
+    permission_classes = (IsAuthenticated,)
+    parser_classes = (MultiPartParser,)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="table_id",
+                location=OpenApiParameter.PATH,
+                type=OpenApiTypes.INT,
+                description="Import data into the table related to the provided value.",
+            )
+        ],
+        tags=["Database tables"],
+        operation_id="import_file_database_table_async",
+        description=(
+            "Imports the rows of the uploaded CSV, TSV or JSON lines file in the "
+            "specified table if the authorized user has access to the related "
+            "database's group. The values of each row must be ordered according to "
+            "the **writable** fields of the table. The file is parsed by the job "
+            "itself, which makes it possible to import much bigger files. This "
+            "endpoint is asynchronous and return the created job to track the "
+            "progress of the task."
+        ),
+        request=TableImportFileSerializer,
+        responses={
+            202: FileImportJobSerializerClass,
+            400: get_error_schema(
+                [
+                    "ERROR_USER_NOT_IN_GROUP",
+                    "ERROR_REQUEST_BODY_VALIDATION",
+                    "ERROR_MAX_JOB_COUNT_EXCEEDED",
+                ]
+            ),
+            404: get_error_schema(["ERROR_TABLE_DOES_NOT_EXIST"]),
+        },
+    )
+    @map_exceptions(
+        {
+            TableDoesNotExist: ERROR_TABLE_DOES_NOT_EXIST,
+            UserNotInGroup: ERROR_USER_NOT_IN_GROUP,
+            MaxJobCountExceeded: ERROR_MAX_JOB_COUNT_EXCEEDED,
+        }
+    )
+    @validate_body(TableImportFileSerializer)
+    def post(self, request, data, table_id):
+        """Import the rows of an uploaded file into an existing table."""
+
+        table = TableHandler().get_table(table_id)
+        table.database.group.has_user(request.user, raise_error=True)
+
+        file_import_job = JobHandler().create_and_start_job(
+            request.user,
+            "file_import",
+            table=table,
+            file=request.FILES["file"],
+            file_type=data["file_type"],
+            encoding=data["encoding"],
+            csv_delimiter=data["csv_delimiter"],
+        )
+
+        serializer = job_type_registry.get_serializer(file_import_job, JobSerializer)
+        return Response(serializer.data)
+
+
 class OrderTablesView(APIView):
     permission_classes = (IsAuthenticated,)
 
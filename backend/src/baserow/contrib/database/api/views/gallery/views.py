@@ -10,6 +10,7 @@ from baserow.api.decorators import map_exceptions, allowed_includes
 from baserow.api.errors import ERROR_USER_NOT_IN_GROUP
 from baserow.api.schemas import get_error_schema
 from baserow.api.serializers import get_example_pagination_serializer_class
+from baserow.contrib.database.api.rows.etags import RowsETag
 from baserow.contrib.database.api.rows.serializers import (
     get_example_row_serializer_class,
 )
@@ -43,6 +44,7 @@ from baserow.contrib.database.views.registries import (
     view_type_registry,
     view_filter_type_registry,
 )
+from baserow.core.db_routers import read_replica
 from baserow.core.exceptions import UserNotInGroup
 
 from baserow.contrib.database.api.views.errors import (
@@ -144,6 +146,7 @@ class GalleryViewView(APIView):
         }
     )
     @allowed_includes("field_options")
+    @read_replica()
     def get(self, request: Request, view_id: int, field_options: bool):
         """Lists the rows for the gallery view."""
 
@@ -158,10 +161,14 @@ class GalleryViewView(APIView):
         search = request.GET.get("search")
 
         model = view.table.get_model()
+        etag = RowsETag(request, view.table, model, view)
+        if etag.is_not_modified():
+            return etag.get_not_modified_response()
+
         queryset = view_handler.get_queryset(view, search, model)
 
         if "count" in request.GET:
-            return Response({"count": queryset.count()})
+            return etag.apply(Response({"count": queryset.count()}))
 
         paginator = GalleryLimitOffsetPagination()
         page = paginator.paginate_queryset(queryset, request, self)
@@ -179,7 +186,7 @@ class GalleryViewView(APIView):
             )
             response.data.update(**serializer_class(view, context=context).data)
 
-        return response
+        return etag.apply(response)
 
 
 class PublicGalleryViewRowsView(APIView):
@@ -362,6 +369,7 @@ class PublicGalleryViewRowsView(APIView):
     )
     @transaction.atomic
     @allowed_includes("field_options")
+    @read_replica()
     def get(self, request: Request, slug: str, field_options: bool) -> Response:
         """
         Lists all the rows of a gallery view, paginated with
@@ -393,6 +401,10 @@ class PublicGalleryViewRowsView(APIView):
         view_type = view_type_registry.get_by_model(view)
         model = view.table.get_model()
 
+        etag = RowsETag(request, view.table, model, view)
+        if etag.is_not_modified():
+            return etag.get_not_modified_response()
+
         (
             queryset,
             field_ids,
@@ -410,7 +422,7 @@ class PublicGalleryViewRowsView(APIView):
         )
 
         if count:
-            return Response({"count": queryset.count()})
+            return etag.apply(Response({"count": queryset.count()}))
 
         paginator = GalleryLimitOffsetPagination()
         page = paginator.paginate_queryset(queryset, request, self)
@@ -429,4 +441,4 @@ class PublicGalleryViewRowsView(APIView):
             )
             response.data.update(**serializer_class(view, context=context).data)
 
-        return response
+        return etag.apply(response)
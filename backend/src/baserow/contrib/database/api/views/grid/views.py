@@ -9,12 +9,15 @@ from rest_framework.views import APIView
 from baserow.api.decorators import map_exceptions, allowed_includes, validate_body
 from baserow.api.errors import ERROR_USER_NOT_IN_GROUP
 from baserow.api.pagination import PageNumberPagination
+from baserow.api.renderers import FastJSONRenderer
 from baserow.api.schemas import get_error_schema
 from baserow.api.serializers import get_example_pagination_serializer_class
 from baserow.contrib.database.api.rows.serializers import (
     get_example_row_serializer_class,
     get_example_row_metadata_field_serializer,
 )
+from baserow.contrib.database.api.rows.encoders import paginate_and_serialize_rows
+from baserow.contrib.database.api.rows.etags import RowsETag
 from baserow.contrib.database.api.rows.serializers import (
     get_row_serializer_class,
     RowSerializer,
@@ -69,6 +72,7 @@ from baserow.contrib.database.fields.exceptions import (
     FilterFieldNotFound,
     FieldNotInTable,
 )
+from baserow.core.db_routers import read_replica
 from baserow.core.exceptions import UserNotInGroup
 from .errors import ERROR_GRID_DOES_NOT_EXIST
 from .serializers import GridViewFilterSerializer
@@ -84,6 +88,7 @@ def get_available_aggregation_type():
 
 class GridViewView(APIView):
     permission_classes = (IsAuthenticated,)
+    renderer_classes = (FastJSONRenderer,)
 
     def get_permissions(self):
         if self.request.method == "GET":
@@ -227,6 +232,7 @@ class GridViewView(APIView):
         }
     )
     @allowed_includes("field_options", "row_metadata")
+    @read_replica()
     def get(self, request, view_id, field_options, row_metadata):
         """
         Lists all the rows of a grid view, paginated either by a page or offset/limit.
@@ -253,26 +259,33 @@ class GridViewView(APIView):
         )
 
         model = view.table.get_model()
+        # The row metadata, like the comment counts, can change without changing
+        # the data of the table.
+        etag = RowsETag(request, view.table, model, view, enabled=not row_metadata)
+        if etag.is_not_modified():
+            return etag.get_not_modified_response()
+
         queryset = view_handler.get_queryset(view, search, model)
 
         if "count" in request.GET:
-            return Response({"count": queryset.count()})
+            return etag.apply(Response({"count": queryset.count()}))
 
         if LimitOffsetPagination.limit_query_param in request.GET:
             paginator = LimitOffsetPagination()
         else:
             paginator = PageNumberPagination()
 
-        page = paginator.paginate_queryset(queryset, request, self)
         serializer_class = get_row_serializer_class(
             model,
             RowSerializer,
             is_response=True,
             field_ids=field_ids,
         )
-        serializer = serializer_class(page, many=True)
+        serialized_rows, row_ids = paginate_and_serialize_rows(
+            paginator, queryset, request, self, serializer_class
+        )
 
-        response = paginator.get_paginated_response(serializer.data)
+        response = paginator.get_paginated_response(serialized_rows)
 
         if field_options:
             context = {"fields": [o["field"] for o in model._field_objects.values()]}
@@ -283,11 +296,11 @@ class GridViewView(APIView):
 
         if row_metadata:
             row_metadata = row_metadata_registry.generate_and_merge_metadata_for_rows(
-                view.table, (row.id for row in page)
+                view.table, row_ids
             )
             response.data.update(row_metadata=row_metadata)
 
-        return response
+        return etag.apply(response)
 
     @extend_schema(
         parameters=[
@@ -559,6 +572,7 @@ class GridViewFieldAggregationView(APIView):
 
 class PublicGridViewRowsView(APIView):
     permission_classes = (AllowAny,)
+    renderer_classes = (FastJSONRenderer,)
 
     @extend_schema(
         parameters=[
@@ -735,6 +749,7 @@ class PublicGridViewRowsView(APIView):
         }
     )
     @allowed_includes("field_options")
+    @read_replica()
     def get(self, request: Request, slug: str, field_options: bool) -> Response:
         """
         Lists all the rows of a grid view, paginated either by a page or offset/limit.
@@ -767,6 +782,10 @@ class PublicGridViewRowsView(APIView):
         view_type = view_type_registry.get_by_model(view)
         model = view.table.get_model()
 
+        etag = RowsETag(request, view.table, model, view)
+        if etag.is_not_modified():
+            return etag.get_not_modified_response()
+
         (
             queryset,
             field_ids,
@@ -784,19 +803,20 @@ class PublicGridViewRowsView(APIView):
         )
 
         if count:
-            return Response({"count": queryset.count()})
+            return etag.apply(Response({"count": queryset.count()}))
 
         if LimitOffsetPagination.limit_query_param in request.GET:
             paginator = LimitOffsetPagination()
         else:
             paginator = PageNumberPagination()
 
-        page = paginator.paginate_queryset(queryset, request, self)
         serializer_class = get_row_serializer_class(
             model, RowSerializer, is_response=True, field_ids=field_ids
         )
-        serializer = serializer_class(page, many=True)
-        response = paginator.get_paginated_response(serializer.data)
+        serialized_rows, _ = paginate_and_serialize_rows(
+            paginator, queryset, request, self, serializer_class
+        )
+        response = paginator.get_paginated_response(serialized_rows)
 
         if field_options:
             context = {"field_options": publicly_visible_field_options}
@@ -805,4 +825,4 @@ class PublicGridViewRowsView(APIView):
             )
             response.data.update(**serializer_class(view, context=context).data)
 
-        return response
+        return etag.apply(response)
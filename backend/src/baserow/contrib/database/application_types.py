@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Generator, Optional, List
 from zipfile import ZipFile
 
 from django.core.files.storage import Storage
@@ -8,6 +8,7 @@ from django.db import connection
 from django.db.transaction import Atomic
 from django.urls import path, include
 from django.utils import timezone
+from psycopg2 import sql
 
 from baserow.contrib.database.api.serializers import DatabaseSerializer
 from baserow.contrib.database.db.schema import (
@@ -17,6 +18,7 @@ from baserow.contrib.database.fields.dependencies.update_collector import (
     FieldUpdateCollector,
 )
 from baserow.contrib.database.fields.field_cache import FieldCache
+from baserow.contrib.database.fields.models import Field
 from baserow.contrib.database.fields.registries import field_type_registry
 from baserow.contrib.database.models import Database, Table
 from baserow.contrib.database.views.registries import view_type_registry
@@ -25,7 +27,11 @@ from baserow.core.registries import ApplicationType
 from baserow.core.trash.handler import TrashHandler
 from baserow.core.utils import ChildProgressBuilder
 from baserow.core.utils import grouper
-from .constants import IMPORT_SERIALIZED_IMPORTING, IMPORT_SERIALIZED_IMPORTING_TABLE
+from .constants import (
+    EXPORT_SERIALIZED_ROWS_CHUNK_SIZE,
+    IMPORT_SERIALIZED_IMPORTING,
+    IMPORT_SERIALIZED_IMPORTING_TABLE,
+)
 from .db.atomic import read_repeatable_single_database_atomic_transaction
 from .export_serialized import DatabaseExportSerializedStructure
 
@@ -65,10 +71,23 @@ class DatabaseApplicationType(ApplicationType):
         tables: List[Table],
         files_zip: Optional[ZipFile] = None,
         storage: Optional[Storage] = None,
+        include_rows: bool = True,
+        lazy_rows: bool = False,
     ) -> List[Dict[str, Any]]:
         """
         Exports the tables provided  to a serialized format that can later be
         be imported via the `import_tables_serialized`.
+
+        If `include_rows` is False, the rows are not serialized. The tables are
+        instead marked so that `import_tables_serialized` copies the rows directly
+        in the database from the exported tables, which is much faster and doesn't
+        use any memory. This can only be used if the tables are imported right away in
+        the same database, for example when duplicating them.
+
+        If `lazy_rows` is True, the rows of each table are a generator that fetches
+        and serializes them by chunks while being consumed, instead of a list. It
+        must be consumed inside the same transaction, for example by writing the
+        export with `stream_json`.
         """
 
         serialized_tables: List[Dict[str, Any]] = []
@@ -88,10 +107,59 @@ class DatabaseApplicationType(ApplicationType):
                     view_type.export_serialized(view, files_zip, storage)
                 )
 
-            model = table.get_model(fields=fields, add_dependencies=False)
             serialized_rows = []
-            table_cache: Dict[str, Any] = {}
-            for row in model.objects.all():
+            if include_rows:
+                serialized_rows = self._iter_rows_serialized(
+                    table, fields, files_zip, storage
+                )
+                if not lazy_rows:
+                    serialized_rows = list(serialized_rows)
+
+            serialized_table = DatabaseExportSerializedStructure.table(
+                id=table.id,
+                name=table.name,
+                order=table.order,
+                fields=serialized_fields,
+                views=serialized_views,
+                rows=serialized_rows,
+            )
+            if not include_rows:
+                serialized_table["_copy_rows_from_table_id"] = table.id
+            serialized_tables.append(serialized_table)
+        return serialized_tables
+
+    def _iter_rows_serialized(
+        self,
+        table: Table,
+        fields: List[Field],
+        files_zip: Optional[ZipFile] = None,
+        storage: Optional[Storage] = None,
+    ) -> Generator[Dict[str, Any], None, None]:
+        """
+        Yields the serialized rows of the table. The rows are fetched by chunks of
+        `EXPORT_SERIALIZED_ROWS_CHUNK_SIZE` ordered by id, so that only one chunk and
+        its prefetched related data are kept in memory at once.
+        """
+
+        model = table.get_model(fields=fields, add_dependencies=False)
+        queryset = model.objects.all()
+        for field_object in model._field_objects.values():
+            queryset = field_object["type"].enhance_queryset_for_export(
+                queryset, field_object["field"], field_object["name"]
+            )
+
+        table_cache: Dict[str, Any] = {}
+        last_id = 0
+        while True:
+            rows = list(
+                queryset.filter(id__gt=last_id).order_by("id")[
+                    :EXPORT_SERIALIZED_ROWS_CHUNK_SIZE
+                ]
+            )
+            if not rows:
+                return
+
+            for row in rows:
                 serialized_row = DatabaseExportSerializedStructure.row(
                     id=row.id,
                     order=str(row.order),
@@ -104,29 +172,22 @@ class DatabaseApplicationType(ApplicationType):
                     serialized_row[field_name] = field_type.get_export_serialized_value(
                         row, field_name, table_cache, files_zip, storage
                     )
-                serialized_rows.append(serialized_row)
-
-            serialized_tables.append(
-                DatabaseExportSerializedStructure.table(
-                    id=table.id,
-                    name=table.name,
-                    order=table.order,
-                    fields=serialized_fields,
-                    views=serialized_views,
-                    rows=serialized_rows,
-                )
-            )
-        return serialized_tables
+                yield serialized_row
+
+            last_id = rows[-1].id
 
     def export_serialized(
         self,
         database: Database,
         files_zip: Optional[ZipFile] = None,
         storage: Optional[Storage] = None,
+        include_rows: bool = True,
+        lazy_rows: bool = False,
     ) -> Dict[str, Any]:
         """
         Exports the database application type to a serialized format that can later be
-        be imported via the `import_serialized`.
+        be imported via the `import_serialized`. See `export_tables_serialized` for
+        the `include_rows` and `lazy_rows` arguments.
         """
 
         tables = database.table_set.all().prefetch_related(
@@ -136,7 +197,9 @@ class DatabaseApplicationType(ApplicationType):
             "view_set__viewsort_set",
         )
 
-        serialized_tables = self.export_tables_serialized(tables, files_zip, storage)
+        serialized_tables = self.export_tables_serialized(
+            tables, files_zip, storage, include_rows=include_rows, lazy_rows=lazy_rows
+        )
 
         serialized = super().export_serialized(database, files_zip, storage)
         serialized.update(
@@ -144,6 +207,19 @@ class DatabaseApplicationType(ApplicationType):
         )
         return serialized
 
+    def export_serialized_for_duplication(
+        self, database: Database, storage: Optional[Storage] = None
+    ) -> Dict[str, Any]:
+        return self.export_serialized(database, None, storage, include_rows=False)
+
+    def export_serialized_lazily(
+        self,
+        database: Database,
+        files_zip: Optional[ZipFile] = None,
+        storage: Optional[Storage] = None,
+    ) -> Dict[str, Any]:
+        return self.export_serialized(database, files_zip, storage, lazy_rows=True)
+
     def _ops_count_for_import_tables_serialized(
         self, serialized_tables: List[Dict[str, Any]]
     ) -> int:
@@ -164,6 +240,8 @@ class DatabaseApplicationType(ApplicationType):
                     len(table["rows"]) +
                     # Inserting every row
                     len(table["rows"]) +
+                    # Copying all the rows in the database
+                    (1 if "_copy_rows_from_table_id" in table else 0) +
                     # After each field
                     len(table["fields"])
                     for table in serialized_tables
@@ -259,8 +337,12 @@ class DatabaseApplicationType(ApplicationType):
 
                 # The auto_now_add and auto_now must be disabled for all fields
                 # because the export contains correct values and we don't want them
-                # to be overwritten when importing.
+                # to be overwritten when importing. The `changed_on` field isn't
+                # exported, so it's set to the moment of the import.
                 for model_field in serialized_table["_model"]._meta.get_fields():
+                    if model_field.name == "changed_on":
+                        continue
+
                     if hasattr(model_field, "auto_now_add"):
                         model_field.auto_now_add = False
 
@@ -271,8 +353,18 @@ class DatabaseApplicationType(ApplicationType):
 
         # Now that everything is in place we can start filling the table with the rows
         # in an efficient matter by using the bulk_create functionality.
+        copied_tables = []
         for serialized_table in serialized_tables:
             table_model = serialized_table["_model"]
+
+            if "_copy_rows_from_table_id" in serialized_table:
+                self._copy_rows_with_sql(serialized_table, id_mapping)
+                copied_tables.append(serialized_table)
+                progress.increment(
+                    state=f"{IMPORT_SERIALIZED_IMPORTING_TABLE}{serialized_table['id']}"
+                )
+                continue
+
             field_ids = [
                 field_object.id for field_object in serialized_table["_field_objects"]
             ]
@@ -342,6 +434,11 @@ class DatabaseApplicationType(ApplicationType):
             with connection.cursor() as cursor:
                 cursor.execute(sequence_sql[0])
 
+        # The relations can only be copied once the rows of all the tables have been
+        # copied, because they must point to rows that exist in the related table.
+        for serialized_table in copied_tables:
+            self._copy_relations_with_sql(serialized_table, id_mapping)
+
         # The progress off `apply_updates_and_get_updated_fields` takes 5% of the
         # total progress of this import.
         for field_type, field in fields_excluding_reversed_linked_fields:
@@ -355,6 +452,153 @@ class DatabaseApplicationType(ApplicationType):
         progress.increment(none_field_count, state=IMPORT_SERIALIZED_IMPORTING)
         return tables
 
+    def _copy_rows_with_sql(
+        self, serialized_table: Dict[str, Any], id_mapping: Dict[str, Any]
+    ):
+        """
+        Copies the rows of the table that has been exported without its rows into
+        the newly created table with `INSERT INTO ... SELECT` queries. The row ids
+        are preserved, so only the field ids and the ids referenced by the values,
+        like the select options, must be mapped. The many to many relations are
+        collected, so that they can be copied by `_copy_relations_with_sql`.
+
+        :param serialized_table: The serialized table that has been imported.
+        :param id_mapping: The map of exported ids to newly created ids.
+        """
+
+        source_table = Table.objects.get(
+            id=serialized_table["_copy_rows_from_table_id"]
+        )
+        source_model = source_table.get_model(add_dependencies=False)
+        target_model = serialized_table["_model"]
+        target_field_ids = [field.id for field in serialized_table["_field_objects"]]
+        target_table_name = sql.Identifier(target_model._meta.db_table)
+
+        field_names = {
+            field_object["name"]
+            for field_object in target_model._field_objects.values()
+        }
+        target_columns = [
+            sql.Identifier(model_field.column)
+            for model_field in target_model._meta.concrete_fields
+            if model_field.name not in field_names
+        ]
+        select_values = [
+            sql.Identifier("source", model_field.column)
+            for model_field in target_model._meta.concrete_fields
+            if model_field.name not in field_names
+        ]
+        relations = []
+
+        for field in serialized_table["fields"]:
+            new_field_id = id_mapping["database_fields"][field["id"]]
+            source_field_name = f'field_{field["id"]}'
+            # See the comment in `import_tables_serialized` about the fields that
+            # are not in the `_field_objects`.
+            if new_field_id not in target_field_ids:
+                continue
+
+            field_type = field_type_registry.get(field["type"])
+            source_model_field = source_model._meta.get_field(source_field_name)
+            target_model_field = target_model._meta.get_field(f"field_{new_field_id}")
+
+            if target_model_field.many_to_many:
+                relations.append((field_type, source_model_field, target_model_field))
+            elif target_model_field.concrete:
+                target_columns.append(sql.Identifier(target_model_field.column))
+                select_values.append(
+                    field_type.get_duplicate_value_sql(
+                        sql.Identifier("source", source_model_field.column),
+                        id_mapping,
+                    )
+                )
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                sql.SQL(
+                    "INSERT INTO {target_table} ({target_columns}) "
+                    "SELECT {select_values} FROM {source_table} AS source "
+                    "WHERE NOT source.trashed"
+                ).format(
+                    target_table=target_table_name,
+                    target_columns=sql.SQL(", ").join(target_columns),
+                    select_values=sql.SQL(", ").join(select_values),
+                    source_table=sql.Identifier(source_model._meta.db_table),
+                )
+            )
+            # All the rows have been copied, so the row count of the new table is
+            # known right away.
+            Table.objects.filter(id=serialized_table["_object"].id).update(
+                row_count=cursor.rowcount
+            )
+
+            # The row ids have been copied, so the sequence must be set to the maximum
+            # id, otherwise creating a new row could later fail.
+            sequence_sql = connection.ops.sequence_reset_sql(no_style(), [target_model])
+            cursor.execute(sequence_sql[0])
+
+        serialized_table["_copy_relations"] = relations
+
+    def _copy_relations_with_sql(
+        self, serialized_table: Dict[str, Any], id_mapping: Dict[str, Any]
+    ):
+        """
+        Copies the many to many relations of the rows that have been copied by
+        `_copy_rows_with_sql` from the through tables of the exported table. Must be
+        called after the rows of all the tables have been copied, because only the
+        relations between copied rows are copied.
+
+        :param serialized_table: The serialized table of which the rows have been
+            copied.
+        :param id_mapping: The map of exported ids to newly created ids.
+        """
+
+        target_table_name = sql.Identifier(serialized_table["_model"]._meta.db_table)
+
+        with connection.cursor() as cursor:
+            for field_type, source_model_field, target_model_field in serialized_table[
+                "_copy_relations"
+            ]:
+                related_value = field_type.get_duplicate_value_sql(
+                    sql.Identifier("source", source_model_field.m2m_reverse_name()),
+                    id_mapping,
+                )
+                # Only the relations between copied rows are copied, just like the
+                # serialized export only contains the relations of the exported rows.
+                # The trashed related rows for example haven't been copied.
+                cursor.execute(
+                    sql.SQL(
+                        "INSERT INTO {target_through_table} "
+                        "({m2m_column}, {m2m_reverse_column}) "
+                        "SELECT source.{source_m2m_column}, {related_value} "
+                        "FROM {source_through_table} AS source "
+                        "WHERE source.{source_m2m_column} IN "
+                        "(SELECT id FROM {target_table}) "
+                        "AND {related_value} IN (SELECT id FROM {related_table}) "
+                        # The order of the relations depends on the through ids.
+                        "ORDER BY source.id"
+                    ).format(
+                        target_through_table=sql.Identifier(
+                            target_model_field.m2m_db_table()
+                        ),
+                        m2m_column=sql.Identifier(target_model_field.m2m_column_name()),
+                        m2m_reverse_column=sql.Identifier(
+                            target_model_field.m2m_reverse_name()
+                        ),
+                        source_m2m_column=sql.Identifier(
+                            source_model_field.m2m_column_name()
+                        ),
+                        related_value=related_value,
+                        source_through_table=sql.Identifier(
+                            source_model_field.m2m_db_table()
+                        ),
+                        target_table=target_table_name,
+                        related_table=sql.Identifier(
+                            target_model_field.related_model._meta.db_table
+                        ),
+                    )
+                )
+
     def import_serialized(
         self,
         group: Group,
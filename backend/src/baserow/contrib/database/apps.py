@@ -86,6 +86,7 @@ class DatabaseConfig(AppConfig):
             MoveRowActionType,
             UpdateRowActionType,
             UpdateRowsActionType,
+            UpsertRowsActionType,
         )
 
         action_type_registry.register(CreateRowActionType())
@@ -96,6 +97,7 @@ class DatabaseConfig(AppConfig):
         action_type_registry.register(MoveRowActionType())
         action_type_registry.register(UpdateRowActionType())
         action_type_registry.register(UpdateRowsActionType())
+        action_type_registry.register(UpsertRowsActionType())
 
         from baserow.contrib.database.views.actions import (
             CreateViewActionType,
@@ -413,10 +415,12 @@ class DatabaseConfig(AppConfig):
         from .airtable.job_type import AirtableImportJobType
         from .file_import.job_type import FileImportJobType
         from baserow.contrib.database.table.job_types import DuplicateTableJobType
+        from baserow.contrib.database.fields.job_types import ConvertFieldTypeJobType
 
         job_type_registry.register(AirtableImportJobType())
         job_type_registry.register(FileImportJobType())
         job_type_registry.register(DuplicateTableJobType())
+        job_type_registry.register(ConvertFieldTypeJobType())
 
         # The signals must always be imported last because they use the registries
         # which need to be filled first.
@@ -1,2 +1,5 @@
 IMPORT_SERIALIZED_IMPORTING = "importing"
 IMPORT_SERIALIZED_IMPORTING_TABLE = "importing-table-"
+
+# The amount of rows that are fetched and serialized at once when exporting a table.
+EXPORT_SERIALIZED_ROWS_CHUNK_SIZE = 2000
@@ -19,3 +19,50 @@ sql_create_try_cast = """
     $FUNCTION$
     language plpgsql;
 """
+sql_create_online_conversion_function = """
+    create or replace function %(function)s(
+        p_in text,
+        p_default int default null
+    )
+        returns %(type)s
+    as
+    $FUNCTION$
+    begin
+        begin
+            %(alter_column_prepare_old_value)s
+            %(alter_column_prepare_new_value)s
+            return coalesce(p_in::%(type)s, %(default)s);
+        exception when others then
+            return %(default)s;
+        end;
+    end;
+    $FUNCTION$
+    language plpgsql;
+
+    create or replace function %(trigger_function)s()
+        returns trigger
+    as
+    $FUNCTION$
+    begin
+        NEW.%(shadow_column)s = %(function)s(NEW.%(column)s::text);
+        return NEW;
+    end;
+    $FUNCTION$
+    language plpgsql;
+
+    create trigger %(trigger)s
+        before insert or update of %(column)s on %(table)s
+        for each row execute procedure %(trigger_function)s();
+"""
+sql_backfill_online_conversion = """
+    update %(table)s set %(shadow_column)s = %(function)s(%(column)s::text)
+    where id in (
+        select id from %(table)s where id > %%s order by id limit %%s
+    )
+    returning id
+"""
+sql_drop_online_conversion_trigger = "drop trigger if exists %(trigger)s on %(table)s"
+sql_drop_online_conversion_function = """
+    drop function if exists %(trigger_function)s();
+    drop function if exists %(function)s(text, int);
+"""
@@ -24,6 +24,7 @@ from baserow.contrib.database.table.models import Table
 from baserow.contrib.database.views.models import View
 from baserow.contrib.database.views.exceptions import ViewNotInTable
 from baserow.contrib.database.views.registries import view_type_registry
+from baserow.core.db_routers import read_replica
 from .exceptions import (
     TableOnlyExportUnsupported,
     ViewUnsupportedForExporterType,
@@ -262,9 +263,12 @@ def _open_file_and_run_export(job: ExportJob) -> ExportJob:
         else:
             serializer = queryset_serializer_class.for_view(job.view)
 
-        serializer.write_to_file(
-            PaginatedExportJobFileWriter(file, job), **job.export_options
-        )
+        # The rows of an export can be read from a replica because it's a long running
+        # read only query.
+        with read_replica():
+            serializer.write_to_file(
+                PaginatedExportJobFileWriter(file, job), **job.export_options
+            )
 
     return job
 
@@ -8,11 +8,20 @@ from django.db import connection
 from django.db.models import ManyToManyField
 from psycopg2 import sql
 
-from baserow.contrib.database.db.schema import safe_django_schema_editor
 from baserow.contrib.database.fields.handler import (
     FieldHandler,
 )
-from baserow.contrib.database.fields.models import Field, SpecificFieldForUpdate
+from baserow.contrib.database.fields.file_references import (
+    update_user_file_references,
+)
+from baserow.contrib.database.fields.models import (
+    Field,
+    FileField,
+    SpecificFieldForUpdate,
+)
+from baserow.contrib.database.fields.online_conversion import (
+    OnlineFieldTypeConversion,
+)
 from baserow.contrib.database.fields.registries import (
     field_type_registry,
 )
@@ -37,11 +46,13 @@ class FieldDataBackupHandler:
     not suitable for actually backing up the data to prevent data loss, but instead
     useful for backing up the data due to Baserow actions to facilitate undoing them.
 
-    If the model field is a many to many field then we backup by creating a duplicate
-    m2m table and copying the data into it.
+    If the model field is a many to many field then we backup by copying the m2m
+    table into a new table.
 
-    Otherwise the field must be an actual column in the user table, so we duplicate
-    the column and copy the data into it.
+    Otherwise the field must be an actual column in the user table, so we copy the
+    id and the value of every row that has a value into a separate backup table. The
+    user table itself isn't touched, so making a backup doesn't rewrite all its rows
+    and the backup can be dropped without having to alter the user table.
 
     Also knows how to restore from a backup and clean up any backups done by this
     class even if the Field/Table etc has been permanently deleted from Baserow.
@@ -54,12 +65,12 @@ class FieldDataBackupHandler:
         identifier_to_backup_into: str,
     ) -> BackupData:
         """
-        Backs up the provided field's data into a new column or table which will be
-        named using the identifier_to_backup_into param.
+        Backs up the provided field's data into a new table which will be named using
+        the identifier_to_backup_into param.
 
         :param field_to_backup: A Baserow field that you want to backup the data for.
         :param identifier_to_backup_into: The name that will be used when creating
-            the backup column or table.
+            the backup table.
         :return: A dictionary than can then be passed back into the other class methods
             to restore the backed up data or cleaned it up.
         """
@@ -74,35 +85,24 @@ class FieldDataBackupHandler:
 
         if isinstance(model_field_to_backup, ManyToManyField):
             through = model_field_to_backup.remote_field.through
-            m2m_table_to_backup = through._meta.db_table
-            cls._create_duplicate_m2m_table(
-                model,
-                m2m_model_field_to_duplicate=model_field_to_backup,
-                new_m2m_table_name=identifier_to_backup_into,
-            )
-            cls._copy_m2m_data_between_tables(
-                source_table=m2m_table_to_backup,
-                target_table=identifier_to_backup_into,
-                m2m_model_field=model_field_to_backup,
-                through_model=through,
+            cls._create_backup_table(
+                source_table=through._meta.db_table,
+                columns=[
+                    "id",
+                    model_field_to_backup.m2m_column_name(),
+                    model_field_to_backup.m2m_reverse_name(),
+                ],
+                backup_table=identifier_to_backup_into,
             )
             return {"backed_up_m2m_table_name": identifier_to_backup_into}
         else:
-            table_name = model_field_to_backup.model._meta.db_table
-            cls._create_duplicate_nullable_column(
-                model,
-                model_field_to_duplicate=model_field_to_backup,
-                new_column_name=identifier_to_backup_into,
+            cls._create_backup_table(
+                source_table=model_field_to_backup.model._meta.db_table,
+                columns=["id", model_field_to_backup.column],
+                backup_table=identifier_to_backup_into,
+                not_null_column=model_field_to_backup.column,
             )
-            cls._copy_not_null_column_data(
-                table_name,
-                source_column=model_field_to_backup.column,
-                target_column=identifier_to_backup_into,
-            )
-            return {
-                "table_id_containing_backup_column": field_to_backup.table_id,
-                "backed_up_column_name": identifier_to_backup_into,
-            }
+            return {"backed_up_table_name": identifier_to_backup_into}
 
     @classmethod
     def restore_backup_data_into_field(
@@ -136,7 +136,17 @@ class FieldDataBackupHandler:
                 through_model=through,
             )
             cls._drop_table(backed_up_m2m_table_name)
+        elif "backed_up_table_name" in backup_data:
+            backed_up_table_name = backup_data["backed_up_table_name"]
+            cls._copy_backup_table_data(
+                table_name=model_field_to_restore_into.model._meta.db_table,
+                backup_table=backed_up_table_name,
+                column=model_field_to_restore_into.column,
+            )
+            cls._drop_table(backed_up_table_name)
         else:
+            # The field data has been kept in a column of the user table, which is
+            # the case when its values have been converted online.
             backed_up_column_name = backup_data["backed_up_column_name"]
             table_name = model_field_to_restore_into.model._meta.db_table
             cls._copy_not_null_column_data(
@@ -146,6 +156,11 @@ class FieldDataBackupHandler:
             )
             cls._drop_column(table_name, backed_up_column_name)
 
+        # The data is restored after the `after_update` of the field type, which has
+        # already updated the user file references using the converted cells.
+        if isinstance(field_to_restore_backup_data_into, FileField):
+            update_user_file_references(field_to_restore_backup_data_into)
+
     @classmethod
     def clean_up_backup_data(
         cls,
@@ -158,6 +173,8 @@ class FieldDataBackupHandler:
 
         if "backed_up_m2m_table_name" in backup_data:
             cls._drop_table(backup_data["backed_up_m2m_table_name"])
+        elif "backed_up_table_name" in backup_data:
+            cls._drop_table(backup_data["backed_up_table_name"])
         else:
             try:
                 table = Table.objects_and_trash.get(
@@ -173,16 +190,36 @@ class FieldDataBackupHandler:
                 pass
 
     @staticmethod
-    def _create_duplicate_m2m_table(
-        model: GeneratedTableModel,
-        m2m_model_field_to_duplicate: ManyToManyField,
-        new_m2m_table_name: str,
+    def _create_backup_table(
+        source_table: str,
+        columns: List[str],
+        backup_table: str,
+        not_null_column: Optional[str] = None,
     ):
-        with safe_django_schema_editor() as schema_editor:
-            # Create a duplicate m2m table to backup the data into.
-            new_backup_table = deepcopy(m2m_model_field_to_duplicate)
-            new_backup_table.remote_field.through._meta.db_table = new_m2m_table_name
-            schema_editor.add_field(model, new_backup_table)
+        """
+        Copies the provided columns of the source table into a new backup table with
+        a single statement. The backup table doesn't have any constraints or indexes
+        because it's only read once when the backup is restored.
+        """
+
+        where = sql.SQL("")
+        if not_null_column is not None:
+            where = sql.SQL("WHERE {not_null_column} IS NOT NULL").format(
+                not_null_column=sql.Identifier(not_null_column)
+            )
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                sql.SQL(
+                    "CREATE TABLE {backup_table} AS SELECT {columns} "
+                    "FROM {source_table} {where}"
+                ).format(
+                    backup_table=sql.Identifier(backup_table),
+                    columns=sql.SQL(", ").join(map(sql.Identifier, columns)),
+                    source_table=sql.Identifier(source_table),
+                    where=where,
+                )
+            )
 
     @staticmethod
     def _truncate_table(target_table):
@@ -197,7 +234,7 @@ class FieldDataBackupHandler:
     def _drop_table(backup_name: str):
         with connection.cursor() as cursor:
             cursor.execute(
-                sql.SQL("DROP TABLE {backup_table}").format(
+                sql.SQL("DROP TABLE IF EXISTS {backup_table}").format(
                     backup_table=sql.Identifier(backup_name),
                 )
             )
@@ -234,18 +271,18 @@ class FieldDataBackupHandler:
             cursor.execute(sequence_sql[0])
 
     @staticmethod
-    def _create_duplicate_nullable_column(
-        model: GeneratedTableModel, model_field_to_duplicate, new_column_name: str
-    ):
-        with safe_django_schema_editor() as schema_editor:
-            # Create a duplicate column to backup the data into.
-            new_backup_model_field = deepcopy(model_field_to_duplicate)
-            new_backup_model_field.column = new_column_name
-            # It must be nullable so INSERT's into the table still work. If we restore
-            # this backed up column back into a real column we won't copy over any
-            # NULLs created by INSERTs.
-            new_backup_model_field.null = True
-            schema_editor.add_field(model, new_backup_model_field)
+    def _copy_backup_table_data(table_name: str, backup_table: str, column: str):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                sql.SQL(
+                    "UPDATE {table_name} SET {column} = backup.{column} "
+                    "FROM {backup_table} backup WHERE {table_name}.id = backup.id"
+                ).format(
+                    table_name=sql.Identifier(table_name),
+                    backup_table=sql.Identifier(backup_table),
+                    column=sql.Identifier(column),
+                )
+            )
 
     @staticmethod
     def _copy_not_null_column_data(table_name, source_column, target_column):
@@ -294,6 +331,7 @@ class UpdateFieldActionType(ActionType):
         user: AbstractUser,
         field: SpecificFieldForUpdate,
         new_type_name: Optional[str] = None,
+        online_conversion: Optional[OnlineFieldTypeConversion] = None,
         **kwargs,
     ) -> Tuple[Field, List[Field]]:
 
@@ -306,6 +344,9 @@ class UpdateFieldActionType(ActionType):
         :param user: The user on whose behalf the table is updated.
         :param field: The field instance that needs to be updated.
         :param new_type_name: If the type needs to be changed it can be provided here.
+        :param online_conversion: If the values of the field have already been
+            converted by this online conversion, the original column is kept as backup
+            instead of copying its data.
         :return: The updated field instance and any
             updated fields as a result of updated the field are returned in a list
             as the second tuple value.
@@ -328,15 +369,29 @@ class UpdateFieldActionType(ActionType):
         # to use when naming a possible backup field/table.
         action = cls.register_action(user, {}, cls.scope(field.table_id))
 
-        optional_backup_data = cls._backup_field_if_required(
-            field, allowed_field_values, action, to_field_type_name, False
-        )
+        if online_conversion is not None and cls._should_backup_field(
+            field, to_field_type_name, allowed_field_values
+        ):
+            # The original column is replaced by the converted column, so it can be
+            # renamed and kept as backup instead of copying all its values.
+            online_conversion.backup_column_name = cls._get_backup_identifier(
+                action, field.id, for_undo=False
+            )
+            optional_backup_data = {
+                "table_id_containing_backup_column": field.table_id,
+                "backed_up_column_name": online_conversion.backup_column_name,
+            }
+        else:
+            optional_backup_data = cls._backup_field_if_required(
+                field, allowed_field_values, action, to_field_type_name, False
+            )
 
         field, updated_fields = FieldHandler().update_field(
             user,
             field,
             new_type_name,
             return_updated_fields=True,
+            online_conversion=online_conversion,
             **allowed_field_values,
         )
 
@@ -4,3 +4,7 @@ RESERVED_BASEROW_FIELD_NAMES = {"id", "order"}
 # This is an internal only field that allows upserting select options with a specific
 # pk.
 UPSERT_OPTION_DICT_KEY = "upsert_id"
+# The kinds of indexes that the index advisor can create on the column of a field.
+INDEX_KIND_BTREE = "btree"
+INDEX_KIND_TRIGRAM = "trigram"
+INDEX_KIND_HASH = "hash"
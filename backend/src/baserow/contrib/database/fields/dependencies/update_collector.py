@@ -2,6 +2,7 @@ from collections import defaultdict
 from typing import Optional, Dict, List, Tuple, Set, cast
 
 from django.db.models import Expression, Q
+from django.utils import timezone
 
 from baserow.contrib.database.fields.dependencies.exceptions import InvalidViaPath
 from baserow.contrib.database.fields.field_cache import FieldCache
@@ -130,7 +131,13 @@ class PathBasedUpdateStatementCollector:
             )
 
             qs = qs.filter(filter_for_rows_connected_to_starting_row)
-        qs.update(**self.update_statements)
+            # The values of these rows change because of a change of the starting
+            # rows, so they're marked as changed to make the row changes endpoint
+            # return them. The rows updated because a field changed are not, because
+            # the clients must fetch all the rows again after a field change anyway.
+            qs.update(**self.update_statements, changed_on=timezone.now())
+        else:
+            qs.update(**self.update_statements)
 
     def _include_rows_connected_to_deleted_m2m_relationships(
         self,
@@ -207,6 +214,34 @@ class FieldUpdateCollector:
             self._starting_table, connection_here=None, connection_is_broken=False
         )
 
+    def add_starting_row_ids(
+        self,
+        row_ids: List[int],
+        deleted_m2m_rels_per_link_field: Optional[Dict[int, Set[int]]] = None,
+    ):
+        """
+        Adds rows to the starting rows of the update, so that the updates caused by
+        multiple row operations in the starting table can be collected and applied
+        at once. Does nothing if the update isn't limited to specific rows.
+
+        :param row_ids: The ids of the rows in the starting table that have changed.
+        :param deleted_m2m_rels_per_link_field: The ids of the rows per link row field
+            that the changed rows don't link to anymore.
+        """
+
+        if self._starting_row_ids is None:
+            return
+
+        self._starting_row_ids = self._starting_row_ids + list(row_ids)
+
+        if deleted_m2m_rels_per_link_field:
+            if self._deleted_m2m_rels_per_link_field is None:
+                self._deleted_m2m_rels_per_link_field = {}
+            for field_id, row_ids in deleted_m2m_rels_per_link_field.items():
+                self._deleted_m2m_rels_per_link_field.setdefault(
+                    field_id, set()
+                ).update(row_ids)
+
     def add_field_with_pending_update_statement(
         self,
         field: Field,
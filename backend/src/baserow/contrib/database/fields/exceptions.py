@@ -185,3 +185,11 @@ class FailedToLockFieldDueToConflict(LockConflict):
     Raised when a user tried to update a field which was locked by another
     concurrent operation
     """
+
+
+class OnlineFieldConversionOutdated(Exception):
+    """
+    Raised when the field has been changed while its values were being converted to
+    the new type in the background, which means that the converted values can't be
+    used anymore.
+    """
@@ -11,14 +11,28 @@ from pytz import all_timezones, timezone
 from dateutil import parser
 from dateutil.parser import ParserError
 
-from django.contrib.postgres.aggregates import StringAgg
-from django.contrib.postgres.fields import JSONField
+from django.conf import settings
+from django.contrib.postgres.aggregates import ArrayAgg, JSONBAgg, StringAgg
+from django.contrib.postgres.fields import ArrayField, JSONField
 from django.core.exceptions import ValidationError
 from django.core.files.storage import default_storage, Storage
 from django.db import models, OperationalError
-from django.db.models import Case, When, Q, F, Func, Value, CharField, DateTimeField
-from django.db.models.functions import Coalesce
+from django.db.models import (
+    Case,
+    When,
+    Q,
+    F,
+    Func,
+    Value,
+    CharField,
+    DateTimeField,
+    Exists,
+    OuterRef,
+    Subquery,
+)
+from django.db.models.functions import Coalesce, JSONObject
 from django.utils.timezone import make_aware
+from psycopg2 import sql
 
 from rest_framework import serializers
 
@@ -57,6 +71,7 @@ from baserow.contrib.database.formula import (
 )
 from baserow.contrib.database.table.handler import TableHandler
 from baserow.contrib.database.validators import UnicodeRegexValidator
+from baserow.core.db import specific_iterator
 from baserow.core.models import UserFile
 from baserow.core.user_files.exceptions import UserFileDoesNotExist
 from baserow.core.user_files.handler import UserFileHandler
@@ -84,6 +99,7 @@ from .field_filters import (
     filename_contains_filter,
 )
 from .field_sortings import AnnotatedOrder
+from .file_references import update_user_file_references
 from .fields import (
     SingleSelectForeignKey,
     BaserowExpressionField,
@@ -112,6 +128,7 @@ from .models import (
     FormulaField,
     Field,
     LookupField,
+    UserFileReference,
 )
 from .registries import (
     FieldType,
@@ -119,6 +136,7 @@ from .registries import (
     field_type_registry,
     StartingRowType,
 )
+from .select_option_cache import get_serialized_select_options
 from baserow.contrib.database.table.cache import invalidate_table_in_model_cache
 
 if TYPE_CHECKING:
@@ -199,6 +217,9 @@ class TextFieldMatchingRegexFieldType(FieldType, ABC):
     def contains_query(self, *args):
         return contains_filter(*args)
 
+    def get_human_readable_value_expression(self, field, path):
+        return Coalesce(F(path), Value(""))
+
     def to_baserow_formula_type(self, field) -> BaserowFormulaType:
         return BaserowFormulaTextType()
 
@@ -247,6 +268,9 @@ class CharFieldMatchingRegexFieldType(TextFieldMatchingRegexFieldType):
 class TextFieldType(FieldType):
     type = "text"
     model_class = TextField
+    can_serialize_from_values = True
+    can_be_upsert_key = True
+    can_be_trigram_indexed = True
     allowed_fields = ["text_default"]
     serializer_field_names = ["text_default"]
 
@@ -273,6 +297,9 @@ class TextFieldType(FieldType):
     def contains_query(self, *args):
         return contains_filter(*args)
 
+    def get_human_readable_value_expression(self, field, path):
+        return Coalesce(F(path), Value(""))
+
     def to_baserow_formula_type(self, field) -> BaserowFormulaType:
         return BaserowFormulaTextType()
 
@@ -285,6 +312,9 @@ class TextFieldType(FieldType):
 class LongTextFieldType(FieldType):
     type = "long_text"
     model_class = LongTextField
+    can_serialize_from_values = True
+    can_be_upsert_key = True
+    can_be_trigram_indexed = True
 
     def get_serializer_field(self, instance, **kwargs):
         required = kwargs.get("required", False)
@@ -306,6 +336,9 @@ class LongTextFieldType(FieldType):
     def contains_query(self, *args):
         return contains_filter(*args)
 
+    def get_human_readable_value_expression(self, field, path):
+        return Coalesce(F(path), Value(""))
+
     def to_baserow_formula_type(self, field) -> BaserowFormulaType:
         return BaserowFormulaTextType()
 
@@ -318,6 +351,9 @@ class LongTextFieldType(FieldType):
 class URLFieldType(TextFieldMatchingRegexFieldType):
     type = "url"
     model_class = URLField
+    can_serialize_from_values = True
+    can_be_upsert_key = True
+    can_be_trigram_indexed = True
 
     @property
     def regex(self):
@@ -335,6 +371,10 @@ class NumberFieldType(FieldType):
 
     type = "number"
     model_class = NumberField
+    can_serialize_from_values = True
+    can_be_upsert_key = True
+    can_be_btree_indexed = True
+    can_be_trigram_indexed = True
     allowed_fields = ["number_decimal_places", "number_negative"]
     serializer_field_names = ["number_decimal_places", "number_negative", "number_type"]
     serializer_field_overrides = {
@@ -477,6 +517,9 @@ class NumberFieldType(FieldType):
 class RatingFieldType(FieldType):
     type = "rating"
     model_class = RatingField
+    can_serialize_from_values = True
+    can_be_btree_indexed = True
+    can_be_trigram_indexed = True
     allowed_fields = ["max_value", "color", "style"]
     serializer_field_names = ["max_value", "color", "style"]
 
@@ -591,6 +634,7 @@ class RatingFieldType(FieldType):
 class BooleanFieldType(FieldType):
     type = "boolean"
     model_class = BooleanField
+    can_serialize_from_values = True
 
     # lowercase serializers.BooleanField.TRUE_VALUES + "checked" keyword
     # WARNING: these values are prone to SQL injection
@@ -644,6 +688,8 @@ class BooleanFieldType(FieldType):
 class DateFieldType(FieldType):
     type = "date"
     model_class = DateField
+    can_serialize_from_values = True
+    can_be_btree_indexed = True
     allowed_fields = ["date_format", "date_include_time", "date_time_format"]
     serializer_field_names = ["date_format", "date_include_time", "date_time_format"]
 
@@ -1067,6 +1113,58 @@ class LinkRowFieldType(FieldType):
             models.Prefetch(name, queryset=related_queryset)
         )
 
+    def get_serialize_from_values(self, model, field, name):
+        """
+        Aggregates the ids and the primary field values of the related rows into the
+        same JSON array as the response serializer field, so that only those two
+        values of the related rows are fetched in a single subquery. This is only
+        possible if the human readable value of the primary field can be computed in
+        the database.
+        """
+
+        model_field = model._meta.get_field(name)
+        remote_model = model_field.remote_field.model
+        primary_field_object = next(
+            (
+                field_object
+                for field_object in remote_model._field_objects.values()
+                if field_object["field"].primary
+            ),
+            None,
+        )
+        if primary_field_object is None:
+            return None
+
+        from_name = model_field.m2m_field_name()
+        to_name = model_field.m2m_reverse_field_name()
+        value_expression = primary_field_object[
+            "type"
+        ].get_human_readable_value_expression(
+            primary_field_object["field"], f"{to_name}__{primary_field_object['name']}"
+        )
+        if value_expression is None:
+            return None
+
+        related_values = (
+            model_field.remote_field.through.objects.filter(
+                **{from_name: OuterRef("pk"), f"{to_name}__trashed": False}
+            )
+            .values(from_name)
+            .annotate(
+                related_values=JSONBAgg(
+                    JSONObject(id=F(f"{to_name}__id"), value=value_expression),
+                    ordering=(f"{to_name}__order", f"{to_name}__id"),
+                )
+            )
+            .values("related_values")
+        )
+        expression = Coalesce(
+            Subquery(related_values),
+            Value([], output_field=models.JSONField()),
+            output_field=models.JSONField(),
+        )
+        return expression, None
+
     def get_export_value(self, value, field_object):
         def map_to_export_value(inner_value, inner_field_object):
             return inner_field_object["type"].get_export_value(
@@ -1213,13 +1311,17 @@ class LinkRowFieldType(FieldType):
         is_referencing_the_same_table = instance.link_row_table_id == instance.table_id
         if is_referencing_the_same_table:
             related_model = model
-        else:
+        elif settings.BASEROW_DISABLE_PROJECTED_RELATED_MODELS:
             related_model = manytomany_models.get(instance.link_row_table_id)
             # If we do not have a related table model already we can generate a new one.
             if related_model is None:
                 related_model = instance.link_row_table.get_model(
                     manytomany_models=manytomany_models
                 )
+        else:
+            related_model = self._get_projected_related_model(
+                instance, model, manytomany_models
+            )
 
         instance._related_model = related_model
         related_name = f"reversed_field_{instance.id}"
@@ -1277,6 +1379,74 @@ class LinkRowFieldType(FieldType):
         apps.do_pending_operations(through_model)
         apps.clear_cache()
 
+    def _get_projected_related_model(self, instance, model, manytomany_models):
+        """
+        Returns a model of the related table containing only the fields that are
+        needed to work with the related rows. Generating the full model would also
+        generate the full models of all the tables linked to the related table, which
+        can be very slow for densely linked databases.
+
+        The projected model contains the primary field, the link row fields that
+        other fields of the related table look up values through and, for the link row
+        fields of the model that is being generated, the related link row fields and
+        the fields that are looked up via them. Every projected model of a table
+        contains everything that the link row fields of other projected models need,
+        so the already generated models are reused for those.
+
+        :param instance: The link row field for which the related model is needed.
+        :param model: The model that is being generated.
+        :param manytomany_models: The already generated models by table id.
+        :return: The model of the related table.
+        """
+
+        related_model = manytomany_models.get(instance.link_row_table_id)
+        if related_model is not None and getattr(
+            instance, "_in_projected_related_model", False
+        ):
+            return related_model
+
+        link_fields = [instance] + [
+            field_object["field"]
+            for field_object in model._field_objects.values()
+            if isinstance(field_object["field"], LinkRowField)
+            and field_object["field"].link_row_table_id == instance.link_row_table_id
+        ]
+        is_looked_up_through = Exists(
+            FieldDependency.objects.filter(via_id=OuterRef("id")).exclude(
+                dependant_id=OuterRef("id")
+            )
+        )
+        related_fields = list(
+            specific_iterator(
+                Field.objects.filter(table_id=instance.link_row_table_id)
+                .annotate(is_looked_up_through=is_looked_up_through)
+                .filter(
+                    Q(primary=True)
+                    | Q(is_looked_up_through=True)
+                    | Q(id__in=[f.link_row_related_field_id for f in link_fields])
+                    | Q(dependants__via__in=link_fields)
+                )
+                .distinct()
+            )
+        )
+
+        if related_model is not None and all(
+            field.id in related_model._field_objects for field in related_fields
+        ):
+            return related_model
+
+        for field in related_fields:
+            field._in_projected_related_model = True
+
+        related_model = instance.link_row_table.get_model(
+            fields=related_fields,
+            field_ids=[],
+            add_dependencies=False,
+            manytomany_models=manytomany_models,
+        )
+        manytomany_models[instance.link_row_table_id] = related_model
+        return related_model
+
     def prepare_values(self, values, user):
         """
         This method checks if the provided link row table is an int because then it
@@ -1625,24 +1795,22 @@ class LinkRowFieldType(FieldType):
             )
         super().after_import_serialized(field, field_cache)
 
+    def enhance_queryset_for_export(self, queryset, field, name):
+        """
+        Only the ids of the related rows are needed, including the trashed ones,
+        because they can be restored in the imported table.
+        """
+
+        remote_field = queryset.model._meta.get_field(name).remote_field
+        related_queryset = remote_field.model.objects_and_trash.only("id").extra(
+            order_by=[f"{remote_field.through._meta.db_table}.id"]
+        )
+        return queryset.prefetch_related(
+            models.Prefetch(name, queryset=related_queryset)
+        )
+
     def get_export_serialized_value(self, row, field_name, cache, files_zip, storage):
-        cache_entry = f"{field_name}_relations"
-        if cache_entry not in cache:
-            # In order to prevent a lot of lookup queries in the through table,
-            # we want to fetch all the relations and add it to a temporary in memory
-            # cache containing a mapping of the old ids to the new ids. Every relation
-            # can use the cached mapped relations to find the correct id.
-            cache[cache_entry] = defaultdict(list)
-            through_model = row._meta.get_field(field_name).remote_field.through
-            through_model_fields = through_model._meta.get_fields()
-            current_field_name = through_model_fields[1].name
-            relation_field_name = through_model_fields[2].name
-            for relation in through_model.objects.all():
-                cache[cache_entry][
-                    getattr(relation, f"{current_field_name}_id")
-                ].append(getattr(relation, f"{relation_field_name}_id"))
-
-        return cache[cache_entry][row.id]
+        return [related_row.id for related_row in getattr(row, field_name).all()]
 
     def set_import_serialized_value(
         self, row, field_name, value, id_mapping, files_zip, storage
@@ -1717,6 +1885,10 @@ class LinkRowFieldType(FieldType):
 class EmailFieldType(CharFieldMatchingRegexFieldType):
     type = "email"
     model_class = EmailField
+    can_serialize_from_values = True
+    can_be_upsert_key = True
+    can_be_btree_indexed = True
+    can_be_trigram_indexed = True
 
     @property
     def regex(self):
@@ -1746,6 +1918,7 @@ class EmailFieldType(CharFieldMatchingRegexFieldType):
 class FileFieldType(FieldType):
     type = "file"
     model_class = FileField
+    can_serialize_from_values = True
     can_be_in_form_view = False
     can_get_unique_values = False
 
@@ -1895,6 +2068,47 @@ class FileFieldType(FieldType):
     def get_model_field(self, instance, **kwargs):
         return JSONField(default=list, **kwargs)
 
+    def after_rows_created(self, field, rows, update_collector, field_cache):
+        update_user_file_references(field, [row.id for row in rows])
+
+    def after_rows_updated(self, field, rows, update_collector, field_cache):
+        update_user_file_references(field, [row.id for row in rows])
+
+    def after_rows_imported(
+        self, field, update_collector, field_cache, via_path_to_starting_table
+    ):
+        update_user_file_references(field)
+        super().after_rows_imported(
+            field, update_collector, field_cache, via_path_to_starting_table
+        )
+
+    def before_schema_change(
+        self,
+        from_field,
+        to_field,
+        from_model,
+        to_model,
+        from_model_field,
+        to_model_field,
+        user,
+    ):
+        if not isinstance(to_field, FileField):
+            UserFileReference.objects.filter(field_id=from_field.id).delete()
+
+    def after_update(
+        self,
+        from_field,
+        to_field,
+        from_model,
+        to_model,
+        user,
+        connection,
+        altered_column,
+        before,
+    ):
+        if not isinstance(from_field, FileField):
+            update_user_file_references(to_field)
+
     def random_value(self, instance, fake, cache):
         """
         Selects between 0 and 3 random user files and returns those serialized in a
@@ -2034,6 +2248,29 @@ class SelectOptionBaseFieldType(FieldType):
         # If there are any deleted options we need to backup
         return old_field.select_options.exclude(id__in=updated_ids).exists()
 
+    def get_duplicate_value_sql(
+        self, source: sql.Composable, id_mapping: Dict[str, Any]
+    ) -> sql.Composable:
+        """
+        The select options have been duplicated, so the referenced option ids must be
+        mapped to the new ones. Options that can't be mapped result in `NULL`.
+        """
+
+        select_option_mapping = id_mapping.get("database_field_select_options", {})
+        if not select_option_mapping:
+            return sql.SQL("NULL")
+
+        return sql.SQL(
+            "(SELECT new_id FROM (VALUES {mapping}) AS mapping (old_id, new_id) "
+            "WHERE old_id = {source})"
+        ).format(
+            mapping=sql.SQL(", ").join(
+                sql.SQL("({}, {})").format(sql.Literal(old_id), sql.Literal(new_id))
+                for old_id, new_id in select_option_mapping.items()
+            ),
+            source=source,
+        )
+
 
 class SingleSelectFieldType(SelectOptionBaseFieldType):
     type = "single_select"
@@ -2066,6 +2303,15 @@ class SingleSelectFieldType(SelectOptionBaseFieldType):
             models.Prefetch(name, queryset=SelectOption.objects.using("default").all())
         )
 
+    def get_serialize_from_values(self, model, field, name):
+        """
+        The select options are resolved from memory by the id of the selected option,
+        so that they don't have to be fetched for every listing.
+        """
+
+        select_options = get_serialized_select_options(field, model._table_version)
+        return name, select_options.get
+
     def get_internal_value_from_db(
         self, row: "GeneratedTableModel", field_name: str
     ) -> int:
@@ -2343,6 +2589,39 @@ class MultipleSelectFieldType(SelectOptionBaseFieldType):
             models.Prefetch(name, queryset=related_queryset)
         )
 
+    def get_serialize_from_values(self, model, field, name):
+        """
+        Only the ids of the selected options are aggregated in a subquery, in the order
+        they have been selected in. The select options are resolved from memory.
+        """
+
+        model_field = model._meta.get_field(name)
+        from_name = model_field.m2m_field_name()
+        to_name = model_field.m2m_reverse_field_name()
+        option_ids = (
+            model_field.remote_field.through.objects.filter(
+                **{from_name: OuterRef("pk")}
+            )
+            .values(from_name)
+            .annotate(option_ids=ArrayAgg(to_name, ordering=("id",)))
+            .values("option_ids")
+        )
+        expression = Coalesce(
+            Subquery(option_ids),
+            Value([], output_field=ArrayField(models.IntegerField())),
+            output_field=ArrayField(models.IntegerField()),
+        )
+        select_options = get_serialized_select_options(field, model._table_version)
+
+        def serialize(value):
+            return [
+                select_options[option_id]
+                for option_id in value
+                if option_id in select_options
+            ]
+
+        return expression, serialize
+
     def prepare_value_for_db(self, instance, value):
         if value is None:
             return value
@@ -2490,24 +2769,17 @@ class MultipleSelectFieldType(SelectOptionBaseFieldType):
         apps.do_pending_operations(select_option_field.remote_field.through)
         apps.clear_cache()
 
+    def enhance_queryset_for_export(self, queryset, field, name):
+        remote_field = queryset.model._meta.get_field(name).remote_field
+        related_queryset = remote_field.model.objects.only("id").extra(
+            order_by=[f"{remote_field.through._meta.db_table}.id"]
+        )
+        return queryset.prefetch_related(
+            models.Prefetch(name, queryset=related_queryset)
+        )
+
     def get_export_serialized_value(self, row, field_name, cache, files_zip, storage):
-        cache_entry = f"{field_name}_relations"
-        if cache_entry not in cache:
-            # In order to prevent a lot of lookup queries in the through table, we want
-            # to fetch all the relations and add it to a temporary in memory cache
-            # containing a mapping of the old ids to the new ids. Every relation can
-            # use the cached mapped relations to find the correct id.
-            cache[cache_entry] = defaultdict(list)
-            through_model = row._meta.get_field(field_name).remote_field.through
-            through_model_fields = through_model._meta.get_fields()
-            current_field_name = through_model_fields[1].name
-            relation_field_name = through_model_fields[2].name
-            for relation in through_model.objects.all():
-                cache[cache_entry][
-                    getattr(relation, f"{current_field_name}_id")
-                ].append(getattr(relation, f"{relation_field_name}_id"))
-
-        return cache[cache_entry][row.id]
+        return [option.id for option in getattr(row, field_name).all()]
 
     def set_import_serialized_value(
         self, row, field_name, value, id_mapping, files_zip, storage
@@ -2581,6 +2853,10 @@ class PhoneNumberFieldType(CharFieldMatchingRegexFieldType):
 
     type = "phone_number"
     model_class = PhoneNumberField
+    can_serialize_from_values = True
+    can_be_upsert_key = True
+    can_be_btree_indexed = True
+    can_be_trigram_indexed = True
 
     MAX_PHONE_NUMBER_LENGTH = 100
 
@@ -2792,6 +3068,13 @@ class FormulaFieldType(ReadOnlyFieldType):
             },
         )
 
+    def get_human_readable_value_expression(self, field, path):
+        (
+            field_instance,
+            field_type,
+        ) = self._get_field_instance_and_type_from_formula_field(field)
+        return field_type.get_human_readable_value_expression(field_instance, path)
+
     def restore_failed(self, field_instance, restore_exception):
         handleable_exceptions_to_error = {
             SelfReferenceFieldDependencyError: "After restoring references itself "
@@ -0,0 +1,166 @@
+from collections import defaultdict
+from typing import Iterable, List, Optional
+
+from django.db import connection
+from django.db.models import QuerySet
+from psycopg2 import sql
+
+from baserow.contrib.database.table.models import Table
+from baserow.core.db_routers import (
+    mark_table_as_changed,
+    mark_table_data_as_changed,
+)
+from baserow.core.user_files.models import UserFile
+
+from .models import Field, FileField, UserFileReference
+
+
+# Extracts the user file of every file object in the cells of a file field. The name
+# of a user file is `{unique}_{sha256_hash}.{extension}`, the indexed hash is used to
+# find the candidates and the unique makes the match exact.
+INSERT_USER_FILE_REFERENCES_SQL = """
+    INSERT INTO {reference_table} (user_file_id, table_id, field_id, row_id)
+    SELECT DISTINCT user_file.id, %(table_id)s, %(field_id)s, table_row.id
+    FROM {table} table_row
+    CROSS JOIN LATERAL jsonb_array_elements(
+        CASE WHEN jsonb_typeof(table_row.{column}) = 'array'
+        THEN table_row.{column} ELSE '[]'::jsonb END
+    ) AS file_object
+    INNER JOIN {user_file_table} user_file
+        ON user_file.sha256_hash = split_part(
+            split_part(file_object->>'name', '_', 2), '.', 1
+        )
+        AND user_file."unique" = split_part(file_object->>'name', '_', 1)
+    WHERE NOT table_row.trashed {row_filter}
+    ON CONFLICT DO NOTHING
+"""
+
+# Clears the `thumbnails_pending` flag of the file objects of the user file in the
+# cells, while keeping the order of the files. The rows are marked as changed, so
+# that the row changes endpoint returns the thumbnails.
+CLEAR_PENDING_THUMBNAILS_SQL = """
+    UPDATE {table} table_row SET changed_on = now(), {column} = (
+        SELECT jsonb_agg(
+            CASE WHEN file_object->>'name' = %(name)s
+            THEN file_object || jsonb_build_object('thumbnails_pending', false)
+            ELSE file_object END
+            ORDER BY position
+        )
+        FROM jsonb_array_elements(table_row.{column})
+            WITH ORDINALITY AS files(file_object, position)
+    )
+    WHERE table_row.id = ANY(%(row_ids)s)
+    AND jsonb_typeof(table_row.{column}) = 'array'
+"""
+
+
+def update_user_file_references(field: Field, row_ids: Optional[List[int]] = None):
+    """
+    Replaces the user file references of the file field with the files that are
+    currently in the cells. Trashed rows don't reference any file.
+
+    :param field: The file field of which the references must be updated.
+    :param row_ids: If provided, only the references of these rows are updated.
+    """
+
+    references = UserFileReference.objects.filter(field_id=field.id)
+    row_filter = sql.SQL("")
+    params = {"table_id": field.table_id, "field_id": field.id}
+
+    if row_ids is not None:
+        row_ids = list(row_ids)
+        if not row_ids:
+            return
+        references = references.filter(row_id__in=row_ids)
+        row_filter = sql.SQL("AND table_row.id = ANY(%(row_ids)s)")
+        params["row_ids"] = row_ids
+
+    references.delete()
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            sql.SQL(INSERT_USER_FILE_REFERENCES_SQL).format(
+                reference_table=sql.Identifier(UserFileReference._meta.db_table),
+                table=sql.Identifier(
+                    f"{Table.USER_TABLE_DATABASE_NAME_PREFIX}{field.table_id}"
+                ),
+                column=sql.Identifier(field.db_column),
+                user_file_table=sql.Identifier(UserFile._meta.db_table),
+                row_filter=row_filter,
+            ),
+            params,
+        )
+
+
+def update_user_file_references_for_rows(model, row_ids: Iterable[int]):
+    """
+    Updates the user file references of all the file fields of the model for the
+    provided rows.
+
+    :param model: The generated table model containing the rows.
+    :param row_ids: The ids of the rows of which the references must be updated.
+    """
+
+    row_ids = list(row_ids)
+    for field_object in model._field_objects.values():
+        if isinstance(field_object["field"], FileField):
+            update_user_file_references(field_object["field"], row_ids)
+
+
+def delete_user_file_references(table_id: int, row_ids: Iterable[int]):
+    """
+    Deletes the user file references of the provided rows, for example because they
+    have been trashed.
+
+    :param table_id: The id of the table containing the rows.
+    :param row_ids: The ids of the rows.
+    """
+
+    UserFileReference.objects.filter(
+        table_id=table_id, row_id__in=list(row_ids)
+    ).delete()
+
+
+def clear_pending_thumbnails(user_file: UserFile):
+    """
+    The serialized user file is stored in the cells of the file fields, including
+    whether its thumbnails are still pending. This clears that flag in all the cells
+    referencing the user file, once its thumbnails have been generated.
+
+    :param user_file: The user file of which the thumbnails have been generated.
+    """
+
+    row_ids_by_field_id = defaultdict(list)
+    for field_id, row_id in UserFileReference.objects.filter(
+        user_file=user_file
+    ).values_list("field_id", "row_id"):
+        row_ids_by_field_id[field_id].append(row_id)
+
+    fields = Field.objects.filter(id__in=row_ids_by_field_id.keys())
+    with connection.cursor() as cursor:
+        for field in fields:
+            cursor.execute(
+                sql.SQL(CLEAR_PENDING_THUMBNAILS_SQL).format(
+                    table=sql.Identifier(
+                        f"{Table.USER_TABLE_DATABASE_NAME_PREFIX}{field.table_id}"
+                    ),
+                    column=sql.Identifier(field.db_column),
+                ),
+                {"name": user_file.name, "row_ids": row_ids_by_field_id[field.id]},
+            )
+            # The cells are updated with raw SQL, so the database router can't mark
+            # the table as changed.
+            mark_table_data_as_changed(field.table_id)
+            mark_table_as_changed(field.table_id)
+
+
+def get_unreferenced_user_files() -> QuerySet:
+    """
+    Returns the user files which aren't used in any cell of a file field. Note that
+    user files can also be referenced outside of file fields, for example by the
+    settings or by other plugins, which must be checked before deleting them.
+
+    :return: A queryset of the unreferenced user files.
+    """
+
+    return UserFile.objects.filter(file_field_references__isnull=True)
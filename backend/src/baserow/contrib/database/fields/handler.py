@@ -2,6 +2,7 @@ import logging
 import traceback
 from copy import deepcopy
 from typing import (
+    TYPE_CHECKING,
     Dict,
     Any,
     Optional,
@@ -59,11 +60,13 @@ from .exceptions import (
     FailedToLockFieldDueToConflict,
 )
 from .field_cache import FieldCache
+from .index_advisor import FieldIndexAdvisor
 from .models import Field, SelectOption, SpecificFieldForUpdate
 from .registries import (
     field_type_registry,
     field_converter_registry,
 )
+from .select_option_cache import invalidate_select_option_cache
 from .signals import (
     field_created,
     field_updated,
@@ -72,6 +75,9 @@ from .signals import (
     before_field_deleted,
 )
 
+if TYPE_CHECKING:
+    from .online_conversion import OnlineFieldTypeConversion
+
 logger = logging.getLogger(__name__)
 
 
@@ -335,6 +341,7 @@ class FieldHandler:
         after_schema_change_callback: Optional[
             Callable[[SpecificFieldForUpdate], None]
         ] = None,
+        online_conversion: Optional["OnlineFieldTypeConversion"] = None,
         **kwargs,
     ) -> Union[SpecificFieldForUpdate, Tuple[SpecificFieldForUpdate, List[Field]]]:
         """
@@ -354,12 +361,17 @@ class FieldHandler:
         :param after_schema_change_callback: If specified this callback is called
             after the field has had it's schema updated but before any dependant
             fields have been updated.
+        :param online_conversion: If the values of the field have already been
+            converted into a shadow column by this online conversion, the column is
+            swapped with the shadow column instead of being altered.
         :param kwargs: The field values that need to be updated
         :raises ValueError: When the provided field is not an instance of Field.
         :raises CannotChangeFieldType: When the database server responds with an
             error while trying to change the field type. This should rarely happen
             because of the lenient schema editor, which replaces the value with null
             if it could not be converted.
+        :raises OnlineFieldConversionOutdated: When the provided online conversion
+            doesn't match the update anymore.
         :return: A data class containing information on all the changes made as a result
             of the field update.
         """
@@ -420,6 +432,7 @@ class FieldHandler:
         field = set_allowed_attrs(field_values, allowed_fields, field)
 
         field.save(field_cache=field_cache, raise_if_invalid=True)
+        invalidate_select_option_cache(field.id)
         FieldDependencyHandler.rebuild_dependencies(field, field_cache)
         # If no converter is found we are going to convert to field using the
         # lenient schema editor which will alter the field's type and set the data
@@ -441,12 +454,31 @@ class FieldHandler:
             user,
         )
 
+        # The indexes of the advisor might not fit the new type, it creates them
+        # again if they're still possible and worth it.
+        if baserow_field_type_changed or (
+            from_model_field.db_parameters(connection)["type"]
+            != to_model_field.db_parameters(connection)["type"]
+        ):
+            FieldIndexAdvisor().drop_field_indexes(old_field)
+
         # Try to find a data converter that can be applied.
         converter = field_converter_registry.find_applicable_converter(
             from_model, old_field, field
         )
 
-        if converter:
+        if online_conversion is not None:
+            # The values have already been converted into a shadow column in the
+            # background, so it only has to replace the original column.
+            online_conversion.swap_columns(
+                old_field,
+                field,
+                from_model,
+                from_model_field,
+                to_model,
+                to_model_field,
+            )
+        elif converter:
             # If a field data converter is found we are going to use that one to alter
             # the field and maybe do some data conversion.
             converter.alter_field(
@@ -631,6 +663,7 @@ class FieldHandler:
         # The trash call above might have just caused a massive field update to lots of
         # different fields. We need to reset our cache accordingly.
         field_cache.reset_cache()
+        FieldIndexAdvisor().drop_field_indexes(field)
 
         FieldDependencyHandler.break_dependencies_delete_dependants(field)
 
@@ -746,6 +779,7 @@ class FieldHandler:
         # The model has changed when the select options have changed, so we need to
         # invalidate the model cache.
         field.invalidate_table_model_cache()
+        invalidate_select_option_cache(field.id)
 
     # noinspection PyMethodMayBeStatic
     def find_next_unused_field_name(
@@ -0,0 +1,451 @@
+import logging
+from collections import defaultdict
+from contextlib import nullcontext
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from psycopg2 import sql
+
+from baserow.contrib.database.table.models import (
+    Table,
+    TableModelQuerySet,
+    deconstruct_filter_key_regex,
+)
+from baserow.contrib.database.table.row_count import get_estimated_row_counts
+from baserow.contrib.database.views.models import ViewFilter, ViewSort
+from baserow.contrib.database.views.registries import view_filter_type_registry
+from baserow.core.db import specific_iterator
+from baserow.core.utils import split_comma_separated_string
+
+from .constants import INDEX_KIND_BTREE, INDEX_KIND_HASH, INDEX_KIND_TRIGRAM
+from .models import Field, FieldIndex, FieldIndexUsage
+from .registries import field_type_registry
+
+logger = logging.getLogger(__name__)
+
+FieldUsage = Tuple[int, str]
+
+# The usage of a field via the API is stored at most once per this number of seconds,
+# so that listing rows doesn't write to the database every time.
+USAGE_RECORD_THROTTLE_SECONDS = 60
+# An index is requested at most once per this number of seconds, so that the task
+# creating it isn't queued by every upsert while it's running.
+INDEX_REQUEST_THROTTLE_SECONDS = 60 * 10
+
+# The btree index matches the `ORDER BY field ASC NULLS FIRST, order, id` of a
+# sorted view, so that the first rows can be read from the index directly.
+CREATE_BTREE_INDEX_SQL = """
+    CREATE INDEX {concurrently} IF NOT EXISTS {index}
+    ON {table} ({column} NULLS FIRST, "order", "id")
+"""
+# The expression must match the `UPPER(column::text) LIKE UPPER(%s)` of the
+# `icontains` lookup, otherwise PostgreSQL can't use the index.
+CREATE_TRIGRAM_INDEX_SQL = """
+    CREATE INDEX {concurrently} IF NOT EXISTS {index}
+    ON {table} USING gin (UPPER({column}::text) gin_trgm_ops)
+"""
+# The hash index matches the equality lookups of the upsert key. Unlike a btree
+# index, it doesn't have a limit on the size of the values.
+CREATE_HASH_INDEX_SQL = """
+    CREATE INDEX {concurrently} IF NOT EXISTS {index}
+    ON {table} USING hash ({column})
+"""
+CREATE_INDEX_SQL = {
+    INDEX_KIND_BTREE: CREATE_BTREE_INDEX_SQL,
+    INDEX_KIND_TRIGRAM: CREATE_TRIGRAM_INDEX_SQL,
+    INDEX_KIND_HASH: CREATE_HASH_INDEX_SQL,
+}
+
+
+def field_can_have_index(field: Field, index_kind: str) -> bool:
+    field_type = field_type_registry.get_by_model(field)
+    if index_kind == INDEX_KIND_BTREE:
+        return field_type.can_be_btree_indexed
+    if index_kind == INDEX_KIND_TRIGRAM:
+        return field_type.can_be_trigram_indexed
+    if index_kind == INDEX_KIND_HASH:
+        return field_type.can_be_upsert_key
+    return False
+
+
+def get_field_index_name(field: Field, index_kind: str) -> str:
+    return f"tbl_{field.table_id}_fld_{field.id}_{index_kind}_idx"
+
+
+def _concurrently() -> sql.SQL:
+    # Indexes can only be created and dropped concurrently outside of a transaction,
+    # which is the case in the background job. Otherwise the table is locked
+    # until the transaction commits.
+    return sql.SQL("" if connection.in_atomic_block else "CONCURRENTLY")
+
+
+def _get_fields(table: Table) -> Dict[int, Field]:
+    return {
+        field.id: field
+        for field in specific_iterator(Field.objects.filter(table=table))
+    }
+
+
+class FieldIndexAdvisor:
+    def get_api_field_usages(
+        self,
+        queryset: TableModelQuerySet,
+        order_string: Optional[str] = None,
+        user_field_names: bool = False,
+        filter_object: Optional[Dict[str, List[str]]] = None,
+    ) -> Set[FieldUsage]:
+        """
+        Returns the fields that the rows are sorted and filtered by via the
+        `order_by` and `filter__` query parameters of the API, together with the kind
+        of index that would speed that up. Must be called after the parameters have
+        been applied to the queryset, so that they're known to be valid.
+
+        :param queryset: The queryset of the table model the parameters are
+            applied to.
+        :param order_string: The value of the `order_by` query parameter.
+        :param user_field_names: Whether the order string contains the names
+            instead of the ids of the fields.
+        :param filter_object: The query parameters containing the filters.
+        :return: A set of field id and index kind tuples.
+        """
+
+        usages = set()
+        field_objects = queryset.model._field_objects
+
+        if order_string:
+            field_ids_by_name = {
+                field_object["field"].name: field_id
+                for field_id, field_object in field_objects.items()
+            }
+            for order in split_comma_separated_string(order_string):
+                if user_field_names:
+                    field_id = field_ids_by_name.get(queryset._get_field_name(order))
+                else:
+                    field_id = queryset._get_field_id(order)
+                if field_id in field_objects:
+                    usages.add((field_id, INDEX_KIND_BTREE))
+
+        for key in filter_object or {}:
+            matches = deconstruct_filter_key_regex.match(key)
+            if not matches or int(matches[1]) not in field_objects:
+                continue
+            field_id = int(matches[1])
+            index_kind = view_filter_type_registry.get(matches[2]).get_index_kind(
+                field_objects[field_id]["field"]
+            )
+            if index_kind is not None:
+                usages.add((field_id, index_kind))
+
+        return {
+            (field_id, index_kind)
+            for field_id, index_kind in usages
+            if field_can_have_index(field_objects[field_id]["field"], index_kind)
+        }
+
+    def record_field_usages(self, usages: Iterable[FieldUsage]):
+        """
+        Counts the provided usages of fields, but every usage at most once per
+        `USAGE_RECORD_THROTTLE_SECONDS`. Nothing is recorded if the index advisor is
+        disabled.
+
+        :param usages: The field id and index kind tuples that have been used.
+        """
+
+        if not settings.BASEROW_INDEX_ADVISOR_ENABLED:
+            return
+
+        now = timezone.now()
+        for field_id, index_kind in usages:
+            if not cache.add(
+                f"field_index_usage_{field_id}_{index_kind}",
+                True,
+                timeout=USAGE_RECORD_THROTTLE_SECONDS,
+            ):
+                continue
+
+            updated = FieldIndexUsage.objects.filter(
+                field_id=field_id, index_kind=index_kind
+            ).update(usage_count=F("usage_count") + 1, last_used_on=now)
+            if not updated:
+                FieldIndexUsage.objects.get_or_create(
+                    field_id=field_id,
+                    index_kind=index_kind,
+                    defaults={"usage_count": 1, "last_used_on": now},
+                )
+
+    def get_usage_scores(
+        self, table: Table, fields: Optional[Dict[int, Field]] = None
+    ) -> Dict[FieldUsage, int]:
+        """
+        Scores how much every field of the table is used per kind of index. Every
+        view sort and view filter counts once and every recent usage via the API is
+        added to that.
+
+        :param table: The table of which the fields must be scored.
+        :param fields: The specific fields of the table by id, if already fetched.
+        :return: The score by field id and index kind.
+        """
+
+        if fields is None:
+            fields = _get_fields(table)
+
+        scores = defaultdict(int)
+
+        for field_id in ViewSort.objects.filter(
+            view__table=table, view__trashed=False
+        ).values_list("field_id", flat=True):
+            scores[(field_id, INDEX_KIND_BTREE)] += 1
+
+        for field_id, filter_type in ViewFilter.objects.filter(
+            view__table=table, view__trashed=False
+        ).values_list("field_id", "type"):
+            if (
+                field_id not in fields
+                or filter_type not in view_filter_type_registry.registry
+            ):
+                continue
+            index_kind = view_filter_type_registry.get(filter_type).get_index_kind(
+                fields[field_id]
+            )
+            if index_kind is not None:
+                scores[(field_id, index_kind)] += 1
+
+        for field_id, index_kind, usage_count in FieldIndexUsage.objects.filter(
+            field__table=table, last_used_on__gte=self._get_usage_cutoff()
+        ).values_list("field_id", "index_kind", "usage_count"):
+            scores[(field_id, index_kind)] += usage_count
+
+        return {
+            (field_id, index_kind): score
+            for (field_id, index_kind), score in scores.items()
+            if field_id in fields and field_can_have_index(fields[field_id], index_kind)
+        }
+
+    def get_wanted_indexes(
+        self,
+        table: Table,
+        estimated_row_count: int,
+        fields: Optional[Dict[int, Field]] = None,
+    ) -> Set[FieldUsage]:
+        """
+        Decides which indexes the table should have. Indexes are only worth it for
+        tables with at least `BASEROW_INDEX_ADVISOR_MIN_ROWS` rows, for which the most
+        used fields up to `BASEROW_INDEX_ADVISOR_MAX_INDEXES_PER_TABLE` are chosen.
+
+        :param table: The table to decide the indexes for.
+        :param estimated_row_count: The estimated number of rows in the table.
+        :param fields: The specific fields of the table by id, if already fetched.
+        :return: The field id and index kind tuples that should be indexed.
+        """
+
+        if estimated_row_count < settings.BASEROW_INDEX_ADVISOR_MIN_ROWS:
+            return set()
+
+        scores = self.get_usage_scores(table, fields)
+        most_used = sorted(scores, key=lambda usage: (-scores[usage], usage))
+        return set(most_used[: settings.BASEROW_INDEX_ADVISOR_MAX_INDEXES_PER_TABLE])
+
+    def create_index(self, field: Field, index_kind: str) -> Optional[FieldIndex]:
+        """
+        Creates an index on the column of the field, concurrently if possible, and
+        records it.
+
+        :param field: The field of which the column must be indexed.
+        :param index_kind: The kind of index that must be created.
+        :return: The created index or None if it couldn't be created.
+        """
+
+        if index_kind == INDEX_KIND_TRIGRAM and not self._ensure_trigram_extension():
+            return None
+
+        name = get_field_index_name(field, index_kind)
+        concurrently = not connection.in_atomic_block
+        try:
+            # A savepoint keeps the transaction usable if the creation fails.
+            with (nullcontext() if concurrently else transaction.atomic()):
+                self._create_index(field, index_kind, name)
+        except DatabaseError as e:
+            logger.warning(f"Could not create the index {name}: {e}")
+            # A failed concurrent index creation leaves an invalid index behind.
+            if concurrently:
+                self._drop_index_by_name(name)
+            return None
+
+        field_index, _ = FieldIndex.objects.get_or_create(
+            field=field, index_kind=index_kind, defaults={"name": name}
+        )
+        return field_index
+
+    def request_index(self, field: Field, index_kind: str):
+        """
+        Makes sure that the column of the field gets an index of the provided kind
+        without waiting for the periodic job, because it's needed right away. The
+        index is created concurrently by a background task after the transaction
+        commits, if the table is large enough. The usage is recorded as well, so that
+        the periodic job keeps the index while it's used.
+
+        :param field: The field of which the column must be indexed.
+        :param index_kind: The kind of index that is needed.
+        """
+
+        self.record_field_usages([(field.id, index_kind)])
+
+        if FieldIndex.objects.filter(field_id=field.id, index_kind=index_kind).exists():
+            return
+
+        if not cache.add(
+            f"field_index_requested_{field.id}_{index_kind}",
+            True,
+            timeout=INDEX_REQUEST_THROTTLE_SECONDS,
+        ):
+            return
+
+        from .tasks import create_field_index
+
+        transaction.on_commit(lambda: create_field_index.delay(field.id, index_kind))
+
+    def create_requested_index(self, field_id: int, index_kind: str):
+        """
+        Creates the index that has been requested with `request_index`, unless it
+        already exists, the field has been deleted in the meantime or the table has
+        fewer rows than `BASEROW_INDEX_ADVISOR_MIN_ROWS`.
+
+        :param field_id: The id of the field of which the column must be indexed.
+        :param index_kind: The kind of index that must be created.
+        """
+
+        field = Field.objects.filter(id=field_id).select_related("table").first()
+        if field is None:
+            return
+
+        field = field.specific
+        if not field_can_have_index(field, index_kind):
+            return
+
+        if FieldIndex.objects.filter(field_id=field.id, index_kind=index_kind).exists():
+            return
+
+        estimated_row_count = max(
+            field.table.row_count or 0,
+            get_estimated_row_counts().get(field.table_id, 0),
+        )
+        if estimated_row_count < settings.BASEROW_INDEX_ADVISOR_MIN_ROWS:
+            return
+
+        self.create_index(field, index_kind)
+
+    def _create_index(self, field: Field, index_kind: str, name: str):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                sql.SQL(CREATE_INDEX_SQL[index_kind]).format(
+                    concurrently=_concurrently(),
+                    index=sql.Identifier(name),
+                    table=sql.Identifier(field.table.get_database_table_name()),
+                    column=sql.Identifier(field.db_column),
+                )
+            )
+
+    def drop_index(self, field_index: FieldIndex):
+        """
+        Drops the index, concurrently if possible, and deletes the record of it.
+
+        :param field_index: The index that must be dropped.
+        """
+
+        self._drop_index_by_name(field_index.name)
+        field_index.delete()
+
+    def drop_field_indexes(self, field: Field):
+        """
+        Drops all the indexes that the advisor has created for the field. This must
+        be done when the type of the column changes or when the field is deleted.
+        The advisor creates them again later if they are still worth it.
+
+        :param field: The field of which the indexes must be dropped.
+        """
+
+        for field_index in FieldIndex.objects.filter(field_id=field.id):
+            self.drop_index(field_index)
+
+    def advise_table(self, table: Table, estimated_row_count: int):
+        """
+        Creates the indexes that the table should have and drops the ones that it
+        shouldn't have anymore.
+
+        :param table: The table of which the indexes must be updated.
+        :param estimated_row_count: The estimated number of rows in the table.
+        """
+
+        fields = _get_fields(table)
+        wanted = self.get_wanted_indexes(table, estimated_row_count, fields)
+        existing = {
+            (field_index.field_id, field_index.index_kind): field_index
+            for field_index in FieldIndex.objects.filter(field__table=table)
+        }
+
+        for usage, field_index in existing.items():
+            if usage not in wanted:
+                self.drop_index(field_index)
+
+        for field_id, index_kind in sorted(wanted - set(existing)):
+            self.create_index(fields[field_id], index_kind)
+
+    def advise_all_tables(self):
+        """
+        Updates the indexes of all the tables of which fields are used to sort or
+        filter by, or that have indexes created by the advisor. The API usages that
+        are older than `BASEROW_INDEX_ADVISOR_USAGE_DAYS` are forgotten.
+        """
+
+        FieldIndexUsage.objects.filter(
+            last_used_on__lt=self._get_usage_cutoff()
+        ).delete()
+
+        table_ids = (
+            set(ViewSort.objects.values_list("view__table_id", flat=True))
+            | set(ViewFilter.objects.values_list("view__table_id", flat=True))
+            | set(FieldIndexUsage.objects.values_list("field__table_id", flat=True))
+            | set(FieldIndex.objects.values_list("field__table_id", flat=True))
+        )
+        estimated_row_counts = get_estimated_row_counts()
+
+        for table in Table.objects.filter(id__in=table_ids, database__trashed=False):
+            estimated_row_count = max(
+                table.row_count or 0, estimated_row_counts.get(table.id, 0)
+            )
+            try:
+                self.advise_table(table, estimated_row_count)
+            except DatabaseError as e:
+                logger.warning(f"Could not update the indexes of table {table.id}: {e}")
+
+    def _get_usage_cutoff(self):
+        return timezone.now() - timedelta(
+            days=settings.BASEROW_INDEX_ADVISOR_USAGE_DAYS
+        )
+
+    def _drop_index_by_name(self, name: str):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                sql.SQL("DROP INDEX {concurrently} IF EXISTS {index}").format(
+                    concurrently=_concurrently(), index=sql.Identifier(name)
+                )
+            )
+
+    def _ensure_trigram_extension(self) -> bool:
+        """
+        Creates the `pg_trgm` extension if it doesn't exist yet. This only works if
+        the database user is allowed to, trigram indexes are skipped otherwise.
+        """
+
+        try:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            return True
+        except DatabaseError as e:
+            logger.warning(f"Could not create the pg_trgm extension: {e}")
+            return False
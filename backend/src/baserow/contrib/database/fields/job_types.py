@@ -0,0 +1,119 @@
+import contextlib
+
+from django.db import transaction
+from rest_framework import serializers
+
+from baserow.api.errors import ERROR_USER_NOT_IN_GROUP
+from baserow.contrib.database.api.fields.errors import ERROR_FIELD_DOES_NOT_EXIST
+from baserow.contrib.database.api.fields.serializers import FieldSerializer
+from baserow.contrib.database.fields.actions import UpdateFieldActionType
+from baserow.contrib.database.fields.exceptions import (
+    CannotChangeFieldType,
+    FieldDoesNotExist,
+    OnlineFieldConversionOutdated,
+)
+from baserow.contrib.database.fields.handler import FieldHandler
+from baserow.contrib.database.fields.models import ConvertFieldTypeJob
+from baserow.contrib.database.fields.online_conversion import (
+    OnlineFieldTypeConversion,
+)
+from baserow.core.action.registries import action_type_registry
+from baserow.core.exceptions import UserNotInGroup
+from baserow.core.jobs.registries import JobType
+
+
+class ConvertFieldTypeJobType(JobType):
+    type = "convert_field_type"
+    model_class = ConvertFieldTypeJob
+    max_count = 1
+
+    api_exceptions_map = {
+        UserNotInGroup: ERROR_USER_NOT_IN_GROUP,
+        FieldDoesNotExist: ERROR_FIELD_DOES_NOT_EXIST,
+    }
+
+    job_exceptions_map = {
+        FieldDoesNotExist: "The field does not exist anymore.",
+        CannotChangeFieldType: "The field type could not be changed.",
+        OnlineFieldConversionOutdated: "The field has been changed while its values "
+        "were being converted.",
+    }
+
+    request_serializer_field_names = ["field_id", "new_type", "field_values"]
+
+    request_serializer_field_overrides = {
+        "field_id": serializers.IntegerField(
+            help_text="The ID of the field to update.",
+        ),
+        "new_type": serializers.CharField(
+            help_text="The type the field must be converted to.",
+        ),
+        "field_values": serializers.DictField(
+            required=False,
+            help_text="The other field values that must be updated.",
+        ),
+    }
+
+    serializer_field_names = ["field", "new_type"]
+    serializer_field_overrides = {
+        "field": FieldSerializer(read_only=True),
+    }
+
+    def transaction_atomic_context(self, job: ConvertFieldTypeJob):
+        """
+        The values are converted in chunks that are committed separately, so the job
+        manages its own transactions.
+        """
+
+        return contextlib.nullcontext()
+
+    def prepare_values(self, values, user):
+        field = FieldHandler().get_field(values.pop("field_id"))
+        field.table.database.group.has_user(user, raise_error=True)
+
+        return {
+            "field": field,
+            "new_type": values["new_type"],
+            "field_values": values.get("field_values", {}),
+        }
+
+    def _update_field(self, job, online_conversion=None):
+        field = FieldHandler().get_specific_field_for_update(job.field_id)
+        return action_type_registry.get_by_type(UpdateFieldActionType).do(
+            job.user,
+            field,
+            job.new_type,
+            online_conversion=online_conversion,
+            **job.field_values,
+        )
+
+    def run(self, job, progress):
+        """
+        Updates the field. If the values of the field must be converted by altering
+        the column, they're converted online into a shadow column first, so that the
+        table is only locked for a short moment when the columns are swapped.
+        """
+
+        field = FieldHandler().get_field(job.field_id).specific
+        online_conversion = OnlineFieldTypeConversion(
+            job.user, field, job.new_type, job.field_values
+        )
+
+        if not online_conversion.is_supported():
+            with transaction.atomic():
+                field, _ = self._update_field(job)
+            progress.increment(by=progress.total)
+            return field
+
+        try:
+            online_conversion.create_shadow_column()
+            online_conversion.backfill(
+                progress.create_child_builder(represents_progress=90)
+            )
+            with transaction.atomic():
+                field, _ = self._update_field(job, online_conversion)
+        finally:
+            online_conversion.clean_up()
+
+        progress.increment(by=10)
+        return field
@@ -19,6 +19,8 @@ from baserow.contrib.database.formula import (
 )
 from baserow.contrib.database.mixins import ParentFieldTrashableModelMixin
 from baserow.contrib.database.table.cache import invalidate_table_in_model_cache
+from baserow.core.jobs.mixins import JobWithUserDataMixin
+from baserow.core.jobs.models import Job
 from baserow.core.mixins import (
     OrderableMixin,
     PolymorphicContentTypeMixin,
@@ -502,4 +504,90 @@ class LookupField(FormulaField):
         )
 
 
+class UserFileReference(models.Model):
+    """
+    Records that a user file is used in a cell of a file field. It's maintained when
+    the cells are written, trashed or restored, so that the files used by a group or
+    the files that aren't used anymore can be found without scanning every table.
+    """
+
+    user_file = models.ForeignKey(
+        "core.UserFile",
+        on_delete=models.CASCADE,
+        related_name="file_field_references",
+    )
+    table = models.ForeignKey("database.Table", on_delete=models.CASCADE)
+    field = models.ForeignKey(Field, on_delete=models.CASCADE)
+    row_id = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["field", "row_id", "user_file"],
+                name="unique_user_file_reference",
+            )
+        ]
+        indexes = [models.Index(fields=["table", "row_id"])]
+
+
 SpecificFieldForUpdate = NewType("SpecificFieldForUpdate", Field)
+
+
+class ConvertFieldTypeJob(JobWithUserDataMixin, Job):
+    field = models.ForeignKey(
+        Field,
+        null=True,
+        related_name="convert_field_type_jobs",
+        on_delete=models.SET_NULL,
+        help_text="The field that is updated.",
+    )
+    new_type = models.CharField(
+        max_length=32,
+        help_text="The type the field is converted to.",
+    )
+    field_values = models.JSONField(
+        default=dict,
+        help_text="The other field values that are updated.",
+    )
+
+
+class FieldIndexUsage(models.Model):
+    """
+    Keeps track of how often the rows are sorted or filtered by a field via the API,
+    so that the index advisor can decide whether an index on the field is worth it.
+    """
+
+    field = models.ForeignKey(Field, on_delete=models.CASCADE)
+    index_kind = models.CharField(
+        max_length=32,
+        help_text="The kind of index that would speed up the usage.",
+    )
+    usage_count = models.PositiveIntegerField(default=0)
+    last_used_on = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["field", "index_kind"],
+                name="unique_field_index_usage",
+            )
+        ]
+
+
+class FieldIndex(models.Model):
+    """
+    An index that has been created by the index advisor on the column of a field.
+    """
+
+    field = models.ForeignKey(Field, on_delete=models.CASCADE)
+    index_kind = models.CharField(max_length=32)
+    name = models.CharField(max_length=63, unique=True)
+    created_on = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["field", "index_kind"],
+                name="unique_field_index",
+            )
+        ]
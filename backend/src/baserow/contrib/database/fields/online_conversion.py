@@ -0,0 +1,346 @@
+from copy import deepcopy
+from typing import Any, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.auth.models import AbstractUser
+from django.db import connection, transaction
+from django.db.models import ManyToManyField
+
+from baserow.contrib.database.db.schema import safe_django_schema_editor
+from baserow.contrib.database.db.sql_queries import (
+    sql_backfill_online_conversion,
+    sql_create_online_conversion_function,
+    sql_drop_online_conversion_function,
+    sql_drop_online_conversion_trigger,
+)
+from baserow.contrib.database.table.models import GeneratedTableModel
+from baserow.core.utils import (
+    ChildProgressBuilder,
+    extract_allowed,
+    set_allowed_attrs,
+)
+
+from .exceptions import OnlineFieldConversionOutdated
+from .models import Field, LinkRowField, SpecificFieldForUpdate
+from .registries import field_converter_registry, field_type_registry
+
+FunctionSql = Tuple[str, Dict[str, Any]]
+
+
+class OnlineFieldTypeConversion:
+    """
+    Converts the values of a field to another field type without blocking the table
+    while doing so. Altering the type of the column in place rewrites the whole table
+    while holding an ACCESS EXCLUSIVE lock, so instead the values are converted into a
+    shadow column in chunks which are each committed in their own transaction. A
+    trigger keeps the shadow column in sync with the rows that are created or updated
+    in the meantime. When all the values have been converted, the
+    `FieldHandler.update_field` method swaps the shadow column with the original
+    column, which only locks the table for a short moment.
+
+    conversion = OnlineFieldTypeConversion(user, field, "number", {})
+    if conversion.is_supported():
+        try:
+            conversion.create_shadow_column()
+            conversion.backfill()
+            with transaction.atomic():
+                FieldHandler().update_field(
+                    user, field, "number", online_conversion=conversion
+                )
+        finally:
+            conversion.clean_up()
+
+    The values are converted with exactly the same SQL as the lenient schema editor
+    would use, so the result is the same as the regular conversion.
+    """
+
+    def __init__(
+        self,
+        user: AbstractUser,
+        field: SpecificFieldForUpdate,
+        new_type_name: Optional[str] = None,
+        field_values: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        :param user: The user on whose behalf the field is updated.
+        :param field: The field of which the values must be converted.
+        :param new_type_name: The type the field is going to be converted to.
+        :param field_values: The field values that are going to be updated.
+        """
+
+        self.field = field
+        self.from_field_type = field_type_registry.get_by_model(field)
+        self.to_field_type = field_type_registry.get(
+            new_type_name or self.from_field_type.type
+        )
+        self.to_field = self._build_to_field(user, field_values or {})
+        self.table_name = field.table.get_database_table_name()
+        self.shadow_column = f"{field.db_column}_converted"
+        self.function_name = f"baserow_convert_field_{field.id}"
+        self.trigger_name = f"field_{field.id}_conversion"
+        self.trigger_function_name = f"baserow_field_{field.id}_conversion_trigger"
+        # If set, the original column is renamed to this column instead of dropped
+        # when the columns are swapped, so that it can be used as undo backup.
+        self.backup_column_name: Optional[str] = None
+        self._function_sql: Optional[FunctionSql] = None
+
+    def _build_to_field(
+        self, user: AbstractUser, field_values: Dict[str, Any]
+    ) -> Field:
+        """
+        Builds an unsaved instance of the field like it's going to be after the
+        update. It's only used to generate the SQL converting the values.
+        """
+
+        allowed_fields = ["name"] + self.to_field_type.allowed_fields
+        field_values = self.to_field_type.prepare_values(
+            extract_allowed(field_values, allowed_fields), user
+        )
+
+        if self.to_field_type.type == self.from_field_type.type:
+            to_field = deepcopy(self.field)
+        else:
+            to_field = self.to_field_type.model_class(
+                **{
+                    model_field.attname: getattr(self.field, model_field.attname)
+                    for model_field in Field._meta.concrete_fields
+                }
+            )
+            to_field.table = self.field.table
+
+        return set_allowed_attrs(field_values, allowed_fields, to_field)
+
+    @staticmethod
+    def _get_model_field(field: Field):
+        model = field.table.get_model(
+            field_ids=[], fields=[field], add_dependencies=False
+        )
+        return model._meta.get_field(field.db_column)
+
+    def _get_shadow_model_field(self, to_model_field):
+        shadow_model_field = deepcopy(to_model_field)
+        shadow_model_field.column = self.shadow_column
+        # It must be nullable because the values are only filled in the background,
+        # the constraints of the field are applied when the columns are swapped.
+        shadow_model_field.null = True
+        return shadow_model_field
+
+    def _get_sql_names(self) -> Dict[str, str]:
+        quote_name = connection.ops.quote_name
+        return {
+            "table": quote_name(self.table_name),
+            "column": quote_name(self.field.db_column),
+            "shadow_column": quote_name(self.shadow_column),
+            "function": quote_name(self.function_name),
+            "trigger": quote_name(self.trigger_name),
+            "trigger_function": quote_name(self.trigger_function_name),
+        }
+
+    def _get_function_sql(
+        self, from_field: Field, to_field: Field, to_model_field
+    ) -> FunctionSql:
+        """
+        Generates the SQL creating the function that converts a value like the
+        `try_cast` function of the lenient schema editor and the trigger that keeps
+        the shadow column in sync.
+        """
+
+        from_field_type = field_type_registry.get_by_model(from_field)
+        to_field_type = field_type_registry.get_by_model(to_field)
+
+        variables = {}
+        prepare_values = []
+        for prepare_value in (
+            from_field_type.get_alter_column_prepare_old_value(
+                connection, from_field, to_field
+            ),
+            to_field_type.get_alter_column_prepare_new_value(
+                connection, from_field, to_field
+            ),
+        ):
+            if isinstance(prepare_value, tuple):
+                prepare_value, prepare_variables = prepare_value
+                variables.update(prepare_variables)
+            prepare_values.append(prepare_value or "")
+
+        for key, value in variables.items():
+            variables[key] = value.replace("$FUNCTION$", "")
+
+        # A not nullable column gets its default value when the value can't be
+        # converted, just like the schema editor does when altering the column.
+        default = None
+        if not to_model_field.null and to_model_field.has_default():
+            default = to_model_field.get_db_prep_save(
+                to_model_field.get_default(), connection
+            )
+        variables["online_conversion_default"] = default
+
+        function_sql = sql_create_online_conversion_function % {
+            **self._get_sql_names(),
+            "type": to_model_field.db_parameters(connection)["type"],
+            "default": "%(online_conversion_default)s",
+            "alter_column_prepare_old_value": prepare_values[0],
+            "alter_column_prepare_new_value": prepare_values[1],
+        }
+        return function_sql, variables
+
+    def is_supported(self) -> bool:
+        """
+        Checks if the values of the field can be converted online. That's only the
+        case if the conversion is done by the lenient schema editor, doesn't depend on
+        anything that's created during the update, like new select options, and the
+        column actually needs to be altered.
+        """
+
+        if (
+            self.to_field_type.read_only
+            or self.to_field_type.can_have_select_options
+            or isinstance(self.field, LinkRowField)
+            or isinstance(self.to_field, LinkRowField)
+        ):
+            return False
+
+        from_model_field = self._get_model_field(self.field)
+        if field_converter_registry.find_applicable_converter(
+            from_model_field.model, self.field, self.to_field
+        ):
+            return False
+
+        to_model_field = self._get_model_field(self.to_field)
+        if isinstance(from_model_field, ManyToManyField) or isinstance(
+            to_model_field, ManyToManyField
+        ):
+            return False
+
+        return (
+            self.from_field_type.type != self.to_field_type.type
+            or self.to_field_type.force_same_type_alter_column(
+                self.field, self.to_field
+            )
+            or from_model_field.db_parameters(connection)["type"]
+            != to_model_field.db_parameters(connection)["type"]
+        )
+
+    def create_shadow_column(self):
+        """
+        Adds the shadow column to the table and the trigger that converts the values
+        of the rows that are created or updated from now on into it.
+        """
+
+        to_model_field = self._get_model_field(self.to_field)
+        function_sql, variables = self._get_function_sql(
+            self.field, self.to_field, to_model_field
+        )
+
+        with transaction.atomic():
+            with safe_django_schema_editor(atomic=False) as schema_editor:
+                schema_editor.add_field(
+                    to_model_field.model, self._get_shadow_model_field(to_model_field)
+                )
+            with connection.cursor() as cursor:
+                cursor.execute(function_sql, variables)
+
+        self._function_sql = (function_sql, variables)
+
+    def backfill(self, progress_builder: Optional[ChildProgressBuilder] = None):
+        """
+        Converts the values of all the existing rows into the shadow column. Every
+        chunk of `BASEROW_ONLINE_FIELD_CONVERSION_CHUNK_SIZE` rows is committed
+        separately, so the rows are only locked for a short moment.
+
+        :param progress_builder: If provided, the progress is updated after every
+            chunk.
+        """
+
+        sql_names = self._get_sql_names()
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT count(*) FROM {sql_names['table']}")  # nosec
+            count = cursor.fetchone()[0]
+
+        progress = ChildProgressBuilder.build(progress_builder, child_total=count or 1)
+        chunk_size = settings.BASEROW_ONLINE_FIELD_CONVERSION_CHUNK_SIZE
+        last_id = 0
+        while True:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(
+                    sql_backfill_online_conversion % sql_names, [last_id, chunk_size]
+                )
+                ids = [row[0] for row in cursor.fetchall()]
+
+            if not ids:
+                break
+
+            last_id = max(ids)
+            progress.increment(by=len(ids))
+
+        if count == 0:
+            progress.increment()
+
+    def swap_columns(
+        self,
+        from_field: Field,
+        to_field: Field,
+        from_model: GeneratedTableModel,
+        from_model_field,
+        to_model: GeneratedTableModel,
+        to_model_field,
+    ):
+        """
+        Replaces the original column with the converted shadow column. Must be called
+        within the transaction updating the field, which holds the lock on the field.
+
+        :raises OnlineFieldConversionOutdated: When the field has been changed in
+            such a way that its values would have to be converted differently since
+            the shadow column was created.
+        """
+
+        if (
+            isinstance(from_model_field, ManyToManyField)
+            or isinstance(to_model_field, ManyToManyField)
+            or field_converter_registry.find_applicable_converter(
+                from_model, from_field, to_field
+            )
+            or self._function_sql
+            != self._get_function_sql(from_field, to_field, to_model_field)
+        ):
+            raise OnlineFieldConversionOutdated(
+                "The field has been changed while its values were being converted."
+            )
+
+        sql_names = self._get_sql_names()
+        with connection.cursor() as cursor:
+            cursor.execute(sql_drop_online_conversion_trigger % sql_names)
+            cursor.execute(sql_drop_online_conversion_function % sql_names)
+
+        with safe_django_schema_editor(atomic=False) as schema_editor:
+            if self.backup_column_name is None:
+                schema_editor.remove_field(from_model, from_model_field)
+            else:
+                backup_model_field = deepcopy(from_model_field)
+                backup_model_field.column = self.backup_column_name
+                backup_model_field.null = True
+                schema_editor.alter_field(
+                    from_model, from_model_field, backup_model_field
+                )
+            schema_editor.alter_field(
+                to_model, self._get_shadow_model_field(to_model_field), to_model_field
+            )
+
+        self._function_sql = None
+
+    def clean_up(self):
+        """
+        Removes the shadow column, the trigger and the functions if they still
+        exist, for example because the conversion has failed.
+        """
+
+        sql_names = self._get_sql_names()
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s)", [self.table_name])
+            if cursor.fetchone()[0] is not None:
+                cursor.execute(sql_drop_online_conversion_trigger % sql_names)
+                cursor.execute(
+                    f"ALTER TABLE {sql_names['table']} "  # nosec
+                    f"DROP COLUMN IF EXISTS {sql_names['shadow_column']}"
+                )
+            cursor.execute(sql_drop_online_conversion_function % sql_names)
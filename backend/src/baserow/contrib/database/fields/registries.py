@@ -1,4 +1,14 @@
-from typing import Any, Dict, List, TYPE_CHECKING, NoReturn, Optional, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    TYPE_CHECKING,
+    NoReturn,
+    Optional,
+    Tuple,
+    Union,
+)
 from zipfile import ZipFile
 
 from django.contrib.postgres.fields import JSONField, ArrayField
@@ -8,10 +18,12 @@ from django.db import models as django_models
 from django.db.models import (
     BooleanField,
     DurationField,
+    Expression,
     Q,
     QuerySet,
 )
 from django.db.models.fields.related import ManyToManyField, ForeignKey
+from psycopg2 import sql
 
 from baserow.contrib.database.fields.constants import UPSERT_OPTION_DICT_KEY
 from baserow.core.registry import (
@@ -105,6 +117,35 @@ class FieldType(
     """Indicates whether the field allows inserting/updating row values or if it is
     read only."""
 
+    can_serialize_from_values = False
+    """
+    Indicates whether the response serializer field can generate the value of the
+    field directly from the value of the database column as returned by
+    `queryset.values_list`. This allows the rows to be listed without the model
+    instances and related objects, so it must be False if the field needs any related
+    object or annotation.
+    """
+
+    can_be_upsert_key = False
+    """
+    Indicates whether rows can be upserted by the value of this field type. The value
+    must be stored in a single column and be comparable for equality.
+    """
+
+    can_be_btree_indexed = False
+    """
+    Indicates whether the index advisor can create a btree index on the column of
+    this field type to speed up sorting and comparing by it. The column must be
+    sorted by its plain value and the values must always fit in a btree index entry.
+    """
+
+    can_be_trigram_indexed = False
+    """
+    Indicates whether the index advisor can create a trigram index on the column of
+    this field type to speed up the contains filter. The `contains_query` must filter
+    with an `icontains` lookup on the column.
+    """
+
     field_data_is_derived_from_attrs = False
     """Set this to True if your field can completely reconstruct it's data just from
     it's field attributes. When set to False the fields data will be backed up when
@@ -201,6 +242,27 @@ class FieldType(
 
         return queryset
 
+    def get_serialize_from_values(
+        self, model: "GeneratedTableModel", field: Field, name: str
+    ) -> Optional[Tuple[Union[str, Expression], Optional[Callable[[Any], Any]]]]:
+        """
+        Fields that can't be serialized from the value of their column, see
+        `can_serialize_from_values`, because the serializer field needs related
+        objects that would normally be prefetched by the `enhance_queryset` method, can
+        still allow the rows to be listed from their values by returning what must be
+        fetched instead and how to convert it into the response value.
+
+        :param model: The model that the rows are listed with.
+        :param field: The field instance.
+        :param name: The name of the field in the model.
+        :return: The name of the column or an expression computing the value that must
+            be fetched and a function converting a non null fetched value into the
+            serialized value, or None if the fetched value is already serialized. None
+            if the field can't be serialized from values.
+        """
+
+        return None
+
     def empty_query(
         self,
         field_name: str,
@@ -798,6 +860,37 @@ class FieldType(
 
         pass
 
+    def after_rows_updated(
+        self,
+        field: Field,
+        rows: List["GeneratedTableModel"],
+        update_collector: "FieldUpdateCollector",
+        field_cache: "FieldCache",
+    ):
+        """
+        Immediately after the values of a field of this type have been updated in
+        one or more rows this method is called. This is useful for fields that need
+        to keep some sort of related data in sync with the cell values.
+        """
+
+        pass
+
+    def enhance_queryset_for_export(
+        self, queryset: QuerySet, field: Field, name: str
+    ) -> QuerySet:
+        """
+        This hook can be used to prefetch the data needed by
+        `get_export_serialized_value`. The rows are exported by chunks, so the
+        prefetched data is only fetched for the rows of the chunk.
+
+        :param queryset: The queryset that selects the rows of a chunk.
+        :param field: The related field's instance.
+        :param name: The name of the field.
+        :return: The enhanced queryset.
+        """
+
+        return queryset
+
     def get_export_serialized_value(
         self,
         row: "GeneratedTableModel",
@@ -849,6 +942,23 @@ class FieldType(
 
         setattr(row, field_name, value)
 
+    def get_duplicate_value_sql(
+        self, source: sql.Composable, id_mapping: Dict[str, Any]
+    ) -> sql.Composable:
+        """
+        Returns the SQL expression selecting the value that must be inserted when the
+        rows of a table are duplicated directly in the database with an
+        `INSERT INTO ... SELECT` query. For fields stored in a many to many table,
+        the source is the column referencing the related object in the through table.
+
+        :param source: The SQL reference to the column in the source table.
+        :param id_mapping: The map of exported ids to newly created ids that must be
+            used if the value references other objects.
+        :return: The SQL expression.
+        """
+
+        return source
+
     def get_export_value(self, value: Any, field_object: "FieldObject") -> Any:
         """
         Should convert this field type's internal baserow value to a form suitable
@@ -880,6 +990,23 @@ class FieldType(
         else:
             return str(human_readable_value)
 
+    def get_human_readable_value_expression(
+        self, field: Field, path: str
+    ) -> Optional[Expression]:
+        """
+        Can return an expression that computes the same string as the
+        `get_human_readable_value` method in the database. This is for example used
+        to compute the primary field values of the rows related via a link row field
+        without fetching those rows.
+
+        :param field: The field instance.
+        :param path: The lookup path to the column of the field, for example
+            `field_1` or `link_to_table__field_1`.
+        :return: The expression or None if the value can't be computed in the database.
+        """
+
+        return None
+
     # noinspection PyMethodMayBeStatic
     def get_other_fields_to_trash_restore_always_together(
         self, field: Field
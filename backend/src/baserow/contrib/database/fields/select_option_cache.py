@@ -0,0 +1,72 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from .models import Field, SelectOption
+
+SELECT_OPTION_CACHE_SIZE = 1024
+_select_option_cache = OrderedDict()
+_select_option_cache_lock = threading.Lock()
+
+SerializedSelectOptions = Dict[int, Dict[str, Any]]
+
+
+def _fetch_serialized_select_options(field: Field) -> SerializedSelectOptions:
+    return {
+        option_id: {"id": option_id, "value": value, "color": color}
+        for option_id, value, color in SelectOption.objects.using("default")
+        .filter(field_id=field.id)
+        .values_list("id", "value", "color")
+    }
+
+
+def get_serialized_select_options(
+    field: Field, table_version: Optional[str] = None
+) -> SerializedSelectOptions:
+    """
+    Returns the select options of the field serialized in the same way as the
+    `SelectOptionSerializer` by their id. The select options rarely change, but are
+    needed to serialize every row, so they're kept in memory for the version of the
+    table they belong to. Because the version of the table changes whenever the select
+    options or the field are updated, a process never uses outdated select options,
+    even if they have been changed by another process. The returned dicts are shared
+    and must not be modified.
+
+    :param field: The field of which the select options are needed.
+    :param table_version: The version of the table the field belongs to, see
+        `Table.version`. The options are not cached if it's unknown.
+    :return: The serialized select options by id.
+    """
+
+    if table_version is None:
+        return _fetch_serialized_select_options(field)
+
+    cache_key = (field.id, table_version)
+    with _select_option_cache_lock:
+        select_options = _select_option_cache.get(cache_key)
+        if select_options is not None:
+            _select_option_cache.move_to_end(cache_key)
+            return select_options
+
+    select_options = _fetch_serialized_select_options(field)
+
+    with _select_option_cache_lock:
+        _select_option_cache[cache_key] = select_options
+        while len(_select_option_cache) > SELECT_OPTION_CACHE_SIZE:
+            _select_option_cache.popitem(last=False)
+
+    return select_options
+
+
+def invalidate_select_option_cache(field_id: int):
+    """
+    Removes the select options of the field from the cache of this process. Other
+    processes don't use them anymore either because the table version has changed, but
+    this frees the memory right away.
+
+    :param field_id: The id of the field of which the select options have changed.
+    """
+
+    with _select_option_cache_lock:
+        for cache_key in [key for key in _select_option_cache if key[0] == field_id]:
+            del _select_option_cache[cache_key]
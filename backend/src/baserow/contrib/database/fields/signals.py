@@ -2,6 +2,7 @@ from django.db.models.signals import post_delete
 from django.dispatch import Signal, receiver
 
 from baserow.contrib.database.fields.models import Field
+from baserow.core.signals import user_file_thumbnails_generated
 
 field_created = Signal()
 field_restored = Signal()
@@ -13,3 +14,12 @@ before_field_deleted = Signal()
 @receiver(post_delete, sender=Field)
 def invalidate_model_cache_when_field_deleted(sender, instance, **kwargs):
     instance.invalidate_table_model_cache()
+
+
+@receiver(user_file_thumbnails_generated)
+def clear_pending_thumbnails_in_cells(sender, user_file, **kwargs):
+    from baserow.contrib.database.fields.file_references import (
+        clear_pending_thumbnails,
+    )
+
+    clear_pending_thumbnails(user_file)
@@ -0,0 +1,39 @@
+from datetime import timedelta
+
+from django.conf import settings
+
+from baserow.config.celery import app
+
+
+@app.task(queue="export")
+def run_field_index_advisor():
+    """
+    Creates the indexes on the columns of the fields that are often sorted or
+    filtered by and drops the ones that aren't used anymore.
+    """
+
+    from baserow.contrib.database.fields.index_advisor import FieldIndexAdvisor
+
+    FieldIndexAdvisor().advise_all_tables()
+
+
+@app.task(queue="export")
+def create_field_index(field_id: int, index_kind: str):
+    """
+    Creates an index that is needed right away on the column of the field, see
+    `FieldIndexAdvisor.request_index`.
+    """
+
+    from baserow.contrib.database.fields.index_advisor import FieldIndexAdvisor
+
+    FieldIndexAdvisor().create_requested_index(field_id, index_kind)
+
+
+# noinspection PyUnusedLocal
+@app.on_after_finalize.connect
+def setup_periodic_field_index_advisor_tasks(sender, **kwargs):
+    if settings.BASEROW_INDEX_ADVISOR_ENABLED:
+        sender.add_periodic_task(
+            timedelta(minutes=settings.BASEROW_INDEX_ADVISOR_INTERVAL_MINUTES),
+            run_field_index_advisor.s(),
+        )
@@ -0,0 +1,10 @@
+FILE_TYPE_JSON = "json"
+FILE_TYPE_CSV = "csv"
+FILE_TYPE_TSV = "tsv"
+FILE_TYPE_JSON_LINES = "jsonl"
+FILE_TYPE_CHOICES = (
+    (FILE_TYPE_JSON, "JSON array of rows"),
+    (FILE_TYPE_CSV, "CSV"),
+    (FILE_TYPE_TSV, "TSV"),
+    (FILE_TYPE_JSON_LINES, "JSON lines"),
+)
@@ -0,0 +1,2 @@
+class InvalidFileImportData(Exception):
+    """Raised when the content of an uploaded import file can't be parsed."""
@@ -36,7 +36,10 @@ from baserow.contrib.database.api.tables.errors import (
 )
 
 from baserow.contrib.database.rows.exceptions import ReportMaxErrorCountExceeded
+from .constants import FILE_TYPE_JSON, FILE_TYPE_CHOICES
+from .exceptions import InvalidFileImportData
 from .models import FileImportJob
+from .readers import get_import_data_reader
 from .serializers import (
     ReportSerializer,
 )
@@ -61,6 +64,7 @@ class FileImportJobType(JobType):
         InitialTableDataDuplicateName: ERROR_INITIAL_TABLE_DATA_HAS_DUPLICATE_NAMES[2],
         ReservedBaserowFieldNameException: ERROR_RESERVED_BASEROW_FIELD_NAME[2],
         InvalidBaserowFieldName: ERROR_INVALID_BASEROW_FIELD_NAME[2],
+        InvalidFileImportData: "The provided file could not be parsed.",
     }
 
     serializer_field_names = [
@@ -68,6 +72,8 @@ class FileImportJobType(JobType):
         "name",
         "table_id",
         "first_row_header",
+        "detect_field_types",
+        "file_type",
         "report",
     ]
 
@@ -84,27 +90,43 @@ class FileImportJobType(JobType):
             max_length=255, required=False, help_text="The name of the new table."
         ),
         "first_row_header": serializers.BooleanField(required=False, default=False),
+        "detect_field_types": serializers.BooleanField(
+            required=False,
+            default=False,
+            help_text="Whether the field types of the new table are detected.",
+        ),
+        "file_type": serializers.ChoiceField(
+            choices=FILE_TYPE_CHOICES,
+            required=False,
+            help_text="The format of the imported data.",
+        ),
         "report": ReportSerializer(help_text="Import error report."),
     }
 
     def prepare_values(self, values, user):
         """
-        Filter data from the values dict. Data are going to be added later as a file.
-        See `.after_job_creation()`.
+        Filter data and the uploaded file from the values dict. They are going to be
+        added later as a file. See `.after_job_creation()`.
         """
 
         filtered_dict = dict(**values)
-        filtered_dict.pop("data")
+        filtered_dict.pop("data", None)
+        filtered_dict.pop("file", None)
         return filtered_dict
 
     def after_job_creation(self, job, values):
         """
-        Save the data file for the newly created job.
+        Save the data file for the newly created job. If a raw file has been
+        uploaded, it's stored as is and parsed by the worker, otherwise the provided
+        data are stored as JSON.
         """
 
-        data_file = ContentFile(
-            json.dumps(values["data"], ensure_ascii=False).encode("utf8")
-        )
+        if values.get("file") is not None:
+            data_file = values["file"]
+        else:
+            data_file = ContentFile(
+                json.dumps(values["data"], ensure_ascii=False).encode("utf8")
+            )
         job.data_file.save(None, data_file)
 
     def before_delete(self, job):
@@ -135,11 +157,20 @@ class FileImportJobType(JobType):
     def run(self, job, progress):
         """
         Fills the provided table with the normalized data that needs to be created upon
-        creation of the table.
+        creation of the table. Uploaded CSV, TSV and JSON lines files are streamed
+        into the table by chunks so that they never have to fit in memory.
         """
 
-        with job.data_file.open("r") as fin:
-            data = json.load(fin)
+        if job.file_type == FILE_TYPE_JSON:
+            with job.data_file.open("r") as fin:
+                data = json.load(fin)
+        else:
+            data = get_import_data_reader(
+                job.data_file,
+                job.file_type,
+                encoding=job.encoding,
+                delimiter=job.csv_delimiter,
+            )
 
         if job.table is None:
             new_table, error_report = action_type_registry.get_by_type(
@@ -151,6 +182,7 @@ class FileImportJobType(JobType):
                 data=data,
                 first_row_header=job.first_row_header,
                 progress=progress,
+                detect_field_types=job.detect_field_types,
             )
 
             job.table = new_table
@@ -5,6 +5,8 @@ from baserow.core.jobs.mixins import JobWithUserDataMixin
 from baserow.contrib.database.table.models import Table
 from baserow.contrib.database.models import Database
 
+from .constants import FILE_TYPE_CHOICES, FILE_TYPE_JSON
+
 
 # If you ever change the return value of this function please duplicate the old
 # version into migration database.0080 and change that migration to use the duplicate
@@ -46,9 +48,31 @@ class FileImportJob(JobWithUserDataMixin, Job):
         null=True,
         help_text="The data file to import.",
     )
+    file_type = models.CharField(
+        max_length=16,
+        choices=FILE_TYPE_CHOICES,
+        default=FILE_TYPE_JSON,
+        help_text="The format of the data file.",
+    )
+    encoding = models.CharField(
+        max_length=32,
+        blank=True,
+        default="",
+        help_text="The encoding of the data file. Detected if empty.",
+    )
+    csv_delimiter = models.CharField(
+        max_length=1,
+        blank=True,
+        default="",
+        help_text="The delimiter of a CSV data file. Detected if empty.",
+    )
     first_row_header = models.BooleanField(
         default=False, help_text="Is the first row of the provided data the header?"
     )
+    detect_field_types = models.BooleanField(
+        default=False,
+        help_text="Whether the field types of a new table are detected from the data.",
+    )
     report = models.JSONField(
         default=default_report,
         help_text="The import error report.",
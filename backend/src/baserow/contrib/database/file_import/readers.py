@@ -0,0 +1,271 @@
+import codecs
+import csv
+import io
+import json
+from typing import Any, Callable, Generator, IO, Iterator, List, Optional, Tuple
+
+from django.db.models.fields.files import FieldFile
+
+from baserow.core.utils import grouper
+
+from .constants import FILE_TYPE_CSV, FILE_TYPE_JSON_LINES, FILE_TYPE_TSV
+from .exceptions import InvalidFileImportData
+
+
+# The amount of bytes read from the start of the file to detect the encoding and the
+# csv dialect.
+SAMPLE_SIZE = 64 * 1024
+
+# The amount of rows that are kept in memory and passed at once to the row creation.
+CHUNK_SIZE = 1024 * 8
+
+CSV_DELIMITER_CANDIDATES = ",;\t|"
+
+FALLBACK_ENCODING = "cp1252"
+
+BOMS = [
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+
+def detect_encoding(sample: bytes, is_complete: bool = False) -> str:
+    """
+    Detects the encoding of a file based on a sample of the first bytes. A byte order
+    mark always wins, otherwise the sample is checked against utf-8 and if that fails
+    we fall back to cp1252, which is what most spreadsheet programs export by default.
+
+    :param sample: The first bytes of the file.
+    :param is_complete: Whether the sample contains the whole file.
+    :return: The name of the detected encoding.
+    """
+
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding
+
+    try:
+        sample.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError as e:
+        # The sample might have been cut in the middle of a multibyte character, in
+        # which case the error is located in the last three bytes.
+        truncated = e.start >= len(sample) - 3 and e.reason == "unexpected end of data"
+        if truncated and not is_complete:
+            return "utf-8"
+
+    return FALLBACK_ENCODING
+
+
+def detect_csv_delimiter(sample: str) -> str:
+    """
+    Detects the delimiter of a CSV file based on a sample of the first lines. Falls
+    back to a comma if the sniffer can't make up its mind.
+
+    :param sample: The first decoded characters of the file.
+    :return: The detected delimiter.
+    """
+
+    # Only complete lines are used, a partial last line confuses the sniffer.
+    if "\n" in sample:
+        sample = sample[: sample.rindex("\n")]
+
+    try:
+        return (
+            csv.Sniffer().sniff(sample, delimiters=CSV_DELIMITER_CANDIDATES).delimiter
+        )
+    except csv.Error:
+        return ","
+
+
+class ImportDataReader:
+    """
+    Base class of all the readers that can feed rows into a table. A reader can be
+    iterated over more than once, so that we can first scan the data to find out the
+    number of rows and columns and then import it, without ever keeping the whole
+    file in memory.
+    """
+
+    def __init__(self):
+        self._scan_result = None
+
+    def iter_rows(self) -> Iterator[List[Any]]:
+        """
+        Must yield every row of the data as a list of values.
+        """
+
+        raise NotImplementedError("The iter_rows method must be implemented.")
+
+    def scan(
+        self, chunk_callback: Optional[Callable[[List[List[Any]]], None]] = None
+    ) -> Tuple[int, int, Optional[List[Any]]]:
+        """
+        Reads all the rows once to compute the number of rows and the largest number
+        of columns. The result is cached so that calling it multiple times doesn't
+        read the file again, unless a `chunk_callback` is provided.
+
+        :param chunk_callback: An optional function called with every chunk of rows
+            while scanning. Can be used to analyse the data in the same pass.
+        :return: The row count, the largest column count and the first row if any.
+        """
+
+        if self._scan_result is None or chunk_callback is not None:
+            row_count = 0
+            largest_column_count = 0
+            first_row = None
+            for chunk in self.iter_chunks():
+                if first_row is None:
+                    first_row = chunk[0]
+                row_count += len(chunk)
+                largest_column_count = max(
+                    largest_column_count, *(len(row) for row in chunk)
+                )
+                if chunk_callback is not None:
+                    chunk_callback(chunk)
+            self._scan_result = (row_count, largest_column_count, first_row)
+
+        return self._scan_result
+
+    def iter_chunks(
+        self, chunk_size: Optional[int] = None, skip_first_row: bool = False
+    ) -> Generator[List[List[Any]], None, None]:
+        """
+        Yields the rows by chunks of `chunk_size`.
+
+        :param chunk_size: The maximum amount of rows per chunk. Defaults to
+            `CHUNK_SIZE`.
+        :param skip_first_row: Whether the first row, usually the header, must be
+            skipped.
+        """
+
+        if chunk_size is None:
+            chunk_size = CHUNK_SIZE
+
+        rows = self.iter_rows()
+        if skip_first_row:
+            next(rows, None)
+
+        for chunk in grouper(chunk_size, rows):
+            yield list(chunk)
+
+
+class FileImportDataReader(ImportDataReader):
+    """
+    Base class for readers that stream the rows out of a stored file. The file is
+    decoded on the fly, undecodable bytes are replaced instead of failing the
+    whole import.
+    """
+
+    def __init__(self, file: FieldFile, encoding: Optional[str] = None):
+        super().__init__()
+        self.file = file
+        self._encoding = encoding or None
+
+    def _open_binary(self) -> IO[bytes]:
+        # A new file is opened from the storage each time because a `FieldFile`
+        # can't reliably be reopened once closed, depending on the storage.
+        return self.file.storage.open(self.file.name, "rb")
+
+    @property
+    def encoding(self) -> str:
+        if self._encoding is None:
+            with self._open_binary() as fin:
+                sample = fin.read(SAMPLE_SIZE)
+            self._encoding = detect_encoding(
+                sample, is_complete=len(sample) < SAMPLE_SIZE
+            )
+        return self._encoding
+
+    def _open_text(self, binary_stream: IO[bytes]) -> io.TextIOWrapper:
+        return io.TextIOWrapper(
+            binary_stream, encoding=self.encoding, errors="replace", newline=""
+        )
+
+
+class CSVImportDataReader(FileImportDataReader):
+    """
+    Streams the rows of a CSV file. The delimiter is detected if not provided.
+    """
+
+    def __init__(
+        self,
+        file: FieldFile,
+        encoding: Optional[str] = None,
+        delimiter: Optional[str] = None,
+    ):
+        super().__init__(file, encoding)
+        self._delimiter = delimiter or None
+
+    @property
+    def delimiter(self) -> str:
+        if self._delimiter is None:
+            with self._open_binary() as fin:
+                sample = fin.read(SAMPLE_SIZE).decode(self.encoding, errors="replace")
+            self._delimiter = detect_csv_delimiter(sample)
+        return self._delimiter
+
+    def iter_rows(self) -> Iterator[List[Any]]:
+        delimiter = self.delimiter
+        with self._open_binary() as fin:
+            reader = csv.reader(self._open_text(fin), delimiter=delimiter)
+            try:
+                yield from reader
+            except csv.Error as e:
+                raise InvalidFileImportData(f"Line {reader.line_num}: {e}")
+
+
+class JSONLinesImportDataReader(FileImportDataReader):
+    """
+    Streams the rows of a file containing one JSON array per line.
+    """
+
+    def iter_rows(self) -> Iterator[List[Any]]:
+        with self._open_binary() as fin:
+            for line_number, line in enumerate(self._open_text(fin), start=1):
+                if not line.strip():
+                    continue
+
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    raise InvalidFileImportData(
+                        f"Line {line_number} does not contain valid JSON."
+                    )
+
+                if not isinstance(row, list):
+                    raise InvalidFileImportData(
+                        f"Line {line_number} must contain a JSON array."
+                    )
+
+                yield row
+
+
+def get_import_data_reader(
+    file: FieldFile,
+    file_type: str,
+    encoding: Optional[str] = None,
+    delimiter: Optional[str] = None,
+) -> FileImportDataReader:
+    """
+    Returns the reader matching the file type of an uploaded import file. The
+    `json` file type isn't streamable and must be loaded directly.
+
+    :param file: The stored file to read.
+    :param file_type: One of the `FILE_TYPE_*` constants.
+    :param encoding: The encoding of the file. Detected if not provided.
+    :param delimiter: The CSV delimiter. Detected if not provided.
+    :raises ValueError: When the file type is unknown.
+    :return: The reader instance.
+    """
+
+    if file_type == FILE_TYPE_CSV:
+        return CSVImportDataReader(file, encoding=encoding, delimiter=delimiter)
+    elif file_type == FILE_TYPE_TSV:
+        return CSVImportDataReader(file, encoding=encoding, delimiter="\t")
+    elif file_type == FILE_TYPE_JSON_LINES:
+        return JSONLinesImportDataReader(file, encoding=encoding)
+
+    raise ValueError(f"The file type {file_type} is not supported.")
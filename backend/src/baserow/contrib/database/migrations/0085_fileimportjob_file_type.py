@@ -0,0 +1,46 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("database", "0084_duplicatetablejob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="fileimportjob",
+            name="file_type",
+            field=models.CharField(
+                choices=[
+                    ("json", "JSON array of rows"),
+                    ("csv", "CSV"),
+                    ("tsv", "TSV"),
+                    ("jsonl", "JSON lines"),
+                ],
+                default="json",
+                help_text="The format of the data file.",
+                max_length=16,
+            ),
+        ),
+        migrations.AddField(
+            model_name="fileimportjob",
+            name="encoding",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="The encoding of the data file. Detected if empty.",
+                max_length=32,
+            ),
+        ),
+        migrations.AddField(
+            model_name="fileimportjob",
+            name="csv_delimiter",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="The delimiter of a CSV data file. Detected if empty.",
+                max_length=1,
+            ),
+        ),
+    ]
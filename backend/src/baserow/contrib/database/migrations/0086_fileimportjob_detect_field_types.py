@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("database", "0085_fileimportjob_file_type"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="fileimportjob",
+            name="detect_field_types",
+            field=models.BooleanField(
+                default=False,
+                help_text="Whether the field types of a new table are detected from "
+                "the data.",
+            ),
+        ),
+    ]
@@ -0,0 +1,104 @@
+from django.db import migrations, models, connection
+import django.db.models.deletion
+from psycopg2 import sql
+
+
+# Copied from `baserow.contrib.database.fields.file_references` so that the
+# migration keeps working if the original changes.
+INSERT_USER_FILE_REFERENCES_SQL = """
+    INSERT INTO database_userfilereference (user_file_id, table_id, field_id, row_id)
+    SELECT DISTINCT user_file.id, %(table_id)s, %(field_id)s, table_row.id
+    FROM {table} table_row
+    CROSS JOIN LATERAL jsonb_array_elements(
+        CASE WHEN jsonb_typeof(table_row.{column}) = 'array'
+        THEN table_row.{column} ELSE '[]'::jsonb END
+    ) AS file_object
+    INNER JOIN core_userfile user_file
+        ON user_file.sha256_hash = split_part(
+            split_part(file_object->>'name', '_', 2), '.', 1
+        )
+        AND user_file."unique" = split_part(file_object->>'name', '_', 1)
+    WHERE NOT table_row.trashed
+    ON CONFLICT DO NOTHING
+"""
+
+
+def forward(apps, schema_editor):
+    FileField = apps.get_model("database", "FileField")
+
+    existing_tables = set(connection.introspection.table_names())
+    with connection.cursor() as cursor:
+        for field_id, table_id in FileField.objects.values_list("id", "table_id"):
+            table_name = f"database_table_{table_id}"
+            if table_name not in existing_tables:
+                continue
+
+            cursor.execute(
+                sql.SQL(INSERT_USER_FILE_REFERENCES_SQL).format(
+                    table=sql.Identifier(table_name),
+                    column=sql.Identifier(f"field_{field_id}"),
+                ),
+                {"table_id": table_id, "field_id": field_id},
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0030_snapshots"),
+        ("database", "0086_fileimportjob_detect_field_types"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserFileReference",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("row_id", models.PositiveIntegerField()),
+                (
+                    "field",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="database.field",
+                    ),
+                ),
+                (
+                    "table",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="database.table",
+                    ),
+                ),
+                (
+                    "user_file",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="file_field_references",
+                        to="core.userfile",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="userfilereference",
+            index=models.Index(
+                fields=["table", "row_id"], name="database_us_table_i_f07be1_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="userfilereference",
+            constraint=models.UniqueConstraint(
+                fields=("field", "row_id", "user_file"),
+                name="unique_user_file_reference",
+            ),
+        ),
+        migrations.RunPython(forward, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,73 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0030_snapshots"),
+        ("database", "0087_userfilereference"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ConvertFieldTypeJob",
+            fields=[
+                (
+                    "job_ptr",
+                    models.OneToOneField(
+                        auto_created=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        parent_link=True,
+                        primary_key=True,
+                        serialize=False,
+                        to="core.job",
+                    ),
+                ),
+                (
+                    "user_session_id",
+                    models.CharField(
+                        help_text="The user session uuid needed for undo/redo functionality.",
+                        max_length=36,
+                        null=True,
+                    ),
+                ),
+                (
+                    "user_websocket_id",
+                    models.CharField(
+                        help_text="The user websocket uuid needed to manage signals sent correctly.",
+                        max_length=36,
+                        null=True,
+                    ),
+                ),
+                (
+                    "new_type",
+                    models.CharField(
+                        help_text="The type the field is converted to.",
+                        max_length=32,
+                    ),
+                ),
+                (
+                    "field_values",
+                    models.JSONField(
+                        default=dict,
+                        help_text="The other field values that are updated.",
+                    ),
+                ),
+                (
+                    "field",
+                    models.ForeignKey(
+                        help_text="The field that is updated.",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="convert_field_type_jobs",
+                        to="database.field",
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+            bases=("core.job", models.Model),
+        ),
+    ]
@@ -0,0 +1,42 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("database", "0088_convertfieldtypejob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RowTombstone",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("row_id", models.PositiveIntegerField()),
+                ("deleted_on", models.DateTimeField(auto_now_add=True)),
+                (
+                    "table",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="database.table",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="rowtombstone",
+            index=models.Index(
+                fields=["table", "deleted_on", "id"],
+                name="database_rowtomb_changes_idx",
+            ),
+        ),
+    ]
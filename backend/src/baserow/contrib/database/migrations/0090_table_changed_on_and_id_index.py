@@ -0,0 +1,54 @@
+from django.db import migrations
+from tqdm import tqdm
+
+
+# noinspection PyPep8Naming
+def forward(apps, schema_editor):
+    Table = apps.get_model("database", "Table")
+
+    for table in tqdm(
+        Table.objects.all().order_by("id"),
+        desc="Adding changed_on column and (changed_on ASC, id ASC) index to all tables",
+    ):
+        # The existing rows all get the same timestamp, which is older than any
+        # change made after this migration. Copying the `updated_on` values instead
+        # would rewrite every row of every table.
+        schema_editor.execute(
+            f'ALTER TABLE "database_table_{table.id}" '
+            f'ADD COLUMN IF NOT EXISTS "changed_on" timestamp with time zone '
+            f"NOT NULL DEFAULT '1970-01-01T00:00:00+00:00'"
+        )
+        schema_editor.execute(
+            f'ALTER TABLE "database_table_{table.id}" '
+            f'ALTER COLUMN "changed_on" DROP DEFAULT'
+        )
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "tbl_changed_on_id_{table.id}_idx" '
+            f'ON "database_table_{table.id}"("changed_on", "id")'
+        )
+
+
+# noinspection PyPep8Naming
+def reverse(apps, schema_editor):
+    Table = apps.get_model("database", "Table")
+
+    for table in Table.objects.all().order_by("id"):
+        schema_editor.execute(
+            f'DROP INDEX CONCURRENTLY IF EXISTS "tbl_changed_on_id_{table.id}_idx"'
+        )
+        schema_editor.execute(
+            f'ALTER TABLE "database_table_{table.id}" '
+            f'DROP COLUMN IF EXISTS "changed_on"'
+        )
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("database", "0089_rowtombstone"),
+    ]
+
+    operations = [
+        migrations.RunPython(forward, reverse),
+    ]
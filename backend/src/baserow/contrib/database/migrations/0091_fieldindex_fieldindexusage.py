@@ -0,0 +1,78 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("database", "0090_table_changed_on_and_id_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FieldIndexUsage",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "index_kind",
+                    models.CharField(
+                        help_text="The kind of index that would speed up the usage.",
+                        max_length=32,
+                    ),
+                ),
+                ("usage_count", models.PositiveIntegerField(default=0)),
+                ("last_used_on", models.DateTimeField()),
+                (
+                    "field",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="database.field",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="FieldIndex",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("index_kind", models.CharField(max_length=32)),
+                ("name", models.CharField(max_length=63, unique=True)),
+                ("created_on", models.DateTimeField(auto_now_add=True)),
+                (
+                    "field",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="database.field",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="fieldindexusage",
+            constraint=models.UniqueConstraint(
+                fields=("field", "index_kind"), name="unique_field_index_usage"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="fieldindex",
+            constraint=models.UniqueConstraint(
+                fields=("field", "index_kind"), name="unique_field_index"
+            ),
+        ),
+    ]
@@ -1,18 +1,34 @@
+import base64
 import dataclasses
+import json
+import uuid
+import zlib
 from copy import deepcopy
 
 from decimal import Decimal
-from typing import Any, Dict, Optional, Type, List, Tuple
+from typing import Any, Dict, Iterator, Optional, Type, List, Tuple, Union
 
 from django.contrib.auth.models import AbstractUser
 from baserow.core.utils import Progress
+from baserow.contrib.database.file_import.readers import ImportDataReader
 from baserow.contrib.database.table.handler import TableHandler
 from baserow.contrib.database.table.signals import table_updated
 
-from baserow.core.action.models import Action
+from baserow.core.action.models import Action, JSONEncoderSupportingDataClasses
 from baserow.core.action.registries import ActionType, ActionScopeStr
 from baserow.contrib.database.action.scopes import TableActionScopeType
+from baserow.api.sessions import (
+    get_client_undo_redo_action_group_id,
+    set_client_undo_redo_action_group_id,
+)
+from baserow.contrib.database.rows.constants import (
+    ROW_OPERATION_CREATE,
+    ROW_OPERATION_DELETE,
+    ROW_OPERATION_MOVE,
+    ROW_OPERATION_UPDATE,
+)
 from baserow.contrib.database.rows.handler import (
+    CombinedRowChanges,
     GeneratedTableModelForUpdate,
     RowHandler,
 )
@@ -23,6 +39,40 @@ from baserow.contrib.database.table.models import (
 from baserow.core.trash.handler import TrashHandler
 
 
+# Row values that take more than this amount of characters in JSON are compressed
+# before they're stored in the params of an action.
+ROWS_VALUES_COMPRESSION_THRESHOLD = 16 * 1024
+COMPRESSED_ROWS_VALUES_PREFIX = "zlib:"
+
+
+def compress_rows_values(rows_values: List[Dict[str, Any]]) -> Union[List, str]:
+    """
+    Compresses the rows values if they're large, so that they take less space when
+    stored in the action params.
+
+    :param rows_values: The list of row values that must be stored.
+    :return: The rows values untouched if small, otherwise a compressed string.
+    """
+
+    serialized = json.dumps(rows_values, cls=JSONEncoderSupportingDataClasses)
+    if len(serialized) < ROWS_VALUES_COMPRESSION_THRESHOLD:
+        return rows_values
+
+    compressed = base64.b64encode(zlib.compress(serialized.encode("utf-8")))
+    return COMPRESSED_ROWS_VALUES_PREFIX + compressed.decode("ascii")
+
+
+def decompress_rows_values(rows_values: Union[List, str]) -> List[Dict[str, Any]]:
+    """
+    The counterpart of `compress_rows_values`.
+    """
+
+    if isinstance(rows_values, str):
+        compressed = rows_values[len(COMPRESSED_ROWS_VALUES_PREFIX) :]
+        return json.loads(zlib.decompress(base64.b64decode(compressed)))
+    return rows_values
+
+
 class CreateRowActionType(ActionType):
     type = "create_row"
 
@@ -109,6 +159,7 @@ class CreateRowsActionType(ActionType):
         rows_values: List[Dict[str, Any]],
         before_row: Optional[GeneratedTableModel] = None,
         model: Optional[Type[GeneratedTableModel]] = None,
+        combined_changes: Optional[CombinedRowChanges] = None,
     ) -> List[GeneratedTableModel]:
         """
         Creates rows for a given table with the provided values if the user
@@ -124,11 +175,18 @@ class CreateRowsActionType(ActionType):
             the row with this id.
         :param model: If the correct model has already been generated it can be
             provided so that it does not have to be generated for a second time.
+        :param combined_changes: If provided, the changes are combined with the
+            other row operations, see `RowHandler.combine_row_changes`.
         :return: The created list of rows instances.
         """
 
         rows = RowHandler().create_rows(
-            user, table, rows_values, before_row=before_row, model=model
+            user,
+            table,
+            rows_values,
+            before_row=before_row,
+            model=model,
+            combined_changes=combined_changes,
         )
 
         params = cls.Params(table.id, [row.id for row in rows])
@@ -172,9 +230,9 @@ class ImportRowsActionType(ActionType):
         cls,
         user: AbstractUser,
         table: Table,
-        data=List[List[Any]],
+        data=Union[List[List[Any]], ImportDataReader],
         progress: Optional[Progress] = None,
-    ) -> Tuple[List[GeneratedTableModel], Dict[str, Any]]:
+    ) -> Tuple[Union[List[GeneratedTableModel], List[int]], Dict[str, Any]]:
         """
         Creates rows for a given table with the provided values if the user
         belongs to the related group. It also calls the table_updated signal.
@@ -187,20 +245,31 @@ class ImportRowsActionType(ActionType):
 
         :param user: The user of whose behalf the rows are created.
         :param table: The table for which the rows should be imported.
-        :param data: List of rows values for rows that need to be created.
+        :param data: List of rows values for rows that need to be created. An
+            `ImportDataReader` can be provided instead, in which case the rows are
+            streamed into the table chunk by chunk.
         :param progress: An optional progress object to track the task progress.
-        :return: The created list of rows instances and the error report.
+        :return: The created list of rows instances, or only their ids if a reader
+            was provided, and the error report.
         """
 
-        created_rows, error_report = RowHandler().import_rows(
-            user, table, data, progress=progress, send_signal=False
-        )
+        if isinstance(data, ImportDataReader):
+            row_count, _, _ = data.scan()
+            created_rows, error_report = RowHandler().import_rows_in_chunks(
+                user, table, data.iter_chunks(), row_count, progress=progress
+            )
+            row_ids = created_rows
+        else:
+            created_rows, error_report = RowHandler().import_rows(
+                user, table, data, progress=progress, send_signal=False
+            )
+            row_ids = [row.id for row in created_rows]
 
         # Use table signal here instead of row signal because we can import a
         # big amount of data.
         table_updated.send(cls, table=table, user=user, force_table_refresh=True)
 
-        params = cls.Params(table.id, [row.id for row in created_rows])
+        params = cls.Params(table.id, row_ids)
         cls.register_action(user, params, cls.scope(table.id))
 
         return created_rows, error_report
@@ -295,6 +364,7 @@ class DeleteRowsActionType(ActionType):
         table: Table,
         row_ids: List[int],
         model: Optional[Type[GeneratedTableModel]] = None,
+        combined_changes: Optional[CombinedRowChanges] = None,
     ):
         """
         Deletes rows of the given table with the given row_ids.
@@ -307,10 +377,14 @@ class DeleteRowsActionType(ActionType):
         :param row_ids: The id of the row that must be deleted.
         :param model: If the correct model has already been generated, it can be
             provided so that it does not have to be generated for a second time.
+        :param combined_changes: If provided, the changes are combined with the
+            other row operations, see `RowHandler.combine_row_changes`.
         :raises RowDoesNotExist: When the row with the provided id does not exist.
         """
 
-        trashed_rows_entry = RowHandler().delete_rows(user, table, row_ids, model=model)
+        trashed_rows_entry = RowHandler().delete_rows(
+            user, table, row_ids, model=model, combined_changes=combined_changes
+        )
 
         params = cls.Params(table.id, row_ids, trashed_rows_entry.id)
         cls.register_action(user, params, cls.scope(table.id))
@@ -422,6 +496,7 @@ class MoveRowActionType(ActionType):
         row_id: int,
         before_row: Optional[GeneratedTableModel] = None,
         model: Optional[Type[GeneratedTableModel]] = None,
+        combined_changes: Optional[CombinedRowChanges] = None,
     ) -> GeneratedTableModelForUpdate:
         """
         Moves the row before another row or to the end if no before row is provided.
@@ -440,6 +515,8 @@ class MoveRowActionType(ActionType):
             instance. Otherwise the row will be moved to the end.
         :param model: If the correct model has already been generated, it can be
             provided so that it does not have to be generated for a second time.
+        :param combined_changes: If provided, the changes are combined with the
+            other row operations, see `RowHandler.combine_row_changes`.
         """
 
         if model is None:
@@ -451,7 +528,12 @@ class MoveRowActionType(ActionType):
         original_row_order = row.order
 
         updated_row = row_handler.move_row(
-            user, table, row, before_row=before_row, model=model
+            user,
+            table,
+            row,
+            before_row=before_row,
+            model=model,
+            combined_changes=combined_changes,
         )
 
         rows_displacement = get_rows_displacement(
@@ -597,8 +679,8 @@ class UpdateRowsActionType(ActionType):
     @dataclasses.dataclass
     class Params:
         table_id: int
-        original_rows_values: List
-        new_rows: List
+        original_rows_values: Union[List, str]
+        new_rows: Union[List, str]
 
     @classmethod
     def do(
@@ -607,6 +689,7 @@ class UpdateRowsActionType(ActionType):
         table: Table,
         rows: List,
         model: Optional[Type[GeneratedTableModel]] = None,
+        combined_changes: Optional[CombinedRowChanges] = None,
     ) -> List[GeneratedTableModelForUpdate]:
         """
         Updates field values in batch based on provided rows with the new values.
@@ -614,12 +697,16 @@ class UpdateRowsActionType(ActionType):
         for more information.
         Undoing this action restores the original values.
         Redoing set the new values again.
+        Only the values that have actually changed are stored in the action, so that
+        pasting over mostly identical data stays cheap to store and to undo.
 
         :param user: The user of whose behalf the change is made.
         :param table: The table for which the rows must be updated.
         :param rows: The rows that must be updated.
         :param model: If the correct model has already been generated it can be
             provided so that it does not have to be generated for a second time.
+        :param combined_changes: If provided, the changes are combined with the
+            other row operations, see `RowHandler.combine_row_changes`.
         :return: The updated rows.
         """
 
@@ -644,10 +731,22 @@ class UpdateRowsActionType(ActionType):
         new_rows = deepcopy(rows)
 
         updated_rows = row_handler.update_rows(
-            user, table, rows, model=model, rows_to_update=original_rows
+            user,
+            table,
+            rows,
+            model=model,
+            rows_to_update=original_rows,
+            combined_changes=combined_changes,
         )
 
-        params = cls.Params(table.id, original_rows_values, new_rows)
+        original_rows_values, new_rows = cls._get_changed_values(
+            model, original_rows_values, new_rows
+        )
+        params = cls.Params(
+            table.id,
+            compress_rows_values(original_rows_values),
+            compress_rows_values(new_rows),
+        )
 
         cls.register_action(user, params, cls.scope(table.id))
 
@@ -657,12 +756,354 @@ class UpdateRowsActionType(ActionType):
     def scope(cls, table_id) -> ActionScopeStr:
         return TableActionScopeType.value(table_id)
 
+    @classmethod
+    def _get_changed_values(
+        cls,
+        model: Type[GeneratedTableModel],
+        original_rows_values: List[Dict[str, Any]],
+        new_rows: List[Dict[str, Any]],
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Compares the values of the rows before and after the update and only keeps
+        the fields that have been changed. Rows without any change are left out.
+
+        :param model: The generated table model of the updated rows.
+        :param original_rows_values: The internal values of the rows before the
+            update, including their id.
+        :param new_rows: The rows as they have been provided to the update.
+        :return: The original and the new values of the changed fields only.
+        """
+
+        row_handler = RowHandler()
+        new_rows_by_id = {row["id"]: row for row in new_rows}
+        updated_rows_by_id = {
+            row.id: row
+            for row in model.objects.enhance_by_fields().filter(
+                id__in=new_rows_by_id.keys()
+            )
+        }
+
+        changed_original_rows_values = []
+        changed_new_rows = []
+        for original_row_values in original_rows_values:
+            row_id = original_row_values["id"]
+            updated_row_values = row_handler.get_internal_values_for_fields(
+                updated_rows_by_id[row_id], original_row_values.keys()
+            )
+            changed_keys = [
+                key
+                for key, value in updated_row_values.items()
+                if original_row_values[key] != value
+            ]
+
+            if not changed_keys:
+                continue
+
+            changed_field_ids = set(
+                row_handler.extract_field_ids_from_keys(changed_keys)
+            )
+            changed_original_rows_values.append(
+                {
+                    "id": row_id,
+                    **{key: original_row_values[key] for key in changed_keys},
+                }
+            )
+            changed_new_rows.append(
+                {
+                    "id": row_id,
+                    **{
+                        key: value
+                        for key, value in new_rows_by_id[row_id].items()
+                        if set(row_handler.extract_field_ids_from_keys([key]))
+                        & changed_field_ids
+                    },
+                }
+            )
+
+        return changed_original_rows_values, changed_new_rows
+
     @classmethod
     def undo(cls, user: AbstractUser, params: Params, action_being_undone: Action):
-        table = TableHandler().get_table(params.table_id)
-        RowHandler().update_rows(user, table, params.original_rows_values)
+        original_rows_values = decompress_rows_values(params.original_rows_values)
+        if original_rows_values:
+            table = TableHandler().get_table(params.table_id)
+            RowHandler().update_rows(user, table, original_rows_values)
 
     @classmethod
     def redo(cls, user: AbstractUser, params: Params, action_being_redone: Action):
+        new_rows = decompress_rows_values(params.new_rows)
+        if new_rows:
+            table = TableHandler().get_table(params.table_id)
+            RowHandler().update_rows(user, table, new_rows)
+
+
+class UpsertRowsActionType(ActionType):
+    type = "upsert_rows"
+
+    @dataclasses.dataclass
+    class Params:
+        table_id: int
+        created_row_ids: List[int]
+        original_rows_values: Union[List, str]
+        new_rows: Union[List, str]
+        trashed_rows_entry_id: Optional[int] = None
+
+    @classmethod
+    def do(
+        cls,
+        user: AbstractUser,
+        table: Table,
+        rows_values: List[Dict[str, Any]],
+        key_field_id: int,
+        before_row: Optional[GeneratedTableModel] = None,
+        model: Optional[Type[GeneratedTableModel]] = None,
+    ) -> List[GeneratedTableModel]:
+        """
+        Creates or updates rows in bulk by the value of the key field.
+        See the baserow.contrib.database.rows.handler.RowHandler.upsert_rows
+        for more information.
+        Undoing this action trashes the created rows and restores the original values
+        of the updated rows. Redoing restores the created rows and sets the new
+        values again.
+
+        :param user: The user of whose behalf the rows are upserted.
+        :param table: The table in which the rows must be upserted.
+        :param rows_values: List of rows values for the rows that need to be created
+            or updated.
+        :param key_field_id: The id of the field of which the value identifies an
+            existing row.
+        :param before_row: If provided the new rows will be placed right before
+            the before_row.
+        :param model: If the correct model has already been generated it can be
+            provided so that it does not have to be generated for a second time.
+        :return: The created or updated rows.
+        """
+
+        row_handler = RowHandler()
+
+        if model is None:
+            model = table.get_model()
+
+        new_rows_values = deepcopy(rows_values)
+        rows, created_row_ids, original_rows = row_handler.upsert_rows(
+            user, table, rows_values, key_field_id, before_row, model
+        )
+
+        new_rows_values_by_id = {
+            row.id: row_values for row, row_values in zip(rows, new_rows_values)
+        }
+        original_rows_values = []
+        for original_row in original_rows:
+            original_row_values = row_handler.get_internal_values_for_fields(
+                original_row, new_rows_values_by_id[original_row.id].keys()
+            )
+            original_row_values["id"] = original_row.id
+            original_rows_values.append(original_row_values)
+
+        original_rows_values, new_rows = UpdateRowsActionType._get_changed_values(
+            model,
+            original_rows_values,
+            [
+                {"id": original_row.id, **new_rows_values_by_id[original_row.id]}
+                for original_row in original_rows
+            ],
+        )
+        params = cls.Params(
+            table.id,
+            sorted(created_row_ids),
+            compress_rows_values(original_rows_values),
+            compress_rows_values(new_rows),
+        )
+        cls.register_action(user, params, cls.scope(table.id))
+
+        return rows
+
+    @classmethod
+    def scope(cls, table_id) -> ActionScopeStr:
+        return TableActionScopeType.value(table_id)
+
+    @classmethod
+    def undo(cls, user: AbstractUser, params: Params, action_being_undone: Action):
         table = TableHandler().get_table(params.table_id)
-        RowHandler().update_rows(user, table, params.new_rows)
+
+        if params.created_row_ids:
+            trashed_rows_trash_entry = RowHandler().delete_rows(
+                user, table, params.created_row_ids
+            )
+            params.trashed_rows_entry_id = trashed_rows_trash_entry.id
+            action_being_undone.params = params
+
+        original_rows_values = decompress_rows_values(params.original_rows_values)
+        if original_rows_values:
+            RowHandler().update_rows(user, table, original_rows_values)
+
+    @classmethod
+    def redo(cls, user: AbstractUser, params: Params, action_being_redone: Action):
+        if params.trashed_rows_entry_id is not None:
+            TrashHandler.restore_item(
+                user,
+                "rows",
+                params.trashed_rows_entry_id,
+                parent_trash_item_id=params.table_id,
+            )
+
+        new_rows = decompress_rows_values(params.new_rows)
+        if new_rows:
+            table = TableHandler().get_table(params.table_id)
+            RowHandler().update_rows(user, table, new_rows)
+
+
+def _group_row_operations(
+    operations: List[Dict[str, Any]]
+) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Groups the consecutive operations that can be executed in bulk together. Rows
+    that are created before the same row, rows that are updated only once and rows
+    that are deleted can be grouped, rows are always moved one by one.
+    """
+
+    group = []
+    group_row_ids = set()
+    for operation in operations:
+        operation_type = operation["type"]
+        if group and (
+            operation_type != group[0]["type"]
+            or operation_type == ROW_OPERATION_MOVE
+            or (
+                operation_type == ROW_OPERATION_CREATE
+                and operation.get("before_id") != group[0].get("before_id")
+            )
+            or (
+                operation_type == ROW_OPERATION_UPDATE
+                and operation["id"] in group_row_ids
+            )
+        ):
+            yield group[0]["type"], group
+            group = []
+            group_row_ids = set()
+
+        group.append(operation)
+        if "id" in operation:
+            group_row_ids.add(operation["id"])
+
+    if group:
+        yield group[0]["type"], group
+
+
+def execute_row_operations(
+    user: AbstractUser,
+    table: Table,
+    operations: List[Dict[str, Any]],
+    model: Optional[Type[GeneratedTableModel]] = None,
+) -> List[int]:
+    """
+    Executes the provided create, update, move and delete row operations in the given
+    order. The consecutive operations of the same kind are executed in bulk by the
+    related action type. The cells of the dependant fields are updated and the
+    signals are sent only once for all the operations, see
+    `RowHandler.combine_row_changes`. All the actions are registered in the same
+    action group, so that they're undone and redone together. Must be called in a
+    transaction, so that either all or none of the operations are executed.
+
+    :param user: The user of whose behalf the operations are executed.
+    :param table: The table in which the operations are executed.
+    :param operations: The operations in the order they must be executed. Each
+        operation is a dict with a `type` that's one of `ROW_OPERATION_TYPES`, the
+        `id` of the row for the update, move and delete operations, the `values` for
+        the create and update operations and optionally the `before_id` of the row
+        before which the row must be created or moved.
+    :param model: If the correct model has already been generated it can be
+        provided so that it does not have to be generated for a second time.
+    :raises RowDoesNotExist: When any of the rows don't exist.
+    :raises RowIdsNotUnique: When a row is deleted twice in a row.
+    :return: The ids of the rows of the operations in the same order.
+    """
+
+    if model is None:
+        model = table.get_model()
+
+    row_handler = RowHandler()
+    row_ids_to_update = set()
+    row_ids_to_delete = set()
+    updated_field_ids = set()
+    for operation in operations:
+        if operation["type"] in (ROW_OPERATION_UPDATE, ROW_OPERATION_MOVE):
+            row_ids_to_update.add(operation["id"])
+        elif operation["type"] == ROW_OPERATION_DELETE:
+            row_ids_to_delete.add(operation["id"])
+
+        if operation["type"] == ROW_OPERATION_UPDATE:
+            updated_field_ids.update(
+                field_id
+                for field_id, field_object in model._field_objects.items()
+                if field_id in operation["values"]
+                or field_object["name"] in operation["values"]
+            )
+
+    def get_before_row(operation):
+        before_id = operation.get("before_id")
+        if before_id is None:
+            return None
+        return row_handler.get_row(user, table, before_id, model)
+
+    action_group_id = get_client_undo_redo_action_group_id(user)
+    if action_group_id is None:
+        set_client_undo_redo_action_group_id(user, str(uuid.uuid4()))
+
+    row_ids = []
+    try:
+        with row_handler.combine_row_changes(
+            user,
+            table,
+            model,
+            row_ids_to_update=row_ids_to_update,
+            updated_field_ids=updated_field_ids,
+            row_ids_to_delete=row_ids_to_delete,
+        ) as combined_changes:
+            for operation_type, group in _group_row_operations(operations):
+                if operation_type == ROW_OPERATION_CREATE:
+                    rows = CreateRowsActionType.do(
+                        user,
+                        table,
+                        [operation["values"] for operation in group],
+                        before_row=get_before_row(group[0]),
+                        model=model,
+                        combined_changes=combined_changes,
+                    )
+                    row_ids.extend(row.id for row in rows)
+                elif operation_type == ROW_OPERATION_UPDATE:
+                    UpdateRowsActionType.do(
+                        user,
+                        table,
+                        [
+                            {**operation["values"], "id": operation["id"]}
+                            for operation in group
+                        ],
+                        model=model,
+                        combined_changes=combined_changes,
+                    )
+                    row_ids.extend(operation["id"] for operation in group)
+                elif operation_type == ROW_OPERATION_MOVE:
+                    MoveRowActionType.do(
+                        user,
+                        table,
+                        group[0]["id"],
+                        before_row=get_before_row(group[0]),
+                        model=model,
+                        combined_changes=combined_changes,
+                    )
+                    row_ids.append(group[0]["id"])
+                else:
+                    group_row_ids = [operation["id"] for operation in group]
+                    DeleteRowsActionType.do(
+                        user,
+                        table,
+                        group_row_ids,
+                        model=model,
+                        combined_changes=combined_changes,
+                    )
+                    row_ids.extend(group_row_ids)
+    finally:
+        set_client_undo_redo_action_group_id(user, action_group_id)
+
+    return row_ids
@@ -0,0 +1,353 @@
+import base64
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple, Type
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+from psycopg2 import sql
+
+from baserow.contrib.database.fields.models import LinkRowField
+from baserow.contrib.database.table.models import GeneratedTableModel
+from baserow.contrib.database.trash.models import RowTombstone
+
+from .exceptions import InvalidRowChangesCursor, RowChangesCursorExpired
+
+logger = logging.getLogger(__name__)
+
+# Changes can't be returned up to now, because a transaction that is still running
+# could commit rows with a `changed_on` older than the changes returned now. Those
+# would then be behind the cursor of the client and never be returned. That's why
+# only the changes older than the start of every other running transaction are
+# returned. This means that a long running transaction holds back the changes of
+# all the tables. Transactions that have been idle for a long time are ignored,
+# because they're most likely abandoned.
+UPPER_BOUND_SQL = """
+    SELECT statement_timestamp(), LEAST(
+        statement_timestamp(),
+        (
+            SELECT min(xact_start) FROM pg_stat_activity
+            WHERE datname = current_database()
+            AND pid <> pg_backend_pid()
+            AND backend_type = 'client backend'
+            AND xact_start IS NOT NULL
+            AND NOT (
+                state = 'idle in transaction'
+                AND state_change < statement_timestamp()
+                    - make_interval(secs => %(idle_seconds)s)
+            )
+        )
+    ) - make_interval(secs => %(settle_seconds)s)
+"""
+
+# The link row field values of the rows in the related table change when the rows
+# they're linked to are trashed, restored or deleted.
+MARK_LINKED_ROWS_AS_CHANGED_SQL = """
+    UPDATE {related_table} SET changed_on = %(now)s
+    WHERE id IN (
+        SELECT {related_column} FROM {through_table}
+        WHERE {column} = ANY(%(row_ids)s)
+    )
+"""
+
+Position = Tuple[datetime, int]
+
+
+@dataclass
+class RowChanges:
+    rows: List[GeneratedTableModel]
+    deleted_row_ids: List[int]
+    cursor: str
+    has_more: bool
+
+
+def get_row_changes_upper_bound() -> datetime:
+    """
+    Returns the timestamp up to which the changes of the rows are final, meaning
+    that no other transaction can still commit changes older than it. A warning is
+    logged when a long running transaction holds it back.
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            UPPER_BOUND_SQL,
+            {
+                "idle_seconds": settings.BASEROW_ROW_CHANGES_IDLE_TRANSACTION_SECONDS,
+                "settle_seconds": settings.BASEROW_ROW_CHANGES_SETTLE_SECONDS,
+            },
+        )
+        now, upper_bound = cursor.fetchone()
+
+    lag = (now - upper_bound).total_seconds()
+    if lag > settings.BASEROW_ROW_CHANGES_LAG_WARNING_SECONDS:
+        logger.warning(
+            f"The row changes are held back by {lag:.0f} seconds because of a long "
+            f"running transaction."
+        )
+
+    return upper_bound
+
+
+def encode_row_changes_cursor(
+    rows_position: Optional[Position], tombstones_position: Position
+) -> str:
+    """
+    Encodes the positions in the rows and in the tombstones of the table in an
+    opaque cursor that can be provided to fetch the next changes.
+    """
+
+    positions = {
+        "rows": [rows_position[0].isoformat(), rows_position[1]]
+        if rows_position
+        else None,
+        "tombstones": [tombstones_position[0].isoformat(), tombstones_position[1]],
+    }
+    return base64.urlsafe_b64encode(json.dumps(positions).encode()).decode()
+
+
+def decode_row_changes_cursor(cursor: str) -> Tuple[Optional[Position], Position]:
+    """
+    Decodes a cursor created by `encode_row_changes_cursor`.
+
+    :raises InvalidRowChangesCursor: When the cursor can't be decoded.
+    """
+
+    try:
+        positions = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        rows_position = positions["rows"]
+        tombstones_position = positions["tombstones"]
+        return (
+            (datetime.fromisoformat(rows_position[0]), int(rows_position[1]))
+            if rows_position
+            else None,
+            (
+                datetime.fromisoformat(tombstones_position[0]),
+                int(tombstones_position[1]),
+            ),
+        )
+    except (ValueError, TypeError, KeyError, IndexError):
+        raise InvalidRowChangesCursor()
+
+
+def _after_position(
+    queryset: QuerySet, date_field_name: str, position: Optional[Position]
+) -> QuerySet:
+    """
+    Filters the queryset so that only the records after the position, when ordered
+    by the date field and the id, are included. This can use the index on both.
+    """
+
+    if position is None:
+        return queryset
+
+    date, id = position
+    return queryset.filter(
+        Q(**{f"{date_field_name}__gte": date})
+        & (Q(**{f"{date_field_name}__gt": date}) | Q(id__gt=id))
+    )
+
+
+def _next_position(
+    fetched: List[Tuple[int, datetime]],
+    consumed_count: int,
+    size: int,
+    position: Optional[Position],
+    upper_bound: datetime,
+) -> Optional[Position]:
+    """
+    Returns the position after the consumed records. If all the records up to the
+    upper bound have been consumed, then the position moves to the upper bound, so
+    that the next changes start from there.
+    """
+
+    if consumed_count == len(fetched) and len(fetched) <= size:
+        return upper_bound, 0
+    if consumed_count == 0:
+        return position
+    id, date = fetched[consumed_count - 1]
+    return date, id
+
+
+def get_row_changes(
+    model: Type[GeneratedTableModel], cursor: Optional[str] = None, size: int = 100
+) -> RowChanges:
+    """
+    Returns the rows that have been created, updated and deleted after the provided
+    cursor, ordered by the moment they changed. Without cursor, all the rows of the
+    table are returned first. The trashed rows and the tombstones of the permanently
+    deleted rows are returned as deleted row ids.
+
+    The rows are marked as changed when they're written to, when their values are
+    recomputed because of a change in another row and when rows of another table
+    are linked to or unlinked from them, see `mark_linked_rows_as_changed`.
+
+    :param model: The generated model of the table.
+    :param cursor: The cursor returned by the previous call, if any.
+    :param size: The maximum number of changes that are returned.
+    :raises InvalidRowChangesCursor: When the cursor can't be decoded.
+    :raises RowChangesCursorExpired: When the tombstones of the rows that have been
+        deleted after the cursor might have been cleaned up already.
+    :return: The changes and the cursor to fetch the next ones with.
+    """
+
+    upper_bound = get_row_changes_upper_bound()
+    if cursor is None:
+        rows_position, tombstones_position = None, (upper_bound, 0)
+    else:
+        rows_position, tombstones_position = decode_row_changes_cursor(cursor)
+        retention = timedelta(days=settings.BASEROW_ROW_TOMBSTONES_RETENTION_DAYS)
+        if tombstones_position[0] < timezone.now() - retention:
+            raise RowChangesCursorExpired()
+
+    changed_rows = list(
+        _after_position(
+            model.objects_and_trash.filter(changed_on__lt=upper_bound),
+            "changed_on",
+            rows_position,
+        )
+        .order_by("changed_on", "id")
+        .values_list("id", "changed_on", "trashed")[: size + 1]
+    )
+    tombstones = list(
+        _after_position(
+            RowTombstone.objects.filter(
+                table_id=model._table_id, deleted_on__lt=upper_bound
+            ),
+            "deleted_on",
+            tombstones_position,
+        )
+        .order_by("deleted_on", "id")
+        .values_list("id", "deleted_on", "row_id")[: size + 1]
+    )
+
+    # Both are merged by the moment they changed and only the first changes are
+    # consumed, the positions of the rest are kept in the cursor.
+    changes = sorted(
+        [(date, 0, index) for index, (_, date, _) in enumerate(changed_rows)]
+        + [(date, 1, index) for index, (_, date, _) in enumerate(tombstones)]
+    )[:size]
+    consumed_rows = [changed_rows[index] for _, source, index in changes if not source]
+    consumed_tombstones = [tombstones[index] for _, source, index in changes if source]
+
+    updated_row_ids = [id for id, _, trashed in consumed_rows if not trashed]
+    rows = list(
+        model.objects.filter(id__in=updated_row_ids)
+        .order_by("changed_on", "id")
+        .enhance_by_fields()
+    )
+    deleted_row_ids = [id for id, _, trashed in consumed_rows if trashed] + [
+        row_id for _, _, row_id in consumed_tombstones
+    ]
+
+    next_cursor = encode_row_changes_cursor(
+        _next_position(
+            [(id, date) for id, date, _ in changed_rows],
+            len(consumed_rows),
+            size,
+            rows_position,
+            upper_bound,
+        ),
+        _next_position(
+            [(id, date) for id, date, _ in tombstones],
+            len(consumed_tombstones),
+            size,
+            tombstones_position,
+            upper_bound,
+        ),
+    )
+    has_more = len(changed_rows) + len(tombstones) > size
+
+    return RowChanges(rows, deleted_row_ids, next_cursor, has_more)
+
+
+def delete_expired_row_tombstones():
+    """
+    Deletes the tombstones that are older than the retention period. The cursors
+    pointing before that moment are rejected as expired, so those tombstones can't
+    be returned anymore.
+    """
+
+    RowTombstone.objects.filter(
+        deleted_on__lt=timezone.now()
+        - timedelta(days=settings.BASEROW_ROW_TOMBSTONES_RETENTION_DAYS)
+    ).delete()
+
+
+def _get_link_row_model_fields(model: Type[GeneratedTableModel]):
+    """
+    Returns the many to many model fields of the link row fields that have a related
+    field in the other table, because only then the rows of the other table have a
+    value that changes when the links change.
+    """
+
+    return {
+        field_object["name"]: model._meta.get_field(field_object["name"])
+        for field_object in model._field_objects.values()
+        if isinstance(field_object["field"], LinkRowField)
+        and field_object["field"].link_row_related_field_id is not None
+    }
+
+
+def mark_linked_rows_as_changed(
+    model: Type[GeneratedTableModel],
+    related_row_ids_per_field_name: Dict[str, Iterable[int]],
+):
+    """
+    Marks the provided rows of the related tables as changed, because they have
+    been linked to or unlinked from rows of the model. The values of their link row
+    fields changed, so the row changes of their table must return them.
+
+    :param model: The generated model of the table of which the rows have been
+        linked or unlinked.
+    :param related_row_ids_per_field_name: The ids of the linked or unlinked rows
+        of the related table, by the name of the link row field in the model.
+    """
+
+    link_row_model_fields = _get_link_row_model_fields(model)
+    now = timezone.now()
+    for field_name, related_row_ids in related_row_ids_per_field_name.items():
+        model_field = link_row_model_fields.get(field_name)
+        related_row_ids = set(related_row_ids)
+        if model_field is None or not related_row_ids:
+            continue
+        model_field.related_model.objects_and_trash.filter(
+            id__in=related_row_ids
+        ).update(changed_on=now)
+
+
+def mark_rows_linked_to_rows_as_changed(
+    model: Type[GeneratedTableModel], row_ids: Iterable[int]
+):
+    """
+    Marks the rows of the related tables that are linked to the provided rows as
+    changed. Must be called before the rows are trashed, restored or deleted,
+    because that changes the link row field values of the linked rows.
+
+    :param model: The generated model of the table containing the rows.
+    :param row_ids: The ids of the rows of which the linked rows must be marked.
+    """
+
+    row_ids = list(row_ids)
+    if not row_ids:
+        return
+
+    now = timezone.now()
+    with connection.cursor() as cursor:
+        for model_field in _get_link_row_model_fields(model).values():
+            cursor.execute(
+                sql.SQL(MARK_LINKED_ROWS_AS_CHANGED_SQL).format(
+                    related_table=sql.Identifier(
+                        model_field.related_model._meta.db_table
+                    ),
+                    related_column=sql.Identifier(model_field.m2m_reverse_name()),
+                    through_table=sql.Identifier(
+                        model_field.remote_field.through._meta.db_table
+                    ),
+                    column=sql.Identifier(model_field.m2m_column_name()),
+                ),
+                {"now": now, "row_ids": row_ids},
+            )
@@ -1,2 +1,13 @@
 ROW_IMPORT_VALIDATION = "row-import-validation"
 ROW_IMPORT_CREATION = "row-import-creation"
+
+ROW_OPERATION_CREATE = "create"
+ROW_OPERATION_UPDATE = "update"
+ROW_OPERATION_MOVE = "move"
+ROW_OPERATION_DELETE = "delete"
+ROW_OPERATION_TYPES = [
+    ROW_OPERATION_CREATE,
+    ROW_OPERATION_UPDATE,
+    ROW_OPERATION_MOVE,
+    ROW_OPERATION_DELETE,
+]
@@ -24,3 +24,33 @@ class ReportMaxErrorCountExceeded(Exception):
     def __init__(self, report, *args, **kwargs):
         self.report = report
         super().__init__("Too many errors", *args, **kwargs)
+
+
+class InvalidUpsertKeyField(Exception):
+    """Raised when rows are upserted by a field that can't be used as key."""
+
+    def __init__(self, field_id, *args, **kwargs):
+        self.field_id = field_id
+        super().__init__(*args, **kwargs)
+
+
+class UpsertKeyValuesNotUnique(Exception):
+    """
+    Raised when the values of the upsert key field are not unique in the provided
+    rows or in the existing rows of the table.
+    """
+
+    def __init__(self, values, *args, **kwargs):
+        self.values = values
+        super().__init__(*args, **kwargs)
+
+
+class InvalidRowChangesCursor(Exception):
+    """Raised when the provided row changes cursor can't be decoded."""
+
+
+class RowChangesCursorExpired(Exception):
+    """
+    Raised when the provided row changes cursor is older than the retention period
+    of the tombstones of the permanently deleted rows.
+    """
@@ -1,10 +1,23 @@
 import re
 from collections import defaultdict
+from contextlib import contextmanager
 from decimal import Decimal
 from math import floor, ceil
-from typing import cast, Any, Dict, List, NewType, Optional, Type, Tuple, Set
+from typing import (
+    cast,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    NewType,
+    Optional,
+    Type,
+    Tuple,
+    Set,
+)
 
 
+from django.conf import settings
 from django.utils.encoding import force_str
 from django.core.exceptions import ValidationError
 from django.contrib.auth.models import AbstractUser
@@ -17,14 +30,23 @@ from baserow.contrib.database.fields.dependencies.handler import FieldDependency
 from baserow.contrib.database.fields.dependencies.update_collector import (
     FieldUpdateCollector,
 )
+from baserow.contrib.database.fields.constants import INDEX_KIND_HASH
 from baserow.contrib.database.fields.field_cache import FieldCache
+from baserow.contrib.database.fields.index_advisor import FieldIndexAdvisor
 from baserow.contrib.database.fields.models import LinkRowField
 from baserow.contrib.database.fields.registries import FieldType
 from baserow.contrib.database.table.models import Table, GeneratedTableModel
+from baserow.contrib.database.table.row_count import update_table_row_count
 from baserow.contrib.database.trash.models import TrashedRows
 from baserow.core.trash.handler import TrashHandler
 from baserow.core.utils import get_non_unique_values
-from .exceptions import RowDoesNotExist, RowIdsNotUnique
+from .exceptions import (
+    InvalidUpsertKeyField,
+    RowDoesNotExist,
+    RowIdsNotUnique,
+    ReportMaxErrorCountExceeded,
+    UpsertKeyValuesNotUnique,
+)
 from .signals import (
     before_rows_update,
     before_rows_delete,
@@ -32,8 +54,10 @@ from .signals import (
     rows_updated,
     rows_deleted,
 )
+from .changes import RowChanges, get_row_changes, mark_linked_rows_as_changed
 from .constants import ROW_IMPORT_VALIDATION, ROW_IMPORT_CREATION
 from .error_report import RowErrorReport
+from .upsert import get_existing_row_ids_by_key, insert_or_update_rows
 
 GeneratedTableModelForUpdate = NewType(
     "GeneratedTableModelForUpdate", GeneratedTableModel
@@ -74,6 +98,158 @@ def prepare_field_errors(field_errors):
     }
 
 
+class CombinedRowChanges:
+    """
+    Collects the changes made by multiple row operations in the same table, so that
+    the cells of the dependant fields are updated, the views are notified and the
+    signals are sent only once for all of them. Must be created with
+    `RowHandler.combine_row_changes` and passed as the `combined_changes` argument of
+    the row operations of the `RowHandler`.
+    """
+
+    def __init__(
+        self,
+        handler: "RowHandler",
+        user: AbstractUser,
+        table: Table,
+        model: Type[GeneratedTableModel],
+    ):
+        self.handler = handler
+        self.user = user
+        self.table = table
+        self.model = model
+        self.update_collector = FieldUpdateCollector(table, starting_row_ids=[])
+        self.field_cache = FieldCache()
+        self.created_row_ids_per_before: Dict[Optional[int], List[int]] = {}
+        self.before_rows: Dict[Optional[int], Optional[GeneratedTableModel]] = {}
+        self.updated_row_ids: Set[int] = set()
+        self.updated_field_ids: Set[int] = set()
+        self.deleted_row_ids: Set[int] = set()
+        self.rows_to_update: List[GeneratedTableModel] = []
+        self.rows_to_delete: List[GeneratedTableModel] = []
+        self.before_update_return = None
+        self.before_delete_return = None
+
+    def prepare(
+        self,
+        row_ids_to_update: Iterable[int],
+        updated_field_ids: Iterable[int],
+        row_ids_to_delete: Iterable[int],
+    ):
+        """
+        Fetches the rows that are going to be updated or deleted and sends the
+        signals that must receive them before they're changed.
+
+        :raises RowDoesNotExist: When any of the rows don't exist.
+        """
+
+        row_ids_to_delete = set(row_ids_to_delete)
+        row_ids_to_update = set(row_ids_to_update) - row_ids_to_delete
+        self.updated_field_ids.update(updated_field_ids)
+
+        row_ids = row_ids_to_update | row_ids_to_delete
+        rows = list(self.model.objects.filter(id__in=row_ids).enhance_by_fields())
+        if len(rows) != len(row_ids):
+            raise RowDoesNotExist(sorted(row_ids - {row.id for row in rows}))
+
+        self.rows_to_update = [row for row in rows if row.id in row_ids_to_update]
+        self.rows_to_delete = [row for row in rows if row.id in row_ids_to_delete]
+        signal_kwargs = dict(user=self.user, table=self.table, model=self.model)
+
+        if self.rows_to_update:
+            self.before_update_return = before_rows_update.send(
+                self.handler,
+                rows=self.rows_to_update,
+                updated_field_ids=self.updated_field_ids,
+                **signal_kwargs,
+            )
+
+        if self.rows_to_delete:
+            self.before_delete_return = before_rows_delete.send(
+                self.handler, rows=self.rows_to_delete, **signal_kwargs
+            )
+
+    def rows_created(
+        self,
+        rows: List[GeneratedTableModel],
+        before_row: Optional[GeneratedTableModel] = None,
+    ):
+        before_id = before_row.id if before_row else None
+        self.before_rows[before_id] = before_row
+        self.created_row_ids_per_before.setdefault(before_id, []).extend(
+            row.id for row in rows
+        )
+        self.update_collector.add_starting_row_ids([row.id for row in rows])
+
+    def rows_updated(
+        self,
+        rows: List[GeneratedTableModel],
+        updated_field_ids: Iterable[int],
+        deleted_m2m_rels_per_link_field: Optional[Dict[int, Set[int]]] = None,
+    ):
+        row_ids = [row.id for row in rows]
+        self.updated_row_ids.update(row_ids)
+        self.updated_field_ids.update(updated_field_ids)
+        self.update_collector.add_starting_row_ids(
+            row_ids, deleted_m2m_rels_per_link_field
+        )
+
+    def rows_deleted(self, rows: List[GeneratedTableModel]):
+        row_ids = [row.id for row in rows]
+        self.deleted_row_ids.update(row_ids)
+        self.update_collector.add_starting_row_ids(row_ids)
+
+    def apply(self):
+        """
+        Updates the cells of all the dependant fields, notifies the views about the
+        updated fields and sends one signal per kind of change for all the changed
+        rows.
+        """
+
+        from baserow.contrib.database.views.handler import ViewHandler
+
+        self.update_collector.apply_updates_and_get_updated_fields(self.field_cache)
+        ViewHandler().field_value_updated(
+            [o["field"] for o in self.model._field_objects.values()]
+        )
+
+        signal_kwargs = dict(user=self.user, table=self.table, model=self.model)
+        queryset = self.model.objects.all().enhance_by_fields()
+
+        for before_id, row_ids in self.created_row_ids_per_before.items():
+            rows_created.send(
+                self.handler,
+                rows=list(queryset.filter(id__in=row_ids)),
+                before=self.before_rows[before_id],
+                **signal_kwargs,
+            )
+
+        # Rows that are created and updated afterwards are only reported as created,
+        # because that signal already contains their final values.
+        created_row_ids = {
+            row_id
+            for row_ids in self.created_row_ids_per_before.values()
+            for row_id in row_ids
+        }
+        updated_row_ids = self.updated_row_ids - self.deleted_row_ids - created_row_ids
+        if updated_row_ids:
+            rows_updated.send(
+                self.handler,
+                rows=list(queryset.filter(id__in=updated_row_ids)),
+                before_return=self.before_update_return,
+                updated_field_ids=self.updated_field_ids,
+                **signal_kwargs,
+            )
+
+        if self.rows_to_delete:
+            rows_deleted.send(
+                self.handler,
+                rows=self.rows_to_delete,
+                before_return=self.before_delete_return,
+                **signal_kwargs,
+            )
+
+
 class RowHandler:
     def prepare_values(self, fields, values):
         """
@@ -423,6 +599,37 @@ class RowHandler:
         else:
             return row_exists
 
+    def get_row_changes(
+        self,
+        user: AbstractUser,
+        table: Table,
+        cursor: Optional[str] = None,
+        size: int = 100,
+        model: Optional[Type[GeneratedTableModel]] = None,
+    ) -> RowChanges:
+        """
+        Returns the rows of the table that have been created, updated or deleted
+        since the provided cursor was returned. See `get_row_changes` in the changes
+        module for more information.
+
+        :param user: The user on whose behalf the changes are requested.
+        :param table: The table of which the changes are requested.
+        :param cursor: The cursor of the previous changes, if any.
+        :param size: The maximum number of changes to return.
+        :param model: If the correct model has already been generated it can be
+            provided so that it does not have to be generated for a second time.
+        :raises UserNotInGroup: If the user does not belong to the group.
+        :return: The changes and the cursor to request the next changes with.
+        """
+
+        if model is None:
+            model = table.get_model()
+
+        group = table.database.group
+        group.has_user(user, raise_error=True)
+
+        return get_row_changes(model, cursor, size)
+
     def create_row(
         self,
         user: AbstractUser,
@@ -509,9 +716,11 @@ class RowHandler:
         values, manytomany_values = self.extract_manytomany_values(values, model)
         values["order"] = self.get_order_before_row(before, model)[0]
         instance = model.objects.create(**values)
+        update_table_row_count(table.id, 1)
 
         for name, value in manytomany_values.items():
             getattr(instance, name).set(value)
+        mark_linked_rows_as_changed(model, manytomany_values)
 
         fields = []
         update_collector = FieldUpdateCollector(table, starting_row_ids=[instance.id])
@@ -673,16 +882,18 @@ class RowHandler:
         # field in this table, and the value is a set of row ids that this row used to
         # link to via that link row field.
         deleted_m2m_rels_per_link_field: Dict[int, Set[int]] = defaultdict(set)
+        linked_or_unlinked_row_ids_per_field_name = {}
 
         for name, value in manytomany_values.items():
             field = updated_fields_by_name[name]
             new_ids = set(value)
             # Uses the existing prefetch cache and so doesn't run queries.
             if isinstance(field, LinkRowField):
-                for existing in getattr(row, name).all():
-                    if existing.id not in new_ids:
-                        deleted_m2m_rels_per_link_field[field.id].add(existing.id)
+                existing_ids = {existing.id for existing in getattr(row, name).all()}
+                deleted_m2m_rels_per_link_field[field.id].update(existing_ids - new_ids)
+                linked_or_unlinked_row_ids_per_field_name[name] = existing_ids ^ new_ids
             getattr(row, name).set(value)
+        mark_linked_rows_as_changed(model, linked_or_unlinked_row_ids_per_field_name)
 
         row.save()
 
@@ -692,6 +903,12 @@ class RowHandler:
             deleted_m2m_rels_per_link_field=deleted_m2m_rels_per_link_field,
         )
         field_cache = FieldCache()
+        for field_id in updated_field_ids:
+            field_object = model._field_objects[field_id]
+            field_object["type"].after_rows_updated(
+                field_object["field"], [row], update_collector, field_cache
+            )
+
         for (
             dependant_field,
             dependant_field_type,
@@ -731,6 +948,51 @@ class RowHandler:
 
         return row
 
+    @contextmanager
+    def combine_row_changes(
+        self,
+        user: AbstractUser,
+        table: Table,
+        model: Optional[Type[GeneratedTableModel]] = None,
+        row_ids_to_update: Optional[Iterable[int]] = None,
+        updated_field_ids: Optional[Iterable[int]] = None,
+        row_ids_to_delete: Optional[Iterable[int]] = None,
+    ):
+        """
+        Context manager that combines the changes of the row operations that are
+        executed within it with the yielded `CombinedRowChanges`. The cells of the
+        dependant fields are only updated and the signals are only sent once when the
+        context is exited without an exception. The rows that are going to be updated,
+        moved or deleted must be known upfront, because the signals that need their
+        state before the changes are sent when entering the context.
+
+        with handler.combine_row_changes(user, table, model, [1], [2], [3]) as changes:
+            handler.update_rows(user, table, rows, model, combined_changes=changes)
+            handler.delete_rows(user, table, [3], model, combined_changes=changes)
+
+        :param user: The user of whose behalf the changes are made.
+        :param table: The table in which the rows are changed.
+        :param model: If the correct model has already been generated it can be
+            provided so that it does not have to be generated for a second time.
+        :param row_ids_to_update: The ids of the rows that are going to be updated or
+            moved.
+        :param updated_field_ids: The ids of the fields that are going to be updated.
+        :param row_ids_to_delete: The ids of the rows that are going to be deleted.
+        :raises RowDoesNotExist: When any of the rows don't exist.
+        """
+
+        table.database.group.has_user(user, raise_error=True)
+
+        if model is None:
+            model = table.get_model()
+
+        combined_changes = CombinedRowChanges(self, user, table, model)
+        combined_changes.prepare(
+            row_ids_to_update or [], updated_field_ids or [], row_ids_to_delete or []
+        )
+        yield combined_changes
+        combined_changes.apply()
+
     def create_rows(
         self,
         user: AbstractUser,
@@ -740,6 +1002,7 @@ class RowHandler:
         model: Optional[Type[GeneratedTableModel]] = None,
         send_signal=True,
         generate_error_report=False,
+        combined_changes: Optional[CombinedRowChanges] = None,
     ) -> List[GeneratedTableModel]:
         """
         Creates new rows for a given table if the user
@@ -752,6 +1015,10 @@ class RowHandler:
             the before_row.
         :param model: If the correct model has already been generated it can be
             provided so that it does not have to be generated for a second time.
+        :param combined_changes: If provided, the cells of the dependant fields are
+            not updated and no signals are sent. The changes are collected instead,
+            so that this is done once for multiple operations, see
+            `combine_row_changes`.
         :return: The created row instances.
         """
 
@@ -789,6 +1056,7 @@ class RowHandler:
         inserted_rows = model.objects.bulk_create(
             [row for (row, relations) in rows_relationships]
         )
+        update_table_row_count(table.id, len(inserted_rows))
 
         many_to_many = defaultdict(list)
         for index, row in enumerate(inserted_rows):
@@ -834,11 +1102,28 @@ class RowHandler:
         for field_name, values in many_to_many.items():
             through = getattr(model, field_name).through
             through.objects.bulk_create(values)
-
-        update_collector = FieldUpdateCollector(
-            table, starting_row_ids=[row.id for row in inserted_rows]
+        mark_linked_rows_as_changed(
+            model,
+            {
+                field_name: [
+                    related_row_id
+                    for _, manytomany_values in rows_relationships
+                    for related_row_id in manytomany_values.get(field_name, [])
+                ]
+                for field_name in many_to_many
+            },
         )
-        field_cache = FieldCache()
+
+        if combined_changes is None:
+            update_collector = FieldUpdateCollector(
+                table, starting_row_ids=[row.id for row in inserted_rows]
+            )
+            field_cache = FieldCache()
+        else:
+            combined_changes.rows_created(inserted_rows, before_row)
+            update_collector = combined_changes.update_collector
+            field_cache = combined_changes.field_cache
+
         field_ids = []
         for field_object in model._field_objects.values():
             field_type = field_object["type"]
@@ -866,6 +1151,10 @@ class RowHandler:
                 field_cache,
                 path_to_starting_table,
             )
+
+        if combined_changes is not None:
+            return inserted_rows
+
         update_collector.apply_updates_and_get_updated_fields(field_cache)
 
         from baserow.contrib.database.views.handler import ViewHandler
@@ -898,6 +1187,7 @@ class RowHandler:
         table: Table,
         rows: List[Dict[str, Any]],
         progress: Optional[Progress] = None,
+        model: Optional[Type[GeneratedTableModel]] = None,
     ) -> Dict[str, Dict[str, Any]]:
         """
         Validates rows by batch and generates an error report.
@@ -906,6 +1196,7 @@ class RowHandler:
         :param table: The table for which the rows should be created.
         :param rows: List of rows values for rows that need to be created.
         :param progress: Give a progress instance to track the progress of the import.
+        :param model: Optional model to prevent recomputing table model.
         :return: The error report.
         """
 
@@ -921,7 +1212,9 @@ class RowHandler:
         if progress:
             progress.increment(state=ROW_IMPORT_VALIDATION)
 
-        model = table.get_model()
+        if model is None:
+            model = table.get_model()
+
         # Use serializer to validate incoming data
         validation_serializer = get_row_serializer_class(model)
         report = {}
@@ -1000,6 +1293,8 @@ class RowHandler:
         validate: bool = True,
         progress: Optional[Progress] = None,
         send_signal: bool = True,
+        model: Optional[Type[GeneratedTableModel]] = None,
+        error_limit: Optional[int] = None,
     ) -> Tuple[List[GeneratedTableModel], Dict[str, Dict[str, Any]]]:
         """
         Creates new rows for a given table if the user
@@ -1014,6 +1309,9 @@ class RowHandler:
         :param validate: If True the data are validated before the import.
         :param progress: Give a progress instance to track the progress of the import.
         :param send_signal: If True a row_created signal is send.
+        :param model: Optional model to prevent recomputing table model.
+        :param error_limit: Optionally overrides the maximum amount of failing rows
+            before the import is aborted.
 
         :return: The created row instances and the error report.
         """
@@ -1021,9 +1319,13 @@ class RowHandler:
         group = table.database.group
         group.has_user(user, raise_error=True)
 
-        error_report = RowErrorReport(data)
+        if error_limit is None:
+            error_report = RowErrorReport(data)
+        else:
+            error_report = RowErrorReport(data, error_limit=error_limit)
 
-        model = table.get_model()
+        if model is None:
+            model = table.get_model()
 
         fields = [
             field_object["field"]
@@ -1067,7 +1369,7 @@ class RowHandler:
             )
 
             validation_report = self.validate_rows(
-                table, valid_rows, progress=validation_sub_progress
+                table, valid_rows, progress=validation_sub_progress, model=model
             )
 
             for index, error in validation_report.items():
@@ -1114,6 +1416,76 @@ class RowHandler:
 
         return created_rows, error_report.to_dict()
 
+    def import_rows_in_chunks(
+        self,
+        user: AbstractUser,
+        table: Table,
+        chunks: Iterable[List[List[Any]]],
+        row_count: int,
+        validate: bool = True,
+        progress: Optional[Progress] = None,
+    ) -> Tuple[List[int], Dict[int, Dict[str, Any]]]:
+        """
+        Imports rows exactly like `import_rows`, but consumes them chunk by chunk so
+        that only a single chunk and the ids of the created rows are kept in memory.
+        This makes it possible to import data streamed from a big file. The row
+        indexes of the error report are relative to the whole data. No rows_created
+        signal is sent.
+
+        :param user: The user of whose behalf the rows are created.
+        :param table: The table for which the rows should be created.
+        :param chunks: An iterable yielding lists of rows values.
+        :param row_count: The total amount of rows yielded by the chunks. Only used to
+            track the progress.
+        :param validate: If True the data are validated before the import.
+        :param progress: Give a progress instance to track the progress of the import.
+        :raises ReportMaxErrorCountExceeded: When the total amount of failing rows
+            exceeds the `BASEROW_MAX_ROW_REPORT_ERROR_COUNT` setting.
+        :return: The ids of the created rows and the error report.
+        """
+
+        group = table.database.group
+        group.has_user(user, raise_error=True)
+
+        model = table.get_model()
+        rows_progress = progress.create_child(100, row_count) if progress else None
+
+        error_limit = settings.BASEROW_MAX_ROW_REPORT_ERROR_COUNT
+        report = {}
+        created_row_ids = []
+        row_start_index = 0
+        for chunk in chunks:
+            if not chunk:
+                continue
+
+            chunk_progress = (
+                rows_progress.create_child(len(chunk), 100) if rows_progress else None
+            )
+
+            try:
+                created_rows, chunk_report = self.import_rows(
+                    user,
+                    table,
+                    chunk,
+                    validate=validate,
+                    progress=chunk_progress,
+                    send_signal=False,
+                    model=model,
+                    error_limit=error_limit - len(report),
+                )
+            except ReportMaxErrorCountExceeded as e:
+                for index, error in e.report.items():
+                    report[row_start_index + index] = error
+                raise ReportMaxErrorCountExceeded(report)
+
+            for index, error in chunk_report.items():
+                report[row_start_index + index] = error
+
+            created_row_ids.extend(row.id for row in created_rows)
+            row_start_index += len(chunk)
+
+        return created_row_ids, report
+
     def update_rows(
         self,
         user: AbstractUser,
@@ -1121,6 +1493,7 @@ class RowHandler:
         rows: List,
         model: Optional[Type[GeneratedTableModel]] = None,
         rows_to_update: Optional[RowsForUpdate] = None,
+        combined_changes: Optional[CombinedRowChanges] = None,
     ) -> List[GeneratedTableModelForUpdate]:
         """
         Updates field values in batch based on provided rows with the new values.
@@ -1133,6 +1506,10 @@ class RowHandler:
         :param rows_to_update: If the rows to update have already been generated
             it can be provided so that it does not have to be generated for a
             second time.
+        :param combined_changes: If provided, the cells of the dependant fields are
+            not updated and no signals are sent. The changes are collected instead,
+            so that this is done once for multiple operations, see
+            `combine_row_changes`.
         :raises RowIdsNotUnique: When trying to update the same row multiple times.
         :raises RowDoesNotExist: When any of the rows don't exist.
         :return: The updated row instances.
@@ -1172,22 +1549,27 @@ class RowHandler:
                 if field_id in row_values or field["name"] in row_values:
                     updated_field_ids.add(field_id)
 
-        before_return = before_rows_update.send(
-            self,
-            rows=list(rows_to_update),
-            user=user,
-            table=table,
-            model=model,
-            updated_field_ids=updated_field_ids,
-        )
+        before_return = None
+        if combined_changes is None:
+            before_return = before_rows_update.send(
+                self,
+                rows=list(rows_to_update),
+                user=user,
+                table=table,
+                model=model,
+                updated_field_ids=updated_field_ids,
+            )
 
         rows_relationships = []
         for obj in rows_to_update:
-            # The `updated_on` field is not updated with `bulk_update`,
-            # so we manually set the value here.
+            # The `updated_on` and `changed_on` fields are not updated with
+            # `bulk_update`, so we manually set the values here.
             obj.updated_on = model._meta.get_field("updated_on").pre_save(
                 obj, add=False
             )
+            obj.changed_on = model._meta.get_field("changed_on").pre_save(
+                obj, add=False
+            )
             row_values = rows_by_id[obj.id]
             values, manytomany_values = self.extract_manytomany_values(
                 row_values, model
@@ -1214,6 +1596,7 @@ class RowHandler:
         many_to_many = defaultdict(list)
         row_column_name = None
         row_ids_change_m2m_per_field = defaultdict(set)
+        linked_or_unlinked_row_ids_per_field_name = defaultdict(set)
 
         # This update can remove link row connections with other rows. We need to keep
         # track of these so we can later update any dependant cells in those rows that
@@ -1269,6 +1652,9 @@ class RowHandler:
                     deleted_m2m_rels_per_link_field[field.id].update(
                         m2m_rels_before_update
                     )
+                    linked_or_unlinked_row_ids_per_field_name[field_name].update(
+                        m2m_rels_before_update ^ set(value)
+                    )
 
                 if len(value) == 0:
                     many_to_many[field_name].append(None)
@@ -1297,8 +1683,9 @@ class RowHandler:
             delete_qs = through.objects.all().filter(**filter)
             delete_qs._raw_delete(delete_qs.db)
             through.objects.bulk_create([v for v in values if v is not None])
+        mark_linked_rows_as_changed(model, linked_or_unlinked_row_ids_per_field_name)
 
-        bulk_update_fields = ["updated_on"]
+        bulk_update_fields = ["updated_on", "changed_on"]
         for field in model._field_objects.values():
             field_name = field["name"]
             model_field = model._meta.get_field(field_name)
@@ -1313,12 +1700,26 @@ class RowHandler:
         if len(bulk_update_fields) > 0:
             model.objects.bulk_update(rows_to_update, bulk_update_fields)
 
-        update_collector = FieldUpdateCollector(
-            table,
-            starting_row_ids=row_ids,
-            deleted_m2m_rels_per_link_field=deleted_m2m_rels_per_link_field,
-        )
-        field_cache = FieldCache()
+        if combined_changes is None:
+            update_collector = FieldUpdateCollector(
+                table,
+                starting_row_ids=row_ids,
+                deleted_m2m_rels_per_link_field=deleted_m2m_rels_per_link_field,
+            )
+            field_cache = FieldCache()
+        else:
+            combined_changes.rows_updated(
+                rows_to_update, updated_field_ids, deleted_m2m_rels_per_link_field
+            )
+            update_collector = combined_changes.update_collector
+            field_cache = combined_changes.field_cache
+
+        for field_id in updated_field_ids:
+            field_object = model._field_objects[field_id]
+            field_object["type"].after_rows_updated(
+                field_object["field"], rows_to_update, update_collector, field_cache
+            )
+
         for (
             dependant_field,
             dependant_field_type,
@@ -1336,6 +1737,10 @@ class RowHandler:
                 field_cache,
                 path_to_starting_table,
             )
+
+        if combined_changes is not None:
+            return list(rows_to_update)
+
         update_collector.apply_updates_and_get_updated_fields(field_cache)
 
         from baserow.contrib.database.views.handler import ViewHandler
@@ -1358,6 +1763,224 @@ class RowHandler:
 
         return rows_to_return
 
+    def upsert_rows(
+        self,
+        user: AbstractUser,
+        table: Table,
+        rows_values: List[Dict[str, Any]],
+        key_field_id: int,
+        before_row: Optional[GeneratedTableModel] = None,
+        model: Optional[Type[GeneratedTableModel]] = None,
+    ) -> Tuple[List[GeneratedTableModel], Set[int], List[GeneratedTableModel]]:
+        """
+        Creates or updates rows in bulk by the value of the key field. If a row with
+        the same value of the key field already exists, it's updated with the
+        provided values, otherwise a new row is created. The existing rows are locked
+        and concurrent upserts by the same key field wait until the transaction
+        ends, so this must be called in a transaction. The rows are created and
+        updated in bulk per combination of provided fields. Rows without a key value
+        are always created. The cells of the dependant fields are updated and the
+        signals are sent once for all the rows.
+
+        :param user: The user of whose behalf the rows are upserted.
+        :param table: The table in which the rows must be upserted.
+        :param rows_values: List of rows values for the rows that need to be created
+            or updated.
+        :param key_field_id: The id of the field of which the value identifies an
+            existing row.
+        :param before_row: If provided the new rows will be placed right before
+            the before_row.
+        :param model: If the correct model has already been generated it can be
+            provided so that it does not have to be generated for a second time.
+        :raises InvalidUpsertKeyField: When the key field is not in the table or
+            can't be used as key.
+        :raises UpsertKeyValuesNotUnique: When the values of the key field are not
+            unique in the provided rows or when multiple existing rows have the same
+            value as a provided row.
+        :return: The created or updated rows in the same order as the provided
+            values, the ids of the created rows and the rows that are updated as they
+            were before the update.
+        """
+
+        group = table.database.group
+        group.has_user(user, raise_error=True)
+
+        if model is None:
+            model = table.get_model()
+
+        key_field_object = model._field_objects.get(key_field_id)
+        if key_field_object is None or not key_field_object["type"].can_be_upsert_key:
+            raise InvalidUpsertKeyField(key_field_id)
+        key_name = key_field_object["name"]
+
+        rows_values, _ = self.prepare_rows_in_bulk(model._field_objects, rows_values)
+
+        key_values = [
+            values[key_name]
+            for values in rows_values
+            if values.get(key_name) not in (None, "")
+        ]
+        non_unique_key_values = get_non_unique_values(key_values)
+        if len(non_unique_key_values) > 0:
+            raise UpsertKeyValuesNotUnique(
+                sorted(str(value) for value in non_unique_key_values)
+            )
+
+        # The existing rows are looked up by the key values, which needs an index on
+        # the key column in large tables. It's created in the background, so the
+        # first upsert doesn't have to wait for it.
+        FieldIndexAdvisor().request_index(key_field_object["field"], INDEX_KIND_HASH)
+        existing_row_ids_by_key = get_existing_row_ids_by_key(
+            model, key_field_object["field"], key_values
+        )
+        existing_row_ids = list(existing_row_ids_by_key.values())
+        updated_field_ids = {
+            field_id
+            for field_id, field_object in model._field_objects.items()
+            if any(field_object["name"] in values for values in rows_values)
+        }
+        highest_order, step = self.get_order_before_row(
+            before_row, model, amount=len(rows_values)
+        )
+
+        # Formulas referencing fields of the same table are calculated from the
+        # values of the row when it's updated, which aren't all known when the
+        # provided values are written, so those are recalculated by updating the
+        # rows again.
+        has_expression_fields = any(
+            hasattr(model._meta.get_field(field_name), "expression")
+            for field_name in model.fields_requiring_refresh_after_update()
+        )
+
+        with self.combine_row_changes(
+            user, table, model, existing_row_ids, updated_field_ids
+        ) as combined_changes:
+            original_rows = combined_changes.rows_to_update
+            rows_per_field_names = defaultdict(list)
+            manytomany_values_per_index = {}
+            for index, row_values in enumerate(rows_values):
+                values, manytomany_values = self.extract_manytomany_values(
+                    row_values, model
+                )
+                values["order"] = highest_order - step * (len(rows_values) - index - 1)
+                rows_per_field_names[frozenset(values.keys())].append(
+                    (index, model(**values))
+                )
+                manytomany_values_per_index[index] = manytomany_values
+
+            row_ids = [None] * len(rows_values)
+            created_row_ids = set()
+            for field_names, indexed_rows in rows_per_field_names.items():
+                results = insert_or_update_rows(
+                    model,
+                    key_field_object["field"],
+                    [row for _, row in indexed_rows],
+                    [name for name in field_names if name != "order"],
+                    existing_row_ids_by_key,
+                )
+                for (index, _), (row_id, created) in zip(indexed_rows, results):
+                    row_ids[index] = row_id
+                    if created:
+                        created_row_ids.add(row_id)
+
+            update_table_row_count(table.id, len(created_row_ids))
+
+            rows = model.objects.all().enhance_by_fields().filter(id__in=row_ids)
+            created_rows = [row for row in rows if row.id in created_row_ids]
+            updated_rows = [row for row in rows if row.id not in created_row_ids]
+            update_collector = combined_changes.update_collector
+            field_cache = combined_changes.field_cache
+
+            if created_rows:
+                combined_changes.rows_created(created_rows, before_row)
+                for field_object in model._field_objects.values():
+                    field_object["type"].after_rows_created(
+                        field_object["field"],
+                        created_rows,
+                        update_collector,
+                        field_cache,
+                    )
+                for (
+                    dependant_field,
+                    dependant_field_type,
+                    path_to_starting_table,
+                ) in FieldDependencyHandler.get_dependant_fields_with_type(
+                    table.id,
+                    list(model._field_objects.keys()),
+                    associated_relations_changed=True,
+                    field_cache=field_cache,
+                ):
+                    dependant_field_type.row_of_dependency_created(
+                        dependant_field,
+                        created_rows,
+                        update_collector,
+                        field_cache,
+                        path_to_starting_table,
+                    )
+
+            updated_column_field_ids = [
+                field_id
+                for field_id in updated_field_ids
+                if not isinstance(
+                    model._meta.get_field(model._field_objects[field_id]["name"]),
+                    ManyToManyField,
+                )
+            ]
+            if updated_rows:
+                combined_changes.rows_updated(updated_rows, updated_column_field_ids)
+                for field_id in updated_column_field_ids:
+                    field_object = model._field_objects[field_id]
+                    field_object["type"].after_rows_updated(
+                        field_object["field"],
+                        updated_rows,
+                        update_collector,
+                        field_cache,
+                    )
+                for (
+                    dependant_field,
+                    dependant_field_type,
+                    path_to_starting_table,
+                ) in FieldDependencyHandler.get_dependant_fields_with_type(
+                    table.id,
+                    updated_column_field_ids,
+                    associated_relations_changed=True,
+                    field_cache=field_cache,
+                ):
+                    dependant_field_type.row_of_dependency_updated(
+                        dependant_field,
+                        updated_rows,
+                        update_collector,
+                        field_cache,
+                        path_to_starting_table,
+                    )
+
+            # The relations can't be written in bulk like that, so they are set by
+            # updating the rows that have them.
+            rows_to_update_again = [
+                {"id": row_ids[index], **manytomany_values}
+                for index, manytomany_values in manytomany_values_per_index.items()
+                if manytomany_values
+                or (has_expression_fields and row_ids[index] not in created_row_ids)
+            ]
+            if rows_to_update_again:
+                self.update_rows(
+                    user,
+                    table,
+                    rows_to_update_again,
+                    model,
+                    combined_changes=combined_changes,
+                )
+
+        rows_by_id = {
+            row.id: row
+            for row in model.objects.all().enhance_by_fields().filter(id__in=row_ids)
+        }
+        return (
+            [rows_by_id[row_id] for row_id in row_ids],
+            created_row_ids,
+            original_rows,
+        )
+
     def get_rows_for_update(
         self, model: GeneratedTableModel, row_ids: List[int]
     ) -> RowsForUpdate:
@@ -1406,6 +2029,7 @@ class RowHandler:
         row: GeneratedTableModelForUpdate,
         before_row: Optional[GeneratedTableModel] = None,
         model: Optional[Type[GeneratedTableModel]] = None,
+        combined_changes: Optional[CombinedRowChanges] = None,
     ) -> GeneratedTableModelForUpdate:
         """
         Updates the row order value.
@@ -1417,6 +2041,10 @@ class RowHandler:
             instance. Otherwise the row will be moved to the end.
         :param model: If the correct model has already been generated, it can be
             provided so that it does not have to be generated for a second time.
+        :param combined_changes: If provided, the cells of the dependant fields are
+            not updated and no signals are sent. The changes are collected instead,
+            so that this is done once for multiple operations, see
+            `combine_row_changes`.
         """
 
         group = table.database.group
@@ -1425,15 +2053,28 @@ class RowHandler:
         if model is None:
             model = table.get_model()
 
-        before_return = before_rows_update.send(
-            self, rows=[row], user=user, table=table, model=model, updated_field_ids=[]
-        )
+        before_return = None
+        if combined_changes is None:
+            before_return = before_rows_update.send(
+                self,
+                rows=[row],
+                user=user,
+                table=table,
+                model=model,
+                updated_field_ids=[],
+            )
 
         row.order = self.get_order_before_row(before_row, model)[0]
         row.save()
 
-        update_collector = FieldUpdateCollector(table, starting_row_ids=[row.id])
-        field_cache = FieldCache()
+        if combined_changes is None:
+            update_collector = FieldUpdateCollector(table, starting_row_ids=[row.id])
+            field_cache = FieldCache()
+        else:
+            combined_changes.rows_updated([row], [])
+            update_collector = combined_changes.update_collector
+            field_cache = combined_changes.field_cache
+
         updated_field_ids = []
         updated_fields = []
         for field_id, field_object in model._field_objects.items():
@@ -1458,6 +2099,10 @@ class RowHandler:
                 field_cache,
                 path_to_starting_table,
             )
+
+        if combined_changes is not None:
+            return row
+
         update_collector.apply_updates_and_get_updated_fields(field_cache)
 
         from baserow.contrib.database.views.handler import ViewHandler
@@ -1578,6 +2223,7 @@ class RowHandler:
         table: Table,
         row_ids: List[int],
         model: Optional[Type[GeneratedTableModel]] = None,
+        combined_changes: Optional[CombinedRowChanges] = None,
     ) -> TrashedRows:
         """
         Trashes existing rows of the given table based on row_ids.
@@ -1585,9 +2231,12 @@ class RowHandler:
         :param user: The user of whose behalf the change is made.
         :param table: The table for which the row must be deleted.
         :param row_ids: The ids of the rows that must be deleted.
-        :param model:
         :param model: If the correct model has already been generated, it can be
             provided so that it does not have to be generated for a second time.
+        :param combined_changes: If provided, the cells of the dependant fields are
+            not updated and no signals are sent. The changes are collected instead,
+            so that this is done once for multiple operations, see
+            `combine_row_changes`.
         :raises RowDoesNotExist: When the row with the provided id does not exist.
         """
 
@@ -1607,9 +2256,11 @@ class RowHandler:
             db_rows_ids = [db_row.id for db_row in rows]
             raise RowDoesNotExist(sorted(list(set(row_ids) - set(db_rows_ids))))
 
-        before_return = before_rows_delete.send(
-            self, rows=rows, user=user, table=table, model=model
-        )
+        before_return = None
+        if combined_changes is None:
+            before_return = before_rows_delete.send(
+                self, rows=rows, user=user, table=table, model=model
+            )
 
         trashed_rows = TrashedRows()
         trashed_rows.row_ids = row_ids
@@ -1630,8 +2281,14 @@ class RowHandler:
             field = field_object["field"]
             updated_fields.append(field)
 
-        update_collector = FieldUpdateCollector(table, starting_row_ids=row_ids)
-        field_cache = FieldCache()
+        if combined_changes is None:
+            update_collector = FieldUpdateCollector(table, starting_row_ids=row_ids)
+            field_cache = FieldCache()
+        else:
+            combined_changes.rows_deleted(rows)
+            update_collector = combined_changes.update_collector
+            field_cache = combined_changes.field_cache
+
         for (
             dependant_field,
             dependant_field_type,
@@ -1649,6 +2306,10 @@ class RowHandler:
                 field_cache,
                 path_to_starting_table,
             )
+
+        if combined_changes is not None:
+            return trashed_rows
+
         update_collector.apply_updates_and_get_updated_fields(field_cache)
 
         from baserow.contrib.database.views.handler import ViewHandler
@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from django.conf import settings
+
+from baserow.config.celery import app
+
+
+@app.task(queue="export")
+def clean_up_row_tombstones():
+    """
+    Deletes the tombstones of the permanently deleted rows that are older than the
+    retention period.
+    """
+
+    from baserow.contrib.database.rows.changes import delete_expired_row_tombstones
+
+    delete_expired_row_tombstones()
+
+
+# noinspection PyUnusedLocal
+@app.on_after_finalize.connect
+def setup_periodic_row_tombstone_tasks(sender, **kwargs):
+    sender.add_periodic_task(
+        timedelta(minutes=settings.BASEROW_ROW_TOMBSTONES_CLEANUP_INTERVAL_MINUTES),
+        clean_up_row_tombstones.s(),
+    )
@@ -0,0 +1,129 @@
+from typing import Any, Dict, List, Tuple, Type
+
+from django.db import connection
+from django.utils import timezone
+
+from baserow.contrib.database.fields.models import Field
+from baserow.contrib.database.table.models import GeneratedTableModel
+from baserow.core.db_routers import (
+    mark_table_as_changed,
+    mark_table_data_as_changed,
+)
+
+from .exceptions import UpsertKeyValuesNotUnique
+
+
+# Prevents that concurrent upserts by the same key field both create a row for a
+# value that doesn't exist yet. The lock is released when the transaction ends.
+LOCK_UPSERT_KEY_SQL = "SELECT pg_advisory_xact_lock(%s, %s)"
+
+
+def get_existing_row_ids_by_key(
+    model: Type[GeneratedTableModel], key_field: Field, key_values: List[Any]
+) -> Dict[Any, int]:
+    """
+    Finds the rows that have one of the provided values in the key field and locks
+    them until the end of the transaction. Trashed rows are ignored. Other upserts
+    by the same key field must wait until the transaction ends, so that they can't
+    create a row for the same new value. The field itself isn't unique, so the
+    other ways of writing rows are not affected.
+
+    :param model: The generated model of the table containing the field.
+    :param key_field: The field that is used as upsert key.
+    :param key_values: The prepared values of the key field of the upserted rows.
+    :raises UpsertKeyValuesNotUnique: When multiple existing rows have the same
+        value as one of the provided rows.
+    :return: The id of the existing row by value of the key field.
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute(LOCK_UPSERT_KEY_SQL, [key_field.table_id, key_field.id])
+
+    key_name = model._field_objects[key_field.id]["name"]
+    row_ids_by_key = {}
+    duplicate_values = set()
+    existing_rows = (
+        model.objects.filter(**{f"{key_name}__in": key_values})
+        .select_for_update()
+        .order_by("id")
+        .values_list(key_name, "id")
+    )
+    for key_value, row_id in existing_rows:
+        if key_value in row_ids_by_key:
+            duplicate_values.add(key_value)
+        row_ids_by_key[key_value] = row_id
+
+    if duplicate_values:
+        raise UpsertKeyValuesNotUnique(sorted(str(value) for value in duplicate_values))
+
+    return row_ids_by_key
+
+
+def insert_or_update_rows(
+    model: Type[GeneratedTableModel],
+    key_field: Field,
+    rows: List[GeneratedTableModel],
+    update_field_names: List[str],
+    existing_row_ids_by_key: Dict[Any, int],
+) -> List[Tuple[int, bool]]:
+    """
+    Inserts the provided rows in bulk, except for the rows of which the value of the
+    key field already exists. Those existing rows are updated in bulk instead, but
+    only the provided fields are updated.
+
+    :param model: The generated model of the table.
+    :param key_field: The field of which the value identifies an existing row.
+    :param rows: The unsaved row instances that must be inserted or updated. The
+        values of the key field must be unique.
+    :param update_field_names: The names of the fields that must be updated if the
+        row already exists.
+    :param existing_row_ids_by_key: The ids of the existing rows by value of the key
+        field, see `get_existing_row_ids_by_key`.
+    :return: The id of every row in the same order and whether it has been inserted.
+    """
+
+    if not rows:
+        return []
+
+    key_name = model._field_objects[key_field.id]["name"]
+    rows_to_insert, rows_to_update = [], []
+    for row in rows:
+        existing_row_id = existing_row_ids_by_key.get(getattr(row, key_name))
+        if existing_row_id is None:
+            rows_to_insert.append(row)
+        else:
+            row.id = existing_row_id
+            rows_to_update.append(row)
+
+    model.objects.bulk_create(rows_to_insert)
+
+    if rows_to_update:
+        # The `bulk_update` doesn't set the `auto_now` fields. The formula fields
+        # can't be updated with the provided values because those don't contain
+        # the other values of the existing row. They're refreshed after.
+        now = timezone.now()
+        for row in rows_to_update:
+            row.updated_on = now
+            row.changed_on = now
+        updated_field_names = [
+            field_name
+            for field_name in [
+                *update_field_names,
+                "updated_on",
+                "changed_on",
+                *model.fields_requiring_refresh_after_update(),
+            ]
+            if not hasattr(model._meta.get_field(field_name), "expression")
+        ]
+        model.objects.bulk_update(
+            rows_to_update, list(dict.fromkeys(updated_field_names))
+        )
+
+    # Makes sure that the cached row listings of the table are not used anymore and
+    # that the table is read from the primary database, no matter which database
+    # the rows have been written to.
+    mark_table_data_as_changed(model._table_id)
+    mark_table_as_changed(model._table_id)
+
+    inserted_row_ids = {row.id for row in rows_to_insert}
+    return [(row.id, row.id in inserted_row_ids) for row in rows]
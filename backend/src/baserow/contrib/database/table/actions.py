@@ -1,9 +1,10 @@
 import dataclasses
-from typing import List, Optional, Any
+from typing import List, Optional, Any, Union
 
 from django.contrib.auth.models import AbstractUser
 
 from baserow.core.utils import Progress
+from baserow.contrib.database.file_import.readers import ImportDataReader
 from baserow.contrib.database.handler import DatabaseHandler
 from baserow.contrib.database.models import Database
 from baserow.contrib.database.table.handler import TableHandler
@@ -28,9 +29,10 @@ class CreateTableActionType(ActionType):
         user: AbstractUser,
         database: Database,
         name: str,
-        data: Optional[List[List[Any]]] = None,
+        data: Optional[Union[List[List[Any]], ImportDataReader]] = None,
         first_row_header: bool = True,
         progress: Optional[Progress] = None,
+        detect_field_types: bool = False,
     ) -> Table:
         """
         Create a table in the specified database.
@@ -40,12 +42,15 @@ class CreateTableActionType(ActionType):
         :param database: The database that the table instance belongs to.
         :param name: The name of the table is created.
         :param data: A list containing all the rows that need to be inserted is
-            expected. All the values will be inserted in the database.
+            expected. All the values will be inserted in the database. An
+            `ImportDataReader` can be provided to stream the rows from a file.
         :param first_row_header: Indicates if the first row are the fields. The names
             of these rows are going to be used as fields. If `fields` is provided,
             this options is ignored.
         :param progress: An optional progress instance if you want to track the progress
             of the task.
+        :param detect_field_types: If True, the type of each field is detected from
+            the provided data instead of creating text fields only.
         :return: The created table and the error report.
         """
 
@@ -57,6 +62,7 @@ class CreateTableActionType(ActionType):
             first_row_header=first_row_header,
             fill_example=True,
             progress=progress,
+            detect_field_types=detect_field_types,
         )
 
         params = cls.Params(table.id)
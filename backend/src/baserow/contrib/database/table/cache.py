@@ -21,6 +21,7 @@ from django.conf import settings
 from django.core.cache import caches
 from django.core.exceptions import ImproperlyConfigured
 
+from baserow.core.db_routers import mark_table_as_changed, mark_table_data_as_changed
 from baserow.version import VERSION as BASEROW_VERSION
 
 if typing.TYPE_CHECKING:
@@ -67,6 +68,12 @@ def clear_generated_model_cache():
 
 
 def invalidate_table_in_model_cache(table_id: int):
+    # The schema of the table changes, the read replicas must not be used until
+    # they have caught up, otherwise the new model could miss columns there.
+    mark_table_as_changed(table_id)
+    # The values of the rows are serialized differently after a schema change.
+    mark_table_data_as_changed(table_id)
+
     if settings.BASEROW_DISABLE_MODEL_CACHE:
         return None
 
@@ -1,6 +1,7 @@
 import logging
 import traceback
-from typing import Any, cast, NewType, List, Tuple, Optional, Dict
+from datetime import timedelta
+from typing import Any, cast, NewType, List, Tuple, Optional, Dict, Union
 
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
@@ -19,11 +20,13 @@ from baserow.contrib.database.fields.exceptions import (
     ReservedBaserowFieldNameException,
     InvalidBaserowFieldName,
 )
-from baserow.contrib.database.fields.models import Field
+from baserow.contrib.database.fields.models import Field, SelectOption
 from baserow.contrib.database.fields.registries import field_type_registry
+from baserow.contrib.database.file_import.readers import ImportDataReader
 from baserow.contrib.database.models import Database
 from baserow.contrib.database.views.handler import ViewHandler
 from baserow.contrib.database.views.view_types import GridViewType
+from baserow.core.db_routers import read_replica
 from baserow.core.registries import application_type_registry
 from baserow.core.trash.handler import TrashHandler
 from baserow.core.utils import (
@@ -42,8 +45,10 @@ from .exceptions import (
 from baserow.contrib.database.rows.handler import RowHandler
 
 from .models import Table
+from .row_count import get_estimated_row_counts
 from .signals import table_created, table_updated, table_deleted, tables_reordered
 from .constants import TABLE_CREATION
+from .type_inference import FieldTypeInferrer, get_row_converter
 
 
 BATCH_SIZE = 1024
@@ -124,10 +129,11 @@ class TableHandler:
         user: AbstractUser,
         database: Database,
         name: str,
-        data: Optional[List[List[Any]]] = None,
+        data: Optional[Union[List[List[Any]], ImportDataReader]] = None,
         first_row_header: bool = True,
         fill_example: bool = False,
         progress: Optional[Progress] = None,
+        detect_field_types: bool = False,
     ):
         """
         Creates a new table from optionally provided data. If no data is specified,
@@ -139,13 +145,17 @@ class TableHandler:
         :param database: The database that the table instance belongs to.
         :param name: The name of the table is created.
         :param data: A list containing all the rows that need to be inserted is
-            expected. All the values will be inserted in the database.
+            expected. All the values will be inserted in the database. An
+            `ImportDataReader` can be provided instead, in which case the rows are
+            streamed into the table chunk by chunk.
         :param first_row_header: Indicates if the first row are the fields. The names
             of these rows are going to be used as fields. If `fields` is provided,
             this options is ignored.
         :param fill_example: Fill the table with example field and data.
         :param progress: An optional progress instance if you want to track the progress
             of the task.
+        :param detect_field_types: If True, the type of each field is detected from
+            the provided data instead of creating text fields only.
         :return: The created table and the error report.
         """
 
@@ -154,9 +164,23 @@ class TableHandler:
         if progress:
             progress.increment(0, state=TABLE_CREATION)
 
+        if isinstance(data, ImportDataReader):
+            return self._create_table_from_reader(
+                user,
+                database,
+                name,
+                data,
+                first_row_header,
+                progress,
+                detect_field_types=detect_field_types,
+            )
+
+        detect_field_types = detect_field_types and data is not None
         if data is not None:
             (fields, data,) = self.normalize_initial_table_data(
-                data, first_row_header=first_row_header
+                data,
+                first_row_header=first_row_header,
+                detect_field_types=detect_field_types,
             )
         else:
             with translation.override(user.profile.language):
@@ -167,6 +191,12 @@ class TableHandler:
 
         table = self.create_table_and_fields(user, database, name, fields)
 
+        if detect_field_types:
+            # The values have been kept as is until the fields were created, they can
+            # now be converted to the values expected by the detected field types.
+            convert_row = get_row_converter(fields)
+            data = [convert_row(row) for row in data]
+
         _, error_report = RowHandler().import_rows(
             user, table, data, progress=progress, send_signal=False
         )
@@ -175,6 +205,79 @@ class TableHandler:
 
         return table, error_report
 
+    def _create_table_from_reader(
+        self,
+        user: AbstractUser,
+        database: Database,
+        name: str,
+        reader: ImportDataReader,
+        first_row_header: bool,
+        progress: Optional[Progress] = None,
+        detect_field_types: bool = False,
+    ):
+        """
+        Creates a new table with the rows of the provided reader. The reader is read a
+        first time to validate the data, find out how many fields must be created and
+        optionally detect their types, and a second time to import the rows by chunk.
+        Only one chunk of rows is ever kept in memory.
+
+        :param user: The user on whose behalf the table is created.
+        :param database: The database that the table instance belongs to.
+        :param name: The name of the table is created.
+        :param reader: The reader providing the rows.
+        :param first_row_header: Indicates if the first row are the fields.
+        :param progress: An optional progress instance if you want to track the progress
+            of the task.
+        :param detect_field_types: If True, the type of each field is detected from
+            the provided data instead of creating text fields only.
+        :return: The created table and the error report.
+        """
+
+        inferrer = FieldTypeInferrer() if detect_field_types else None
+        skip_header = first_row_header
+
+        def infer_field_types(chunk):
+            nonlocal skip_header
+            inferrer.feed(chunk[1:] if skip_header else chunk)
+            skip_header = False
+
+        row_count, largest_column_count, first_row = reader.scan(
+            chunk_callback=infer_field_types if inferrer else None
+        )
+        header = list(first_row) if first_row_header and first_row is not None else []
+
+        field_names = self.normalize_initial_table_header(
+            header, row_count, largest_column_count
+        )
+        if first_row_header:
+            row_count -= 1
+
+        if inferrer:
+            fields = inferrer.get_fields(field_names)
+        else:
+            fields = [(field_name, "text", {}) for field_name in field_names]
+
+        table = self.create_table_and_fields(user, database, name, fields)
+
+        if inferrer:
+            convert_row = get_row_converter(fields)
+        else:
+
+            def convert_row(row):
+                return [str(value) for value in row]
+
+        chunks = (
+            [convert_row(row) for row in chunk]
+            for chunk in reader.iter_chunks(skip_first_row=first_row_header)
+        )
+        _, error_report = RowHandler().import_rows_in_chunks(
+            user, table, chunks, row_count, progress=progress
+        )
+
+        table_created.send(self, table=table, user=user)
+
+        return table, error_report
+
     def create_table_and_fields(
         self,
         user: AbstractUser,
@@ -192,21 +295,28 @@ class TableHandler:
         :param fields: You specify the field configuration with this parameter. The
             tuples content is the field name, then the field type and the field
             configuration. You can add an optional `field_options` dict for the
-            field_options of the created view.
+            field_options of the created view and a `select_options` list for the
+            select options of the field. The list is updated in place with the
+            created field instances.
         """
 
         last_order = Table.get_last_order(database)
+        # The table is empty, so the row count is known and can be maintained from
+        # the start.
         table = Table.objects.create(
             database=database,
             order=last_order,
             name=name,
+            row_count=0,
         )
 
         # Let's create the fields before creating the model so that the whole
         # table schema is created right away.
         field_options_dict = {}
+        select_options = []
         for index, (name, field_type_name, field_config) in enumerate(fields):
             field_options = field_config.pop("field_options", None)
+            field_select_options = field_config.pop("select_options", [])
             field_type = field_type_registry.get(field_type_name)
             FieldModel = field_type.model_class
 
@@ -219,6 +329,13 @@ class TableHandler:
             )
             if field_options:
                 field_options_dict[fields[index].id] = field_options
+            select_options += [
+                SelectOption(field=fields[index], order=order, **select_option)
+                for order, select_option in enumerate(field_select_options)
+            ]
+
+        if select_options:
+            SelectOption.objects.bulk_create(select_options)
 
         # Creates a default view
         view_handler = ViewHandler()
@@ -246,7 +363,10 @@ class TableHandler:
         return table
 
     def normalize_initial_table_data(
-        self, data: List[List[Any]], first_row_header: bool
+        self,
+        data: List[List[Any]],
+        first_row_header: bool,
+        detect_field_types: bool = False,
     ) -> Tuple[List, List]:
         """
         Normalizes the provided initial table data. The amount of columns will be made
@@ -255,6 +375,10 @@ class TableHandler:
         :param data: A list containing all the provided rows.
         :param first_row_header: Indicates if the first row is the header. For each
             of these header columns a field is going to be created.
+        :param detect_field_types: If True, the field types are detected based on the
+            data and the values of the rows are left untouched, so that they can be
+            converted once the fields are created. Otherwise text fields are used and
+            all the values are converted to strings.
         :raises InvalidInitialTableData: When the data doesn't contain a column or row.
         :raises MaxFieldNameLengthExceeded: When the provided name is too long.
         :raises InitialTableDataDuplicateName: When duplicates exit in field names.
@@ -268,19 +392,59 @@ class TableHandler:
         if len(data) == 0:
             raise InvalidInitialTableData("At least one row should be provided.")
 
+        row_count = len(data)
+        largest_column_count = len(max(data, key=len))
+        header = data.pop(0) if first_row_header else []
+
+        fields = self.normalize_initial_table_header(
+            header, row_count, largest_column_count
+        )
+
+        if detect_field_types:
+            inferrer = FieldTypeInferrer()
+            inferrer.feed(data)
+            return inferrer.get_fields(fields), data
+
+        fields_with_type = [(field_name, "text", {}) for field_name in fields]
+        result = [[str(value) for value in row] for row in data]
+
+        return fields_with_type, result
+
+    def normalize_initial_table_header(
+        self, header: List[Any], row_count: int, largest_column_count: int
+    ) -> List[str]:
+        """
+        Validates the initial table dimensions and completes the header so that
+        there is one field name for each column.
+
+        :param header: The provided field names, can be empty.
+        :param row_count: The amount of provided rows, including the header row.
+        :param largest_column_count: The amount of columns of the widest row.
+        :raises InvalidInitialTableData: When the data doesn't contain a column or row.
+        :raises InitialTableDataLimitExceeded: When there are too many rows.
+        :raises MaxFieldLimitExceeded: When there are too many columns.
+        :raises MaxFieldNameLengthExceeded: When the provided name is too long.
+        :raises InitialTableDataDuplicateName: When duplicates exit in field names.
+        :raises ReservedBaserowFieldNameException: When the field name is reserved by
+            Baserow.
+        :raises InvalidBaserowFieldName: When the field name is invalid (empty).
+        :return: The list of field names.
+        """
+
+        if row_count == 0:
+            raise InvalidInitialTableData("At least one row should be provided.")
+
         limit = settings.INITIAL_TABLE_DATA_LIMIT
-        if limit and len(data) > limit:
+        if limit and row_count > limit:
             raise InitialTableDataLimitExceeded(
                 f"It is not possible to import more than "
                 f"{settings.INITIAL_TABLE_DATA_LIMIT} rows when creating a table."
             )
 
-        largest_column_count = len(max(data, key=len))
-
         if largest_column_count == 0:
             raise InvalidInitialTableData("At least one column should be provided.")
 
-        fields = data.pop(0) if first_row_header else []
+        fields = list(header)
 
         for i in range(len(fields), largest_column_count):
             fields.append(_("Field %d") % (i + 1,))
@@ -310,10 +474,7 @@ class TableHandler:
         if "" in field_name_set:
             raise InvalidBaserowFieldName()
 
-        fields_with_type = [(field_name, "text", {}) for field_name in fields]
-        result = [[str(value) for value in row] for row in data]
-
-        return fields_with_type, result
+        return fields
 
     def get_example_table_field_and_data(self):
         """
@@ -452,7 +613,11 @@ class TableHandler:
         database.group.has_user(user, raise_error=True)
         database_type = application_type_registry.get_by_model(database)
 
-        serialized_tables = database_type.export_tables_serialized([table])
+        # The rows are not serialized, they are copied directly in the database when
+        # importing the table.
+        serialized_tables = database_type.export_tables_serialized(
+            [table], include_rows=False
+        )
         progress.increment()
 
         # Set a unique name for the table to import back as a new one.
@@ -510,28 +675,50 @@ class TableHandler:
     @classmethod
     def count_rows(cls):
         """
-        Counts how many rows each user table has and stores the count
-        for later reference.
+        Reconciles the stored row count of each user table. The counts are kept up to
+        date when rows are created, trashed or restored, so this only corrects any
+        drift. Tables which are estimated by PostgreSQL to contain less than
+        `ROW_COUNT_EXACT_COUNT_THRESHOLD` rows are counted exactly. The sequential
+        scan of larger tables is mostly avoided, their maintained count is kept or,
+        if it isn't known yet, the estimate is stored. Their maintained count is only
+        counted exactly once every `ROW_COUNT_RECONCILE_DAYS`.
         """
 
         chunk_size = 200
         tables_to_store = []
         time = timezone.now()
+        threshold = settings.ROW_COUNT_EXACT_COUNT_THRESHOLD
+        reconcile_before = time - timedelta(days=settings.ROW_COUNT_RECONCILE_DAYS)
+        estimated_row_counts = get_estimated_row_counts()
         for i, table in enumerate(
             Table.objects.filter(database__group__template__isnull=True).iterator(
                 chunk_size=chunk_size
             )
         ):
-            try:
-                count = table.get_model(field_ids=[]).objects.count()
-                table.row_count = count
-                table.row_count_updated_at = time
-                tables_to_store.append(table)
-            except ProgrammingError as e:
-                if f'"database_table_{table.id}" does not exist' in str(e):
-                    logger.warning(f"Error while counting rows {e}")
-                else:
-                    raise e
+            estimated_row_count = estimated_row_counts.get(table.id, 0)
+            must_reconcile = table.row_count is not None and (
+                table.row_count_updated_at is None
+                or table.row_count_updated_at < reconcile_before
+            )
+            if estimated_row_count > threshold and not must_reconcile:
+                if table.row_count is None:
+                    table.row_count = estimated_row_count
+                    table.row_count_updated_at = time
+                    tables_to_store.append(table)
+            else:
+                try:
+                    # Counted on the primary database, because the count replaces the
+                    # maintained one and a lagging replica would make it stale.
+                    with read_replica(enabled=False):
+                        count = table.get_model(field_ids=[]).objects.count()
+                    table.row_count = count
+                    table.row_count_updated_at = time
+                    tables_to_store.append(table)
+                except ProgrammingError as e:
+                    if f'"database_table_{table.id}" does not exist' in str(e):
+                        logger.warning(f"Error while counting rows {e}")
+                    else:
+                        raise e
 
             # This makes sure we don't pollute the memory
             if i % chunk_size == 0:
@@ -550,6 +737,9 @@ class TableHandler:
         """
         Returns the total row count of all tables in the given group.
 
+        The row counts are maintained when rows are created, trashed or restored so
+        this is a cheap lookup.
+
         :param group_id: The group of which the total row count needs to be calculated.
         :return: The total row count of all tables in the given group.
         """
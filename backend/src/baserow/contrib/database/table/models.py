@@ -318,6 +318,20 @@ class TableModelManager(TableModelTrashAndObjectsManager):
 FieldObject = Dict[str, Any]
 
 
+class RowChangedOnMixin(models.Model):
+    """
+    Introduces a timestamp that is updated whenever anything about the row changes,
+    including its trashed state and the values that are recomputed because another
+    row changed. Unlike the `updated_on` field, which is shown to the user as the
+    last modified date, it's only used to find the changed rows.
+    """
+
+    changed_on = models.DateTimeField(auto_now=True, blank=True, editable=False)
+
+    class Meta:
+        abstract = True
+
+
 class GeneratedTableModel(models.Model):
     """
     Mixed into Model classes which have been generated by Baserow.
@@ -436,6 +450,10 @@ class Table(
                         fields=["order", "id"],
                         name=self.get_collision_safe_order_id_idx_name(),
                     ),
+                    models.Index(
+                        fields=["changed_on", "id"],
+                        name=self.get_collision_safe_changed_on_id_idx_name(),
+                    ),
                 ],
             },
         )
@@ -490,6 +508,11 @@ class Table(
         else:
             field_attrs = None
 
+        # The version of the table the fields of the model belong to. It's only known
+        # when the model contains all the fields and can be used to cache things
+        # derived from them.
+        attrs["_table_version"] = self.version if use_cache else None
+
         if field_attrs is None:
             field_attrs = self._fetch_and_generate_field_attrs(
                 add_dependencies,
@@ -512,6 +535,7 @@ class Table(
                 GeneratedTableModel,
                 TrashableModelMixin,
                 CreatedAndUpdatedOnMixin,
+                RowChangedOnMixin,
                 models.Model,
             ),
             attrs,
@@ -657,6 +681,9 @@ class Table(
     def get_collision_safe_order_id_idx_name(self):
         return f"tbl_order_id_{self.id}_idx"
 
+    def get_collision_safe_changed_on_id_idx_name(self):
+        return f"tbl_changed_on_id_{self.id}_idx"
+
 
 class DuplicateTableJob(JobWithUserDataMixin, Job):
 
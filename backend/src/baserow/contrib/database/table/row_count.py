@@ -0,0 +1,83 @@
+from typing import Dict
+
+from django.db import connection, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+from .models import Table
+
+
+def _apply_row_count_delta(table_id: int, delta: int):
+    if not delta:
+        return
+
+    Table.objects_and_trash.filter(id=table_id, row_count__isnull=False).update(
+        row_count=Greatest(F("row_count") + delta, 0)
+    )
+
+
+class _RowCountDelta:
+    def __init__(self, table_id: int, delta: int):
+        self.table_id = table_id
+        self.delta = delta
+
+    def __call__(self):
+        _apply_row_count_delta(self.table_id, self.delta)
+
+
+def update_table_row_count(table_id: int, delta: int):
+    """
+    Adjusts the stored row count of the table by `delta` when the current
+    transaction is committed, so that it's in sync with the rows that have been
+    created, trashed or restored. The deltas of a transaction are added up and
+    applied with a single short update after the commit, so that concurrent writers
+    of the same table don't wait for each other's transaction on the lock of the
+    table row. A count that isn't known yet is left as is, it will be set by the
+    next run of `TableHandler.count_rows`.
+
+    :param table_id: The id of the table of which the row count must be adjusted.
+    :param delta: The number of rows that have been added, negative if they have
+        been removed.
+    """
+
+    if not delta:
+        return
+
+    if connection.in_atomic_block:
+        # Only a delta of the same savepoint can be added to, otherwise rolling back
+        # the savepoint wouldn't discard this delta.
+        savepoint_ids = set(connection.savepoint_ids)
+        for entry_savepoint_ids, func in connection.run_on_commit:
+            if (
+                isinstance(func, _RowCountDelta)
+                and func.table_id == table_id
+                and entry_savepoint_ids == savepoint_ids
+            ):
+                func.delta += delta
+                return
+
+    transaction.on_commit(_RowCountDelta(table_id, delta))
+
+
+def get_estimated_row_counts() -> Dict[int, int]:
+    """
+    Returns the number of rows of every user table as estimated by PostgreSQL in
+    `pg_class.reltuples`. The estimate is updated by vacuum and analyze, it includes
+    the trashed rows and is missing for tables which have never been analyzed.
+
+    :return: A dict containing the estimated row count by table id.
+    """
+
+    prefix = Table.USER_TABLE_DATABASE_NAME_PREFIX
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT substring(c.relname FROM %s)::int, c.reltuples::bigint
+            FROM pg_class c
+            WHERE c.relkind = 'r' AND c.relname ~ %s
+              AND pg_table_is_visible(c.oid)
+              AND c.reltuples > 0
+            """,
+            [f"^{prefix}([0-9]+)$", f"^{prefix}[0-9]+$"],
+        )
+        return {table_id: estimate for table_id, estimate in cursor.fetchall()}
@@ -0,0 +1,390 @@
+import re
+from datetime import date, datetime
+from itertools import zip_longest
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from baserow.contrib.database.fields.models import NUMBER_MAX_DECIMAL_PLACES
+from baserow.contrib.database.fields.registries import field_type_registry
+
+
+# Columns with more distinct values than this are never converted to a single select.
+SINGLE_SELECT_MAX_OPTIONS = 32
+
+# A value must be used this many times on average before a column is considered to be
+# a single select.
+SINGLE_SELECT_MIN_AVERAGE_USAGE = 2
+
+SINGLE_SELECT_COLORS = [
+    "blue",
+    "green",
+    "orange",
+    "red",
+    "dark-blue",
+    "dark-green",
+    "dark-orange",
+    "dark-red",
+    "light-blue",
+    "light-green",
+    "light-orange",
+    "light-red",
+]
+
+BOOLEAN_TRUE_VALUES = {"t", "true", "on", "y", "yes", "checked"}
+BOOLEAN_FALSE_VALUES = {"f", "false", "off", "n", "no", "unchecked"}
+
+NUMBER_REGEX = re.compile(r"^-?(0|[1-9]\d*)(\.\d+)?$")
+NUMBER_MAX_DIGITS = 50
+
+TIME_REGEX = r"(?:[ T](\d{1,2}):(\d{2})(?::(\d{2}))?)?"
+ISO_DATE_REGEX = re.compile(rf"^(\d{{4}})-(\d{{1,2}})-(\d{{1,2}}){TIME_REGEX}$")
+SLASH_DATE_REGEX = re.compile(rf"^(\d{{1,2}})[/.](\d{{1,2}})[/.](\d{{4}}){TIME_REGEX}$")
+
+URL_PREFIX_REGEX = re.compile(r"^(https?://|www\.)", re.IGNORECASE)
+
+BOOLEAN = "boolean"
+NUMBER = "number"
+DATE = "date"
+EMAIL = "email"
+URL = "url"
+SINGLE_SELECT = "single_select"
+TEXT = "text"
+
+# The order in which the candidates are preferred if several of them match all the
+# values of a column.
+CANDIDATE_TYPES = [BOOLEAN, NUMBER, DATE, EMAIL, URL, SINGLE_SELECT]
+
+DateParts = Tuple[int, int, int, Optional[int], Optional[int], Optional[int]]
+
+
+def _to_datetime(parts: DateParts) -> datetime:
+    year, month, day, hour, minute, second = parts
+    return datetime(year, month, day, hour or 0, minute or 0, second or 0)
+
+
+def _parse_date(value: str) -> Dict[str, DateParts]:
+    """
+    Returns the date formats matching the value, with the date parts the value
+    represents in each format.
+    """
+
+    match = ISO_DATE_REGEX.match(value)
+    if match:
+        candidates = {"ISO": match.groups()[:3]}
+    else:
+        match = SLASH_DATE_REGEX.match(value)
+        if not match:
+            return {}
+        first, second, year = match.groups()[:3]
+        candidates = {"EU": (year, second, first), "US": (year, first, second)}
+
+    time = tuple(int(part) if part else None for part in match.groups()[3:])
+    valid = {}
+    for date_format, date_parts in candidates.items():
+        parts = tuple(int(part) for part in date_parts) + time
+        try:
+            _to_datetime(parts)
+        except ValueError:
+            continue
+        valid[date_format] = parts
+    return valid
+
+
+class ColumnTypeCandidates:
+    """
+    Keeps track of the field types that can still hold every value seen so far in a
+    column. The candidates are eliminated as soon as a value doesn't match, so a
+    column only costs something while it could still be something else than text.
+    """
+
+    def __init__(self):
+        self.candidates = set(CANDIDATE_TYPES)
+        self.non_empty_count = 0
+        self.decimal_places = 0
+        self.negative = False
+        self.date_formats = {"ISO", "EU", "US"}
+        self.date_include_time = False
+        self.distinct_values: Dict[str, int] = {}
+
+    @property
+    def done(self) -> bool:
+        return not self.candidates
+
+    def feed(self, values: List[str]):
+        """
+        Eliminates the candidates that can't hold all the provided values.
+
+        :param values: The non empty, stripped, values of the column.
+        """
+
+        if not values:
+            return
+
+        self.non_empty_count += len(values)
+
+        for candidate in list(self.candidates):
+            if not getattr(self, f"_check_{candidate}")(values):
+                self.candidates.discard(candidate)
+
+    def _check_boolean(self, values: List[str]) -> bool:
+        return all(
+            value.lower() in BOOLEAN_TRUE_VALUES
+            or value.lower() in BOOLEAN_FALSE_VALUES
+            for value in values
+        )
+
+    def _check_number(self, values: List[str]) -> bool:
+        for value in values:
+            match = NUMBER_REGEX.match(value)
+            if not match:
+                return False
+
+            decimals = match.group(2)
+            decimal_places = len(decimals) - 1 if decimals else 0
+            if (
+                decimal_places > NUMBER_MAX_DECIMAL_PLACES
+                or len(value) - decimal_places > NUMBER_MAX_DIGITS
+            ):
+                return False
+
+            self.decimal_places = max(self.decimal_places, decimal_places)
+            self.negative = self.negative or value.startswith("-")
+        return True
+
+    def _check_date(self, values: List[str]) -> bool:
+        for value in values:
+            parsed = _parse_date(value)
+            self.date_formats &= set(parsed.keys())
+            if not self.date_formats:
+                return False
+            if any(part is not None for part in next(iter(parsed.values()))[3:]):
+                self.date_include_time = True
+        return True
+
+    def _check_email(self, values: List[str]) -> bool:
+        regex = _get_field_type_regex(EMAIL)
+        return all(regex.match(value) for value in values)
+
+    def _check_url(self, values: List[str]) -> bool:
+        regex = _get_field_type_regex(URL)
+        return all(
+            URL_PREFIX_REGEX.match(value) and regex.match(value) for value in values
+        )
+
+    def _check_single_select(self, values: List[str]) -> bool:
+        for value in values:
+            if len(value) > 255:
+                return False
+            self.distinct_values[value] = self.distinct_values.get(value, 0) + 1
+        return len(self.distinct_values) <= SINGLE_SELECT_MAX_OPTIONS
+
+    def get_type(self) -> str:
+        """
+        :return: The preferred field type that can hold all the values of the column.
+        """
+
+        if self.non_empty_count == 0:
+            return TEXT
+
+        for candidate in CANDIDATE_TYPES:
+            if candidate not in self.candidates:
+                continue
+
+            if candidate == SINGLE_SELECT and (
+                self.non_empty_count
+                < len(self.distinct_values) * SINGLE_SELECT_MIN_AVERAGE_USAGE
+            ):
+                continue
+
+            return candidate
+
+        return TEXT
+
+    def get_date_format(self) -> str:
+        for date_format in ["ISO", "EU", "US"]:
+            if date_format in self.date_formats:
+                return date_format
+
+    def get_field_config(self) -> Tuple[str, Dict[str, Any]]:
+        """
+        :return: The field type and the field configuration that must be used to
+            create the field of this column.
+        """
+
+        field_type = self.get_type()
+        if field_type == NUMBER:
+            return field_type, {
+                "number_decimal_places": self.decimal_places,
+                "number_negative": self.negative,
+            }
+        elif field_type == DATE:
+            return field_type, {
+                "date_format": self.get_date_format(),
+                "date_include_time": self.date_include_time,
+            }
+        elif field_type == SINGLE_SELECT:
+            return field_type, {
+                "select_options": [
+                    {
+                        "value": value,
+                        "color": SINGLE_SELECT_COLORS[
+                            index % len(SINGLE_SELECT_COLORS)
+                        ],
+                    }
+                    for index, value in enumerate(self.distinct_values)
+                ]
+            }
+        return field_type, {}
+
+
+_field_type_regexes = {}
+
+
+def _get_field_type_regex(field_type_name: str):
+    if field_type_name not in _field_type_regexes:
+        _field_type_regexes[field_type_name] = re.compile(
+            field_type_registry.get(field_type_name).regex
+        )
+    return _field_type_regexes[field_type_name]
+
+
+class FieldTypeInferrer:
+    """
+    Detects the most specific field type that can hold all the values of each column
+    of the imported data. The data can be fed by chunks, which are processed column
+    by column, so that only the state of each column is kept in memory.
+
+    Example:
+        inferrer = FieldTypeInferrer()
+        for chunk in chunks:
+            inferrer.feed(chunk)
+        fields = inferrer.get_fields(["Name", "Age"])
+    """
+
+    def __init__(self):
+        self.columns: List[ColumnTypeCandidates] = []
+
+    def feed(self, rows: List[List[Any]]):
+        """
+        Processes a chunk of rows.
+
+        :param rows: The rows with their values in column order.
+        """
+
+        for index, values in enumerate(zip_longest(*rows, fillvalue=None)):
+            if index >= len(self.columns):
+                self.columns.append(ColumnTypeCandidates())
+
+            column = self.columns[index]
+            if column.done:
+                continue
+
+            column.feed(
+                [
+                    value
+                    for value in (
+                        "" if value is None else str(value).strip() for value in values
+                    )
+                    if value
+                ]
+            )
+
+    def get_fields(
+        self, field_names: List[str]
+    ) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Returns the field definitions in the format expected by
+        `TableHandler.create_table_and_fields`.
+
+        :param field_names: The name of the field of each column.
+        """
+
+        fields = []
+        for index, name in enumerate(field_names):
+            if index < len(self.columns):
+                field_type, config = self.columns[index].get_field_config()
+            else:
+                field_type, config = TEXT, {}
+            fields.append((name, field_type, config))
+        return fields
+
+
+def _convert_text(value):
+    return str(value)
+
+
+def _convert_stripped_or_empty(value):
+    return "" if value is None else str(value).strip()
+
+
+def _convert_number(value):
+    value = "" if value is None else str(value).strip()
+    return value or None
+
+
+def _convert_boolean(value):
+    return value is not None and str(value).strip().lower() in BOOLEAN_TRUE_VALUES
+
+
+def _get_date_converter(date_format: str, include_time: bool) -> Callable:
+    def convert(value):
+        value = "" if value is None else str(value).strip()
+        if not value:
+            return None
+
+        parts = _parse_date(value).get(date_format)
+        if parts is None:
+            # The value doesn't match the format of the field, which is reported as
+            # an error by the row validation.
+            return value
+
+        result = _to_datetime(parts)
+        return result.isoformat() if include_time else date.isoformat(result.date())
+
+    return convert
+
+
+def _get_single_select_converter(options_by_value: Dict[str, int]) -> Callable:
+    def convert(value):
+        value = "" if value is None else str(value).strip()
+        if not value:
+            return None
+        return options_by_value.get(value, value)
+
+    return convert
+
+
+def get_row_converter(fields: List[Any]) -> Callable[[List[Any]], List[Any]]:
+    """
+    Returns a function converting the raw values of an imported row to the values
+    expected by the fields that have been created based on the detected types.
+
+    :param fields: The created field instances, in column order.
+    :return: A function accepting a row and returning the converted row.
+    """
+
+    converters = []
+    for field in fields:
+        field_type = field_type_registry.get_by_model(field).type
+        if field_type == NUMBER:
+            converters.append(_convert_number)
+        elif field_type == BOOLEAN:
+            converters.append(_convert_boolean)
+        elif field_type == DATE:
+            converters.append(
+                _get_date_converter(field.date_format, field.date_include_time)
+            )
+        elif field_type in (EMAIL, URL):
+            converters.append(_convert_stripped_or_empty)
+        elif field_type == SINGLE_SELECT:
+            converters.append(
+                _get_single_select_converter(
+                    {option.value: option.id for option in field.select_options.all()}
+                )
+            )
+        else:
+            converters.append(_convert_text)
+
+    def convert_row(row: List[Any]) -> List[Any]:
+        return [converter(value) for converter, value in zip(converters, row)]
+
+    return convert_row
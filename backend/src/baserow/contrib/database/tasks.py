@@ -1,3 +1,11 @@
+from baserow.contrib.database.fields.tasks import (
+    setup_periodic_field_index_advisor_tasks,
+)
+from baserow.contrib.database.rows.tasks import setup_periodic_row_tombstone_tasks
 from baserow.contrib.database.table.tasks import setup_periodic_tasks
 
-__all__ = ["setup_periodic_tasks"]
+__all__ = [
+    "setup_periodic_tasks",
+    "setup_periodic_field_index_advisor_tasks",
+    "setup_periodic_row_tombstone_tasks",
+]
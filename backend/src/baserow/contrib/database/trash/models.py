@@ -14,3 +14,23 @@ class TrashedRows(models.Model):
     @property
     def trashed(self):
         return True
+
+
+class RowTombstone(models.Model):
+    """
+    Keeps track of the rows that have been permanently deleted, so that the changes
+    of the table can still report their deletion to the clients that haven't seen
+    them being trashed.
+    """
+
+    table = models.ForeignKey(Table, on_delete=models.CASCADE)
+    row_id = models.PositiveIntegerField()
+    deleted_on = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["table", "deleted_on", "id"],
+                name="database_rowtomb_changes_idx",
+            )
+        ]
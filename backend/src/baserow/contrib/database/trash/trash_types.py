@@ -1,17 +1,28 @@
-from typing import Optional, Any, Dict
+from collections import defaultdict
+from typing import Optional, Any, Dict, List
 
 from django.contrib.auth import get_user_model
 from django.db import connection
+from django.utils import timezone
+from psycopg2 import sql
 
 from baserow.contrib.database.db.schema import safe_django_schema_editor
 from baserow.contrib.database.fields.dependencies.update_collector import (
     FieldUpdateCollector,
 )
+from baserow.contrib.database.fields.file_references import (
+    delete_user_file_references,
+    update_user_file_references_for_rows,
+)
 from baserow.contrib.database.fields.handler import FieldHandler
 from baserow.contrib.database.fields.models import Field
 from baserow.contrib.database.fields.registries import field_type_registry
+from baserow.contrib.database.rows.changes import (
+    mark_rows_linked_to_rows_as_changed,
+)
 from baserow.contrib.database.rows.signals import rows_created
 from baserow.contrib.database.table.models import Table, GeneratedTableModel
+from baserow.contrib.database.table.row_count import update_table_row_count
 from baserow.contrib.database.table.signals import table_created, table_updated
 from baserow.contrib.database.views.handler import ViewHandler
 from baserow.contrib.database.views.models import View
@@ -20,13 +31,72 @@ from baserow.contrib.database.views.signals import view_created
 from baserow.core.exceptions import TrashItemDoesNotExist
 from baserow.core.models import TrashEntry
 from baserow.core.trash.exceptions import RelatedTableTrashedException
+from baserow.core.db import specific_iterator
 from baserow.core.trash.registries import TrashableItemType
-from .models import TrashedRows
+from .models import RowTombstone, TrashedRows
 from baserow.contrib.database.fields.field_cache import FieldCache
 
 User = get_user_model()
 
 
+def _uncache_table_models(trash_item_lookup_cache, table_ids):
+    if (
+        trash_item_lookup_cache is not None
+        and "row_table_model_cache" in trash_item_lookup_cache
+    ):
+        for table_id in table_ids:
+            trash_item_lookup_cache["row_table_model_cache"].pop(table_id, None)
+
+
+def _create_row_tombstones(table_id: int, row_ids: List[int]):
+    """
+    Records that the rows have been permanently deleted, so that the row changes
+    endpoint can still report them as deleted. The tombstones that are older than
+    the retention period are cleaned up by a periodic task.
+
+    :param table_id: The id of the table containing the rows.
+    :param row_ids: The ids of the permanently deleted rows.
+    """
+
+    RowTombstone.objects.bulk_create(
+        [RowTombstone(table_id=table_id, row_id=row_id) for row_id in row_ids]
+    )
+
+
+def _permanently_delete_rows(model: GeneratedTableModel, row_ids: List[int]):
+    """
+    Deletes the rows with the provided ids and their many to many relations using a
+    single query per table, without loading the rows. A tombstone is left behind for
+    every row.
+
+    :param model: The generated model of the table containing the rows.
+    :param row_ids: The ids of the rows to delete.
+    """
+
+    if not row_ids:
+        return
+
+    mark_rows_linked_to_rows_as_changed(model, row_ids)
+    with connection.cursor() as cursor:
+        for model_field in model._meta.many_to_many:
+            cursor.execute(
+                sql.SQL("DELETE FROM {through_table} WHERE {column} = ANY(%s)").format(
+                    through_table=sql.Identifier(
+                        model_field.remote_field.through._meta.db_table
+                    ),
+                    column=sql.Identifier(model_field.m2m_column_name()),
+                ),
+                [list(row_ids)],
+            )
+        cursor.execute(
+            sql.SQL("DELETE FROM {table} WHERE id = ANY(%s)").format(
+                table=sql.Identifier(model._meta.db_table)
+            ),
+            [list(row_ids)],
+        )
+    _create_row_tombstones(model._table_id, row_ids)
+
+
 class TableTrashableItemType(TrashableItemType):
     type = "table"
     model_class = Table
@@ -111,6 +181,35 @@ class TableTrashableItemType(TrashableItemType):
 
         trashed_item.delete()
 
+    def permanently_delete_items(
+        self,
+        trashed_items: List[Table],
+        trash_item_lookup_cache=None,
+    ) -> List[Table]:
+        """
+        Drops the schemas of all the tables using a single schema editor and deletes
+        their instances with one query.
+        """
+
+        table_ids = [table.id for table in trashed_items]
+        _uncache_table_models(trash_item_lookup_cache, table_ids)
+
+        locked_ids = set(
+            Table.objects_and_trash.select_for_update(of=("self",))
+            .filter(id__in=table_ids)
+            .values_list("id", flat=True)
+        )
+        tables = [table for table in trashed_items if table.id in locked_ids]
+        if not tables:
+            return []
+
+        with safe_django_schema_editor() as schema_editor:
+            for table in tables:
+                schema_editor.delete_model(table.get_model())
+
+        Table.objects_and_trash.filter(id__in=locked_ids).delete()
+        return tables
+
     # noinspection PyMethodMayBeStatic
     def trash(self, item_to_trash: Table, requesting_user: User):
         model = item_to_trash.get_model()
@@ -192,6 +291,52 @@ class FieldTrashableItemType(TrashableItemType):
         # the field type because some instance cleanup might need to happen.
         field_type.after_delete(field, from_model, connection)
 
+    def permanently_delete_items(
+        self,
+        trashed_items: List[Field],
+        trash_item_lookup_cache=None,
+    ) -> List[Field]:
+        """
+        Removes the fields per table, using one generated model and schema editor for
+        all the fields of the same table.
+        """
+
+        fields_by_table = defaultdict(list)
+        for field in trashed_items:
+            fields_by_table[field.table_id].append(field)
+        _uncache_table_models(trash_item_lookup_cache, fields_by_table.keys())
+
+        deleted_items = []
+        for table_fields in fields_by_table.values():
+            # The fields are looked up again because deleting the fields of a
+            # previous table can also delete related fields of this table.
+            fields = list(
+                specific_iterator(
+                    Field.objects_and_trash.select_for_update(of=("self",))
+                    .filter(id__in=[field.id for field in table_fields])
+                    .order_by("id")
+                )
+            )
+            if not fields:
+                continue
+
+            with safe_django_schema_editor() as schema_editor:
+                from_model = fields[0].table.get_model(field_ids=[], fields=fields)
+                for field in fields:
+                    model_field = from_model._meta.get_field(field.db_column)
+                    schema_editor.remove_field(from_model, model_field)
+
+            for field in fields:
+                field_type = field_type_registry.get_by_model(field)
+                field.delete()
+                field_type.after_delete(field, from_model, connection)
+
+            deleted_ids = {field.id for field in fields}
+            deleted_items += [
+                field for field in table_fields if field.id in deleted_ids
+            ]
+        return deleted_items
+
     # noinspection PyMethodMayBeStatic
     def trash(self, item_to_trash: Field, requesting_user: User):
         """
@@ -241,12 +386,21 @@ class RowTrashableItemType(TrashableItemType):
     def get_names(self, trashed_item: Any) -> str:
         return [str(trashed_item) or f"unnamed row {trashed_item.id}"]
 
+    def trash(self, item_to_trash, requesting_user):
+        super().trash(item_to_trash, requesting_user)
+        mark_rows_linked_to_rows_as_changed(type(item_to_trash), [item_to_trash.id])
+        update_table_row_count(item_to_trash._table_id, -1)
+        delete_user_file_references(item_to_trash._table_id, [item_to_trash.id])
+
     def restore(self, trashed_item, trash_entry: TrashEntry):
         super().restore(trashed_item, trash_entry)
 
         table = self.get_parent(trashed_item, trash_entry.parent_trash_item_id)
+        update_table_row_count(table.id, 1)
 
         model = table.get_model()
+        update_user_file_references_for_rows(model, [trashed_item.id])
+        mark_rows_linked_to_rows_as_changed(model, [trashed_item.id])
 
         field_cache = FieldCache()
         update_collector = FieldUpdateCollector(
@@ -282,7 +436,35 @@ class RowTrashableItemType(TrashableItemType):
         )
 
     def permanently_delete_item(self, row, trash_item_lookup_cache=None):
+        mark_rows_linked_to_rows_as_changed(type(row), [row.id])
         row.delete()
+        _create_row_tombstones(row._table_id, [row.id])
+
+    def permanently_delete_items(self, rows, trash_item_lookup_cache=None):
+        """
+        Deletes all the rows, which are in the same table, and their relations with
+        a single query per table.
+        """
+
+        _permanently_delete_rows(type(rows[0]), [row.id for row in rows])
+        return rows
+
+    def lookup_trashed_items(
+        self, trash_entries: List[TrashEntry], trash_item_lookup_cache=None
+    ):
+        """
+        Looks up all the rows of the provided entries, which are in the same table,
+        with a single query.
+        """
+
+        model = self._get_cached_table_model(
+            trash_entries[0].parent_trash_item_id, trash_item_lookup_cache
+        )
+        return list(
+            model.trash.filter(
+                id__in=[trash_entry.trash_item_id for trash_entry in trash_entries]
+            )
+        )
 
     def lookup_trashed_item(
         self, trashed_entry: TrashEntry, trash_item_lookup_cache=None
@@ -298,6 +480,16 @@ class RowTrashableItemType(TrashableItemType):
         :return: An instance of the model_class with trashed_item_id
         """
 
+        model = self._get_cached_table_model(
+            trashed_entry.parent_trash_item_id, trash_item_lookup_cache
+        )
+
+        try:
+            return model.trash.get(id=trashed_entry.trash_item_id)
+        except model.DoesNotExist:
+            raise TrashItemDoesNotExist()
+
+    def _get_cached_table_model(self, table_id, trash_item_lookup_cache=None):
         # Cache the expensive table.get_model function call if we are looking up
         # many trash items at once.
         if trash_item_lookup_cache is not None:
@@ -305,19 +497,11 @@ class RowTrashableItemType(TrashableItemType):
                 "row_table_model_cache", {}
             )
             try:
-                model = model_cache[trashed_entry.parent_trash_item_id]
+                return model_cache[table_id]
             except KeyError:
-                model = model_cache.setdefault(
-                    trashed_entry.parent_trash_item_id,
-                    self._get_table_model(trashed_entry.parent_trash_item_id),
-                )
+                return model_cache.setdefault(table_id, self._get_table_model(table_id))
         else:
-            model = self._get_table_model(trashed_entry.parent_trash_item_id)
-
-        try:
-            return model.trash.get(id=trashed_entry.trash_item_id)
-        except model.DoesNotExist:
-            raise TrashItemDoesNotExist()
+            return self._get_table_model(table_id)
 
     def _get_table_model(self, table_id):
         table = self._get_table(table_id)
@@ -367,7 +551,12 @@ class RowsTrashableItemType(TrashableItemType):
         rows_to_restore_queryset = table_model.objects_and_trash.filter(
             id__in=trashed_item.row_ids
         )
-        rows_to_restore_queryset.update(trashed=False)
+        restored_count = rows_to_restore_queryset.update(
+            trashed=False, changed_on=timezone.now()
+        )
+        update_table_row_count(table.id, restored_count)
+        update_user_file_references_for_rows(table_model, trashed_item.row_ids)
+        mark_rows_linked_to_rows_as_changed(table_model, trashed_item.row_ids)
         rows_to_restore = rows_to_restore_queryset.enhance_by_fields()
         trashed_item.delete()
 
@@ -413,20 +602,51 @@ class RowsTrashableItemType(TrashableItemType):
         """
 
         table_model = self._get_table_model(item_to_trash.table_id)
-        table_model.objects.filter(id__in=item_to_trash.row_ids).update(trashed=True)
+        trashed_count = table_model.objects.filter(id__in=item_to_trash.row_ids).update(
+            trashed=True, changed_on=timezone.now()
+        )
+        update_table_row_count(item_to_trash.table_id, -trashed_count)
+        delete_user_file_references(item_to_trash.table_id, item_to_trash.row_ids)
+        mark_rows_linked_to_rows_as_changed(table_model, item_to_trash.row_ids)
         item_to_trash.save()
 
     def permanently_delete_item(self, trashed_item, trash_item_lookup_cache=None):
-        table_model = self._get_table_model(trashed_item.table_id)
-        delete_qs = table_model.objects_and_trash.filter(id__in=trashed_item.row_ids)
-        delete_qs._raw_delete(delete_qs.db)
-        trashed_item.delete()
+        self.permanently_delete_items([trashed_item], trash_item_lookup_cache)
+
+    def permanently_delete_items(self, trashed_items, trash_item_lookup_cache=None):
+        """
+        Deletes the rows of all the provided batches, which are in the same table,
+        and their relations with a single query per table.
+        """
+
+        table_model = self._get_table_model(trashed_items[0].table_id)
+        _permanently_delete_rows(
+            table_model,
+            [
+                row_id
+                for trashed_item in trashed_items
+                for row_id in trashed_item.row_ids
+            ],
+        )
+        TrashedRows.objects.filter(
+            id__in=[trashed_item.id for trashed_item in trashed_items]
+        ).delete()
+        return trashed_items
 
     def lookup_trashed_item(
         self, trashed_entry: TrashEntry, trash_item_lookup_cache=None
     ):
         return TrashedRows.objects.get(id=trashed_entry.trash_item_id)
 
+    def lookup_trashed_items(
+        self, trash_entries: List[TrashEntry], trash_item_lookup_cache=None
+    ):
+        return list(
+            TrashedRows.objects.filter(
+                id__in=[trash_entry.trash_item_id for trash_entry in trash_entries]
+            )
+        )
+
     def _get_table_model(self, table_id):
         table = self._get_table(table_id)
         return table.get_model()
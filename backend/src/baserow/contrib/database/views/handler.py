@@ -33,6 +33,7 @@ from baserow.contrib.database.rows.handler import RowHandler
 from baserow.contrib.database.rows.signals import rows_created
 from baserow.contrib.database.table.models import Table, GeneratedTableModel
 from baserow.contrib.database.api.utils import get_include_exclude_field_ids
+from baserow.core.db_routers import read_replica
 from baserow.core.trash.handler import TrashHandler
 from baserow.core.utils import (
     extract_allowed,
@@ -1613,7 +1614,8 @@ class ViewHandler:
         if with_total:
             aggregation_dict["total"] = Count("id", distinct=True)
 
-        return queryset.aggregate(**aggregation_dict)
+        with read_replica():
+            return queryset.aggregate(**aggregation_dict)
 
     def rotate_view_slug(self, user: AbstractUser, view: View) -> View:
         """
@@ -660,6 +660,25 @@ class ViewFilterType(Instance):
     checked and returns True if compatible or False if not.
     """
 
+    index_kind: Optional[str] = None
+    """
+    The kind of index on the column of the field that speeds up this filter, either
+    `INDEX_KIND_BTREE` or `INDEX_KIND_TRIGRAM`. The index advisor only considers the
+    filters that have one.
+    """
+
+    def get_index_kind(self, field: "Field") -> Optional[str]:
+        """
+        Returns the kind of index on the column of the provided field that speeds up
+        this filter, or None if there is none. Can be overridden if that depends on
+        the field.
+
+        :param field: The specific field instance that is filtered on.
+        :return: The kind of index or None.
+        """
+
+        return self.index_kind
+
     def default_filter_on_exception(self):
         """The default Q to use when the filter value is of an incompatible type."""
 
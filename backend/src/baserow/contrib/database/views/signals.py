@@ -2,6 +2,7 @@ from django.dispatch import Signal, receiver
 
 from baserow.contrib.database.fields import signals as field_signals
 from baserow.contrib.database.fields.models import FileField
+from baserow.core.cache import bump_version_on_commit
 
 from .models import GalleryView
 
@@ -42,3 +43,36 @@ def field_deleted(sender, field, **kwargs):
         decorator_value_provider_type
     ) in decorator_value_provider_type_registry.get_all():
         decorator_value_provider_type.after_field_delete(field)
+
+
+def get_view_settings_version_name(view_id: int) -> str:
+    """
+    Returns the name of the version counter that's bumped whenever the settings of
+    the view that affect its rows, like the filters, sortings and field options,
+    change.
+
+    :param view_id: The id of the view.
+    :return: The name of the version counter.
+    """
+
+    return f"view_settings_{view_id}"
+
+
+@receiver(view_updated)
+@receiver(view_field_options_updated)
+def view_settings_changed(sender, view, **kwargs):
+    bump_version_on_commit(get_view_settings_version_name(view.id))
+
+
+@receiver(view_filter_created)
+@receiver(view_filter_updated)
+@receiver(view_filter_deleted)
+def view_filter_changed(sender, view_filter, **kwargs):
+    bump_version_on_commit(get_view_settings_version_name(view_filter.view_id))
+
+
+@receiver(view_sort_created)
+@receiver(view_sort_updated)
+@receiver(view_sort_deleted)
+def view_sort_changed(sender, view_sort, **kwargs):
+    bump_version_on_commit(get_view_settings_version_name(view_sort.view_id))
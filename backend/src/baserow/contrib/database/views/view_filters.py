@@ -37,6 +37,10 @@ from baserow.contrib.database.fields.field_types import (
     PhoneNumberFieldType,
     FormulaFieldType,
 )
+from baserow.contrib.database.fields.constants import (
+    INDEX_KIND_BTREE,
+    INDEX_KIND_TRIGRAM,
+)
 from baserow.contrib.database.fields.registries import field_type_registry
 from baserow.core.expressions import Timezone
 from .registries import ViewFilterType
@@ -50,6 +54,9 @@ from baserow.contrib.database.formula import (
 
 
 class NotViewFilterTypeMixin:
+    # An index doesn't help to find the rows that don't match.
+    index_kind = None
+
     def default_filter_on_exception(self):
         return Q()
 
@@ -66,6 +73,7 @@ class EqualViewFilterType(ViewFilterType):
     """
 
     type = "equal"
+    index_kind = INDEX_KIND_BTREE
     compatible_field_types = [
         TextFieldType.type,
         LongTextFieldType.type,
@@ -147,6 +155,7 @@ class ContainsViewFilterType(ViewFilterType):
     """
 
     type = "contains"
+    index_kind = INDEX_KIND_TRIGRAM
     compatible_field_types = [
         TextFieldType.type,
         LongTextFieldType.type,
@@ -216,6 +225,7 @@ class HigherThanViewFilterType(ViewFilterType):
     """
 
     type = "higher_than"
+    index_kind = INDEX_KIND_BTREE
     compatible_field_types = [
         NumberFieldType.type,
         RatingFieldType.type,
@@ -251,6 +261,7 @@ class LowerThanViewFilterType(ViewFilterType):
     """
 
     type = "lower_than"
+    index_kind = INDEX_KIND_BTREE
     compatible_field_types = [
         NumberFieldType.type,
         RatingFieldType.type,
@@ -422,6 +433,13 @@ class BaseDateFieldLookupFilterType(ViewFilterType):
         except (ParserError, ValueError):
             return Q()
 
+    def get_index_kind(self, field):
+        # Datetime columns are compared by their date part or in a timezone, which
+        # an index on the column itself can't be used for.
+        if getattr(field, "date_include_time", False) or hasattr(field, "timezone"):
+            return None
+        return super().get_index_kind(field)
+
 
 class DateBeforeViewFilterType(BaseDateFieldLookupFilterType):
     """
@@ -431,6 +449,7 @@ class DateBeforeViewFilterType(BaseDateFieldLookupFilterType):
     """
 
     type = "date_before"
+    index_kind = INDEX_KIND_BTREE
     query_field_lookup = "__lt"
     compatible_field_types = [
         DateFieldType.type,
@@ -450,6 +469,7 @@ class DateAfterViewFilterType(BaseDateFieldLookupFilterType):
     """
 
     type = "date_after"
+    index_kind = INDEX_KIND_BTREE
     query_field_lookup = "__gt"
 
 
@@ -0,0 +1,89 @@
+import time
+from typing import Dict, Iterable, Tuple
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def _get_version_cache_key(name: str) -> str:
+    return f"version_{name}"
+
+
+def _get_version_modified_cache_key(name: str) -> str:
+    return f"version_modified_{name}"
+
+
+def get_versions(names: Iterable[str]) -> Dict[str, Tuple[int, float]]:
+    """
+    Returns the current version and the timestamp of the last change of the provided
+    version counters. A counter that's not in the cache, because it has never been
+    bumped or has been evicted, is initialized with the current time in nanoseconds.
+    That value is higher than any version the counter could have had before, so a
+    version is never reused.
+
+    :param names: The names of the version counters.
+    :return: The version and the timestamp of the last change by name.
+    """
+
+    keys = {
+        name: (_get_version_cache_key(name), _get_version_modified_cache_key(name))
+        for name in names
+    }
+    cached = cache.get_many([key for name_keys in keys.values() for key in name_keys])
+
+    versions = {}
+    for name, (version_key, modified_key) in keys.items():
+        version = cached.get(version_key)
+        if version is None:
+            cache.add(version_key, time.time_ns(), timeout=None)
+            cache.add(modified_key, time.time(), timeout=None)
+            version = cache.get(version_key)
+        versions[name] = (version, cached.get(modified_key) or cache.get(modified_key))
+
+    return versions
+
+
+def bump_version(name: str):
+    """
+    Increases the version of the provided version counter and stores the timestamp
+    of the change.
+
+    :param name: The name of the version counter.
+    """
+
+    version_key = _get_version_cache_key(name)
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        cache.set(version_key, time.time_ns(), timeout=None)
+    cache.set(_get_version_modified_cache_key(name), time.time(), timeout=None)
+
+
+class _BumpVersion:
+    def __init__(self, name: str):
+        self.name = name
+
+    def __call__(self):
+        bump_version(self.name)
+
+    def __eq__(self, other):
+        return isinstance(other, _BumpVersion) and other.name == self.name
+
+
+def bump_version_on_commit(name: str):
+    """
+    Bumps the version counter when the current transaction is committed, so that
+    nobody can fetch the new version before the changes are visible. The counter is
+    only bumped once per transaction, no matter how often this is called.
+
+    :param name: The name of the version counter.
+    """
+
+    bump = _BumpVersion(name)
+    connection = transaction.get_connection()
+    if connection.in_atomic_block and any(
+        entry[1] == bump for entry in connection.run_on_commit
+    ):
+        return
+
+    transaction.on_commit(bump)
@@ -0,0 +1,192 @@
+import contextlib
+import random
+from contextvars import ContextVar
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from baserow.core.cache import bump_version_on_commit
+
+_read_replica_enabled = ContextVar("read_replica_enabled", default=False)
+
+
+@contextlib.contextmanager
+def read_replica(enabled: bool = True):
+    """
+    Context manager that allows the read only queries of the user tables executed
+    within it to be sent to one of the configured read replicas. Should only wrap code
+    that doesn't need to see changes made in the same request, except for the changes
+    to the user tables which are protected by `mark_table_as_changed`.
+
+    with read_replica():
+        rows = list(view_handler.get_queryset(view))
+
+    :param enabled: Can be set to False to force the queries to the primary database.
+    """
+
+    token = _read_replica_enabled.set(enabled)
+    try:
+        yield
+    finally:
+        _read_replica_enabled.reset(token)
+
+
+def _get_sticky_table_cache_key(table_id: int) -> str:
+    return f"read_replica_sticky_table_{table_id}"
+
+
+def _make_table_sticky(table_id: int):
+    cache.set(
+        _get_sticky_table_cache_key(table_id),
+        True,
+        timeout=settings.DATABASE_READ_REPLICA_STICKY_SECONDS,
+    )
+
+
+class _MakeTableSticky:
+    def __init__(self, table_id: int):
+        self.table_id = table_id
+
+    def __call__(self):
+        _make_table_sticky(self.table_id)
+
+    def __eq__(self, other):
+        return isinstance(other, _MakeTableSticky) and other.table_id == self.table_id
+
+
+def mark_table_as_changed(table_id: int):
+    """
+    Makes sure that the reads of the table are sent to the primary database for the
+    next `DATABASE_READ_REPLICA_STICKY_SECONDS`, so that a change to the table is
+    immediately visible to the user making it, even if the replicas lag behind. The
+    period starts again when the current transaction is committed, because the
+    replicas can only receive the change from then on, no matter how long the
+    transaction took.
+
+    :param table_id: The id of the table that has been changed.
+    """
+
+    if not settings.DATABASE_READ_REPLICAS:
+        return
+
+    _make_table_sticky(table_id)
+
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        return
+
+    make_sticky = _MakeTableSticky(table_id)
+    if not any(entry[1] == make_sticky for entry in connection.run_on_commit):
+        transaction.on_commit(make_sticky)
+
+
+def get_table_data_version_name(table_id: int) -> str:
+    """
+    Returns the name of the version counter that's bumped whenever the data of the
+    table changes. The current version can be fetched with
+    `baserow.core.cache.get_versions`.
+
+    :param table_id: The id of the table.
+    :return: The name of the version counter.
+    """
+
+    return f"table_data_{table_id}"
+
+
+def mark_table_data_as_changed(table_id: int):
+    """
+    Bumps the data version of the table when the current transaction is committed.
+    Called for every write to a user table, so that clients can cheaply check if the
+    rows of a table could have changed.
+
+    :param table_id: The id of the table of which the data has changed.
+    """
+
+    bump_version_on_commit(get_table_data_version_name(table_id))
+
+
+def _get_written_table_ids(model):
+    table_id = getattr(model, "_table_id", None)
+    if table_id is not None:
+        return [table_id]
+
+    # The auto created through models of the link row fields connect two tables.
+    if model._meta.auto_created:
+        return [
+            field.related_model._table_id
+            for field in model._meta.concrete_fields
+            if getattr(field.related_model, "_table_id", None) is not None
+        ]
+
+    return []
+
+
+def get_read_replica_alias(table_id: int) -> Optional[str]:
+    """
+    Returns the alias of the read replica that can be used to read the provided user
+    table or None if the primary database must be used.
+
+    :param table_id: The id of the table that's going to be read.
+    :return: The database alias of a random read replica or None.
+    """
+
+    replicas = settings.DATABASE_READ_REPLICAS
+    if not replicas or not _read_replica_enabled.get():
+        return None
+
+    if cache.get(_get_sticky_table_cache_key(table_id)):
+        return None
+
+    return random.choice(replicas)  # nosec
+
+
+class ReadReplicaRouter:
+    """
+    Sends the read queries of the generated table models to the read replicas if
+    allowed by the `read_replica` context manager. All the other queries and writes
+    are always sent to the primary database. Every write to a user table also bumps
+    the data version of the table.
+    """
+
+    def db_for_read(self, model, **hints):
+        # Some generated models, like the select options of a multiple select field,
+        # don't belong to a user table and are always read from the primary database.
+        table_id = getattr(model, "_table_id", None)
+        if table_id is not None:
+            return get_read_replica_alias(table_id)
+        return None
+
+    def db_for_write(self, model, **hints):
+        for written_table_id in _get_written_table_ids(model):
+            mark_table_data_as_changed(written_table_id)
+
+        if not settings.DATABASE_READ_REPLICAS:
+            return None
+
+        table_id = getattr(model, "_table_id", None)
+        if table_id is not None:
+            mark_table_as_changed(table_id)
+            return settings.USER_TABLE_DATABASE
+
+        # Objects fetched from a replica must still be saved in the primary database.
+        instance = hints.get("instance")
+        if (
+            instance is not None
+            and instance._state.db in settings.DATABASE_READ_REPLICAS
+        ):
+            return DEFAULT_DB_ALIAS
+
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_READ_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_READ_REPLICAS:
+            return False
+        return None
@@ -4,14 +4,14 @@ import os
 
 from io import BytesIO
 from pathlib import Path
-from typing import Any, Dict, NewType, Optional, cast, List
+from typing import IO, Any, Dict, Generator, NewType, Optional, cast, List
 from urllib.parse import urlparse, urljoin
 from zipfile import ZipFile, ZIP_DEFLATED
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AbstractUser
-from django.core.files.storage import default_storage
+from django.core.files.storage import Storage, default_storage
 from django.db import transaction
 from django.db.models import Q, Count, QuerySet
 from django.utils import translation
@@ -64,7 +64,12 @@ from .signals import (
     groups_reordered,
 )
 from .trash.handler import TrashHandler
-from .utils import ChildProgressBuilder, find_unused_name, set_allowed_attrs
+from .utils import (
+    ChildProgressBuilder,
+    find_unused_name,
+    set_allowed_attrs,
+    stream_json,
+)
 
 User = get_user_model()
 
@@ -829,7 +834,9 @@ class CoreHandler:
         # export the application
         specific_application = application.specific
         application_type = application_type_registry.get_by_model(specific_application)
-        serialized = application_type.export_serialized(specific_application)
+        serialized = application_type.export_serialized_for_duplication(
+            specific_application
+        )
         progress.increment()
 
         # Set a new unique name for the new application
@@ -909,9 +916,8 @@ class CoreHandler:
         """
         Exports the applications of a group to a list. They can later be imported via
         the `import_applications_to_group` method. The result can be serialized to JSON.
-
-        @TODO look into speed optimizations by streaming to a JSON file instead of
-            generating the entire file in memory.
+        Use `export_group_applications_to_json` to export big groups without keeping
+        the whole export in memory.
 
         :param group: The group of which the applications must be exported.
         :type group: Group
@@ -928,18 +934,65 @@ class CoreHandler:
             storage = default_storage
 
         with ZipFile(files_buffer, "a", ZIP_DEFLATED, False) as files_zip:
-            exported_applications = []
-            applications = group.application_set.all()
-            for a in applications:
-                application = a.specific
-                application_type = application_type_registry.get_by_model(application)
-                with application_type.export_safe_transaction_context(application):
-                    exported_application = application_type.export_serialized(
+            return list(
+                self._iter_exported_group_applications(group, files_zip, storage)
+            )
+
+    def export_group_applications_to_json(
+        self,
+        group: Group,
+        json_buffer: IO[str],
+        files_buffer: IO[bytes],
+        storage: Optional[Storage] = None,
+        indent: Optional[int] = None,
+    ):
+        """
+        Exports the applications of a group as JSON to the provided buffer, in the
+        same format as the `export_group_applications` method. The rows are fetched,
+        serialized and written by chunks, so the memory usage doesn't depend on the
+        size of the group.
+
+        :param group: The group of which the applications must be exported.
+        :param json_buffer: A text file buffer where the JSON is written to.
+        :param files_buffer: A file buffer where the files must be written to in ZIP
+            format.
+        :param storage: The storage where the files can be loaded from.
+        :param indent: If provided, the JSON is pretty printed with that indent level.
+        """
+
+        if not storage:
+            storage = default_storage
+
+        with ZipFile(files_buffer, "a", ZIP_DEFLATED, False) as files_zip:
+            stream_json(
+                self._iter_exported_group_applications(
+                    group, files_zip, storage, lazily=True
+                ),
+                json_buffer,
+                indent=indent,
+            )
+
+    def _iter_exported_group_applications(
+        self, group: Group, files_zip: ZipFile, storage: Storage, lazily: bool = False
+    ) -> Generator[Dict[str, Any], None, None]:
+        """
+        Yields the exported applications of the group. Every application is yielded
+        from within its export transaction, so that a lazy export can be consumed
+        before moving on to the next application.
+        """
+
+        for a in group.application_set.all():
+            application = a.specific
+            application_type = application_type_registry.get_by_model(application)
+            with application_type.export_safe_transaction_context(application):
+                if lazily:
+                    yield application_type.export_serialized_lazily(
+                        application, files_zip, storage
+                    )
+                else:
+                    yield application_type.export_serialized(
                         application, files_zip, storage
                     )
-                exported_applications.append(exported_application)
-
-        return exported_applications
 
     def import_applications_to_group(
         self,
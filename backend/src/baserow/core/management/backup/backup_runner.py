@@ -1,12 +1,14 @@
+import heapq
 import math
 import re
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 
 # See nosec comment later in file.
 import subprocess  # nosec
 import tarfile
 import tempfile
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, List, Optional
 
 import psycopg2
 from django.utils import timezone
@@ -31,6 +33,7 @@ class BaserowBackupRunner:
         username: str,
         port: Optional[str] = "5432",
         jobs: Optional[int] = 1,
+        parallel_batches: Optional[int] = 1,
     ):
         """
         Constructs a BaserowBackupRunner.
@@ -40,6 +43,9 @@ class BaserowBackupRunner:
         :param username: The username to connect to the database as.
         :param port: The port to connect to the database using.
         :param jobs: How many parallel dump/restart jobs to run per batch.
+        :param parallel_batches: How many batches to dump/restore at the same time.
+            When larger than one the user tables are also distributed over the
+            batches based on their size instead of their name.
         """
 
         self.host = host
@@ -47,6 +53,7 @@ class BaserowBackupRunner:
         self.username = username
         self.port = port
         self.jobs = jobs
+        self.parallel_batches = max(parallel_batches or 1, 1)
 
     def backup_baserow(
         self,
@@ -191,21 +198,35 @@ class BaserowBackupRunner:
 
         with self._build_connection() as connection:
             sorted_user_table_names = _get_sorted_user_tables_names(connection)
-        num_batches = math.ceil(len(sorted_user_table_names) / batch_size)
-        for batch_num in range(num_batches):
-            tables_to_dump_this_batch = sorted_user_table_names[
-                batch_num * batch_size : (batch_num + 1) * batch_size
+            if self.parallel_batches > 1:
+                table_sizes = _get_user_table_sizes(connection)
+
+        if self.parallel_batches > 1:
+            batches = _split_tables_into_balanced_batches(
+                sorted_user_table_names, table_sizes, batch_size
+            )
+        else:
+            num_batches = math.ceil(len(sorted_user_table_names) / batch_size)
+            batches = [
+                sorted_user_table_names[
+                    batch_num * batch_size : (batch_num + 1) * batch_size
+                ]
+                for batch_num in range(num_batches)
             ]
+
+        commands = []
+        for batch_num, tables_to_dump_this_batch in enumerate(batches):
             pg_dump_tables_include_arg = [
                 f"--table={t}" for t in tables_to_dump_this_batch
             ]
-            self._run_command_in_sub_process(
+            commands.append(
                 self._build_pg_dump_command(
                     pg_dump_tables_include_arg
                     + [f"--file={output_directory}/user_tables_batch_{batch_num}/"]
                     + additional_pg_dump_args
-                ),
+                )
             )
+        self._run_batch_commands(commands)
 
     def _restore_everything_but_user_tables(
         self,
@@ -227,16 +248,52 @@ class BaserowBackupRunner:
         extracted_backup_location: Path,
         additional_pg_restore_args: List[str],
     ):
+        commands = []
         for child in extracted_backup_location.iterdir():
             if child.name != NO_USER_TABLES_BACKUP_SUB_FOLDER:
-                self._run_command_in_sub_process(
+                commands.append(
                     self._build_pg_restore_command(
                         [
                             str(child),
                         ]
                         + additional_pg_restore_args
-                    ),
+                    )
                 )
+        self._run_batch_commands(commands)
+
+    def _run_batch_commands(self, commands: List[List[str]]):
+        """
+        Runs the provided batch commands, at most `parallel_batches` of them at the
+        same time. Every command runs in its own `pg_dump`/`pg_restore` process, the
+        threads are only used to wait on them. The commands are started in the
+        provided order and as soon as one fails the ones which haven't started yet are
+        cancelled.
+
+        :param commands: The commands to run.
+        :raises CalledProcessError: When one of the commands fails.
+        """
+
+        if self.parallel_batches <= 1:
+            for command in commands:
+                self._run_command_in_sub_process(command)
+            return
+
+        total = len(commands)
+        finished = 0
+        with ThreadPoolExecutor(max_workers=self.parallel_batches) as executor:
+            pending = {
+                executor.submit(self._run_command_in_sub_process, command)
+                for command in commands
+            }
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_EXCEPTION)
+                for future in done:
+                    if future.exception() is not None:
+                        for not_started in pending:
+                            not_started.cancel()
+                        raise future.exception()
+                    finished += 1
+                print(f"Finished {finished}/{total} batches.")
 
     def _open_files_and_run_backup(
         self,
@@ -301,6 +358,75 @@ def _get_sorted_user_tables_names(conn) -> List[str]:
         return [r[0] for r in cursor.fetchall()]
 
 
+def _get_user_table_sizes(conn) -> Dict[str, int]:
+    """
+    Queries the provided connection for the estimated size, in pages, of Baserow's
+    user tables including their toast table. The estimate comes from `pg_class` so
+    it's cheap to compute, even for a large number of tables.
+    """
+
+    with conn.cursor() as cursor:
+        cursor.execute(
+            """SELECT CONCAT(n.nspname, '.', c.relname),
+           c.relpages + COALESCE(t.relpages, 0)
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    LEFT JOIN pg_class t ON t.oid = c.reltoastrelid
+    WHERE c.relkind = 'r' AND (
+          c.relname LIKE %(table_prefix)s or
+          c.relname LIKE %(through_table_prefix)s or
+          c.relname LIKE %(multipleselect_table_prefix)s
+    )""",
+            {
+                "table_prefix": f"{Table.USER_TABLE_DATABASE_NAME_PREFIX}%",
+                "through_table_prefix": f"{LinkRowField.THROUGH_DATABASE_TABLE_PREFIX}%",
+                "multipleselect_table_prefix": (
+                    f"{MultipleSelectField.THROUGH_DATABASE_TABLE_PREFIX}%"
+                ),
+            },
+        )
+        return {name: size for name, size in cursor.fetchall()}
+
+
+def _split_tables_into_balanced_batches(
+    table_names: List[str], table_sizes: Dict[str, int], batch_size: int
+) -> List[List[str]]:
+    """
+    Splits the tables into the same number of batches as when splitting them by
+    name, but distributes them so that every batch contains roughly the same amount
+    of data. Starting with the largest table, each table is added to the smallest
+    batch which isn't full yet. The largest batches are returned first so that they
+    are started first when running in parallel.
+
+    :param table_names: The names of the tables to split.
+    :param table_sizes: The size of every table by name, unknown tables are
+        considered empty.
+    :param batch_size: The maximum number of tables per batch.
+    :return: The batches, every batch containing the table names in their original
+        order.
+    """
+
+    num_batches = math.ceil(len(table_names) / batch_size)
+    batches = [[] for _ in range(num_batches)]
+    batch_totals = [0] * num_batches
+    order = {name: index for index, name in enumerate(table_names)}
+    # Heap of the batches which aren't full yet, smallest total size first.
+    open_batches = [(0, batch_num) for batch_num in range(num_batches)]
+
+    for name in sorted(table_names, key=lambda n: -table_sizes.get(n, 0)):
+        total, batch_num = heapq.heappop(open_batches)
+        batches[batch_num].append(name)
+        batch_totals[batch_num] = total + table_sizes.get(name, 0)
+        if len(batches[batch_num]) < batch_size:
+            heapq.heappush(open_batches, (batch_totals[batch_num], batch_num))
+
+    sorted_batch_nums = sorted(range(num_batches), key=lambda b: -batch_totals[b])
+    return [
+        sorted(batches[batch_num], key=lambda n: order[n])
+        for batch_num in sorted_batch_nums
+    ]
+
+
 def _default_backup_location(database):
     now = timezone.now().strftime("%Y-%m-%d_%H-%M-%S")
     return f"baserow_backup_{database}_{now}.tar.gz"
@@ -71,6 +71,16 @@ class Command(BaseCommand):
             "server. Please read the `pg_dump` documentation for this argument "
             "for further details.",
         )
+        parser.add_argument(
+            "--parallel-batches",
+            type=int,
+            dest="parallel-batches",
+            default=1,
+            help="The number of batches to run `pg_dump` for at the same time. When "
+            "larger than 1 the tables are also spread over the batches based on "
+            "their size. Combined with --jobs this can open up to "
+            "parallel-batches * jobs connections to the database.",
+        )
         parser.add_argument(
             "-f",
             "--file",
@@ -101,6 +111,7 @@ class Command(BaseCommand):
         batch_size = options["batch-size"]
         file = options["file"]
         jobs = options["jobs"]
+        parallel_batches = options["parallel-batches"]
         additional_args = options["additional_pg_dump_args"]
 
         runner = BaserowBackupRunner(
@@ -109,6 +120,7 @@ class Command(BaseCommand):
             username,
             port,
             jobs,
+            parallel_batches,
         )
         try:
             backup_file_name = runner.backup_baserow(file, batch_size, additional_args)
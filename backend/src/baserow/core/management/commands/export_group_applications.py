@@ -1,5 +1,4 @@
 import sys
-import json
 import os
 
 from django.core.management.base import BaseCommand
@@ -52,12 +51,12 @@ class Command(BaseCommand):
         files_path = os.path.join(current_path, f"{file_name}.zip")
         export_path = os.path.join(current_path, f"{file_name}.json")
 
-        with open(files_path, "wb") as files_buffer:
-            exported_applications = CoreHandler().export_group_applications(
-                group, files_buffer=files_buffer
-            )
-
-        with open(export_path, "w") as export_buffer:
-            json.dump(
-                exported_applications, export_buffer, indent=4 if indent else None
+        with open(files_path, "wb") as files_buffer, open(
+            export_path, "w"
+        ) as export_buffer:
+            CoreHandler().export_group_applications_to_json(
+                group,
+                json_buffer=export_buffer,
+                files_buffer=files_buffer,
+                indent=4 if indent else None,
             )
@@ -1,12 +1,28 @@
-from PIL import Image
+import os
+from concurrent.futures import ProcessPoolExecutor
 
 from django.core.management.base import BaseCommand
-from django.core.files.storage import default_storage
+from django.db import connections
 
 from baserow.core.user_files.models import UserFile
 from baserow.core.user_files.handler import UserFileHandler
 
 
+def _close_db_connections():
+    # The forked worker processes must not share the database connections of the
+    # parent process, they will open their own when needed.
+    connections.close_all()
+
+
+def _regenerate_thumbnails(user_file_ids, only_with_name):
+    handler = UserFileHandler()
+    for user_file in UserFile.objects.filter(id__in=user_file_ids):
+        handler.generate_and_save_thumbnails_from_storage(
+            user_file, only_with_name=only_with_name
+        )
+    return len(user_file_ids)
+
+
 class Command(BaseCommand):
     help = (
         "Regenerates all the user file thumbnails based on the current settings. "
@@ -22,6 +38,13 @@ class Command(BaseCommand):
             "added to.",
             default=None,
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="The amount of processes generating the thumbnails in parallel. "
+            "Defaults to the number of CPUs.",
+        )
 
     def handle(self, *args, **options):
         """
@@ -29,32 +52,29 @@ class Command(BaseCommand):
         setting ever changes then this file can be used to fix all the thumbnails.
         """
 
-        i = 0
-        handler = UserFileHandler()
         buffer_size = 100
-        queryset = UserFile.objects.filter(is_image=True)
-        count = queryset.count()
-
-        while i < count:
-            user_files = queryset[i : min(count, i + buffer_size)]
-            for user_file in user_files:
-                i += 1
-
-                full_path = handler.user_file_path(user_file)
-                stream = default_storage.open(full_path)
-
-                try:
-                    image = Image.open(stream)
-                    handler.generate_and_save_image_thumbnails(
-                        image,
-                        user_file,
-                        storage=default_storage,
-                        only_with_name=options["name"],
-                    )
-                    image.close()
-                except IOError:
-                    pass
-
-                stream.close()
+        user_file_ids = list(
+            UserFile.objects.filter(is_image=True).values_list("id", flat=True)
+        )
+        chunks = [
+            user_file_ids[i : i + buffer_size]
+            for i in range(0, len(user_file_ids), buffer_size)
+        ]
+
+        i = 0
+        if options["workers"] <= 1:
+            for chunk in chunks:
+                i += _regenerate_thumbnails(chunk, options["name"])
+        else:
+            _close_db_connections()
+            with ProcessPoolExecutor(
+                max_workers=options["workers"], initializer=_close_db_connections
+            ) as executor:
+                for count in executor.map(
+                    _regenerate_thumbnails,
+                    chunks,
+                    [options["name"]] * len(chunks),
+                ):
+                    i += count
 
         self.stdout.write(self.style.SUCCESS(f"{i} thumbnails have been regenerated."))
@@ -52,6 +52,16 @@ class Command(BaseCommand):
             "server. Please read the `pg_restore` documentation for this argument "
             "for further details.",
         )
+        parser.add_argument(
+            "--parallel-batches",
+            type=int,
+            dest="parallel-batches",
+            default=1,
+            help="The number of batches to run `pg_restore` for at the same time. When "
+            "larger than 1 the tables are also spread over the batches based on "
+            "their size. Combined with --jobs this can open up to "
+            "parallel-batches * jobs connections to the database.",
+        )
         parser.add_argument(
             "-f",
             "--file",
@@ -81,6 +91,7 @@ class Command(BaseCommand):
         port = options["port"]
         file = options["file"]
         jobs = options["jobs"]
+        parallel_batches = options["parallel-batches"]
         additional_args = options["additional_pg_restore_args"]
 
         runner = BaserowBackupRunner(
@@ -89,6 +100,7 @@ class Command(BaseCommand):
             username,
             port,
             jobs,
+            parallel_batches,
         )
         try:
             runner.restore_baserow(file, additional_args)
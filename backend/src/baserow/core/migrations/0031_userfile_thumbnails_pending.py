@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0030_snapshots"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userfile",
+            name="thumbnails_pending",
+            field=models.BooleanField(
+                default=False,
+                help_text="Indicates whether the thumbnails are still being generated "
+                "in the background.",
+            ),
+        ),
+    ]
@@ -226,6 +226,45 @@ class ApplicationType(
             type=self.type,
         )
 
+    def export_serialized_for_duplication(
+        self, application: "Application", storage: Optional[Storage] = None
+    ) -> Dict[str, Any]:
+        """
+        Exports the application to a serialized dict that is going to be imported
+        right away in the same database by the `import_serialized` method, for
+        example to duplicate the application. Application types can override this
+        to leave the data out of the export and copy it directly in the database
+        during the import instead. By default, the regular export is used.
+
+        :param application: The application that must be exported.
+        :param storage: The storage where the files can be loaded from.
+        :return: The exported and serialized application.
+        """
+
+        return self.export_serialized(application, None, storage)
+
+    def export_serialized_lazily(
+        self,
+        application: "Application",
+        files_zip: Optional[ZipFile] = None,
+        storage: Optional[Storage] = None,
+    ) -> Dict[str, Any]:
+        """
+        Exports the application just like `export_serialized`, except that big
+        collections, like the rows of a table, can be generators that fetch and
+        serialize the data while being consumed. The result must be consumed inside
+        the `export_safe_transaction_context`, for example by writing it to a file with
+        `baserow.core.utils.stream_json`. By default, the regular export is used.
+
+        :param application: The application that must be exported.
+        :param files_zip: A zip file buffer where the files related to the template
+            must be copied into.
+        :param storage: The storage where the files can be loaded from.
+        :return: The exported and serialized application.
+        """
+
+        return self.export_serialized(application, files_zip, storage)
+
     def import_serialized(
         self,
         group: "Group",
@@ -20,3 +20,5 @@ application_created = Signal()
 application_updated = Signal()
 application_deleted = Signal()
 applications_reordered = Signal()
+
+user_file_thumbnails_generated = Signal()
@@ -344,8 +344,8 @@ class SnapshotHandler:
 
         application = snapshot.snapshot_from_application.specific
         application_type = application_type_registry.get_by_model(application)
-        exported_application = application_type.export_serialized(
-            application, None, default_storage
+        exported_application = application_type.export_serialized_for_duplication(
+            application, default_storage
         )
         progress.increment(by=50)
         imported_database = application_type.import_serialized(
@@ -380,8 +380,8 @@ class SnapshotHandler:
 
         application = snapshot.snapshot_to_application.specific
         application_type = application_type_registry.get_by_model(application)
-        exported_application = application_type.export_serialized(
-            application, None, default_storage
+        exported_application = application_type.export_serialized_for_duplication(
+            application, default_storage
         )
         progress.increment(by=50)
         imported_database = application_type.import_serialized(
@@ -9,6 +9,7 @@ from .trash.tasks import (
 )
 from .usage.tasks import run_calculate_storage
 from .user.tasks import check_pending_account_deletion
+from .user_files.tasks import generate_user_file_thumbnails
 from .snapshots.tasks import delete_expired_snapshots
 
 
@@ -33,4 +34,5 @@ __all__ = [
     "run_calculate_storage",
     "check_pending_account_deletion",
     "delete_expired_snapshots",
+    "generate_user_file_thumbnails",
 ]
@@ -1,5 +1,6 @@
 import logging
-from typing import Optional, Dict, Any
+from collections import defaultdict
+from typing import Optional, Dict, Any, List, Tuple
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
@@ -186,49 +187,64 @@ class TrashHandler:
             trash_contents.update(should_be_permanently_deleted=True)
 
     @staticmethod
-    def permanently_delete_marked_trash():
+    def permanently_delete_marked_trash(batch_size: Optional[int] = None):
         """
         Looks up every trash item marked for permanent deletion and removes them
         irreversibly from the database along with their corresponding trash entries.
+        The entries are processed in batches, every batch in its own transaction. The
+        items of a batch having the same type and parent are deleted together.
+
+        :param batch_size: The maximum number of trash entries to delete per
+            transaction. Defaults to the `TRASH_PERMANENT_DELETION_BATCH_SIZE`
+            setting.
         """
 
+        if batch_size is None:
+            batch_size = settings.TRASH_PERMANENT_DELETION_BATCH_SIZE
+
         trash_item_lookup_cache = {}
         deleted_count = 0
         while True:
             with transaction.atomic():
-                # Perm deleting a group or application can cause cascading deletion of
-                # other trash entries hence we only look up one a time. If we instead
-                # looped over a single queryset lookup of all TrashEntries then we could
-                # end up trying to delete TrashEntries which have already been deleted
-                # by a previous cascading delete of a group or application.
-                trash_entry = TrashEntry.objects.filter(
-                    should_be_permanently_deleted=True
-                ).first()
-                if not trash_entry:
-                    break
-
-                trash_item_type = trash_item_type_registry.get(
-                    trash_entry.trash_item_type
+                trash_entries = list(
+                    TrashEntry.objects.filter(
+                        should_be_permanently_deleted=True
+                    ).order_by("id")[:batch_size]
                 )
+                if not trash_entries:
+                    break
 
-                try:
-                    to_delete = trash_item_type.lookup_trashed_item(
-                        trash_entry, trash_item_lookup_cache
-                    )
-                    TrashHandler._permanently_delete_and_signal(
-                        trash_item_type,
-                        to_delete,
-                        trash_entry.parent_trash_item_id,
-                        trash_item_lookup_cache,
-                    )
-                except TrashItemDoesNotExist:
-                    # When a parent item is deleted it should also delete all of it's
-                    # children. Hence we expect that many of these TrashEntries to no
-                    # longer point to an existing item. In such a situation we just want
-                    # to delete the entry as the item itself has been correctly deleted.
-                    pass
-                trash_entry.delete()
-                deleted_count += 1
+                # Perm deleting a group or application can cause cascading deletion of
+                # other trash entries and items in the same batch. Those items simply
+                # won't be found anymore when their group of entries is processed.
+                for (
+                    trash_item_type_name,
+                    parent_id,
+                ), entries in _group_trash_entries(trash_entries).items():
+                    trash_item_type = trash_item_type_registry.get(trash_item_type_name)
+                    try:
+                        trashed_items = trash_item_type.lookup_trashed_items(
+                            entries, trash_item_lookup_cache
+                        )
+                        if trashed_items:
+                            TrashHandler._permanently_delete_items_and_signal(
+                                trash_item_type,
+                                trashed_items,
+                                parent_id,
+                                trash_item_lookup_cache,
+                            )
+                    except TrashItemDoesNotExist:
+                        # When a parent item is deleted it should also delete all of
+                        # it's children. Hence we expect that many of these
+                        # TrashEntries to no longer point to an existing item. In
+                        # such a situation we just want to delete the entries as the
+                        # items themselves have been correctly deleted.
+                        pass
+
+                TrashEntry.objects.filter(
+                    id__in=[trash_entry.id for trash_entry in trash_entries]
+                ).delete()
+                deleted_count += len(trash_entries)
         logger.info(
             f"Successfully deleted {deleted_count} trash entries and their associated "
             "trashed items."
@@ -266,6 +282,45 @@ class TrashHandler:
             parent_id=parent_id,
         )
 
+    @staticmethod
+    def _permanently_delete_items_and_signal(
+        trash_item_type: Any,
+        to_delete: List[Any],
+        parent_id: Optional[int],
+        trash_item_lookup_cache: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Same as `_permanently_delete_and_signal`, but deletes multiple items sharing
+        the same type and parent at once.
+
+        :param trash_item_type: The trashable item type of the items being deleted.
+        :param to_delete: The actual instances of the things to delete.
+        :param parent_id: If required for the trashable item type then the id of the
+            parent of the items.
+        :param trash_item_lookup_cache: An optional dictionary used for caching during
+            many different invocations of permanently_delete.
+        """
+
+        _check_parent_id_valid(parent_id, trash_item_type)
+        trash_item_ids = [item.id for item in to_delete]
+        # Django resets the primary key of deleted instances, so the deleted items
+        # are matched by identity.
+        deleted_items = {
+            id(item)
+            for item in trash_item_type.permanently_delete_items(
+                to_delete, trash_item_lookup_cache
+            )
+        }
+        for trash_item_id, trash_item in zip(trash_item_ids, to_delete):
+            if id(trash_item) not in deleted_items:
+                continue
+            permanently_deleted.send(
+                sender=trash_item_type.type,
+                trash_item_id=trash_item_id,
+                trash_item=trash_item,
+                parent_id=parent_id,
+            )
+
     @staticmethod
     def permanently_delete(trashable_item, parent_id=None):
         """
@@ -351,6 +406,22 @@ class TrashHandler:
                 trash_item_type = trash_item_type_registry.get_by_model(item)
 
 
+def _group_trash_entries(
+    trash_entries: List[TrashEntry],
+) -> Dict[Tuple[str, Optional[int]], List[TrashEntry]]:
+    """
+    Groups the provided trash entries by their trash item type and parent id, keeping
+    the order in which the groups first appear.
+    """
+
+    grouped = defaultdict(list)
+    for trash_entry in trash_entries:
+        grouped[(trash_entry.trash_item_type, trash_entry.parent_trash_item_id)].append(
+            trash_entry
+        )
+    return grouped
+
+
 def _get_group(group_id, user):
     try:
         group = Group.objects_and_trash.get(id=group_id)
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Optional, Dict
+from typing import Any, Optional, Dict, List
 
 from baserow.core.exceptions import TrashItemDoesNotExist
 from baserow.core.registry import (
@@ -52,6 +52,56 @@ class TrashableItemType(ModelInstanceMixin, Instance, ABC):
 
         pass
 
+    def lookup_trashed_items(
+        self, trash_entries: List[Any], trash_item_lookup_cache: Dict[str, Any] = None
+    ) -> List[Any]:
+        """
+        Returns the actual instances of the provided trashed entries, which all share
+        the same parent id. Entries of which the item doesn't exist anymore are
+        skipped. By default every item is looked up individually, this can be
+        overridden to look them up in bulk.
+
+        :param trash_entries: The entries to get the real trashed instances for.
+        :param trash_item_lookup_cache: A dictionary which can be used to store
+            expensive objects used to lookup these items.
+        :return: The instances of the model_class which still exist.
+        """
+
+        trashed_items = []
+        for trash_entry in trash_entries:
+            try:
+                trashed_items.append(
+                    self.lookup_trashed_item(trash_entry, trash_item_lookup_cache)
+                )
+            except TrashItemDoesNotExist:
+                pass
+        return trashed_items
+
+    def permanently_delete_items(
+        self,
+        trashed_items: List[Any],
+        trash_item_lookup_cache: Dict[str, Any] = None,
+    ) -> List[Any]:
+        """
+        Permanently deletes the provided trashed items, which all share the same
+        parent. By default every item is deleted individually using
+        `permanently_delete_item`, this can be overridden to delete them in bulk.
+
+        :param trashed_items: The items to delete permanently.
+        :param trash_item_lookup_cache: If a cache is being used to speed up trash
+            item lookups it should be provided here so it can be invalidated.
+        :return: The items which have actually been deleted.
+        """
+
+        deleted_items = []
+        for trashed_item in trashed_items:
+            try:
+                self.permanently_delete_item(trashed_item, trash_item_lookup_cache)
+            except TrashItemDoesNotExist:
+                continue
+            deleted_items.append(trashed_item)
+        return deleted_items
+
     @property
     def requires_parent_id(self) -> bool:
         """
@@ -1,8 +1,11 @@
+import hashlib
+import math
 import pathlib
 import mimetypes
 
 from os.path import join
 from io import BytesIO
+from tempfile import SpooledTemporaryFile
 from urllib.parse import urlparse
 from typing import Optional
 
@@ -14,10 +17,11 @@ from PIL import Image, ImageOps
 
 from django.conf import settings
 from django.core.files.storage import default_storage
-from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
 from django.db.models import QuerySet
 
-from baserow.core.utils import sha256_hash, stream_size, random_string, truncate_middle
+from baserow.core.signals import user_file_thumbnails_generated
+from baserow.core.utils import stream_size, random_string, truncate_middle
 
 from .exceptions import (
     InvalidFileStreamError,
@@ -29,6 +33,14 @@ from .exceptions import (
 from .models import UserFile
 
 
+# The amount of bytes that are read from an uploaded stream at once.
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Files downloaded from a URL are kept in memory up to this size while they're being
+# hashed, larger ones are written to a temporary file.
+UPLOAD_SPOOL_MAX_MEMORY_SIZE = 5 * 1024 * 1024
+
+
 class UserFileHandler:
     def get_user_file_by_name(
         self, user_file_name: int, base_queryset: Optional[QuerySet] = None
@@ -118,13 +130,77 @@ class UserFileHandler:
             ).exists():
                 return unique
 
+    def get_thumbnail_sizes(self, user_file, only_with_name=None):
+        """
+        Calculates the size of every configured thumbnail of the user file. A width or
+        height of None in the settings means that the aspect ratio must be kept.
+
+        :param user_file: The image user file for which the sizes must be calculated.
+        :type user_file: UserFile
+        :param only_with_name: If provided, only the size of the thumbnail with that
+            name is returned.
+        :type only_with_name: None or str
+        :return: The width and height by thumbnail name.
+        :rtype: dict
+        """
+
+        image_width = user_file.image_width
+        image_height = user_file.image_height
+        sizes = {}
+
+        for name, size in settings.USER_THUMBNAILS.items():
+            if only_with_name and only_with_name != name:
+                continue
+
+            size_copy = size.copy()
+
+            # If the width or height is None we want to keep the aspect ratio.
+            if size_copy[0] is None and size_copy[1] is not None:
+                size_copy[0] = round(image_width / image_height * size_copy[1])
+            elif size_copy[1] is None and size_copy[0] is not None:
+                size_copy[1] = round(image_height / image_width * size_copy[0])
+
+            sizes[name] = size_copy
+
+        return sizes
+
+    def _get_thumbnails_base_image(self, image, sizes):
+        """
+        Downscales the original image once to the smallest size from which all the
+        thumbnails can still be cropped and resized with full quality. JPEG images
+        are decoded at a reduced scale directly, which is a lot faster than decoding
+        the full resolution and resizing afterwards.
+        """
+
+        scale = max(
+            max(width / image.width, height / image.height) for width, height in sizes
+        )
+        # Keep twice the resolution so that the final resampling has enough pixels
+        # to antialias with.
+        scale = min(scale * 2, 1)
+        base_size = (
+            max(math.ceil(image.width * scale), 1),
+            max(math.ceil(image.height * scale), 1),
+        )
+
+        image.draft(image.mode, base_size)
+
+        # Palette and bilevel images can't be averaged, those are resized with the
+        # nearest neighbour anyway.
+        factor = min(image.width // base_size[0], image.height // base_size[1])
+        if factor > 1 and image.mode not in ("1", "P"):
+            image = image.reduce(factor)
+
+        return image
+
     def generate_and_save_image_thumbnails(
         self, image, user_file, storage=None, only_with_name=None
     ):
         """
         Generates the thumbnails based on the current settings and saves them to the
         provided storage. Note that existing files with the same name will be
-        overwritten.
+        overwritten. The image is only decoded once, all the thumbnails are made out
+        of a single downscaled version of it.
 
         :param image: The original Pillow image that serves as base when generating the
             the image.
@@ -144,24 +220,18 @@ class UserFileHandler:
             raise ValueError("The provided user file is not an image.")
 
         storage = storage or default_storage
-        image_width = user_file.image_width
-        image_height = user_file.image_height
+        sizes = self.get_thumbnail_sizes(user_file, only_with_name)
 
-        for name, size in settings.USER_THUMBNAILS.items():
-            if only_with_name and only_with_name != name:
-                continue
+        if not sizes:
+            return
 
-            size_copy = size.copy()
+        image_format = image.format
+        base_image = self._get_thumbnails_base_image(image, sizes.values())
 
-            # If the width or height is None we want to keep the aspect ratio.
-            if size_copy[0] is None and size_copy[1] is not None:
-                size_copy[0] = round(image_width / image_height * size_copy[1])
-            elif size_copy[1] is None and size_copy[0] is not None:
-                size_copy[1] = round(image_height / image_width * size_copy[0])
-
-            thumbnail = ImageOps.fit(image.copy(), size_copy, Image.ANTIALIAS)
+        for name, size in sizes.items():
+            thumbnail = ImageOps.fit(base_image, size, Image.ANTIALIAS)
             thumbnail_stream = BytesIO()
-            thumbnail.save(thumbnail_stream, image.format)
+            thumbnail.save(thumbnail_stream, image_format)
             thumbnail_stream.seek(0)
             thumbnail_path = self.user_file_thumbnail_path(user_file, name)
             storage.save(thumbnail_path, thumbnail_stream)
@@ -169,11 +239,91 @@ class UserFileHandler:
             del thumbnail
             del thumbnail_stream
 
+        del base_image
+
+    def generate_and_save_thumbnails_from_storage(
+        self, user_file, storage=None, only_with_name=None
+    ):
+        """
+        Opens the original image of the user file from the storage and generates its
+        thumbnails. Afterwards the user file is marked as not having pending
+        thumbnails anymore and the `user_file_thumbnails_generated` signal is sent.
+
+        :param user_file: The image user file for which the thumbnails must be
+            generated.
+        :type user_file: UserFile
+        :param storage: The storage where the file is stored and where the
+            thumbnails must be saved to.
+        :type storage: Storage or None
+        :param only_with_name: If provided, then only thumbnail types with that name
+            will be regenerated.
+        :type only_with_name: None or String
+        """
+
+        storage = storage or default_storage
+
+        with storage.open(self.user_file_path(user_file), "rb") as stream:
+            try:
+                with Image.open(stream) as image:
+                    self.generate_and_save_image_thumbnails(
+                        image,
+                        user_file,
+                        storage=storage,
+                        only_with_name=only_with_name,
+                    )
+            except IOError:
+                pass
+
+        if user_file.thumbnails_pending:
+            user_file.thumbnails_pending = False
+            # The user files of the other uploads of the same content share the
+            # thumbnails.
+            UserFile.objects.filter(
+                unique=user_file.unique,
+                sha256_hash=user_file.sha256_hash,
+                original_extension=user_file.original_extension,
+            ).update(thumbnails_pending=False)
+            user_file_thumbnails_generated.send(self, user_file=user_file)
+
+    def read_and_hash_chunks(self, chunks, write_to=None):
+        """
+        Consumes the provided chunks once to calculate the size and the sha256 hash
+        of the content. Optionally the chunks are written to another stream at the
+        same time, so that content which can only be read once doesn't have to be
+        buffered first. Stops as soon as the content exceeds the upload size limit.
+
+        :param chunks: An iterable of bytes.
+        :type chunks: Iterable[bytes]
+        :param write_to: An optional writable stream where the chunks are copied to.
+        :type write_to: IOBase or None
+        :raises FileSizeToLargeError: If the content is too large.
+        :return: The size and the hash of the content.
+        :rtype: (int, str)
+        """
+
+        size = 0
+        hasher = hashlib.sha256()
+
+        for chunk in chunks:
+            size += len(chunk)
+            if size > settings.BASEROW_FILE_UPLOAD_SIZE_LIMIT_MB:
+                raise FileSizeTooLargeError(
+                    settings.BASEROW_FILE_UPLOAD_SIZE_LIMIT_MB,
+                    "The provided file is too large.",
+                )
+
+            hasher.update(chunk)
+            if write_to is not None:
+                write_to.write(chunk)
+
+        return size, hasher.hexdigest()
+
     def upload_user_file(self, user, file_name, stream, storage=None):
         """
         Saves the provided uploaded file in the provided storage. If no storage is
         provided the default_storage will be used. An entry into the user file table
-        is also created.
+        is also created. If a file with the same content and extension has already
+        been uploaded to the default storage, then the stored file is reused.
 
         :param user: The user on whose behalf the file is uploaded.
         :type user: User
@@ -192,26 +342,61 @@ class UserFileHandler:
         if not hasattr(stream, "read"):
             raise InvalidFileStreamError("The provided stream is not readable.")
 
-        size = stream_size(stream)
-
-        if size > settings.BASEROW_FILE_UPLOAD_SIZE_LIMIT_MB:
+        # Checking the size of a seekable stream is free, so we can fail before
+        # reading anything.
+        if stream_size(stream) > settings.BASEROW_FILE_UPLOAD_SIZE_LIMIT_MB:
             raise FileSizeTooLargeError(
                 settings.BASEROW_FILE_UPLOAD_SIZE_LIMIT_MB,
                 "The provided file is too large.",
             )
 
+        size, hash = self.read_and_hash_chunks(
+            iter(lambda: stream.read(UPLOAD_CHUNK_SIZE), b"")
+        )
+        stream.seek(0)
+
+        return self._create_user_file(user, file_name, stream, size, hash, storage)
+
+    def _create_user_file(self, user, file_name, stream, size, hash, storage=None):
+        """
+        Creates the user file based on the already hashed stream and saves the stream
+        to the storage, unless a file with the same content already exists.
+        """
+
+        storage_is_default = storage is None
         storage = storage or default_storage
-        hash = sha256_hash(stream)
         file_name = truncate_middle(file_name, 64)
+        extension = pathlib.Path(file_name).suffix[1:].lower()
 
-        existing_user_file = UserFile.objects.filter(
-            original_name=file_name, sha256_hash=hash
-        ).first()
+        # The content is deduplicated by its hash. The extension must match as well
+        # because it's part of the stored file name and it determines the mime type.
+        # The stored file is reused, but the upload gets its own user file, so that
+        # the original name and uploader of the other upload are not exposed. A
+        # custom storage doesn't contain the files of the default storage.
+        existing_user_file = (
+            UserFile.objects.filter(sha256_hash=hash, original_extension=extension)
+            .order_by("id")
+            .first()
+            if storage_is_default
+            else None
+        )
 
         if existing_user_file:
-            return existing_user_file
+            stream.close()
+            return UserFile.objects.create(
+                original_name=file_name,
+                original_extension=extension,
+                size=existing_user_file.size,
+                mime_type=existing_user_file.mime_type,
+                unique=existing_user_file.unique,
+                uploaded_by=user,
+                sha256_hash=hash,
+                is_image=existing_user_file.is_image,
+                image_width=existing_user_file.image_width,
+                image_height=existing_user_file.image_height,
+                thumbnails_pending=existing_user_file.thumbnails_pending,
+            )
 
-        extension = pathlib.Path(file_name).suffix[1:].lower()
         mime_type = mimetypes.guess_type(file_name)[0] or ""
         unique = self.generate_unique(hash, extension)
 
@@ -231,6 +416,8 @@ class UserFileHandler:
         except IOError:
             pass
 
+        thumbnails_pending = is_image and storage_is_default
+
         user_file = UserFile.objects.create(
             original_name=file_name,
             original_extension=extension,
@@ -242,17 +429,21 @@ class UserFileHandler:
             is_image=is_image,
             image_width=image_width,
             image_height=image_height,
+            thumbnails_pending=thumbnails_pending,
         )
 
         # If the uploaded file is an image we need to generate the configurable
-        # thumbnails for it. We want to generate them before the file is saved to the
-        # storage because some storages close the stream after saving.
-        if image:
+        # thumbnails for it. When the file is saved to the default storage that's done
+        # by a background job, so that large images don't block the request. A custom
+        # storage can't be passed to the job, so then we generate them right away,
+        # before the file is saved to the storage because some storages close the
+        # stream after saving.
+        if image and not thumbnails_pending:
             self.generate_and_save_image_thumbnails(image, user_file, storage=storage)
 
-            # When all the thumbnails have been generated, the image can be deleted
-            # from memory.
-            del image
+        # When all the thumbnails have been generated, the image can be deleted
+        # from memory.
+        del image
 
         # Save the file to the storage.
         full_path = self.user_file_path(user_file)
@@ -261,6 +452,13 @@ class UserFileHandler:
         # Close the stream because we don't need it anymore.
         stream.close()
 
+        if thumbnails_pending:
+            from .tasks import generate_user_file_thumbnails
+
+            transaction.on_commit(
+                lambda: generate_user_file_thumbnails.delay(user_file.id)
+            )
+
         return user_file
 
     def upload_user_file_by_url(self, user, url, storage=None):
@@ -305,17 +503,23 @@ class UserFileHandler:
             except ValueError:
                 pass
 
-            content = b""
-            for chunk in response.iter_content(chunk_size=None):
-                content += chunk
-                if len(content) > settings.BASEROW_FILE_UPLOAD_SIZE_LIMIT_MB:
-                    response.close()
-                    raise FileSizeTooLargeError(
-                        settings.BASEROW_FILE_UPLOAD_SIZE_LIMIT_MB,
-                        "The provided file is too large.",
-                    )
+            # The download is hashed while it's being spooled, small files stay in
+            # memory and larger ones are written to a temporary file.
+            spooled_file = SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX_MEMORY_SIZE)
+            try:
+                size, hash = self.read_and_hash_chunks(
+                    response.iter_content(chunk_size=UPLOAD_CHUNK_SIZE),
+                    write_to=spooled_file,
+                )
+            except BaseException:
+                spooled_file.close()
+                raise
+            finally:
+                response.close()
         except (RequestException, UnacceptableAddressException, ConnectionError):
             raise FileURLCouldNotBeReached("The provided URL could not be reached.")
 
-        file = SimpleUploadedFile(file_name, content)
-        return UserFileHandler().upload_user_file(user, file_name, file, storage)
+        spooled_file.seek(0)
+        return self._create_user_file(
+            user, file_name, spooled_file, size, hash, storage
+        )
@@ -12,4 +12,13 @@ class UserFileQuerySet(models.QuerySet):
         for name in names:
             q_or |= Q(**self.model.deconstruct_name(name))
 
-        return self.filter(q_or)
+        # The same content uploaded by different users is stored once, but every
+        # upload has its own user file with the same name. Only the oldest of those
+        # is returned, so that every name matches exactly one user file.
+        first_ids = (
+            self.filter(q_or)
+            .order_by("unique", "sha256_hash", "original_extension", "id")
+            .distinct("unique", "sha256_hash", "original_extension")
+            .values("id")
+        )
+        return self.filter(id__in=first_ids)
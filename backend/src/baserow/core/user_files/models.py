@@ -24,6 +24,11 @@ class UserFile(models.Model):
     uploaded_at = models.DateTimeField(auto_now_add=True)
     uploaded_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
     sha256_hash = models.CharField(max_length=64, db_index=True)
+    thumbnails_pending = models.BooleanField(
+        default=False,
+        help_text="Indicates whether the thumbnails are still being generated in the "
+        "background.",
+    )
 
     objects = UserFileQuerySet.as_manager()
 
@@ -33,7 +38,10 @@ class UserFile(models.Model):
     def serialize(self):
         """
         Generates a serialized version that can be stored in other data sources. This
-        is possible because the state of the UserFile never changes.
+        is possible because the state of the UserFile never changes, except for the
+        thumbnails that can still be pending. Whoever stores the serialized version
+        must clear `thumbnails_pending` when the `user_file_thumbnails_generated`
+        signal is sent.
 
         :return: The serialized version.
         :rtype: dict
@@ -47,6 +55,7 @@ class UserFile(models.Model):
             "image_width": self.image_width,
             "image_height": self.image_height,
             "uploaded_at": self.uploaded_at.isoformat(),
+            "thumbnails_pending": self.thumbnails_pending,
         }
 
     @property
@@ -0,0 +1,21 @@
+from baserow.config.celery import app
+
+
+@app.task(bind=True, queue="export")
+def generate_user_file_thumbnails(self, user_file_id: int):
+    """
+    Generates the thumbnails of an uploaded image in the background, so that the
+    upload request doesn't have to wait for it.
+
+    :param user_file_id: The id of the image user file.
+    """
+
+    from .handler import UserFileHandler
+    from .models import UserFile
+
+    try:
+        user_file = UserFile.objects.get(id=user_file_id)
+    except UserFile.DoesNotExist:
+        return
+
+    UserFileHandler().generate_and_save_thumbnails_from_storage(user_file)
@@ -8,10 +8,11 @@ import random
 import re
 import string
 import io
+import json
 from collections import namedtuple
 from decimal import Decimal
 from itertools import islice
-from typing import List, Optional, Iterable, Tuple
+from typing import Any, IO, Iterator, List, Optional, Iterable, Tuple
 
 from django.db.models import ForeignKey
 from django.db.models.fields import NOT_PROVIDED
@@ -454,6 +455,53 @@ def grouper(n: int, iterable: Iterable):
         yield chunk
 
 
+def stream_json(value: Any, fout: IO[str], indent: Optional[int] = None, level=0):
+    """
+    Writes the value as JSON to the provided file, just like `json.dump`, except that
+    iterators and generators are written as JSON arrays while being consumed. This
+    makes it possible to write huge nested structures, like the rows of an export,
+    without having to keep them in memory.
+
+    :param value: The value that must be written as JSON.
+    :param fout: The text file where the JSON must be written to.
+    :param indent: If provided, the JSON is pretty printed with that indent level.
+    :param level: The current nesting level, used to compute the indentation.
+    """
+
+    if isinstance(value, dict):
+        opening, closing = "{", "}"
+        items = iter(value.items())
+    elif isinstance(value, (list, tuple, Iterator)):
+        opening, closing = "[", "]"
+        items = iter(value)
+    else:
+        fout.write(json.dumps(value))
+        return
+
+    if indent is None:
+        separator, item_prefix, closing_prefix = ", ", "", ""
+    else:
+        separator = ","
+        item_prefix = "\n" + " " * indent * (level + 1)
+        closing_prefix = "\n" + " " * indent * level
+
+    fout.write(opening)
+    is_empty = True
+    for item in items:
+        if not is_empty:
+            fout.write(separator)
+        is_empty = False
+        fout.write(item_prefix)
+        if closing == "}":
+            key, item = item
+            fout.write(f"{json.dumps(str(key))}: ")
+        stream_json(item, fout, indent, level + 1)
+
+    if not is_empty:
+        fout.write(closing_prefix)
+    fout.write(closing)
+
+
 class Progress:
     """
     This helper class can be used to easily track progress of certain tasks. It's
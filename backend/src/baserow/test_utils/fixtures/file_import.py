@@ -37,7 +37,7 @@ class FileImportFixtures:
         else:
             data = kwargs.pop("data")
 
-        data_file = kwargs.get("data_file", ContentFile(json.dumps(data)))
+        data_file = kwargs.pop("data_file", None) or ContentFile(json.dumps(data))
 
         job = FileImportJob.objects.create(**kwargs)
 
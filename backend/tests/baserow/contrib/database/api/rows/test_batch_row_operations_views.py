@@ -0,0 +1,122 @@
+import pytest
+from django.shortcuts import reverse
+from rest_framework.status import (
+    HTTP_200_OK,
+    HTTP_400_BAD_REQUEST,
+    HTTP_401_UNAUTHORIZED,
+    HTTP_404_NOT_FOUND,
+)
+
+from baserow.contrib.database.tokens.handler import TokenHandler
+
+
+@pytest.mark.django_db
+def test_batch_row_operations(api_client, data_fixture):
+    user, jwt_token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    field = data_fixture.create_text_field(table=table, name="Name", primary=True)
+    model = table.get_model()
+    row_1 = model.objects.create(**{f"field_{field.id}": "a"}, order=1)
+    row_2 = model.objects.create(**{f"field_{field.id}": "b"}, order=2)
+    url = reverse("api:database:rows:batch-operations", kwargs={"table_id": table.id})
+
+    response = api_client.post(
+        f"{url}?user_field_names",
+        {
+            "items": [
+                {"type": "create", "values": {"Name": "c"}, "before_id": row_1.id},
+                {"type": "update", "id": row_2.id, "values": {"Name": "b2"}},
+                {"type": "move", "id": row_2.id, "before_id": row_1.id},
+                {"type": "update", "id": row_2.id, "values": {"Name": "b3"}},
+                {"type": "delete", "id": row_1.id},
+            ]
+        },
+        format="json",
+        HTTP_AUTHORIZATION=f"JWT {jwt_token}",
+    )
+    assert response.status_code == HTTP_200_OK, response.json()
+    items = response.json()["items"]
+    created_id = items[0]["id"]
+    assert [(item["type"], item["id"]) for item in items] == [
+        ("create", created_id),
+        ("update", row_2.id),
+        ("move", row_2.id),
+        ("update", row_2.id),
+        ("delete", row_1.id),
+    ]
+    assert items[0]["row"]["Name"] == "c"
+    assert items[3]["row"]["Name"] == "b3"
+    assert items[4]["row"] is None
+    assert list(model.objects.values_list("id", f"field_{field.id}")) == [
+        (created_id, "c"),
+        (row_2.id, "b3"),
+    ]
+
+
+@pytest.mark.django_db
+def test_batch_row_operations_are_atomic(api_client, data_fixture):
+    user, jwt_token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    field = data_fixture.create_text_field(table=table, primary=True)
+    model = table.get_model()
+    row = model.objects.create(**{f"field_{field.id}": "a"})
+    url = reverse("api:database:rows:batch-operations", kwargs={"table_id": table.id})
+
+    response = api_client.post(
+        url,
+        {
+            "items": [
+                {"type": "create", "values": {f"field_{field.id}": "b"}},
+                {"type": "delete", "id": row.id},
+                {"type": "update", "id": row.id, "values": {f"field_{field.id}": "c"}},
+            ]
+        },
+        format="json",
+        HTTP_AUTHORIZATION=f"JWT {jwt_token}",
+    )
+    assert response.status_code == HTTP_404_NOT_FOUND
+    assert response.json()["error"] == "ERROR_ROW_DOES_NOT_EXIST"
+    assert list(model.objects.values_list("id", flat=True)) == [row.id]
+
+
+@pytest.mark.django_db
+def test_batch_row_operations_validation(api_client, data_fixture):
+    user, jwt_token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    field = data_fixture.create_number_field(table=table)
+    url = reverse("api:database:rows:batch-operations", kwargs={"table_id": table.id})
+
+    response = api_client.post(
+        url,
+        {
+            "items": [
+                {"type": "create", "values": {f"field_{field.id}": "not a number"}},
+                {"type": "delete"},
+            ]
+        },
+        format="json",
+        HTTP_AUTHORIZATION=f"JWT {jwt_token}",
+    )
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    detail = response.json()["detail"]["items"]
+    assert detail["0"]["values"][f"field_{field.id}"][0]["code"] == "invalid"
+    assert detail["1"]["id"][0]["code"] == "required"
+
+
+@pytest.mark.django_db
+def test_batch_row_operations_token_permissions(api_client, data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    row = table.get_model().objects.create()
+    token = TokenHandler().create_token(user, table.database.group, "Token")
+    TokenHandler().update_token_permissions(user, token, True, True, True, False)
+    url = reverse("api:database:rows:batch-operations", kwargs={"table_id": table.id})
+
+    response = api_client.post(
+        url,
+        {"items": [{"type": "create"}, {"type": "delete", "id": row.id}]},
+        format="json",
+        HTTP_AUTHORIZATION=f"Token {token.key}",
+    )
+    assert response.status_code == HTTP_401_UNAUTHORIZED
+    assert response.json()["error"] == "ERROR_NO_PERMISSION_TO_TABLE"
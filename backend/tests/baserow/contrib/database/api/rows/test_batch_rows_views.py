@@ -765,6 +765,70 @@ def test_batch_create_rows_num_of_queries(api_client, data_fixture):
     )
 
 
+@pytest.mark.django_db
+@pytest.mark.api_rows
+def test_batch_upsert_rows(api_client, data_fixture):
+    user, jwt_token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    key_field = data_fixture.create_text_field(table=table, name="Key", primary=True)
+    number_field = data_fixture.create_number_field(table=table, name="Number")
+    model = table.get_model()
+    row = model.objects.create(
+        **{f"field_{key_field.id}": "a", f"field_{number_field.id}": 1}
+    )
+    url = reverse("api:database:rows:batch", kwargs={"table_id": table.id})
+
+    response = api_client.post(
+        f"{url}?user_field_names&upsert_field={key_field.id}",
+        {"items": [{"Key": "b", "Number": 2}, {"Key": "a", "Number": 3}]},
+        format="json",
+        HTTP_AUTHORIZATION=f"JWT {jwt_token}",
+    )
+    assert response.status_code == HTTP_200_OK
+    items = response.json()["items"]
+    assert [(item["Key"], item["Number"]) for item in items] == [("b", "2"), ("a", "3")]
+    assert items[1]["id"] == row.id
+    assert model.objects.count() == 2
+
+    response = api_client.post(
+        f"{url}?upsert_field={key_field.id}",
+        {"items": [{f"field_{key_field.id}": "c"}, {f"field_{key_field.id}": "c"}]},
+        format="json",
+        HTTP_AUTHORIZATION=f"JWT {jwt_token}",
+    )
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert response.json()["error"] == "ERROR_UPSERT_KEY_VALUES_NOT_UNIQUE"
+
+    response = api_client.post(
+        f"{url}?upsert_field={number_field.id + 1000}",
+        {"items": [{f"field_{key_field.id}": "c"}]},
+        format="json",
+        HTTP_AUTHORIZATION=f"JWT {jwt_token}",
+    )
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert response.json()["error"] == "ERROR_INVALID_UPSERT_KEY_FIELD"
+
+
+@pytest.mark.django_db
+@pytest.mark.api_rows
+def test_batch_upsert_rows_token_no_update_permission(api_client, data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    key_field = data_fixture.create_text_field(table=table, primary=True)
+    token = TokenHandler().create_token(user, table.database.group, "Token")
+    TokenHandler().update_token_permissions(user, token, True, True, False, True)
+    url = reverse("api:database:rows:batch", kwargs={"table_id": table.id})
+
+    response = api_client.post(
+        f"{url}?upsert_field={key_field.id}",
+        {"items": [{f"field_{key_field.id}": "a"}]},
+        format="json",
+        HTTP_AUTHORIZATION=f"Token {token.key}",
+    )
+    assert response.status_code == HTTP_401_UNAUTHORIZED
+    assert response.json()["error"] == "ERROR_NO_PERMISSION_TO_TABLE"
+
+
 # Update
 
 
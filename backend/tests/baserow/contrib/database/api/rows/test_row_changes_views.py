@@ -0,0 +1,65 @@
+import pytest
+from django.shortcuts import reverse
+from rest_framework.status import (
+    HTTP_200_OK,
+    HTTP_400_BAD_REQUEST,
+    HTTP_401_UNAUTHORIZED,
+)
+
+from baserow.contrib.database.rows.handler import RowHandler
+from baserow.contrib.database.tokens.handler import TokenHandler
+
+
+@pytest.mark.django_db
+def test_list_row_changes(api_client, data_fixture, settings):
+    settings.BASEROW_ROW_CHANGES_SETTLE_SECONDS = 0
+    user, jwt_token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    data_fixture.create_text_field(table=table, name="Name", primary=True)
+    row_1 = RowHandler().create_row(user, table, {"Name": "a"}, user_field_names=True)
+    row_2 = RowHandler().create_row(user, table, {"Name": "b"}, user_field_names=True)
+    url = reverse("api:database:rows:changes", kwargs={"table_id": table.id})
+
+    response = api_client.get(
+        f"{url}?user_field_names=true&size=1", HTTP_AUTHORIZATION=f"JWT {jwt_token}"
+    )
+    assert response.status_code == HTTP_200_OK, response.json()
+    response_json = response.json()
+    assert [row["Name"] for row in response_json["items"]] == ["a"]
+    assert response_json["deleted"] == []
+    assert response_json["has_more"]
+
+    RowHandler().delete_row_by_id(user, table, row_1.id)
+    response = api_client.get(
+        url,
+        {"cursor": response_json["cursor"]},
+        HTTP_AUTHORIZATION=f"JWT {jwt_token}",
+    )
+    assert response.status_code == HTTP_200_OK, response.json()
+    response_json = response.json()
+    assert [row["id"] for row in response_json["items"]] == [row_2.id]
+    assert response_json["deleted"] == [row_1.id]
+    assert not response_json["has_more"]
+
+    response = api_client.get(
+        url, {"cursor": "invalid"}, HTTP_AUTHORIZATION=f"JWT {jwt_token}"
+    )
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert response.json()["error"] == "ERROR_INVALID_ROW_CHANGES_CURSOR"
+
+    response = api_client.get(url, {"size": 0}, HTTP_AUTHORIZATION=f"JWT {jwt_token}")
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert response.json()["error"] == "ERROR_QUERY_PARAMETER_VALIDATION"
+
+
+@pytest.mark.django_db
+def test_list_row_changes_token_permissions(api_client, data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    token = TokenHandler().create_token(user, table.database.group, "Token")
+    TokenHandler().update_token_permissions(user, token, True, False, True, True)
+    url = reverse("api:database:rows:changes", kwargs={"table_id": table.id})
+
+    response = api_client.get(url, HTTP_AUTHORIZATION=f"Token {token.key}")
+    assert response.status_code == HTTP_401_UNAUTHORIZED
+    assert response.json()["error"] == "ERROR_NO_PERMISSION_TO_TABLE"
@@ -0,0 +1,342 @@
+import time
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.status import HTTP_200_OK
+from rest_framework.test import APIRequestFactory
+
+from baserow.api.pagination import PageNumberPagination
+from baserow.api.renderers import FastJSONRenderer
+from baserow.contrib.database.api.rows.encoders import (
+    get_row_values_encoder,
+    paginate_and_serialize_rows,
+)
+from baserow.contrib.database.api.rows.serializers import (
+    get_row_serializer_class,
+    RowSerializer,
+)
+from baserow.contrib.database.fields.handler import FieldHandler
+from baserow.contrib.database.rows.handler import RowHandler
+from baserow.test_utils.helpers import setup_interesting_test_table
+
+
+@pytest.mark.django_db
+def test_row_values_encoder_matches_serializer(data_fixture):
+    table, user, row, blank_row = setup_interesting_test_table(data_fixture)
+    model = table.get_model()
+
+    all_fields_serializer_class = get_row_serializer_class(
+        model, RowSerializer, is_response=True
+    )
+    assert get_row_values_encoder(all_fields_serializer_class) is None
+
+    field_ids = [
+        field_object["field"].id
+        for field_object in model._field_objects.values()
+        if field_object["type"].can_serialize_from_values
+    ]
+    assert len(field_ids) > 0
+    serializer_class = get_row_serializer_class(
+        model, RowSerializer, is_response=True, field_ids=field_ids
+    )
+    encoder = get_row_values_encoder(serializer_class)
+    assert encoder is not None
+
+    queryset = model.objects.all().enhance_by_fields().order_by("id")
+    expected = serializer_class(queryset, many=True).data
+    encoded = encoder.encode(encoder.get_values_queryset(queryset))
+
+    assert encoded == expected
+    assert [list(row.keys()) for row in encoded] == [
+        list(row.keys()) for row in expected
+    ]
+    assert FastJSONRenderer().render(encoded) == JSONRenderer().render(expected)
+
+
+@pytest.mark.django_db
+def test_paginate_and_serialize_rows(data_fixture):
+    table = data_fixture.create_database_table()
+    text_field = data_fixture.create_text_field(table=table)
+    model = table.get_model()
+    for i in range(3):
+        model.objects.create(**{f"field_{text_field.id}": f"Row {i}"})
+
+    serializer_class = get_row_serializer_class(model, RowSerializer, is_response=True)
+    request = Request(APIRequestFactory().get("/?size=2"))
+    queryset = model.objects.all().order_by("id")
+
+    rows, row_ids = paginate_and_serialize_rows(
+        PageNumberPagination(), queryset, request, None, serializer_class
+    )
+    assert row_ids == [row.id for row in queryset[:2]]
+    assert rows == serializer_class(queryset[:2], many=True).data
+
+    with override_settings(BASEROW_DISABLE_FAST_ROW_LISTING=True):
+        slow_rows, slow_row_ids = paginate_and_serialize_rows(
+            PageNumberPagination(), queryset, request, None, serializer_class
+        )
+    assert slow_rows == rows
+    assert slow_row_ids == row_ids
+
+
+@pytest.mark.django_db
+def test_list_rows_fast_and_regular_response_are_identical(api_client, data_fixture):
+    user, jwt_token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    text_field = data_fixture.create_text_field(table=table)
+    number_field = data_fixture.create_number_field(
+        table=table, number_decimal_places=2
+    )
+    grid = data_fixture.create_grid_view(table=table)
+    model = table.get_model()
+    model.objects.create(
+        **{
+            f"field_{text_field.id}": "Test \u2028 é",
+            f"field_{number_field.id}": Decimal("1.5"),
+        }
+    )
+    model.objects.create()
+
+    for url in [
+        reverse("api:database:rows:list", kwargs={"table_id": table.id}),
+        reverse("api:database:views:grid:list", kwargs={"view_id": grid.id}),
+    ]:
+        fast_response = api_client.get(url, HTTP_AUTHORIZATION=f"JWT {jwt_token}")
+        with override_settings(BASEROW_DISABLE_FAST_ROW_LISTING=True):
+            regular_response = api_client.get(
+                url, HTTP_AUTHORIZATION=f"JWT {jwt_token}"
+            )
+
+        assert fast_response.status_code == HTTP_200_OK
+        assert fast_response.content == regular_response.content
+        assert fast_response.json()["results"][0][f"field_{number_field.id}"] == (
+            "1.50"
+        )
+
+
+@pytest.mark.django_db
+def test_row_values_encoder_link_row_fields(data_fixture, django_assert_num_queries):
+    user = data_fixture.create_user()
+    database = data_fixture.create_database_application(user=user)
+    table = data_fixture.create_database_table(database=database)
+    text_related_table = data_fixture.create_database_table(database=database)
+    number_related_table = data_fixture.create_database_table(database=database)
+    data_fixture.create_text_field(table=table, primary=True)
+    text_primary = data_fixture.create_text_field(
+        table=text_related_table, primary=True
+    )
+    data_fixture.create_number_field(table=number_related_table, primary=True)
+
+    field_handler = FieldHandler()
+    text_link_row = field_handler.create_field(
+        user=user,
+        table=table,
+        type_name="link_row",
+        name="Text link",
+        link_row_table=text_related_table,
+    )
+    field_handler.create_field(
+        user=user,
+        table=table,
+        type_name="link_row",
+        name="Number link",
+        link_row_table=number_related_table,
+    )
+    self_link_row = field_handler.create_field(
+        user=user,
+        table=table,
+        type_name="link_row",
+        name="Self link",
+        link_row_table=table,
+    )
+
+    related_model = text_related_table.get_model()
+    first = related_model.objects.create(**{text_primary.db_column: "First"})
+    unnamed = related_model.objects.create(order=0)
+    trashed = related_model.objects.create(**{text_primary.db_column: "Trashed"})
+    row_handler = RowHandler()
+    row = row_handler.create_row(
+        user,
+        table,
+        {text_link_row.db_column: [first.id, unnamed.id, trashed.id]},
+    )
+    row_handler.create_row(user, table, {self_link_row.db_column: [row.id]})
+    trashed.trashed = True
+    trashed.save()
+
+    model = table.get_model()
+    queryset = model.objects.all().enhance_by_fields().order_by("id")
+
+    all_fields_serializer_class = get_row_serializer_class(
+        model, RowSerializer, is_response=True
+    )
+    # The human readable value of a number primary field can't be computed in the
+    # database.
+    assert get_row_values_encoder(all_fields_serializer_class) is None
+
+    serializer_class = get_row_serializer_class(
+        model,
+        RowSerializer,
+        is_response=True,
+        field_ids=[text_link_row.id, self_link_row.id],
+    )
+    encoder = get_row_values_encoder(serializer_class)
+    assert encoder is not None
+
+    expected = serializer_class(queryset, many=True).data
+    # The rows and the values of the related rows are fetched in a single query.
+    with django_assert_num_queries(1):
+        encoded = encoder.encode(encoder.get_values_queryset(queryset))
+
+    assert encoded == expected
+    assert encoded[0][text_link_row.db_column] == [
+        {"id": unnamed.id, "value": ""},
+        {"id": first.id, "value": "First"},
+    ]
+    assert FastJSONRenderer().render(encoded) == JSONRenderer().render(expected)
+
+
+@pytest.mark.django_db
+@pytest.mark.disabled_in_ci
+# You must add --run-disabled-in-ci -s to pytest to run this test, you can do this in
+# intellij by editing the run config for this test and adding --run-disabled-in-ci -s
+# to additional args.
+def test_link_row_listing_performance(data_fixture):
+    rows_amount = 100
+    link_fields_amount = 5
+    related_fields_amount = 80
+
+    user = data_fixture.create_user()
+    database = data_fixture.create_database_application(user=user)
+    table = data_fixture.create_database_table(database=database)
+    data_fixture.create_text_field(table=table, primary=True)
+    related_table = data_fixture.create_database_table(database=database)
+    data_fixture.create_text_field(table=related_table, primary=True)
+    for i in range(related_fields_amount):
+        data_fixture.create_text_field(table=related_table, name=f"Field {i}")
+
+    related_model = related_table.get_model()
+    related_row_ids = [
+        related_model.objects.create(
+            **{
+                field_object["name"]: "x" * 100
+                for field_object in related_model._field_objects.values()
+            }
+        ).id
+        for _ in range(rows_amount)
+    ]
+    link_fields = [
+        FieldHandler().create_field(
+            user=user,
+            table=table,
+            type_name="link_row",
+            name=f"Link {i}",
+            link_row_table=related_table,
+        )
+        for i in range(link_fields_amount)
+    ]
+    RowHandler().create_rows(
+        user,
+        table,
+        [
+            {
+                link_field.db_column: related_row_ids[i : i + 3]
+                for link_field in link_fields
+            }
+            for i in range(rows_amount)
+        ],
+    )
+
+    model = table.get_model()
+    serializer_class = get_row_serializer_class(model, RowSerializer, is_response=True)
+    queryset = model.objects.all().enhance_by_fields()
+    request = Request(APIRequestFactory().get(f"/?size={rows_amount}"))
+
+    def run():
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            rows, _ = paginate_and_serialize_rows(
+                PageNumberPagination(), queryset, request, None, serializer_class
+            )
+            duration = (time.perf_counter() - start) * 1000
+        return rows, duration, len(captured.captured_queries)
+
+    fast_rows, fast_duration, fast_queries = run()
+    with override_settings(BASEROW_DISABLE_FAST_ROW_LISTING=True):
+        rows, duration, queries = run()
+
+    size = len(FastJSONRenderer().render(rows))
+    print(
+        f"Prefetch: {duration:.1f}ms and {queries} queries, aggregated subquery: "
+        f"{fast_duration:.1f}ms and {fast_queries} queries, {size} bytes response."
+    )
+    assert fast_rows == rows
+    assert fast_queries < queries
+
+
+@pytest.mark.django_db
+def test_row_values_encoder_select_fields(data_fixture, django_assert_num_queries):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    single_select_field = data_fixture.create_single_select_field(table=table)
+    multiple_select_field = data_fixture.create_multiple_select_field(table=table)
+    option_a = data_fixture.create_select_option(
+        field=single_select_field, value="A", color="red"
+    )
+    option_b = data_fixture.create_select_option(
+        field=multiple_select_field, value="B", color="blue"
+    )
+    option_c = data_fixture.create_select_option(
+        field=multiple_select_field, value="C", color="green"
+    )
+
+    row_handler = RowHandler()
+    row_handler.create_row(
+        user,
+        table,
+        {
+            single_select_field.db_column: option_a.id,
+            multiple_select_field.db_column: [option_c.id, option_b.id],
+        },
+    )
+    row_handler.create_row(user, table, {})
+
+    model = table.get_model()
+    serializer_class = get_row_serializer_class(model, RowSerializer, is_response=True)
+    queryset = model.objects.all().enhance_by_fields().order_by("id")
+    expected = serializer_class(queryset, many=True).data
+
+    encoder = get_row_values_encoder(serializer_class)
+    assert encoder is not None
+    # The select options are resolved from memory, so only the rows are fetched.
+    with django_assert_num_queries(1):
+        encoded = encoder.encode(encoder.get_values_queryset(queryset))
+
+    assert encoded == expected
+    assert sorted(
+        encoded[0][multiple_select_field.db_column], key=lambda option: option["id"]
+    ) == [
+        {"id": option_b.id, "value": "B", "color": "blue"},
+        {"id": option_c.id, "value": "C", "color": "green"},
+    ]
+    assert encoded[1][single_select_field.db_column] is None
+    assert encoded[1][multiple_select_field.db_column] == []
+    assert FastJSONRenderer().render(encoded) == JSONRenderer().render(expected)
+
+    FieldHandler().update_field_select_options(
+        user, single_select_field, [{"id": option_a.id, "value": "D", "color": "red"}]
+    )
+    model = table.get_model()
+    serializer_class = get_row_serializer_class(model, RowSerializer, is_response=True)
+    encoder = get_row_values_encoder(serializer_class)
+    encoded = encoder.encode(encoder.get_values_queryset(model.objects.order_by("id")))
+    assert encoded[0][single_select_field.db_column] == {
+        "id": option_a.id,
+        "value": "D",
+        "color": "red",
+    }
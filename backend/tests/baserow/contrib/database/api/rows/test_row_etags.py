@@ -0,0 +1,167 @@
+import pytest
+from django.shortcuts import reverse
+from django.test.utils import override_settings
+from rest_framework.status import HTTP_200_OK, HTTP_304_NOT_MODIFIED
+
+from baserow.contrib.database.rows.handler import RowHandler
+from baserow.contrib.database.views.handler import ViewHandler
+
+
+@pytest.mark.django_db(transaction=True)
+def test_list_rows_not_modified(api_client, data_fixture):
+    user, jwt_token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    field = data_fixture.create_text_field(table=table, primary=True)
+    row = RowHandler().create_row(user, table, {f"field_{field.id}": "a"})
+    url = reverse("api:database:rows:list", kwargs={"table_id": table.id})
+
+    response = api_client.get(url, HTTP_AUTHORIZATION=f"JWT {jwt_token}")
+    assert response.status_code == HTTP_200_OK
+    etag = response["ETag"]
+    assert response["Last-Modified"]
+
+    response = api_client.get(
+        url, HTTP_AUTHORIZATION=f"JWT {jwt_token}", HTTP_IF_NONE_MATCH=etag
+    )
+    assert response.status_code == HTTP_304_NOT_MODIFIED
+    assert response["ETag"] == etag
+
+    # Other query parameters result in another response.
+    response = api_client.get(
+        f"{url}?search=a",
+        HTTP_AUTHORIZATION=f"JWT {jwt_token}",
+        HTTP_IF_NONE_MATCH=etag,
+    )
+    assert response.status_code == HTTP_200_OK
+    assert response["ETag"] != etag
+
+    RowHandler().update_row_by_id(user, table, row.id, {f"field_{field.id}": "b"})
+
+    response = api_client.get(
+        url, HTTP_AUTHORIZATION=f"JWT {jwt_token}", HTTP_IF_NONE_MATCH=etag
+    )
+    assert response.status_code == HTTP_200_OK
+    assert response["ETag"] != etag
+    assert response.json()["results"][0][f"field_{field.id}"] == "b"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_list_rows_not_modified_changes_after_upsert(api_client, data_fixture):
+    user, jwt_token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    field = data_fixture.create_text_field(table=table, primary=True)
+    RowHandler().create_row(user, table, {f"field_{field.id}": "a"})
+    url = reverse("api:database:rows:list", kwargs={"table_id": table.id})
+
+    response = api_client.get(url, HTTP_AUTHORIZATION=f"JWT {jwt_token}")
+    etag = response["ETag"]
+
+    response = api_client.post(
+        reverse("api:database:rows:batch", kwargs={"table_id": table.id})
+        + f"?upsert_field={field.id}",
+        {"items": [{f"field_{field.id}": "a"}, {f"field_{field.id}": "b"}]},
+        format="json",
+        HTTP_AUTHORIZATION=f"JWT {jwt_token}",
+    )
+    assert response.status_code == HTTP_200_OK
+
+    response = api_client.get(
+        url, HTTP_AUTHORIZATION=f"JWT {jwt_token}", HTTP_IF_NONE_MATCH=etag
+    )
+    assert response.status_code == HTTP_200_OK
+    assert response.json()["count"] == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_list_rows_not_modified_changes_with_related_table(api_client, data_fixture):
+    user, jwt_token = data_fixture.create_user_and_token()
+    database = data_fixture.create_database_application(user=user)
+    table = data_fixture.create_database_table(database=database)
+    related_table = data_fixture.create_database_table(database=database)
+    related_field = data_fixture.create_text_field(table=related_table, primary=True)
+    data_fixture.create_link_row_field(table=table, link_row_table=related_table)
+    related_row = RowHandler().create_row(
+        user, related_table, {f"field_{related_field.id}": "a"}
+    )
+    url = reverse("api:database:rows:list", kwargs={"table_id": table.id})
+
+    response = api_client.get(url, HTTP_AUTHORIZATION=f"JWT {jwt_token}")
+    etag = response["ETag"]
+
+    RowHandler().update_row_by_id(
+        user, related_table, related_row.id, {f"field_{related_field.id}": "b"}
+    )
+
+    response = api_client.get(
+        url, HTTP_AUTHORIZATION=f"JWT {jwt_token}", HTTP_IF_NONE_MATCH=etag
+    )
+    assert response.status_code == HTTP_200_OK
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db(transaction=True)
+def test_list_grid_view_rows_not_modified(api_client, data_fixture):
+    user, jwt_token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    field = data_fixture.create_text_field(table=table, primary=True)
+    grid = data_fixture.create_grid_view(table=table)
+    url = reverse("api:database:views:grid:list", kwargs={"view_id": grid.id})
+
+    response = api_client.get(url, HTTP_AUTHORIZATION=f"JWT {jwt_token}")
+    etag = response["ETag"]
+
+    response = api_client.get(
+        url, HTTP_AUTHORIZATION=f"JWT {jwt_token}", HTTP_IF_NONE_MATCH=etag
+    )
+    assert response.status_code == HTTP_304_NOT_MODIFIED
+
+    ViewHandler().create_filter(user, grid, field, "equal", "a")
+
+    response = api_client.get(
+        url, HTTP_AUTHORIZATION=f"JWT {jwt_token}", HTTP_IF_NONE_MATCH=etag
+    )
+    assert response.status_code == HTTP_200_OK
+    assert response["ETag"] != etag
+
+    # The row metadata can change without changing the table.
+    response = api_client.get(
+        f"{url}?include=row_metadata", HTTP_AUTHORIZATION=f"JWT {jwt_token}"
+    )
+    assert response.status_code == HTTP_200_OK
+    assert "ETag" not in response
+
+
+@pytest.mark.django_db(transaction=True)
+def test_list_public_grid_view_rows_not_modified(api_client, data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    field = data_fixture.create_text_field(table=table, primary=True)
+    grid = data_fixture.create_grid_view(table=table, public=True)
+    url = reverse("api:database:views:grid:public_rows", kwargs={"slug": grid.slug})
+
+    etag = api_client.get(url)["ETag"]
+    assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == (
+        HTTP_304_NOT_MODIFIED
+    )
+
+    ViewHandler().update_field_options(
+        user=user, view=grid, field_options={field.id: {"hidden": True}}
+    )
+
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTP_200_OK
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db(transaction=True)
+@override_settings(BASEROW_DISABLE_ROW_LISTING_ETAGS=True)
+def test_list_rows_etags_disabled(api_client, data_fixture):
+    user, jwt_token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    url = reverse("api:database:rows:list", kwargs={"table_id": table.id})
+
+    response = api_client.get(
+        url, HTTP_AUTHORIZATION=f"JWT {jwt_token}", HTTP_IF_NONE_MATCH="*"
+    )
+    assert response.status_code == HTTP_200_OK
+    assert "ETag" not in response
@@ -1,4 +1,5 @@
 import json
+import time
 
 import pytest
 from rest_framework import serializers
@@ -250,6 +251,7 @@ def test_get_row_serializer_with_user_field_names(data_fixture):
                         "name": "hashed_name.txt",
                         "size": 0,
                         "thumbnails": None,
+                        "thumbnails_pending": False,
                         "uploaded_at": "2020-02-01 01:23",
                         "url": "http://localhost:8000/media/user_files/hashed_name.txt",
                         "visible_name": "a.txt",
@@ -262,6 +264,7 @@ def test_get_row_serializer_with_user_field_names(data_fixture):
                         "name": "other_name.txt",
                         "size": 0,
                         "thumbnails": None,
+                        "thumbnails_pending": False,
                         "uploaded_at": "2020-02-01 01:23",
                         "url": "http://localhost:8000/media/user_files/other_name.txt",
                         "visible_name": "b.txt",
@@ -379,3 +382,78 @@ def test_remap_serialized_row_to_user_field_names(data_fixture):
         "Link": [{"id": 1, "value": "Lookup 1"}],
         "Test 1": "Test value",
     }
+
+
+@pytest.mark.django_db
+def test_get_row_serializer_class_is_cached(data_fixture):
+    table = data_fixture.create_database_table()
+    text_field = data_fixture.create_text_field(table=table, name="Text")
+    number_field = data_fixture.create_number_field(table=table, name="Number")
+
+    model = table.get_model()
+    serializer_class = get_row_serializer_class(model, RowSerializer, is_response=True)
+    assert (
+        get_row_serializer_class(table.get_model(), RowSerializer, is_response=True)
+        is serializer_class
+    )
+    assert (
+        get_row_serializer_class(model, RowSerializer, is_response=False)
+        is not serializer_class
+    )
+    assert get_row_serializer_class(
+        model, RowSerializer, is_response=True, field_ids=[text_field.id]
+    ) is not get_row_serializer_class(
+        model, RowSerializer, is_response=True, field_ids=[number_field.id]
+    )
+
+    # Models which don't contain all the fields of the table are not cached.
+    partial_model = table.get_model(field_ids=[text_field.id])
+    assert get_row_serializer_class(
+        partial_model, RowSerializer, is_response=True
+    ) is not get_row_serializer_class(partial_model, RowSerializer, is_response=True)
+
+    # Changing the fields of the table changes the version of the table.
+    user_field_names_serializer_class = get_row_serializer_class(
+        table.get_model(), RowSerializer, is_response=True, user_field_names=True
+    )
+    assert "Number" in user_field_names_serializer_class().fields
+    number_field.name = "Renamed"
+    number_field.save()
+    new_serializer_class = get_row_serializer_class(
+        table.get_model(), RowSerializer, is_response=True, user_field_names=True
+    )
+    assert new_serializer_class is not user_field_names_serializer_class
+    assert "Renamed" in new_serializer_class().fields
+    assert "Number" not in new_serializer_class().fields
+
+
+@pytest.mark.django_db
+@pytest.mark.disabled_in_ci
+# You must add --run-disabled-in-ci -s to pytest to run this test, you can do this in
+# intellij by editing the run config for this test and adding --run-disabled-in-ci -s
+# to additional args.
+def test_get_row_serializer_class_performance(data_fixture):
+    fields_amount = 200
+    requests_amount = 100
+
+    table = data_fixture.create_database_table()
+    for i in range(fields_amount):
+        data_fixture.create_text_field(table=table, name=f"Field {i}")
+    model = table.get_model()
+    # A model generated for specific field ids doesn't know the table version and is
+    # therefore never cached.
+    uncached_model = table.get_model(field_ids=list(model._field_objects.keys()))
+
+    def run(model_to_serialize):
+        start = time.perf_counter()
+        for _ in range(requests_amount):
+            get_row_serializer_class(
+                model_to_serialize, RowSerializer, is_response=True
+            )
+        return (time.perf_counter() - start) / requests_amount * 1000
+
+    uncached = run(uncached_model)
+    cached = run(model)
+
+    print(f"Uncached: {uncached:.3f}ms per request, cached: {cached:.3f}ms")
+    assert cached < uncached
@@ -3,6 +3,7 @@ from pytest_unordered import unordered
 from unittest.mock import patch
 
 import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db import connection
 from django.shortcuts import reverse
 from django.test.utils import CaptureQueriesContext
@@ -202,6 +203,104 @@ def test_create_table_with_data(
             ]
 
 
+@pytest.mark.django_db(transaction=True)
+@patch("baserow.core.jobs.handler.run_async_job")
+def test_create_table_from_file(
+    mock_run_async_job, api_client, data_fixture, patch_filefield_storage
+):
+    user, token = data_fixture.create_user_and_token()
+    database = data_fixture.create_database_application(user=user)
+    url = reverse(
+        "api:database:tables:async_create_from_file",
+        kwargs={"database_id": database.id},
+    )
+
+    response = api_client.post(
+        url,
+        {"name": "Test 1", "file_type": "csv"},
+        format="multipart",
+        HTTP_AUTHORIZATION=f"JWT {token}",
+    )
+    response_json = response.json()
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert response_json["error"] == "ERROR_REQUEST_BODY_VALIDATION"
+    assert response_json["detail"]["file"][0]["code"] == "required"
+
+    response = api_client.post(
+        url,
+        {
+            "name": "Test 1",
+            "file_type": "csv",
+            "encoding": "unknown",
+            "file": SimpleUploadedFile("test.csv", b"A,B\n1,2\n"),
+        },
+        format="multipart",
+        HTTP_AUTHORIZATION=f"JWT {token}",
+    )
+    response_json = response.json()
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert response_json["detail"]["encoding"][0]["code"] == "invalid"
+
+    with patch_filefield_storage():
+        response = api_client.post(
+            url,
+            {
+                "name": "Test 1",
+                "file_type": "csv",
+                "first_row_header": True,
+                "file": SimpleUploadedFile("test.csv", b"A;B\n1-1;1-2\n2-1;2-2\n"),
+            },
+            format="multipart",
+            HTTP_AUTHORIZATION=f"JWT {token}",
+        )
+    response_json = response.json()
+    assert response.status_code == HTTP_200_OK
+    assert response_json["file_type"] == "csv"
+
+    mock_run_async_job.delay.assert_called_with(response_json["id"])
+
+    job = FileImportJob.objects.get(id=response_json["id"])
+    assert job.table is None
+    assert job.name == "Test 1"
+    assert job.first_row_header
+    assert job.file_type == "csv"
+    assert job.encoding == ""
+    assert job.csv_delimiter == ""
+
+    with patch_filefield_storage():
+        with job.data_file.open("rb") as fin:
+            assert fin.read() == b"A;B\n1-1;1-2\n2-1;2-2\n"
+
+
+@pytest.mark.django_db(transaction=True)
+@patch("baserow.core.jobs.handler.run_async_job")
+def test_import_file_into_table(
+    mock_run_async_job, api_client, data_fixture, patch_filefield_storage
+):
+    user, token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    url = reverse(
+        "api:database:tables:import_file_async", kwargs={"table_id": table.id}
+    )
+
+    with patch_filefield_storage():
+        response = api_client.post(
+            url,
+            {
+                "file_type": "jsonl",
+                "file": SimpleUploadedFile("test.jsonl", b'["1"]\n["2"]\n'),
+            },
+            format="multipart",
+            HTTP_AUTHORIZATION=f"JWT {token}",
+        )
+    response_json = response.json()
+    assert response.status_code == HTTP_200_OK
+
+    job = FileImportJob.objects.get(id=response_json["id"])
+    assert job.table_id == table.id
+    assert job.file_type == "jsonl"
+
+
 @pytest.mark.django_db(transaction=True)
 def test_create_table_with_data_sync(api_client, data_fixture, patch_filefield_storage):
     user, token = data_fixture.create_user_and_token()
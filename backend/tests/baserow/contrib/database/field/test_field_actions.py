@@ -19,6 +19,7 @@ from baserow.contrib.database.fields.models import (
     MultipleSelectField,
     RatingField,
     SpecificFieldForUpdate,
+    UserFileReference,
 )
 from baserow.contrib.database.rows.handler import RowHandler
 from baserow.core.action.handler import ActionHandler
@@ -214,6 +215,36 @@ def test_can_undo_updating_field(data_fixture, django_assert_num_queries):
     ]
 
 
+@pytest.mark.django_db
+@pytest.mark.undo_redo
+def test_undoing_converting_file_field_restores_user_file_references(data_fixture):
+    session_id = "session-id"
+    user = data_fixture.create_user(session_id=session_id)
+    table = data_fixture.create_database_table(user=user)
+    file_field = data_fixture.create_file_field(table=table, name="file")
+    user_file = data_fixture.create_user_file()
+    row = RowHandler().create_row(
+        user, table, {file_field.id: [{"name": user_file.name}]}
+    )
+    assert list(UserFileReference.objects.values_list("user_file_id", "row_id")) == [
+        (user_file.id, row.id)
+    ]
+
+    action_type_registry.get_by_type(UpdateFieldActionType).do(
+        user, file_field, new_type_name="text"
+    )
+    assert not UserFileReference.objects.exists()
+
+    actions = ActionHandler.undo(
+        user, [UpdateFieldActionType.scope(table.id)], session_id
+    )
+    assert_undo_redo_actions_are_valid(actions, [UpdateFieldActionType])
+
+    assert list(UserFileReference.objects.values_list("user_file_id", "row_id")) == [
+        (user_file.id, row.id)
+    ]
+
+
 @pytest.mark.django_db
 @pytest.mark.undo_redo
 def test_can_undo_and_redo_converting_link_row_to_other_type_related(
@@ -702,26 +733,31 @@ def test_can_still_cleanup_m2m_backup_after_field_perm_deleted(data_fixture):
 
 @pytest.mark.django_db
 @pytest.mark.undo_redo
-def test_cleaning_up_undo_single_column_field_action_deletes_column(data_fixture):
+def test_cleaning_up_undo_single_column_field_action_deletes_backup_table(
+    data_fixture,
+):
     session_id = "session-id"
     user = data_fixture.create_user(session_id=session_id)
     text_field = data_fixture.create_text_field(user=user)
+    column_names = get_table_column_names(text_field)
 
     update_field_action_type = action_type_registry.get_by_type(UpdateFieldActionType)
     update_field_action_type.do(user, text_field, new_type_name="number")
 
     action = Action.objects.first()
-    backup_column_name = dict(action.params)["backup_data"]["backed_up_column_name"]
-    assert backup_column_name in get_table_column_names(text_field)
+    backup_table_name = dict(action.params)["backup_data"]["backed_up_table_name"]
+    assert backup_table_name in connection.introspection.table_names()
+    # The backup is stored in a separate table, so the user table isn't altered.
+    assert get_table_column_names(text_field) == column_names
 
     update_field_action_type.clean_up_any_extra_action_data(action)
 
-    assert backup_column_name not in get_table_column_names(text_field)
+    assert backup_table_name not in connection.introspection.table_names()
 
 
 @pytest.mark.django_db
 @pytest.mark.undo_redo
-def test_cleaning_up_undo_single_column_perm_deleted_field_action_deletes_column(
+def test_cleaning_up_undo_single_column_perm_deleted_field_action_deletes_table(
     data_fixture,
 ):
     session_id = "session-id"
@@ -732,14 +768,14 @@ def test_cleaning_up_undo_single_column_perm_deleted_field_action_deletes_column
     update_field_action_type.do(user, text_field, new_type_name="number")
 
     action = Action.objects.first()
-    backup_column_name = dict(action.params)["backup_data"]["backed_up_column_name"]
-    assert backup_column_name in get_table_column_names(text_field)
+    backup_table_name = dict(action.params)["backup_data"]["backed_up_table_name"]
+    assert backup_table_name in connection.introspection.table_names()
 
     TrashHandler().permanently_delete(NumberField.objects.get(id=text_field.id))
 
     update_field_action_type.clean_up_any_extra_action_data(action)
 
-    assert backup_column_name not in get_table_column_names(text_field)
+    assert backup_table_name not in connection.introspection.table_names()
 
 
 @pytest.mark.django_db
@@ -759,8 +795,7 @@ def test_cleaning_up_undo_single_column_perm_deleted_table_doesnt_crash(
 
     TrashHandler().permanently_delete(table)
 
-    # The cleanup shouldn't crash if the table (and backup column) has already been
-    # deleted.
+    # The cleanup shouldn't crash if the table has already been deleted.
     update_field_action_type.clean_up_any_extra_action_data(action)
 
 
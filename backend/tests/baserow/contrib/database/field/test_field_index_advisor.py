@@ -0,0 +1,234 @@
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.shortcuts import reverse
+
+from baserow.contrib.database.fields.constants import (
+    INDEX_KIND_BTREE,
+    INDEX_KIND_HASH,
+    INDEX_KIND_TRIGRAM,
+)
+from baserow.contrib.database.fields.handler import FieldHandler
+from baserow.contrib.database.fields.index_advisor import (
+    FieldIndexAdvisor,
+    get_field_index_name,
+)
+from baserow.contrib.database.fields.models import FieldIndex, FieldIndexUsage
+from baserow.contrib.database.rows.handler import RowHandler
+
+
+def index_exists(name):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_indexes WHERE indexname = %s", [name])
+        return cursor.fetchone() is not None
+
+
+@pytest.mark.django_db
+def test_get_api_field_usages(data_fixture):
+    table = data_fixture.create_database_table()
+    text_field = data_fixture.create_text_field(table=table, name="Text")
+    number_field = data_fixture.create_number_field(table=table, name="Number")
+    boolean_field = data_fixture.create_boolean_field(table=table, name="Boolean")
+    queryset = table.get_model().objects.all()
+    advisor = FieldIndexAdvisor()
+
+    usages = advisor.get_api_field_usages(
+        queryset,
+        f"field_{number_field.id},-field_{text_field.id},field_{boolean_field.id}",
+        False,
+        {
+            f"filter__field_{text_field.id}__contains": ["a"],
+            f"filter__field_{number_field.id}__higher_than": ["1"],
+            f"filter__field_{text_field.id}__not_equal": ["b"],
+            "search": ["c"],
+        },
+    )
+    assert usages == {
+        (number_field.id, INDEX_KIND_BTREE),
+        (text_field.id, INDEX_KIND_TRIGRAM),
+    }
+
+    usages = advisor.get_api_field_usages(queryset, "-Number", True, {})
+    assert usages == {(number_field.id, INDEX_KIND_BTREE)}
+
+
+@pytest.mark.django_db
+def test_date_filters_only_use_an_index_on_date_columns(data_fixture):
+    table = data_fixture.create_database_table()
+    view = data_fixture.create_grid_view(table=table)
+    date_field = data_fixture.create_date_field(table=table)
+    datetime_field = data_fixture.create_date_field(table=table, date_include_time=True)
+    created_on_field = data_fixture.create_created_on_field(table=table)
+    for field in [date_field, datetime_field, created_on_field]:
+        data_fixture.create_view_filter(view=view, field=field, type="date_after")
+    queryset = table.get_model().objects.all()
+    advisor = FieldIndexAdvisor()
+
+    usages = advisor.get_api_field_usages(
+        queryset,
+        None,
+        False,
+        {
+            f"filter__field_{date_field.id}__date_before": ["2022-01-01"],
+            f"filter__field_{datetime_field.id}__date_before": ["2022-01-01"],
+            f"filter__field_{created_on_field.id}__date_before": ["2022-01-01"],
+        },
+    )
+    assert usages == {(date_field.id, INDEX_KIND_BTREE)}
+    assert advisor.get_usage_scores(table) == {(date_field.id, INDEX_KIND_BTREE): 1}
+
+
+@pytest.mark.django_db
+def test_record_field_usages(data_fixture, settings):
+    field = data_fixture.create_number_field()
+    advisor = FieldIndexAdvisor()
+    usages = [(field.id, INDEX_KIND_BTREE)]
+
+    settings.BASEROW_INDEX_ADVISOR_ENABLED = False
+    advisor.record_field_usages(usages)
+    assert not FieldIndexUsage.objects.exists()
+
+    settings.BASEROW_INDEX_ADVISOR_ENABLED = True
+    cache.clear()
+    advisor.record_field_usages(usages)
+    advisor.record_field_usages(usages)
+    assert FieldIndexUsage.objects.get(field=field).usage_count == 1
+
+    cache.clear()
+    advisor.record_field_usages(usages)
+    assert FieldIndexUsage.objects.get(field=field).usage_count == 2
+
+
+@pytest.mark.django_db
+def test_get_wanted_indexes(data_fixture, settings):
+    settings.BASEROW_INDEX_ADVISOR_MIN_ROWS = 100
+    settings.BASEROW_INDEX_ADVISOR_MAX_INDEXES_PER_TABLE = 2
+    table = data_fixture.create_database_table()
+    view = data_fixture.create_grid_view(table=table)
+    text_field = data_fixture.create_text_field(table=table)
+    number_field = data_fixture.create_number_field(table=table)
+    date_field = data_fixture.create_date_field(table=table)
+    link_field = data_fixture.create_link_row_field(table=table)
+    data_fixture.create_view_sort(view=view, field=number_field)
+    data_fixture.create_view_sort(view=view, field=text_field)
+    data_fixture.create_view_sort(view=view, field=link_field)
+    data_fixture.create_view_filter(view=view, field=text_field, type="contains")
+    data_fixture.create_view_filter(view=view, field=text_field, type="contains")
+    data_fixture.create_view_filter(view=view, field=date_field, type="date_before")
+    advisor = FieldIndexAdvisor()
+
+    assert advisor.get_usage_scores(table) == {
+        (number_field.id, INDEX_KIND_BTREE): 1,
+        (text_field.id, INDEX_KIND_TRIGRAM): 2,
+        (date_field.id, INDEX_KIND_BTREE): 1,
+    }
+    assert advisor.get_wanted_indexes(table, 99) == set()
+    assert advisor.get_wanted_indexes(table, 100) == {
+        (text_field.id, INDEX_KIND_TRIGRAM),
+        (number_field.id, INDEX_KIND_BTREE),
+    }
+
+
+@pytest.mark.django_db
+def test_advise_table_creates_and_drops_indexes(data_fixture, settings):
+    settings.BASEROW_INDEX_ADVISOR_MIN_ROWS = 0
+    table = data_fixture.create_database_table()
+    view = data_fixture.create_grid_view(table=table)
+    number_field = data_fixture.create_number_field(table=table)
+    view_sort = data_fixture.create_view_sort(view=view, field=number_field)
+    name = get_field_index_name(number_field, INDEX_KIND_BTREE)
+    advisor = FieldIndexAdvisor()
+
+    advisor.advise_table(table, 0)
+    assert FieldIndex.objects.get(field=number_field).name == name
+    assert index_exists(name)
+
+    view_sort.delete()
+    advisor.advise_table(table, 0)
+    assert not FieldIndex.objects.exists()
+    assert not index_exists(name)
+
+
+@pytest.mark.django_db
+def test_field_indexes_are_dropped_when_the_field_changes(data_fixture, settings):
+    settings.BASEROW_INDEX_ADVISOR_MIN_ROWS = 0
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    view = data_fixture.create_grid_view(table=table)
+    number_field = data_fixture.create_number_field(table=table)
+    date_field = data_fixture.create_date_field(table=table)
+    data_fixture.create_view_sort(view=view, field=number_field)
+    data_fixture.create_view_sort(view=view, field=date_field)
+    number_index_name = get_field_index_name(number_field, INDEX_KIND_BTREE)
+    date_index_name = get_field_index_name(date_field, INDEX_KIND_BTREE)
+    FieldIndexAdvisor().advise_table(table, 0)
+    assert index_exists(number_index_name)
+    assert index_exists(date_index_name)
+
+    FieldHandler().update_field(user, number_field, new_type_name="text")
+    assert not FieldIndex.objects.filter(field=number_field).exists()
+    assert not index_exists(number_index_name)
+
+    FieldHandler().delete_field(user, date_field)
+    assert not FieldIndex.objects.filter(field=date_field).exists()
+    assert not index_exists(date_index_name)
+
+
+@pytest.mark.django_db
+def test_upsert_rows_requests_a_key_field_index(
+    data_fixture, settings, django_capture_on_commit_callbacks
+):
+    cache.clear()
+    settings.BASEROW_INDEX_ADVISOR_MIN_ROWS = 100
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    key_field = data_fixture.create_text_field(table=table)
+    key = f"field_{key_field.id}"
+    name = get_field_index_name(key_field, INDEX_KIND_HASH)
+
+    # Small tables don't need the index.
+    with django_capture_on_commit_callbacks(execute=True):
+        RowHandler().upsert_rows(user, table, [{key: "a"}], key_field.id)
+    assert not FieldIndex.objects.exists()
+    assert not index_exists(name)
+
+    cache.clear()
+    settings.BASEROW_INDEX_ADVISOR_MIN_ROWS = 0
+    with django_capture_on_commit_callbacks(execute=True):
+        RowHandler().upsert_rows(user, table, [{key: "a"}], key_field.id)
+    field_index = FieldIndex.objects.get(field=key_field)
+    assert field_index.index_kind == INDEX_KIND_HASH
+    assert field_index.name == name
+    assert index_exists(name)
+
+    # The existing index isn't requested again.
+    with patch(
+        "baserow.contrib.database.fields.tasks.create_field_index.delay"
+    ) as create_field_index, django_capture_on_commit_callbacks(execute=True):
+        RowHandler().upsert_rows(user, table, [{key: "b"}], key_field.id)
+    create_field_index.assert_not_called()
+
+    FieldHandler().update_field(user, key_field, new_type_name="number")
+    assert not FieldIndex.objects.exists()
+    assert not index_exists(name)
+
+
+@pytest.mark.django_db
+def test_list_rows_records_field_usages(api_client, data_fixture, settings):
+    settings.BASEROW_INDEX_ADVISOR_ENABLED = True
+    cache.clear()
+    user, jwt_token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    number_field = data_fixture.create_number_field(table=table)
+
+    response = api_client.get(
+        reverse("api:database:rows:list", kwargs={"table_id": table.id}),
+        {"order_by": f"field_{number_field.id}"},
+        HTTP_AUTHORIZATION=f"JWT {jwt_token}",
+    )
+    assert response.status_code == 200
+    usage = FieldIndexUsage.objects.get(field=number_field)
+    assert usage.index_kind == INDEX_KIND_BTREE
+    assert usage.usage_count == 1
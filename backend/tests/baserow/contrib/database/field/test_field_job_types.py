@@ -0,0 +1,130 @@
+from decimal import Decimal
+
+import pytest
+from django.db import connection, transaction
+from django.test.utils import override_settings
+
+from baserow.contrib.database.fields.handler import FieldHandler
+from baserow.contrib.database.fields.job_types import ConvertFieldTypeJobType
+from baserow.contrib.database.fields.models import NumberField, SingleSelectField
+from baserow.contrib.database.fields.online_conversion import (
+    OnlineFieldTypeConversion,
+)
+from baserow.contrib.database.table.scopes import TableActionScopeType
+from baserow.core.action.handler import ActionHandler
+from baserow.core.jobs.constants import JOB_FINISHED
+from baserow.core.jobs.handler import JobHandler
+
+
+def get_column_names(table):
+    with connection.cursor() as cursor:
+        return [
+            column.name
+            for column in connection.introspection.get_table_description(
+                cursor, table.get_database_table_name()
+            )
+        ]
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.undo_redo
+@override_settings(BASEROW_ONLINE_FIELD_CONVERSION_CHUNK_SIZE=2)
+def test_convert_field_type_job_converts_values_online(data_fixture):
+    session_id = "session-id"
+    user = data_fixture.create_user(session_id=session_id)
+    table = data_fixture.create_database_table(user=user)
+    field = data_fixture.create_text_field(table=table, name="Text")
+    model = table.get_model()
+    for value in ["1", "2.5", "not a number", None, "10"]:
+        model.objects.create(**{f"field_{field.id}": value})
+
+    job = JobHandler().create_and_start_job(
+        user,
+        ConvertFieldTypeJobType.type,
+        field_id=field.id,
+        new_type="number",
+        field_values={"number_decimal_places": 1},
+        user_session_id=session_id,
+    )
+
+    job.refresh_from_db()
+    assert job.state == JOB_FINISHED
+    assert job.progress_percentage == 100
+
+    field = NumberField.objects.get(id=field.id)
+    assert field.number_decimal_places == 1
+    model = table.get_model()
+    assert list(
+        model.objects.order_by("id").values_list(f"field_{field.id}", flat=True)
+    ) == [Decimal("1.0"), Decimal("2.5"), None, None, Decimal("10.0")]
+    assert f"field_{field.id}_converted" not in get_column_names(table)
+
+    # The original column has been kept as backup, so the conversion can be undone.
+    with transaction.atomic():
+        ActionHandler.undo(user, [TableActionScopeType.value(table.id)], session_id)
+
+    model = table.get_model()
+    assert list(
+        model.objects.order_by("id").values_list(f"field_{field.id}", flat=True)
+    ) == ["1", "2.5", "not a number", None, "10"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_online_field_type_conversion_keeps_shadow_column_in_sync(data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    field = data_fixture.create_text_field(table=table, name="Text")
+    model = table.get_model()
+    row_1 = model.objects.create(**{f"field_{field.id}": "1"})
+
+    online_conversion = OnlineFieldTypeConversion(user, field, "number")
+    assert online_conversion.is_supported()
+
+    try:
+        online_conversion.create_shadow_column()
+        # Rows that are created or updated during the conversion are converted by
+        # the trigger.
+        row_2 = model.objects.create(**{f"field_{field.id}": "2"})
+        online_conversion.backfill()
+        setattr(row_1, f"field_{field.id}", "3")
+        row_1.save()
+
+        with transaction.atomic():
+            field = FieldHandler().get_specific_field_for_update(field.id)
+            FieldHandler().update_field(
+                user, field, "number", online_conversion=online_conversion
+            )
+    finally:
+        online_conversion.clean_up()
+
+    model = table.get_model()
+    assert getattr(model.objects.get(id=row_1.id), f"field_{field.id}") == 3
+    assert getattr(model.objects.get(id=row_2.id), f"field_{field.id}") == 2
+    assert get_column_names(table).count(f"field_{field.id}") == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_convert_field_type_job_falls_back_to_regular_update(data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    field = data_fixture.create_text_field(table=table, name="Text")
+    model = table.get_model()
+    model.objects.create(**{f"field_{field.id}": "Option"})
+
+    online_conversion = OnlineFieldTypeConversion(user, field, "single_select")
+    assert not online_conversion.is_supported()
+
+    job = JobHandler().create_and_start_job(
+        user,
+        ConvertFieldTypeJobType.type,
+        field_id=field.id,
+        new_type="single_select",
+        field_values={"select_options": [{"value": "Option", "color": "blue"}]},
+    )
+
+    job.refresh_from_db()
+    assert job.state == JOB_FINISHED
+    field = SingleSelectField.objects.get(id=field.id)
+    option = field.select_options.get()
+    row = table.get_model().objects.get()
+    assert getattr(row, f"field_{field.id}_id") == option.id
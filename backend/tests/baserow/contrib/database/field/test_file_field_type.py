@@ -8,14 +8,22 @@ from django.core.exceptions import ValidationError
 from django.core.files.base import ContentFile
 from django.core.files.storage import FileSystemStorage
 
+from baserow.contrib.database.api.fields.serializers import (
+    FileFieldResponseSerializer,
+)
 from baserow.core.handler import CoreHandler
+from baserow.core.signals import user_file_thumbnails_generated
+from baserow.core.trash.handler import TrashHandler
 from baserow.core.user_files.models import UserFile
 from baserow.core.user_files.exceptions import (
     InvalidUserFileNameError,
     UserFileDoesNotExist,
 )
 from baserow.core.user_files.handler import UserFileHandler
-from baserow.contrib.database.fields.models import FileField
+from baserow.contrib.database.fields.file_references import (
+    get_unreferenced_user_files,
+)
+from baserow.contrib.database.fields.models import FileField, UserFileReference
 from baserow.contrib.database.fields.handler import FieldHandler
 from baserow.contrib.database.rows.handler import RowHandler
 
@@ -296,3 +304,106 @@ def test_import_export_file_field(data_fixture, tmpdir):
     file_path = tmpdir.join("user_files", imported_user_file.name)
     assert file_path.isfile()
     assert file_path.open().read() == "Hello World"
+
+
+@pytest.mark.django_db
+def test_file_field_type_maintains_user_file_references(data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    file_field = data_fixture.create_file_field(table=table)
+    user_file_1 = data_fixture.create_user_file()
+    user_file_2 = data_fixture.create_user_file()
+    user_file_3 = data_fixture.create_user_file()
+
+    def get_references():
+        return set(
+            UserFileReference.objects.values_list("user_file_id", "row_id").order_by()
+        )
+
+    handler = RowHandler()
+    row_1 = handler.create_row(
+        user,
+        table,
+        {file_field.id: [{"name": user_file_1.name}, {"name": user_file_2.name}]},
+    )
+    row_2, row_3 = handler.create_rows(
+        user,
+        table,
+        [
+            {f"field_{file_field.id}": [{"name": user_file_1.name}]},
+            {f"field_{file_field.id}": []},
+        ],
+    )
+    assert get_references() == {
+        (user_file_1.id, row_1.id),
+        (user_file_2.id, row_1.id),
+        (user_file_1.id, row_2.id),
+    }
+    assert list(get_unreferenced_user_files()) == [user_file_3]
+
+    handler.update_row(
+        user, table, row_1, {file_field.id: [{"name": user_file_3.name}]}
+    )
+    handler.update_rows(
+        user,
+        table,
+        [
+            {"id": row_2.id, f"field_{file_field.id}": []},
+            {"id": row_3.id, f"field_{file_field.id}": [{"name": user_file_2.name}]},
+        ],
+    )
+    assert get_references() == {
+        (user_file_3.id, row_1.id),
+        (user_file_2.id, row_3.id),
+    }
+
+    handler.delete_row(user, table, row_1)
+    assert get_references() == {(user_file_2.id, row_3.id)}
+
+    TrashHandler.restore_item(user, "row", row_1.id, parent_trash_item_id=table.id)
+    assert get_references() == {
+        (user_file_3.id, row_1.id),
+        (user_file_2.id, row_3.id),
+    }
+
+    FieldHandler().update_field(user, file_field, new_type_name="text")
+    assert get_references() == set()
+
+
+@pytest.mark.django_db
+def test_file_field_cells_leave_out_pending_thumbnails(data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    file_field = data_fixture.create_file_field(table=table)
+    user_file = data_fixture.create_user_file(
+        is_image=True, image_width=100, image_height=100, thumbnails_pending=True
+    )
+    other_user_file = data_fixture.create_user_file(is_image=True)
+
+    row = RowHandler().create_row(
+        user,
+        table,
+        {file_field.id: [{"name": user_file.name}, {"name": other_user_file.name}]},
+    )
+
+    def get_serialized_cell():
+        row.refresh_from_db()
+        return FileFieldResponseSerializer(
+            getattr(row, f"field_{file_field.id}"), many=True
+        ).data
+
+    pending, other = get_serialized_cell()
+    assert pending["thumbnails_pending"] is True
+    assert pending["thumbnails"] is None
+    assert other["thumbnails_pending"] is False
+    assert "tiny" in other["thumbnails"]
+
+    UserFile.objects.filter(id=user_file.id).update(thumbnails_pending=False)
+    user_file.thumbnails_pending = False
+    user_file_thumbnails_generated.send(None, user_file=user_file)
+
+    generated, other = get_serialized_cell()
+    assert generated["name"] == user_file.name
+    assert generated["thumbnails_pending"] is False
+    assert "tiny" in generated["thumbnails"]
+    assert other["name"] == other_user_file.name
@@ -1263,3 +1263,150 @@ def test_no_pending_operations_after_creating_self_linking_model(data_fixture):
     # Django ManyToManyField registers pending operations every time a table model is
     # generated, which can causes a memory leak if they are not triggered.
     assert len(apps._pending_operations) == 0
+
+
+@pytest.mark.django_db
+@pytest.mark.field_link_row
+def test_link_row_related_model_only_contains_needed_fields(data_fixture):
+    user = data_fixture.create_user()
+    database = data_fixture.create_database_application(user=user)
+    table = data_fixture.create_database_table(database=database)
+    related_table = data_fixture.create_database_table(database=database)
+    other_table = data_fixture.create_database_table(database=database)
+    data_fixture.create_text_field(table=table, primary=True)
+    related_primary = data_fixture.create_text_field(table=related_table, primary=True)
+    related_text = data_fixture.create_text_field(table=related_table)
+    data_fixture.create_text_field(table=other_table, primary=True)
+
+    field_handler = FieldHandler()
+    link_row = field_handler.create_field(
+        user=user,
+        table=table,
+        type_name="link_row",
+        name="Link",
+        link_row_table=related_table,
+    )
+    related_link_row = field_handler.create_field(
+        user=user,
+        table=related_table,
+        type_name="link_row",
+        name="Other link",
+        link_row_table=other_table,
+    )
+
+    related_model = (
+        table.get_model()._meta.get_field(link_row.db_column).remote_field.model
+    )
+    assert set(related_model._field_objects.keys()) == {
+        related_primary.id,
+        link_row.link_row_related_field_id,
+    }
+
+    lookup = field_handler.create_field(
+        user=user,
+        table=table,
+        type_name="lookup",
+        name="Lookup",
+        through_field_id=link_row.id,
+        target_field_id=related_text.id,
+    )
+    related_model = (
+        table.get_model()._meta.get_field(link_row.db_column).remote_field.model
+    )
+    assert set(related_model._field_objects.keys()) == {
+        related_primary.id,
+        related_text.id,
+        link_row.link_row_related_field_id,
+    }
+
+    # The related table model itself must still contain all fields.
+    related_table_model = related_table.get_model()
+    assert set(related_table_model._field_objects.keys()) == {
+        related_primary.id,
+        related_text.id,
+        related_link_row.id,
+        link_row.link_row_related_field_id,
+    }
+
+    related_row = related_table_model.objects.create(
+        **{related_primary.db_column: "Primary", related_text.db_column: "Text"}
+    )
+    row = RowHandler().create_row(user, table, {link_row.db_column: [related_row.id]})
+    row = table.get_model().objects.get(id=row.id)
+    assert getattr(row, f"field_{link_row.id}").get().id == related_row.id
+    assert getattr(row, f"field_{lookup.id}") == [
+        {"id": related_row.id, "value": "Text"}
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.field_link_row
+def test_link_row_related_model_contains_links_that_are_looked_up_through(
+    data_fixture,
+):
+    user = data_fixture.create_user()
+    database = data_fixture.create_database_application(user=user)
+    table = data_fixture.create_database_table(database=database)
+    related_table = data_fixture.create_database_table(database=database)
+    other_table = data_fixture.create_database_table(database=database)
+    data_fixture.create_text_field(table=table, primary=True)
+    data_fixture.create_text_field(table=related_table, primary=True)
+    other_primary = data_fixture.create_text_field(
+        table=other_table, name="Name", primary=True
+    )
+
+    field_handler = FieldHandler()
+    link_row = field_handler.create_field(
+        user=user,
+        table=table,
+        type_name="link_row",
+        name="Link",
+        link_row_table=related_table,
+    )
+    related_link_row = field_handler.create_field(
+        user=user,
+        table=related_table,
+        type_name="link_row",
+        name="Other link",
+        link_row_table=other_table,
+    )
+    related_formula = field_handler.create_field(
+        user=user,
+        table=related_table,
+        type_name="formula",
+        name="Names",
+        formula="join(totext(lookup('Other link', 'Name')), ',')",
+    )
+    lookup = field_handler.create_field(
+        user=user,
+        table=table,
+        type_name="lookup",
+        name="Lookup",
+        through_field_id=link_row.id,
+        target_field_id=related_formula.id,
+    )
+
+    related_model = (
+        table.get_model()._meta.get_field(link_row.db_column).remote_field.model
+    )
+    assert related_link_row.id in related_model._field_objects
+    assert related_formula.id in related_model._field_objects
+
+    row_handler = RowHandler()
+    other_row = row_handler.create_row(
+        user, other_table, {other_primary.db_column: "Before"}
+    )
+    related_row = row_handler.create_row(
+        user, related_table, {related_link_row.db_column: [other_row.id]}
+    )
+    row = row_handler.create_row(user, table, {link_row.db_column: [related_row.id]})
+    row.refresh_from_db()
+    assert getattr(row, lookup.db_column) == [{"id": related_row.id, "value": "Before"}]
+
+    # Changing a value two links away must update the rows that are joined via the
+    # projected related model.
+    row_handler.update_row_by_id(
+        user, other_table, other_row.id, {other_primary.db_column: "After"}
+    )
+    row.refresh_from_db()
+    assert getattr(row, lookup.db_column) == [{"id": related_row.id, "value": "After"}]
@@ -17,6 +17,9 @@ from baserow.contrib.database.fields.models import (
 )
 from baserow.contrib.database.fields.field_types import SingleSelectFieldType
 from baserow.contrib.database.fields.registries import field_type_registry
+from baserow.contrib.database.fields.select_option_cache import (
+    get_serialized_select_options,
+)
 from baserow.contrib.database.rows.handler import RowHandler
 from baserow.contrib.database.views.handler import ViewHandler
 from baserow.contrib.database.api.rows.serializers import (
@@ -799,3 +802,34 @@ def test_get_set_export_serialized_value_single_select_field(data_fixture):
     assert getattr(imported_row_3, f"field_{imported_field.id}_id") != option_b.id
     assert getattr(imported_row_3, f"field_{imported_field.id}").value == "B"
     assert getattr(imported_row_3, f"field_{imported_field.id}").color == "red"
+
+
+@pytest.mark.django_db
+def test_get_serialized_select_options_is_cached_per_table_version(
+    data_fixture, django_assert_num_queries
+):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    field = data_fixture.create_single_select_field(table=table)
+    option = data_fixture.create_select_option(field=field, value="A", color="red")
+    table.refresh_from_db()
+
+    with django_assert_num_queries(1):
+        select_options = get_serialized_select_options(field, table.version)
+        assert get_serialized_select_options(field, table.version) is select_options
+    assert select_options == {
+        option.id: {"id": option.id, "value": "A", "color": "red"}
+    }
+
+    # Without a version the options are always fetched.
+    with django_assert_num_queries(2):
+        get_serialized_select_options(field)
+        get_serialized_select_options(field)
+
+    FieldHandler().update_field_select_options(
+        user, field, [{"id": option.id, "value": "B", "color": "blue"}]
+    )
+    table.refresh_from_db()
+    assert get_serialized_select_options(field, table.version) == {
+        option.id: {"id": option.id, "value": "B", "color": "blue"}
+    }
@@ -0,0 +1,40 @@
+import codecs
+
+import pytest
+
+from baserow.contrib.database.file_import.readers import (
+    detect_csv_delimiter,
+    detect_encoding,
+)
+
+
+@pytest.mark.parametrize(
+    "sample,is_complete,expected",
+    [
+        (b"a,b\n1,2", True, "utf-8"),
+        ("é,ü".encode("utf-8"), True, "utf-8"),
+        (codecs.BOM_UTF8 + b"a,b", True, "utf-8-sig"),
+        ("a,b".encode("utf-16"), True, "utf-16"),
+        ("a,é".encode("cp1252"), True, "cp1252"),
+        # The sample stops in the middle of a multibyte character.
+        ("a,é".encode("utf-8")[:-1], False, "utf-8"),
+        ("a,é".encode("utf-8")[:-1], True, "cp1252"),
+    ],
+)
+def test_detect_encoding(sample, is_complete, expected):
+    assert detect_encoding(sample, is_complete=is_complete) == expected
+
+
+@pytest.mark.parametrize(
+    "sample,expected",
+    [
+        ("a,b,c\n1,2,3\n4,5,6", ","),
+        ("a;b;c\n1;2;3\n4;5", ";"),
+        ("a\tb\n1\t2\n", "\t"),
+        ("a|b\n1|2\n", "|"),
+        ('a;"b\nc";d\n1;2;3\n', ";"),
+        ("single column", ","),
+    ],
+)
+def test_detect_csv_delimiter(sample, expected):
+    assert detect_csv_delimiter(sample) == expected
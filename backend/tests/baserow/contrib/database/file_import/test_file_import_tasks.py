@@ -1,5 +1,8 @@
+from unittest.mock import patch
+
 import pytest
 from django.conf import settings
+from django.core.files.base import ContentFile
 from django.test.utils import override_settings
 from django.utils import timezone
 from freezegun import freeze_time
@@ -15,6 +18,7 @@ from baserow.contrib.database.fields.exceptions import (
 from baserow.contrib.database.fields.field_cache import FieldCache
 from baserow.contrib.database.fields.models import SelectOption
 from baserow.contrib.database.fields.models import TextField
+from baserow.contrib.database.file_import.exceptions import InvalidFileImportData
 from baserow.contrib.database.rows.exceptions import ReportMaxErrorCountExceeded
 from baserow.contrib.database.table.exceptions import (
     InvalidInitialTableData,
@@ -502,6 +506,100 @@ def test_run_file_import_test_chunk(data_fixture, patch_filefield_storage):
     assert job.progress_percentage == 100
 
 
+@pytest.mark.django_db(transaction=True)
+def test_run_file_import_task_from_csv_file(data_fixture, patch_filefield_storage):
+    user = data_fixture.create_user()
+    database = data_fixture.create_database_application(user=user)
+
+    content = 'A;B;C\r\n1-1;"1\n2";1-3\r\n2-1;2-2\r\né;3-2;3-3;3-4\r\n'
+    with patch_filefield_storage():
+        job = data_fixture.create_file_import_job(
+            user=user,
+            database=database,
+            file_type="csv",
+            data_file=ContentFile(content.encode("cp1252")),
+        )
+        run_async_job(job.id)
+
+    job.refresh_from_db()
+    assert job.state == JOB_FINISHED
+    assert job.progress_percentage == 100
+    assert job.report == {"failing_rows": {}}
+
+    text_fields = TextField.objects.filter(table=job.table).order_by("order")
+    assert [f.name for f in text_fields] == ["A", "B", "C", "Field 4"]
+
+    model = job.table.get_model()
+    rows = model.objects.all()
+    assert [
+        [getattr(row, f"field_{field.id}") for field in text_fields] for row in rows
+    ] == [
+        ["1-1", "1\n2", "1-3", None],
+        ["2-1", "2-2", None, None],
+        ["é", "3-2", "3-3", "3-4"],
+    ]
+
+    with patch_filefield_storage():
+        job = data_fixture.create_file_import_job(
+            user=user,
+            database=database,
+            file_type="csv",
+            data_file=ContentFile(b"id,name\n1,test\n"),
+        )
+
+        with pytest.raises(ReservedBaserowFieldNameException):
+            run_async_job(job.id)
+
+
+@pytest.mark.django_db(transaction=True)
+@patch("baserow.contrib.database.file_import.readers.CHUNK_SIZE", 2)
+def test_run_file_import_task_from_file_into_table_by_chunks(
+    data_fixture, patch_filefield_storage
+):
+    user = data_fixture.create_user()
+    table, fields, _ = data_fixture.build_table(
+        columns=[("Name", "text"), ("Count", "number")],
+        rows=[],
+        user=user,
+    )
+
+    with patch_filefield_storage():
+        job = data_fixture.create_file_import_job(
+            user=user,
+            table=table,
+            file_type="tsv",
+            data_file=ContentFile(b"a\t1\nb\tbad\nc\t3\nd\te\tf\ne\t5\n"),
+        )
+        run_async_job(job.id)
+
+    job.refresh_from_db()
+    assert job.state == JOB_FINISHED
+    assert sorted(job.report["failing_rows"].keys()) == ["1", "3"]
+
+    model = table.get_model()
+    assert [getattr(row, f"field_{fields[0].id}") for row in model.objects.all()] == [
+        "a",
+        "c",
+        "e",
+    ]
+
+    with patch_filefield_storage():
+        job = data_fixture.create_file_import_job(
+            user=user,
+            table=table,
+            file_type="jsonl",
+            data_file=ContentFile(b'["f", 6]\n\n{"g": 7}\n'),
+        )
+
+        with pytest.raises(InvalidFileImportData):
+            run_async_job(job.id)
+
+    job.refresh_from_db()
+    assert job.state == JOB_FAILED
+    assert job.human_readable_error == "The provided file could not be parsed."
+    assert model.objects.count() == 3
+
+
 @pytest.mark.django_db()
 def test_run_file_import_limit(data_fixture, patch_filefield_storage):
 
@@ -6,6 +6,7 @@ from unittest.mock import patch
 from pytest_unordered import unordered
 
 from baserow.core.action.handler import ActionHandler
+from baserow.core.action.models import Action
 from baserow.core.action.registries import (
     action_type_registry,
 )
@@ -23,6 +24,11 @@ from baserow.contrib.database.rows.actions import (
     MoveRowActionType,
     UpdateRowActionType,
     UpdateRowsActionType,
+    UpsertRowsActionType,
+    ROWS_VALUES_COMPRESSION_THRESHOLD,
+    compress_rows_values,
+    decompress_rows_values,
+    execute_row_operations,
 )
 from baserow.contrib.database.rows.handler import RowHandler
 from baserow.test_utils.helpers import assert_undo_redo_actions_are_valid
@@ -1146,6 +1152,78 @@ def test_can_undo_redo_update_rows(data_fixture):
     assert getattr(row_two, f"field_{name_field.id}") == "New value"
 
 
+@pytest.mark.django_db
+@pytest.mark.undo_redo
+def test_update_rows_action_only_stores_changed_values(data_fixture):
+    session_id = "session-id"
+    user = data_fixture.create_user(session_id=session_id)
+    table = data_fixture.create_database_table(user=user)
+    name_field = data_fixture.create_text_field(table=table, name="Name")
+    number_field = data_fixture.create_number_field(table=table, name="Number")
+
+    row_handler = RowHandler()
+    row_one = row_handler.create_row(
+        user, table, {name_field.id: "One", number_field.id: 1}
+    )
+    row_two = row_handler.create_row(
+        user, table, {name_field.id: "Two", number_field.id: 2}
+    )
+
+    action_type_registry.get_by_type(UpdateRowsActionType).do(
+        user,
+        table,
+        [
+            {
+                "id": row_one.id,
+                f"field_{name_field.id}": "One",
+                f"field_{number_field.id}": 10,
+            },
+            {
+                "id": row_two.id,
+                f"field_{name_field.id}": "Two",
+                f"field_{number_field.id}": 2,
+            },
+        ],
+    )
+
+    action = Action.objects.get(type=UpdateRowsActionType.type)
+    assert action.params["original_rows_values"] == [
+        {"id": row_one.id, f"field_{number_field.id}": "1"}
+    ]
+    assert action.params["new_rows"] == [
+        {"id": row_one.id, f"field_{number_field.id}": 10}
+    ]
+
+    ActionHandler.undo(
+        user, [TableActionScopeType.value(table_id=table.id)], session_id
+    )
+    row_one.refresh_from_db()
+    assert getattr(row_one, f"field_{number_field.id}") == 1
+    assert getattr(row_one, f"field_{name_field.id}") == "One"
+
+    ActionHandler.redo(
+        user, [TableActionScopeType.value(table_id=table.id)], session_id
+    )
+    row_one.refresh_from_db()
+    assert getattr(row_one, f"field_{number_field.id}") == 10
+
+
+def test_compress_rows_values():
+    small_rows_values = [{"id": 1, "field_1": "value"}]
+    assert compress_rows_values(small_rows_values) is small_rows_values
+    assert decompress_rows_values(small_rows_values) is small_rows_values
+
+    large_rows_values = [
+        {"id": i, "field_1": "value", "field_2": Decimal("1.5")} for i in range(1000)
+    ]
+    compressed = compress_rows_values(large_rows_values)
+    assert isinstance(compressed, str)
+    assert len(compressed) < ROWS_VALUES_COMPRESSION_THRESHOLD
+    assert decompress_rows_values(compressed) == [
+        {"id": i, "field_1": "value", "field_2": "1.5"} for i in range(1000)
+    ]
+
+
 @pytest.mark.django_db
 @pytest.mark.undo_redo
 def test_can_undo_redo_update_rows_interesting_field_types(data_fixture):
@@ -1300,3 +1378,81 @@ def test_can_undo_redo_update_rows_interesting_field_types(data_fixture):
         )
     ) == [multi_select_option_2.id]
     assert getattr(row_table_1, f"field_{formula_field.id}") == "New value"
+
+
+@pytest.mark.django_db
+@pytest.mark.undo_redo
+def test_can_undo_redo_row_operations_at_once(data_fixture):
+    session_id = "session-id"
+    user = data_fixture.create_user(session_id=session_id)
+    table = data_fixture.create_database_table(user=user)
+    field = data_fixture.create_text_field(table=table, name="Name", primary=True)
+    name = f"field_{field.id}"
+    model = table.get_model()
+    row_1 = model.objects.create(**{name: "a"}, order=1)
+    row_2 = model.objects.create(**{name: "b"}, order=2)
+
+    row_ids = execute_row_operations(
+        user,
+        table,
+        [
+            {"type": "create", "values": {name: "c"}},
+            {"type": "create", "values": {name: "d"}},
+            {"type": "update", "id": row_1.id, "values": {name: "a2"}},
+            {"type": "move", "id": row_1.id, "before_id": None},
+            {"type": "delete", "id": row_2.id},
+        ],
+    )
+
+    assert row_ids[2:] == [row_1.id, row_1.id, row_2.id]
+    assert list(model.objects.values_list(name, flat=True)) == ["c", "d", "a2"]
+
+    actions = list(Action.objects.order_by("id"))
+    assert [action.type for action in actions] == [
+        CreateRowsActionType.type,
+        UpdateRowsActionType.type,
+        MoveRowActionType.type,
+        DeleteRowsActionType.type,
+    ]
+    assert len({action.action_group for action in actions}) == 1
+    assert actions[0].action_group is not None
+
+    ActionHandler.undo(user, [TableActionScopeType.value(table.id)], session_id)
+
+    assert list(model.objects.values_list(name, flat=True)) == ["a", "b"]
+
+    ActionHandler.redo(user, [TableActionScopeType.value(table.id)], session_id)
+
+    assert list(model.objects.values_list(name, flat=True)) == ["c", "d", "a2"]
+
+
+@pytest.mark.django_db
+@pytest.mark.undo_redo
+def test_can_undo_redo_upsert_rows(data_fixture):
+    session_id = "session-id"
+    user = data_fixture.create_user(session_id=session_id)
+    table = data_fixture.create_database_table(user=user)
+    key_field = data_fixture.create_text_field(table=table, name="Key", primary=True)
+    number_field = data_fixture.create_number_field(table=table, name="Number")
+    key = f"field_{key_field.id}"
+    number = f"field_{number_field.id}"
+    model = table.get_model()
+    row = model.objects.create(**{key: "a", number: 1}, order=1)
+
+    rows = action_type_registry.get_by_type(UpsertRowsActionType).do(
+        user,
+        table,
+        [{key: "a", number: 2}, {key: "b", number: 3}],
+        key_field.id,
+    )
+
+    assert rows[0].id == row.id
+    assert list(model.objects.values_list(key, number)) == [("a", 2), ("b", 3)]
+
+    ActionHandler.undo(user, [TableActionScopeType.value(table.id)], session_id)
+
+    assert list(model.objects.values_list(key, number)) == [("a", 1)]
+
+    ActionHandler.redo(user, [TableActionScopeType.value(table.id)], session_id)
+
+    assert list(model.objects.values_list(key, number)) == [("a", 2), ("b", 3)]
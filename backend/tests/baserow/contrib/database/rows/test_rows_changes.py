@@ -0,0 +1,220 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from baserow.contrib.database.fields.handler import FieldHandler
+from baserow.contrib.database.rows.changes import (
+    decode_row_changes_cursor,
+    delete_expired_row_tombstones,
+    encode_row_changes_cursor,
+    get_row_changes_upper_bound,
+)
+from baserow.contrib.database.rows.exceptions import (
+    InvalidRowChangesCursor,
+    RowChangesCursorExpired,
+)
+from baserow.contrib.database.rows.handler import RowHandler
+from baserow.contrib.database.trash.models import RowTombstone
+from baserow.core.exceptions import UserNotInGroup
+from baserow.core.trash.handler import TrashHandler
+
+
+@pytest.mark.django_db
+def test_get_row_changes(data_fixture, settings):
+    settings.BASEROW_ROW_CHANGES_SETTLE_SECONDS = 0
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    field = data_fixture.create_text_field(table=table)
+    handler = RowHandler()
+    row_1 = handler.create_row(user, table, {f"field_{field.id}": "a"})
+    row_2 = handler.create_row(user, table, {f"field_{field.id}": "b"})
+    row_3 = handler.create_row(user, table, {f"field_{field.id}": "c"})
+
+    with pytest.raises(UserNotInGroup):
+        handler.get_row_changes(data_fixture.create_user(), table)
+
+    changes = handler.get_row_changes(user, table, size=2)
+    assert [row.id for row in changes.rows] == [row_1.id, row_2.id]
+    assert changes.deleted_row_ids == []
+    assert changes.has_more
+
+    changes = handler.get_row_changes(user, table, changes.cursor, size=2)
+    assert [row.id for row in changes.rows] == [row_3.id]
+    assert not changes.has_more
+
+    changes = handler.get_row_changes(user, table, changes.cursor)
+    assert changes.rows == []
+    assert changes.deleted_row_ids == []
+
+    handler.update_row_by_id(user, table, row_1.id, {f"field_{field.id}": "a2"})
+    handler.delete_row_by_id(user, table, row_2.id)
+    changes = handler.get_row_changes(user, table, changes.cursor)
+    assert [(row.id, getattr(row, f"field_{field.id}")) for row in changes.rows] == [
+        (row_1.id, "a2")
+    ]
+    assert changes.deleted_row_ids == [row_2.id]
+
+    model = table.get_model()
+    TrashHandler.permanently_delete(model.objects.get(id=row_3.id), table.id)
+    assert RowTombstone.objects.filter(table=table, row_id=row_3.id).exists()
+    changes = handler.get_row_changes(user, table, changes.cursor)
+    assert changes.rows == []
+    assert changes.deleted_row_ids == [row_3.id]
+
+    changes = handler.get_row_changes(user, table, changes.cursor)
+    assert changes.rows == []
+    assert changes.deleted_row_ids == []
+
+
+@pytest.mark.django_db
+def test_get_row_changes_does_not_change_last_modified(data_fixture, settings):
+    settings.BASEROW_ROW_CHANGES_SETTLE_SECONDS = 0
+    user = data_fixture.create_user()
+    database = data_fixture.create_database_application(user=user)
+    table = data_fixture.create_database_table(database=database)
+    related_table = data_fixture.create_database_table(database=database)
+    related_field = data_fixture.create_text_field(table=related_table, primary=True)
+    link_field = FieldHandler().create_field(
+        user, table, "link_row", name="link", link_row_table=related_table
+    )
+    FieldHandler().create_field(
+        user,
+        table,
+        "lookup",
+        name="lookup",
+        through_field_id=link_field.id,
+        target_field_id=related_field.id,
+    )
+    handler = RowHandler()
+    related_row = handler.create_row(
+        user, related_table, {f"field_{related_field.id}": "a"}
+    )
+    row = handler.create_row(user, table, {f"field_{link_field.id}": [related_row.id]})
+    trashed_row = handler.create_row(user, table, {})
+    changes = handler.get_row_changes(user, table)
+    assert [r.id for r in changes.rows] == [row.id, trashed_row.id]
+
+    model = table.get_model()
+    updated_on = model.objects.get(id=row.id).updated_on
+    handler.update_row_by_id(
+        user, related_table, related_row.id, {f"field_{related_field.id}": "b"}
+    )
+    handler.delete_rows(user, table, [trashed_row.id])
+    changes = handler.get_row_changes(user, table, changes.cursor)
+    assert [r.id for r in changes.rows] == [row.id]
+    assert changes.deleted_row_ids == [trashed_row.id]
+    assert model.objects.get(id=row.id).updated_on == updated_on
+    assert model.objects.get(id=row.id).changed_on > updated_on
+    assert (
+        model.objects_and_trash.get(id=trashed_row.id).updated_on
+        == trashed_row.updated_on
+    )
+
+
+@pytest.mark.django_db
+def test_get_row_changes_returns_linked_and_unlinked_rows(data_fixture, settings):
+    settings.BASEROW_ROW_CHANGES_SETTLE_SECONDS = 0
+    user = data_fixture.create_user()
+    database = data_fixture.create_database_application(user=user)
+    table = data_fixture.create_database_table(database=database)
+    related_table = data_fixture.create_database_table(database=database)
+    link_field = FieldHandler().create_field(
+        user, table, "link_row", name="link", link_row_table=related_table
+    )
+    link = f"field_{link_field.id}"
+    handler = RowHandler()
+    related_row_1 = handler.create_row(user, related_table, {})
+    related_row_2 = handler.create_row(user, related_table, {})
+    cursor = handler.get_row_changes(user, related_table).cursor
+
+    def get_changed_related_row_ids():
+        nonlocal cursor
+        changes = handler.get_row_changes(user, related_table, cursor)
+        cursor = changes.cursor
+        return [row.id for row in changes.rows]
+
+    row = handler.create_row(user, table, {link: [related_row_1.id]})
+    assert get_changed_related_row_ids() == [related_row_1.id]
+
+    handler.update_rows(user, table, [{"id": row.id, link: [related_row_2.id]}])
+    assert get_changed_related_row_ids() == [related_row_1.id, related_row_2.id]
+
+    handler.update_row_by_id(user, table, row.id, {link: [related_row_2.id]})
+    assert get_changed_related_row_ids() == []
+
+    handler.create_rows(user, table, [{link: [related_row_1.id]}])
+    assert get_changed_related_row_ids() == [related_row_1.id]
+
+    handler.delete_row_by_id(user, table, row.id)
+    assert get_changed_related_row_ids() == [related_row_2.id]
+
+    TrashHandler.permanently_delete(
+        table.get_model().objects_and_trash.get(id=row.id), table.id
+    )
+    assert get_changed_related_row_ids() == [related_row_2.id]
+
+
+@pytest.mark.django_db
+def test_get_row_changes_only_returns_settled_changes(data_fixture, settings):
+    settings.BASEROW_ROW_CHANGES_SETTLE_SECONDS = 60
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    row = RowHandler().create_row(user, table, {})
+
+    changes = RowHandler().get_row_changes(user, table)
+    assert changes.rows == []
+
+    settings.BASEROW_ROW_CHANGES_SETTLE_SECONDS = 0
+    changes = RowHandler().get_row_changes(user, table, changes.cursor)
+    assert [r.id for r in changes.rows] == [row.id]
+
+
+@pytest.mark.django_db
+def test_get_row_changes_upper_bound_logs_lag(settings, caplog):
+    settings.BASEROW_ROW_CHANGES_SETTLE_SECONDS = 5
+    settings.BASEROW_ROW_CHANGES_LAG_WARNING_SECONDS = 60
+    assert get_row_changes_upper_bound() <= timezone.now() - timedelta(seconds=5)
+    assert "held back" not in caplog.text
+
+    settings.BASEROW_ROW_CHANGES_LAG_WARNING_SECONDS = 1
+    get_row_changes_upper_bound()
+    assert "held back" in caplog.text
+
+
+@pytest.mark.django_db
+def test_get_row_changes_invalid_or_expired_cursor(data_fixture, settings):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+
+    with pytest.raises(InvalidRowChangesCursor):
+        RowHandler().get_row_changes(user, table, "invalid")
+
+    expired = timezone.now() - timedelta(
+        days=settings.BASEROW_ROW_TOMBSTONES_RETENTION_DAYS + 1
+    )
+    cursor = encode_row_changes_cursor((expired, 1), (expired, 1))
+    assert decode_row_changes_cursor(cursor) == ((expired, 1), (expired, 1))
+    with pytest.raises(RowChangesCursorExpired):
+        RowHandler().get_row_changes(user, table, cursor)
+
+
+@pytest.mark.django_db
+def test_delete_expired_row_tombstones(data_fixture, settings):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    row = RowHandler().create_row(user, table, {})
+    old_tombstone = RowTombstone.objects.create(table=table, row_id=0)
+    RowTombstone.objects.filter(id=old_tombstone.id).update(
+        deleted_on=timezone.now()
+        - timedelta(days=settings.BASEROW_ROW_TOMBSTONES_RETENTION_DAYS + 1)
+    )
+
+    TrashHandler.permanently_delete(row, table.id)
+    assert sorted(RowTombstone.objects.values_list("row_id", flat=True)) == [
+        0,
+        row.id,
+    ]
+
+    delete_expired_row_tombstones()
+    assert list(RowTombstone.objects.values_list("row_id", flat=True)) == [row.id]
@@ -8,7 +8,12 @@ import pytest
 from django.core.exceptions import ValidationError
 from django.db import models
 
-from baserow.contrib.database.rows.exceptions import RowDoesNotExist
+from baserow.contrib.database.fields.handler import FieldHandler
+from baserow.contrib.database.rows.exceptions import (
+    InvalidUpsertKeyField,
+    RowDoesNotExist,
+    UpsertKeyValuesNotUnique,
+)
 from baserow.contrib.database.rows.handler import RowHandler
 from baserow.core.exceptions import UserNotInGroup
 from baserow.core.trash.handler import TrashHandler
@@ -714,3 +719,167 @@ def test_has_row(data_fixture):
 
     assert handler.has_row(user=user, table=table, row_id=row.id, raise_error=False)
     assert handler.has_row(user=user, table=table, row_id=row.id, raise_error=True)
+
+
+@pytest.mark.django_db
+@patch("baserow.contrib.database.rows.signals.rows_deleted.send")
+@patch("baserow.contrib.database.rows.signals.rows_updated.send")
+@patch("baserow.contrib.database.rows.signals.rows_created.send")
+def test_combine_row_changes(
+    send_rows_created, send_rows_updated, send_rows_deleted, data_fixture
+):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    field = data_fixture.create_text_field(table=table, name="Name", primary=True)
+    formula_field = FieldHandler().create_field(
+        user, table, "formula", name="Formula", formula="concat(field('Name'), '!')"
+    )
+    name = f"field_{field.id}"
+    model = table.get_model()
+    row_1 = model.objects.create(**{name: "a"})
+    row_2 = model.objects.create(**{name: "b"})
+    row_3 = model.objects.create(**{name: "c"})
+
+    handler = RowHandler()
+    with handler.combine_row_changes(
+        user,
+        table,
+        model,
+        row_ids_to_update=[row_1.id, row_2.id],
+        updated_field_ids=[field.id],
+        row_ids_to_delete=[row_3.id],
+    ) as combined_changes:
+        created_rows = handler.create_rows(
+            user, table, [{name: "d"}], model=model, combined_changes=combined_changes
+        )
+        handler.update_rows(
+            user,
+            table,
+            [{"id": row_1.id, name: "e"}],
+            model=model,
+            combined_changes=combined_changes,
+        )
+        handler.update_rows(
+            user,
+            table,
+            [{"id": row_2.id, name: "f"}],
+            model=model,
+            combined_changes=combined_changes,
+        )
+        handler.delete_rows(
+            user, table, [row_3.id], model=model, combined_changes=combined_changes
+        )
+
+        # The signals are only sent when all changes have been made.
+        send_rows_created.assert_not_called()
+        send_rows_updated.assert_not_called()
+        send_rows_deleted.assert_not_called()
+
+    row_1.refresh_from_db()
+    assert getattr(row_1, f"field_{formula_field.id}") == "e!"
+    assert (
+        getattr(model.objects.get(id=created_rows[0].id), f"field_{formula_field.id}")
+        == "d!"
+    )
+
+    send_rows_created.assert_called_once()
+    assert [row.id for row in send_rows_created.call_args[1]["rows"]] == [
+        created_rows[0].id
+    ]
+    send_rows_updated.assert_called_once()
+    assert {row.id for row in send_rows_updated.call_args[1]["rows"]} == {
+        row_1.id,
+        row_2.id,
+    }
+    assert send_rows_updated.call_args[1]["updated_field_ids"] == {field.id}
+    send_rows_deleted.assert_called_once()
+    assert [row.id for row in send_rows_deleted.call_args[1]["rows"]] == [row_3.id]
+
+
+@pytest.mark.django_db
+@patch("baserow.contrib.database.rows.signals.rows_updated.send")
+@patch("baserow.contrib.database.rows.signals.rows_created.send")
+def test_upsert_rows(send_rows_created, send_rows_updated, data_fixture):
+    user = data_fixture.create_user()
+    database = data_fixture.create_database_application(user=user)
+    table = data_fixture.create_database_table(database=database)
+    related_table = data_fixture.create_database_table(database=database)
+    key_field = data_fixture.create_text_field(table=table, name="Key", primary=True)
+    number_field = data_fixture.create_number_field(table=table, name="Number")
+    link_field = FieldHandler().create_field(
+        user, table, "link_row", name="Link", link_row_table=related_table
+    )
+    formula_field = FieldHandler().create_field(
+        user, table, "formula", name="Formula", formula="field('Number') * 2"
+    )
+    key = f"field_{key_field.id}"
+    number = f"field_{number_field.id}"
+    link = f"field_{link_field.id}"
+    formula = f"field_{formula_field.id}"
+    related_row = related_table.get_model().objects.create()
+    model = table.get_model()
+    row = model.objects.create(**{key: "a", number: 1}, order=1)
+    model.objects.create(**{key: "", number: 1}, order=2)
+    model.objects.create(**{key: "", number: 1}, order=3)
+
+    handler = RowHandler()
+    rows, created_row_ids, original_rows = handler.upsert_rows(
+        user,
+        table,
+        [
+            {key: "a", number: 2, link: [related_row.id]},
+            {key: "b", number: 3},
+            {number: 4},
+        ],
+        key_field.id,
+        model=model,
+    )
+
+    assert rows[0].id == row.id
+    assert created_row_ids == {rows[1].id, rows[2].id}
+    assert [original_row.id for original_row in original_rows] == [row.id]
+    assert getattr(original_rows[0], number) == 1
+    assert [
+        (getattr(row, key), getattr(row, number), getattr(row, formula)) for row in rows
+    ] == [("a", 2, 4), ("b", 3, 6), (None, 4, 8)]
+    assert [r.id for r in getattr(rows[0], link).all()] == [related_row.id]
+    assert model.objects.count() == 5
+
+    send_rows_created.assert_called_once()
+    assert {r.id for r in send_rows_created.call_args[1]["rows"]} == created_row_ids
+    send_rows_updated.assert_called_once()
+    assert [r.id for r in send_rows_updated.call_args[1]["rows"]] == [row.id]
+
+    with pytest.raises(UpsertKeyValuesNotUnique):
+        handler.upsert_rows(user, table, [{key: "c"}, {key: "c"}], key_field.id)
+
+    with pytest.raises(InvalidUpsertKeyField):
+        handler.upsert_rows(user, table, [{key: "c"}], formula_field.id)
+
+
+@pytest.mark.django_db
+def test_upsert_rows_key_field_must_be_unique(data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    key_field = data_fixture.create_text_field(table=table, primary=True)
+    key = f"field_{key_field.id}"
+    model = table.get_model()
+    model.objects.create(**{key: "a"})
+    model.objects.create(**{key: "a"})
+
+    with pytest.raises(UpsertKeyValuesNotUnique) as exc:
+        RowHandler().upsert_rows(user, table, [{key: "a"}, {key: "b"}], key_field.id)
+
+    assert exc.value.values == ["a"]
+
+    # Only the existing rows with one of the provided values must be unique.
+    RowHandler().upsert_rows(user, table, [{key: "b"}], key_field.id)
+    assert model.objects.filter(**{key: "b"}).count() == 1
+
+    # The field doesn't become unique by upserting, so other writes can still
+    # create rows with the same value.
+    RowHandler().create_row(user, table, {key: "b"})
+    RowHandler().update_rows(
+        user, table, [{"id": model.objects.filter(**{key: "a"}).first().id, key: "b"}]
+    )
+    assert model.objects.filter(**{key: "b"}).count() == 3
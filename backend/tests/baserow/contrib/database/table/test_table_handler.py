@@ -3,17 +3,20 @@ import random
 
 import pytest
 from unittest.mock import patch
+from datetime import date, timedelta
 from decimal import Decimal
 
 from django.core.files.storage import FileSystemStorage
-from django.db import connection
+from django.db import connection, transaction
 from django.conf import settings
 from django.test.utils import override_settings
+from django.utils import timezone
 
 from pyinstrument import Profiler
 
 from baserow.contrib.database.fields.handler import FieldHandler
 from baserow.contrib.database.management.commands.fill_table_rows import fill_table_rows
+from baserow.core.db_routers import read_replica
 from baserow.core.exceptions import UserNotInGroup
 from baserow.contrib.database.fields.exceptions import (
     MaxFieldLimitExceeded,
@@ -21,6 +24,7 @@ from baserow.contrib.database.fields.exceptions import (
 )
 from baserow.contrib.database.table.models import Table
 from baserow.contrib.database.table.handler import TableHandler
+from baserow.contrib.database.table.row_count import update_table_row_count
 from baserow.contrib.database.table.exceptions import (
     TableDoesNotExist,
     TableNotInDatabase,
@@ -32,11 +36,16 @@ from baserow.contrib.database.fields.models import (
     TextField,
     LongTextField,
     BooleanField,
+    NumberField,
+    DateField,
+    EmailField,
+    SingleSelectField,
 )
 from baserow.contrib.database.views.models import GridView, GridViewFieldOptions
 from baserow.core.handler import CoreHandler
 from baserow.core.models import TrashEntry
 from baserow.core.trash.handler import TrashHandler
+from baserow.contrib.database.rows.handler import RowHandler
 from baserow.test_utils.helpers import setup_interesting_test_table
 
 
@@ -273,6 +282,57 @@ def test_fill_table_with_initial_data(data_fixture):
     assert table.field_set.count() == 5
 
 
+@pytest.mark.django_db
+def test_fill_table_with_initial_data_and_detect_field_types(data_fixture):
+    user = data_fixture.create_user()
+    database = data_fixture.create_database_application(user=user)
+
+    data = [
+        ["Name", "Amount", "Active", "Date", "Email", "Status"],
+        ["Tesla", "1.5", "yes", "31/12/2021", "tesla@example.com", "Open"],
+        ["Amazon", "-20", "no", "01/02/2022", "amazon@example.com", "Closed"],
+        ["Google", "", "", "", "", "Open"],
+        ["Apple", "3", "yes", "15/06/2022", "apple@example.com", "Closed"],
+    ]
+    table, _ = TableHandler().create_table(
+        user,
+        database,
+        name="Table 1",
+        data=data,
+        first_row_header=True,
+        detect_field_types=True,
+    )
+
+    fields = [field.specific for field in table.field_set.order_by("order")]
+    assert [field.name for field in fields] == data[0]
+    assert [type(field) for field in fields] == [
+        TextField,
+        NumberField,
+        BooleanField,
+        DateField,
+        EmailField,
+        SingleSelectField,
+    ]
+    assert fields[1].number_decimal_places == 1
+    assert fields[1].number_negative is True
+    assert fields[3].date_format == "EU"
+    assert fields[3].date_include_time is False
+    options = list(fields[5].select_options.order_by("order"))
+    assert [option.value for option in options] == ["Open", "Closed"]
+
+    model = table.get_model()
+    rows = model.objects.all()
+    assert getattr(rows[0], f"field_{fields[1].id}") == Decimal("1.5")
+    assert getattr(rows[0], f"field_{fields[2].id}") is True
+    assert getattr(rows[0], f"field_{fields[3].id}") == date(2021, 12, 31)
+    assert getattr(rows[0], f"field_{fields[4].id}") == "tesla@example.com"
+    assert getattr(rows[0], f"field_{fields[5].id}").id == options[0].id
+    assert getattr(rows[1], f"field_{fields[1].id}") == Decimal("-20")
+    assert getattr(rows[2], f"field_{fields[1].id}") is None
+    assert getattr(rows[2], f"field_{fields[2].id}") is False
+    assert getattr(rows[2], f"field_{fields[3].id}") is None
+
+
 @pytest.mark.django_db
 @patch("baserow.contrib.database.table.signals.table_updated.send")
 def test_update_database_table(send_mock, data_fixture):
@@ -516,6 +576,23 @@ def test_count_rows(data_fixture):
     assert table.row_count == count_expected
 
 
+@pytest.mark.django_db
+@override_settings(DATABASE_READ_REPLICAS=["default-copy"])
+def test_count_rows_on_the_primary_database(data_fixture):
+    table = data_fixture.create_database_table()
+    model = table.get_model()
+    model.objects.create()
+    model.objects.create()
+
+    # The rows aren't visible to the replica, which isn't allowed in this test
+    # anyway.
+    with read_replica():
+        TableHandler().count_rows()
+
+    table.refresh_from_db()
+    assert table.row_count == 2
+
+
 @pytest.mark.django_db
 def test_count_rows_ignores_templates(data_fixture, tmpdir):
     old_templates = settings.APPLICATION_TEMPLATES_DIR
@@ -633,6 +710,108 @@ def test_get_total_row_count_of_group(data_fixture):
     assert TableHandler.get_total_row_count_of_group(group.id) == 10
 
 
+@pytest.mark.django_db
+def test_row_count_is_maintained_when_rows_change(
+    data_fixture, django_capture_on_commit_callbacks
+):
+    user = data_fixture.create_user()
+    database = data_fixture.create_database_application(user=user)
+    with django_capture_on_commit_callbacks(execute=True):
+        table, _ = TableHandler().create_table(
+            user, database, name="Table", data=[["A"], ["B"], ["C"]]
+        )
+    table.refresh_from_db()
+    assert table.row_count == 2
+
+    row_handler = RowHandler()
+    with django_capture_on_commit_callbacks(execute=True):
+        row = row_handler.create_row(user, table)
+        rows = row_handler.create_rows(user, table, [{}, {}])
+    table.refresh_from_db()
+    assert table.row_count == 5
+
+    with django_capture_on_commit_callbacks(execute=True):
+        row_handler.delete_row(user, table, row)
+        trashed_rows = row_handler.delete_rows(user, table, [r.id for r in rows])
+    table.refresh_from_db()
+    assert table.row_count == 2
+    assert TableHandler.get_total_row_count_of_group(database.group_id) == 2
+
+    with django_capture_on_commit_callbacks(execute=True):
+        TrashHandler.restore_item(user, "row", row.id, parent_trash_item_id=table.id)
+        TrashHandler.restore_item(
+            user, "rows", trashed_rows.id, parent_trash_item_id=table.id
+        )
+    table.refresh_from_db()
+    assert table.row_count == 5
+    assert table.row_count == table.get_model().objects.count()
+
+
+@pytest.mark.django_db
+def test_row_count_deltas_are_applied_once_when_committed(
+    data_fixture, django_capture_on_commit_callbacks
+):
+    table = data_fixture.create_database_table(row_count=10)
+    other_table = data_fixture.create_database_table(row_count=10)
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        update_table_row_count(table.id, 2)
+        update_table_row_count(table.id, -3)
+        update_table_row_count(other_table.id, 1)
+        with transaction.atomic():
+            # Must be discarded separately if the savepoint is rolled back.
+            update_table_row_count(table.id, 4)
+
+    table.refresh_from_db()
+    assert table.row_count == 10
+    assert len(callbacks) == 3
+
+    for callback in callbacks:
+        callback()
+    table.refresh_from_db()
+    other_table.refresh_from_db()
+    assert table.row_count == 13
+    assert other_table.row_count == 11
+
+
+@pytest.mark.django_db
+@override_settings(ROW_COUNT_EXACT_COUNT_THRESHOLD=10)
+def test_count_rows_uses_estimate_for_large_tables(data_fixture):
+    now = timezone.now()
+    counted_table = data_fixture.create_database_table(
+        row_count=100, row_count_updated_at=now - timedelta(days=6)
+    )
+    stale_table = data_fixture.create_database_table(
+        row_count=100, row_count_updated_at=now - timedelta(days=8)
+    )
+    uncounted_table = data_fixture.create_database_table()
+    small_table = data_fixture.create_database_table(row_count=100)
+    fill_table_rows(3, small_table)
+    fill_table_rows(2, stale_table)
+
+    with patch(
+        "baserow.contrib.database.table.handler.get_estimated_row_counts"
+    ) as mock_estimate:
+        mock_estimate.return_value = {
+            counted_table.id: 20,
+            stale_table.id: 20,
+            uncounted_table.id: 30,
+        }
+        TableHandler.count_rows()
+
+    counted_table.refresh_from_db()
+    stale_table.refresh_from_db()
+    uncounted_table.refresh_from_db()
+    small_table.refresh_from_db()
+    # The large tables are not counted, the maintained count is kept or the estimate
+    # is used if the count isn't known yet. A maintained count that hasn't been
+    # counted for `ROW_COUNT_RECONCILE_DAYS` is counted exactly.
+    assert counted_table.row_count == 100
+    assert stale_table.row_count == 2
+    assert uncounted_table.row_count == 30
+    assert small_table.row_count == 3
+
+
 @pytest.mark.django_db
 @pytest.mark.undo_redo
 def test_duplicate_interesting_table(data_fixture):
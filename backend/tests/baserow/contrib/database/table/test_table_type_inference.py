@@ -0,0 +1,128 @@
+import pytest
+
+from baserow.contrib.database.table.type_inference import (
+    SINGLE_SELECT_MAX_OPTIONS,
+    FieldTypeInferrer,
+    get_row_converter,
+)
+
+
+@pytest.mark.parametrize(
+    "values,expected_type,expected_config",
+    [
+        (
+            ["1", "2", "-3"],
+            "number",
+            {"number_decimal_places": 0, "number_negative": True},
+        ),
+        (
+            ["1.25", "2"],
+            "number",
+            {"number_decimal_places": 2, "number_negative": False},
+        ),
+        # Leading zeros are usually meaningful, like in zip codes or phone numbers.
+        (["0123", "1"], "text", {}),
+        (["yes", "No", "TRUE"], "boolean", {}),
+        (
+            ["2021-01-31", "2021-02-01"],
+            "date",
+            {"date_format": "ISO", "date_include_time": False},
+        ),
+        (
+            ["31/01/2021", "01/02/2021"],
+            "date",
+            {"date_format": "EU", "date_include_time": False},
+        ),
+        (
+            ["01/31/2021", "02/01/2021"],
+            "date",
+            {"date_format": "US", "date_include_time": False},
+        ),
+        (
+            ["2021-01-31 10:30", "2021-02-01"],
+            "date",
+            {"date_format": "ISO", "date_include_time": True},
+        ),
+        (["2021-02-31"], "text", {}),
+        (["a@example.com", "b@example.com"], "email", {}),
+        (["https://baserow.io", "www.example.com"], "url", {}),
+        (["baserow.io"], "text", {}),
+        (["a", "b", "c"], "text", {}),
+        ([], "text", {}),
+    ],
+)
+def test_field_type_inferrer(values, expected_type, expected_config):
+    inferrer = FieldTypeInferrer()
+    inferrer.feed([[value] for value in values])
+    assert inferrer.get_fields(["Field"]) == [("Field", expected_type, expected_config)]
+
+
+def test_field_type_inferrer_by_chunks():
+    inferrer = FieldTypeInferrer()
+    inferrer.feed([["1", "a"], ["2", "b"]])
+    inferrer.feed([["3"], ["x", "a"], [None, "b", "extra"]])
+
+    fields = inferrer.get_fields(["A", "B", "C", "D"])
+    assert fields[0] == ("A", "text", {})
+    assert fields[1] == (
+        "B",
+        "single_select",
+        {
+            "select_options": [
+                {"value": "a", "color": "blue"},
+                {"value": "b", "color": "green"},
+            ]
+        },
+    )
+    assert fields[2] == ("C", "text", {})
+    assert fields[3] == ("D", "text", {})
+
+
+def test_field_type_inferrer_too_many_select_options():
+    inferrer = FieldTypeInferrer()
+    count = SINGLE_SELECT_MAX_OPTIONS + 1
+    inferrer.feed([[str(index)] for index in range(count)] * 2)
+    inferrer.feed([[f"value {index}"] for index in range(count)] * 2)
+    assert inferrer.get_fields(["A"]) == [("A", "text", {})]
+
+
+@pytest.mark.django_db
+def test_get_row_converter(data_fixture):
+    table = data_fixture.create_database_table()
+    text_field = data_fixture.create_text_field(table=table)
+    number_field = data_fixture.create_number_field(table=table)
+    boolean_field = data_fixture.create_boolean_field(table=table)
+    date_field = data_fixture.create_date_field(
+        table=table, date_format="US", date_include_time=True
+    )
+    email_field = data_fixture.create_email_field(table=table)
+    single_select_field = data_fixture.create_single_select_field(table=table)
+    option = data_fixture.create_select_option(field=single_select_field, value="A")
+
+    convert_row = get_row_converter(
+        [
+            text_field,
+            number_field,
+            boolean_field,
+            date_field,
+            email_field,
+            single_select_field,
+        ]
+    )
+
+    assert convert_row([1, " 10 ", "Yes", "12/31/2021 10:30", " a@b.com ", "A"]) == [
+        "1",
+        "10",
+        True,
+        "2021-12-31T10:30:00",
+        "a@b.com",
+        option.id,
+    ]
+    assert convert_row([None, "", "", "", None, ""]) == [
+        "None",
+        None,
+        False,
+        None,
+        "",
+        None,
+    ]
@@ -122,6 +122,39 @@ def test_table_group_storage_usage_item_type_unique_files(data_fixture):
     assert usage == 500
 
 
+@pytest.mark.django_db
+def test_table_group_storage_usage_item_type_trashed_rows_and_fields(data_fixture):
+    user = data_fixture.create_user()
+    group = data_fixture.create_group(user=user)
+    database = data_fixture.create_database_application(group=group)
+    table = data_fixture.create_database_table(user=user, database=database)
+    file_field = data_fixture.create_file_field(table=table)
+    user_file_1 = data_fixture.create_user_file(size=500)
+    user_file_2 = data_fixture.create_user_file(size=200)
+
+    handler = RowHandler()
+    row_1 = handler.create_row(
+        user, table, {file_field.id: [{"name": user_file_1.name}]}
+    )
+    row_2 = handler.create_row(
+        user, table, {file_field.id: [{"name": user_file_2.name}]}
+    )
+    usage_type = TableGroupStorageUsageItemType()
+    assert usage_type.calculate_storage_usage(group.id) == 700
+
+    trashed_rows = handler.delete_rows(user, table, [row_1.id, row_2.id])
+    assert usage_type.calculate_storage_usage(group.id) == 0
+
+    TrashHandler.restore_item(user, "rows", trashed_rows.id, table.id)
+    assert usage_type.calculate_storage_usage(group.id) == 700
+
+    TrashHandler.trash(user, group, database, file_field)
+    assert usage_type.calculate_storage_usage(group.id) == 0
+
+    TrashHandler.restore_item(user, "field", file_field.id)
+    assert usage_type.calculate_storage_usage(group.id) == 700
+
+
 @pytest.mark.django_db
 @pytest.mark.disabled_in_ci
 # You must add --run-disabled-in-ci -s to pytest to run this test, you can do this in
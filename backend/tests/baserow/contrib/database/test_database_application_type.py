@@ -100,3 +100,83 @@ def test_import_export_database(data_fixture):
     # It must still be possible to create a new row in the imported table
     row_3 = imported_model.objects.create()
     assert row_3.id == 3
+
+
+@pytest.mark.django_db
+def test_duplicate_database_copies_rows_with_sql(data_fixture):
+    database = data_fixture.create_database_application()
+    table = data_fixture.create_database_table(database=database)
+    other_table = data_fixture.create_database_table(database=database)
+    text_field = data_fixture.create_text_field(table=table, primary=True)
+    other_text_field = data_fixture.create_text_field(table=other_table, primary=True)
+    single_select_field = data_fixture.create_single_select_field(table=table)
+    option_a = data_fixture.create_select_option(field=single_select_field, value="A")
+    multiple_select_field = data_fixture.create_multiple_select_field(table=table)
+    option_b = data_fixture.create_select_option(field=multiple_select_field, value="B")
+    option_c = data_fixture.create_select_option(field=multiple_select_field, value="C")
+    link_field = data_fixture.create_link_row_field(
+        table=table, link_row_table=other_table
+    )
+
+    other_model = other_table.get_model()
+    other_row = other_model.objects.create(**{f"field_{other_text_field.id}": "Other"})
+    trashed_other_row = other_model.objects.create(trashed=True)
+    model = table.get_model()
+    row = model.objects.create(
+        **{
+            f"field_{text_field.id}": "Row",
+            f"field_{single_select_field.id}": option_a,
+        }
+    )
+    getattr(row, f"field_{multiple_select_field.id}").set([option_b, option_c])
+    getattr(row, f"field_{link_field.id}").set([other_row, trashed_other_row])
+    model.objects.create(**{f"field_{text_field.id}": "Trashed", "trashed": True})
+
+    database_type = application_type_registry.get("database")
+    serialized = database_type.export_serialized_for_duplication(database)
+    assert all(table["rows"] == [] for table in serialized["tables"])
+
+    id_mapping = {}
+    duplicated_database = database_type.import_serialized(
+        database.group, serialized, id_mapping
+    )
+
+    duplicated_table = duplicated_database.table_set.get(
+        id=id_mapping["database_tables"][table.id]
+    )
+    duplicated_model = duplicated_table.get_model()
+    assert duplicated_model.objects_and_trash.count() == 1
+
+    duplicated_row = duplicated_model.objects.get()
+    assert duplicated_row.id == row.id
+    assert duplicated_row.order == row.order
+    assert duplicated_row.created_on == row.created_on
+
+    field_id = id_mapping["database_fields"]
+    options = id_mapping["database_field_select_options"]
+    assert getattr(duplicated_row, f"field_{field_id[text_field.id]}") == "Row"
+    assert (
+        getattr(duplicated_row, f"field_{field_id[single_select_field.id]}_id")
+        == options[option_a.id]
+    )
+    assert [
+        option.id
+        for option in getattr(
+            duplicated_row, f"field_{field_id[multiple_select_field.id]}"
+        ).all()
+    ] == [options[option_b.id], options[option_c.id]]
+    assert [
+        linked_row.id
+        for linked_row in getattr(
+            duplicated_row, f"field_{field_id[link_field.id]}"
+        ).all()
+    ] == [other_row.id]
+    # The trashed related row hasn't been copied, so neither is the relation to it.
+    duplicated_link_field = duplicated_model._meta.get_field(
+        f"field_{field_id[link_field.id]}"
+    )
+    assert duplicated_link_field.remote_field.through.objects.count() == 1
+
+    # The sequence must have been reset after copying the ids.
+    new_row = duplicated_model.objects.create()
+    assert new_row.id > row.id
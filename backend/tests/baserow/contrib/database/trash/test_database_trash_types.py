@@ -87,18 +87,12 @@ def test_perm_deleting_many_rows_at_once_only_looks_up_the_model_once(
     TrashEntry.objects.update(should_be_permanently_deleted=True)
 
     invalidate_table_in_model_cache(table.id)
-    # We only want seven more queries when deleting 2 rows instead of 1 compared to
-    # above:
-    # 1. An extra query to open the second trash entries savepoint
-    # 2. An extra query to lookup the second trash entry
-    # 3. A query to lookup the extra row we are deleting
-    # 4. A query to delete said row
-    # 5. A query to delete it's trash entry.
-    # 6. A query to delete any related row comments.
-    # 7. An extra query to close the second trash entries savepoint
+    # The rows of the same table are looked up and deleted together, so we only want
+    # one more query when deleting 2 rows instead of 1 compared to above, to delete
+    # the related row comments of the extra row.
     # If we weren't caching the table models an extra number of queries would be first
     # performed to lookup the table information which breaks this assertion.
-    with django_assert_num_queries(21):
+    with django_assert_num_queries(15):
         TrashHandler.permanently_delete_marked_trash()
 
 
@@ -1619,3 +1613,92 @@ def test_can_perm_delete_application_which_links_to_self(data_fixture):
         table_a.get_database_table_name() not in connection.introspection.table_names()
     )
     assert TrashEntry.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_perm_deleting_rows_in_batch_also_deletes_their_relations(data_fixture):
+    user = data_fixture.create_user()
+    database = data_fixture.create_database_application(user=user)
+    table = data_fixture.create_database_table(database=database)
+    other_table = data_fixture.create_database_table(database=database)
+    data_fixture.create_text_field(table=other_table, primary=True)
+    field_handler = FieldHandler()
+    link_field = field_handler.create_field(
+        user=user,
+        table=table,
+        type_name="link_row",
+        name="Link",
+        link_row_table=other_table,
+    )
+    multiple_select_field = data_fixture.create_multiple_select_field(table=table)
+    option = data_fixture.create_select_option(field=multiple_select_field)
+
+    other_row = other_table.get_model().objects.create()
+    row_handler = RowHandler()
+    rows = [
+        row_handler.create_row(
+            user=user,
+            table=table,
+            values={
+                f"field_{link_field.id}": [other_row.id],
+                f"field_{multiple_select_field.id}": [option.id],
+            },
+        )
+        for _ in range(3)
+    ]
+
+    TrashHandler.trash(user, database.group, database, rows[0], parent_id=table.id)
+    trashed_rows = TrashedRows.objects.create(
+        table=table, row_ids=[rows[1].id, rows[2].id]
+    )
+    TrashHandler.trash(user, database.group, database, trashed_rows, parent_id=table.id)
+    TrashEntry.objects.update(should_be_permanently_deleted=True)
+
+    TrashHandler.permanently_delete_marked_trash()
+
+    model = table.get_model()
+    assert model.objects_and_trash.count() == 0
+    assert TrashedRows.objects.count() == 0
+    assert TrashEntry.objects.count() == 0
+    assert getattr(model, f"field_{link_field.id}").through.objects.count() == 0
+    assert (
+        getattr(model, f"field_{multiple_select_field.id}").through.objects.count() == 0
+    )
+    assert other_table.get_model().objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_perm_deleting_fields_and_tables_in_batch(data_fixture):
+    user = data_fixture.create_user()
+    database = data_fixture.create_database_application(user=user)
+    table = data_fixture.create_database_table(database=database)
+    data_fixture.create_text_field(table=table, primary=True)
+    field_1 = data_fixture.create_text_field(table=table)
+    field_2 = data_fixture.create_number_field(table=table)
+    tables_to_delete = [
+        data_fixture.create_database_table(database=database) for _ in range(2)
+    ]
+
+    TrashHandler.trash(user, database.group, database, field_1)
+    TrashHandler.trash(user, database.group, database, field_2)
+    for table_to_delete in tables_to_delete:
+        TrashHandler.trash(user, database.group, database, table_to_delete)
+    TrashEntry.objects.update(should_be_permanently_deleted=True)
+
+    TrashHandler.permanently_delete_marked_trash(batch_size=3)
+
+    assert TrashEntry.objects.count() == 0
+    assert Field.objects_and_trash.filter(id__in=[field_1.id, field_2.id]).count() == 0
+    assert Table.objects_and_trash.count() == 1
+    table_names = connection.introspection.table_names()
+    for table_to_delete in tables_to_delete:
+        assert table_to_delete.get_database_table_name() not in table_names
+    with connection.cursor() as cursor:
+        columns = [
+            column.name
+            for column in connection.introspection.get_table_description(
+                cursor, table.get_database_table_name()
+            )
+        ]
+    assert f"field_{field_1.id}" not in columns
+    assert f"field_{field_2.id}" not in columns
@@ -1,6 +1,7 @@
 import os
 import tempfile
 from pathlib import Path
+from subprocess import CalledProcessError  # nosec
 from unittest.mock import patch, call
 
 import pytest
@@ -8,7 +9,10 @@ from django.db import connection, transaction
 from freezegun import freeze_time
 
 from baserow.contrib.database.table.models import Table
-from baserow.core.management.backup.backup_runner import BaserowBackupRunner
+from baserow.core.management.backup.backup_runner import (
+    BaserowBackupRunner,
+    _split_tables_into_balanced_batches,
+)
 from baserow.core.management.backup.exceptions import (
     InvalidBaserowBackupArchive,
 )
@@ -576,6 +580,119 @@ def test_restore_baserow_raises_exception_if_sub_folder_not_found_after_extract(
     mock_check_output.assert_not_called()
 
 
+def test_split_tables_into_balanced_batches():
+    tables = ["t_1", "t_2", "t_3", "t_4", "t_5"]
+    sizes = {"t_1": 100, "t_2": 1, "t_3": 60, "t_4": 50, "t_5": 2}
+
+    assert _split_tables_into_balanced_batches(tables, sizes, 3) == [
+        ["t_3", "t_4"],
+        ["t_1", "t_2", "t_5"],
+    ]
+    # Every batch respects the batch size even if that makes them unbalanced.
+    assert _split_tables_into_balanced_batches(tables, sizes, 1) == [
+        ["t_1"],
+        ["t_3"],
+        ["t_4"],
+        ["t_5"],
+        ["t_2"],
+    ]
+    # Tables without a known size are considered empty.
+    assert _split_tables_into_balanced_batches(tables, {}, 5) == [tables]
+    assert _split_tables_into_balanced_batches([], sizes, 5) == []
+
+
+@patch("tempfile.TemporaryDirectory")
+@patch("psycopg2.connect")
+@patch("subprocess.check_output")
+def test_backup_baserow_can_run_size_balanced_batches_in_parallel(
+    mock_check_output, mock_connect, mock_tempfile, fs, data_fixture, environ
+):
+
+    with mock_connect() as conn:
+        with conn.cursor() as cursor:
+            cursor.fetchall.side_effect = [
+                [
+                    ("public.database_table_1",),
+                    ("public.database_table_2",),
+                    ("public.database_table_3",),
+                    ("public.database_table_4",),
+                ],
+                [
+                    ("public.database_table_1", 10),
+                    ("public.database_table_2", 1000),
+                    ("public.database_table_3", 20),
+                    ("public.database_table_4", 900),
+                ],
+            ]
+
+    mock_tempdir_to_be(fs, mock_tempfile, "/fake_tmp_dir")
+
+    runner = BaserowBackupRunner(
+        host=connection.settings_dict["HOST"],
+        database=connection.settings_dict["NAME"],
+        username=connection.settings_dict["USER"],
+        port=connection.settings_dict["PORT"],
+        jobs=1,
+        parallel_batches=2,
+    )
+
+    runner.backup_baserow(backup_file_name="test_backup.tar.gz", batch_size=2)
+
+    assert os.path.exists("test_backup.tar.gz")
+    assert mock_check_output.call_count == 3
+    assert mock_check_output.call_args_list[0] == a_pg_dump_for_everything_else()
+    mock_check_output.assert_has_calls(
+        [
+            a_pg_dump_table_batch(
+                tables=["public.database_table_1", "public.database_table_2"],
+                batch_num=0,
+            ),
+            a_pg_dump_table_batch(
+                tables=["public.database_table_3", "public.database_table_4"],
+                batch_num=1,
+            ),
+        ],
+        any_order=True,
+    )
+
+
+@patch("tempfile.TemporaryDirectory")
+@patch("subprocess.check_output")
+@patch("tarfile.open")
+def test_restore_baserow_in_parallel_stops_when_a_batch_fails(
+    mock_tarfile_open, mock_check_output, mock_tempfile, fs, data_fixture, environ
+):
+
+    mock_tempdir_to_be(fs, mock_tempfile, "/fake_tmp_dir/")
+    fs.create_dir("/fake_tmp_dir/backup.tar.gz/everything_but_user_tables")
+    for batch_num in range(3):
+        fs.create_dir(f"/fake_tmp_dir/backup.tar.gz/user_tables_batch_{batch_num}")
+
+    def fail_on_batch_restore(command):
+        if "everything_but_user_tables" not in command[-1]:
+            raise CalledProcessError(1, command)
+
+    mock_check_output.side_effect = fail_on_batch_restore
+
+    runner = BaserowBackupRunner(
+        host=connection.settings_dict["HOST"],
+        database=connection.settings_dict["NAME"],
+        username=connection.settings_dict["USER"],
+        port=connection.settings_dict["PORT"],
+        jobs=1,
+        parallel_batches=2,
+    )
+
+    with pytest.raises(CalledProcessError):
+        runner.restore_baserow("backup.tar.gz")
+
+    # The first restore always runs on its own before the batches.
+    assert mock_check_output.call_args_list[0][0][0][-1] == (
+        "/fake_tmp_dir/backup.tar.gz/everything_but_user_tables/"
+    )
+    assert 2 <= mock_check_output.call_count <= 4
+
+
 def a_pg_dump_for_everything_else():
     dbname = connection.settings_dict["NAME"]
     host = connection.settings_dict["HOST"]
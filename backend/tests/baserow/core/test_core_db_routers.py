@@ -0,0 +1,140 @@
+import pytest
+
+from django.core.cache import cache
+from django.test.utils import override_settings
+
+from baserow.contrib.database.rows.handler import RowHandler
+from baserow.contrib.database.table.cache import invalidate_table_in_model_cache
+from baserow.contrib.database.table.models import Table
+from baserow.core.cache import get_versions
+from baserow.core.db_routers import (
+    read_replica,
+    mark_table_as_changed,
+    get_read_replica_alias,
+    get_table_data_version_name,
+)
+
+
+@pytest.mark.django_db
+@override_settings(DATABASE_READ_REPLICAS=["default-copy"])
+def test_read_replica_routing(data_fixture):
+    table = data_fixture.create_database_table()
+    other_table = data_fixture.create_database_table()
+    multiple_select_field = data_fixture.create_multiple_select_field(table=table)
+    model = table.get_model()
+    select_option_model = model._meta.get_field(
+        f"field_{multiple_select_field.id}"
+    ).remote_field.model
+    cache.clear()
+
+    assert model.objects.all().db == "default"
+    with read_replica():
+        assert get_read_replica_alias(table.id) == "default-copy"
+        assert model.objects.all().db == "default-copy"
+        # Only the user tables are read from the replicas.
+        assert Table.objects.all().db == "default"
+        assert select_option_model.objects.all().db == "default"
+        with read_replica(enabled=False):
+            assert model.objects.all().db == "default"
+    assert model.objects.all().db == "default"
+
+    # After writing to the table it must be read from the primary database.
+    model.objects.create()
+    with read_replica():
+        assert model.objects.all().db == "default"
+        assert get_read_replica_alias(other_table.id) == "default-copy"
+
+    invalidate_table_in_model_cache(other_table.id)
+    with read_replica():
+        assert get_read_replica_alias(other_table.id) is None
+
+
+@pytest.mark.django_db
+@override_settings(DATABASE_READ_REPLICAS=["default-copy"])
+def test_mark_table_as_changed_when_committed(
+    data_fixture, django_capture_on_commit_callbacks
+):
+    table = data_fixture.create_database_table()
+    cache.clear()
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        mark_table_as_changed(table.id)
+        mark_table_as_changed(table.id)
+        with read_replica():
+            assert get_read_replica_alias(table.id) is None
+
+    # The sticky period starts again when the transaction commits.
+    assert len(callbacks) == 1
+    cache.clear()
+    callbacks[0]()
+    with read_replica():
+        assert get_read_replica_alias(table.id) is None
+
+
+@pytest.mark.django_db
+def test_read_replica_routing_without_replicas(data_fixture):
+    table = data_fixture.create_database_table()
+    model = table.get_model()
+
+    with read_replica():
+        assert get_read_replica_alias(table.id) is None
+        assert model.objects.all().db == "default"
+
+
+@pytest.mark.django_db(transaction=True, databases=["default", "default-copy"])
+@override_settings(DATABASE_READ_REPLICAS=["default-copy"])
+def test_read_replica_read_and_write(data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    text_field = data_fixture.create_text_field(table=table, name="Text")
+    model = table.get_model()
+    RowHandler().create_row(
+        user, table, {f"field_{text_field.id}": "Test"}, model=model
+    )
+
+    cache.clear()
+    with read_replica():
+        row = model.objects.get()
+        assert row._state.db == "default-copy"
+        assert getattr(row, f"field_{text_field.id}") == "Test"
+
+    # The rows fetched from the replica must still be saved in the primary database.
+    setattr(row, f"field_{text_field.id}", "Changed")
+    row.save()
+    assert model.objects.using("default").get().id == row.id
+    assert getattr(model.objects.get(), f"field_{text_field.id}") == "Changed"
+
+    mark_table_as_changed(table.id)
+    with read_replica():
+        assert model.objects.get()._state.db == "default"
+
+
+@pytest.mark.django_db
+def test_writing_rows_bumps_table_data_version(
+    data_fixture, django_capture_on_commit_callbacks
+):
+    table = data_fixture.create_database_table()
+    other_table = data_fixture.create_database_table()
+    table_version_name = get_table_data_version_name(table.id)
+    other_table_version_name = get_table_data_version_name(other_table.id)
+    versions = get_versions([table_version_name, other_table_version_name])
+
+    model = table.get_model()
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        model.objects.create()
+        model.objects.create()
+        model.objects.all().update(order=1)
+
+    # The version is only bumped once per transaction.
+    assert len(callbacks) == 1
+    new_versions = get_versions([table_version_name, other_table_version_name])
+    assert new_versions[table_version_name][0] == versions[table_version_name][0] + 1
+    assert new_versions[other_table_version_name] == versions[other_table_version_name]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        invalidate_table_in_model_cache(other_table.id)
+
+    assert (
+        get_versions([other_table_version_name])[other_table_version_name][0]
+        == versions[other_table_version_name][0] + 1
+    )
@@ -1,5 +1,6 @@
+import json
 import os
-from io import BytesIO
+from io import BytesIO, StringIO
 from pathlib import Path
 from unittest.mock import patch
 
@@ -969,6 +970,42 @@ def test_export_import_group_application(data_fixture):
     assert id_mapping["applications"][database.id] == imported_database.id
 
 
+@pytest.mark.django_db(transaction=True)
+def test_export_group_applications_to_json(data_fixture):
+    group = data_fixture.create_group()
+    database = data_fixture.create_database_application(group=group)
+    table = data_fixture.create_database_table(database=database)
+    text_field = data_fixture.create_text_field(table=table, primary=True)
+    multiple_select_field = data_fixture.create_multiple_select_field(table=table)
+    option = data_fixture.create_select_option(field=multiple_select_field)
+    link_field = data_fixture.create_link_row_field(table=table, link_row_table=table)
+    model = table.get_model()
+    rows = [
+        model.objects.create(**{f"field_{text_field.id}": f"Row {i}"})
+        for i in range(0, 5)
+    ]
+    getattr(rows[0], f"field_{multiple_select_field.id}").set([option.id])
+    getattr(rows[1], f"field_{link_field.id}").set([rows[0].id, rows[2].id])
+
+    handler = CoreHandler()
+    json_buffer = StringIO()
+    with patch(
+        "baserow.contrib.database.application_types."
+        "EXPORT_SERIALIZED_ROWS_CHUNK_SIZE",
+        2,
+    ):
+        handler.export_group_applications_to_json(
+            group, json_buffer, BytesIO(), indent=4
+        )
+
+    exported_applications = json.loads(json_buffer.getvalue())
+    assert exported_applications == handler.export_group_applications(group, BytesIO())
+    exported_rows = exported_applications[0]["tables"][0]["rows"]
+    assert [row["id"] for row in exported_rows] == [row.id for row in rows]
+    assert exported_rows[0][f"field_{multiple_select_field.id}"] == [option.id]
+    assert exported_rows[1][f"field_{link_field.id}"] == [rows[0].id, rows[2].id]
+
+
 @pytest.mark.django_db
 @pytest.mark.once_per_day_in_ci
 # You must add --run-once-per-day-in-ci to pytest's additional args to run this test,
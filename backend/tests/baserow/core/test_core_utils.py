@@ -1,6 +1,7 @@
+import json
 import pytest
 
-from io import BytesIO
+from io import BytesIO, StringIO
 from unittest.mock import MagicMock
 
 from baserow.core.utils import (
@@ -18,6 +19,7 @@ from baserow.core.utils import (
     remove_invalid_surrogate_characters,
     find_unused_name,
     grouper,
+    stream_json,
     Progress,
     ChildProgressBuilder,
     MirrorDict,
@@ -207,6 +209,26 @@ def test_grouper():
     assert list(grouper(3, g())) == [(0, 1, 2), (3, 4, 5), (6, 7, 8), (9,)]
 
 
+@pytest.mark.parametrize("indent", [None, 2])
+def test_stream_json(indent):
+    def rows():
+        for i in range(0, 3):
+            yield {"id": i, "values": [i, str(i)]}
+
+    value = {"name": "Test é", "empty": [], "nested": {}, "rows": rows(), 1: None}
+    expected = {
+        "name": "Test é",
+        "empty": [],
+        "nested": {},
+        "rows": list(rows()),
+        1: None,
+    }
+
+    buffer = StringIO()
+    stream_json(value, buffer, indent=indent)
+    assert buffer.getvalue() == json.dumps(expected, indent=indent)
+
+
 def test_progress():
     mock_event = MagicMock()
 
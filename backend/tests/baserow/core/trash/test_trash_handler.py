@@ -483,3 +483,31 @@ def test_cant_trash_same_row_twice(
     model = table.get_model()
     assert model.objects.count() == 1
     assert model.trash.count() == 1
+
+
+@pytest.mark.django_db
+def test_permanently_delete_marked_trash_deletes_in_batches(
+    data_fixture,
+):
+    user = data_fixture.create_user()
+    group = data_fixture.create_group(user=user)
+    applications = [
+        data_fixture.create_database_application(user=user, group=group)
+        for _ in range(3)
+    ]
+    for application in applications:
+        TrashHandler.trash(user, group, application, application)
+    not_marked_application = data_fixture.create_database_application(
+        user=user, group=group
+    )
+    TrashHandler.trash(user, group, not_marked_application, not_marked_application)
+    TrashEntry.objects.filter(
+        trash_item_id__in=[application.id for application in applications]
+    ).update(should_be_permanently_deleted=True)
+
+    TrashHandler.permanently_delete_marked_trash(batch_size=2)
+
+    assert TrashEntry.objects.count() == 1
+    assert list(Application.objects_and_trash.values_list("id", flat=True)) == [
+        not_marked_application.id
+    ]
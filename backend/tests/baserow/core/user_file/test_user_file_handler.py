@@ -1,5 +1,6 @@
 import string
 from io import BytesIO
+from unittest.mock import patch
 
 import httpretty
 import pytest
@@ -76,6 +77,25 @@ def test_generate_unique(data_fixture):
     handler.generate_unique("test", "txt2", 1, 3)
 
 
+def test_read_and_hash_chunks(settings):
+    handler = UserFileHandler()
+    copy = BytesIO()
+
+    size, hash = handler.read_and_hash_chunks([b"Hello", b" ", b"World"], copy)
+    assert size == 11
+    assert hash == ("a591a6d40bf420404a011733cfb7b190d62c65bf0bcda32b57b277d9ad9f146e")
+    assert copy.getvalue() == b"Hello World"
+
+    def chunks():
+        yield b"Hello"
+        yield b" World"
+        raise AssertionError("The chunks must not be read after exceeding the limit.")
+
+    settings.BASEROW_FILE_UPLOAD_SIZE_LIMIT_MB = 6
+    with pytest.raises(FileSizeTooLargeError):
+        handler.read_and_hash_chunks(chunks())
+
+
 @pytest.mark.django_db
 def test_upload_user_file(data_fixture, tmpdir):
     user = data_fixture.create_user()
@@ -133,17 +153,13 @@ def test_upload_user_file(data_fixture, tmpdir):
     assert file_path.isfile()
     assert file_path.open().read() == "Hello"
 
+    # The files uploaded to a custom storage are not deduplicated because the
+    # storage doesn't contain the other files.
     assert (
         handler.upload_user_file(
             user, "another.txt", ContentFile(b"Hello"), storage=storage
-        ).id
-        == user_file.id
-    )
-    assert (
-        handler.upload_user_file(
-            user, "another_name.txt", ContentFile(b"Hello"), storage=storage
-        ).id
-        != user_file.id
+        ).unique
+        != user_file.unique
     )
 
     image = Image.new("RGB", (100, 140), color="red")
@@ -218,6 +234,68 @@ def test_upload_user_file(data_fixture, tmpdir):
     )
 
 
+@pytest.mark.django_db
+def test_upload_user_file_deduplicates_stored_files(data_fixture, tmpdir):
+    user = data_fixture.create_user()
+    other_user = data_fixture.create_user()
+    storage = FileSystemStorage(location=str(tmpdir), base_url="http://localhost")
+    handler = UserFileHandler()
+
+    with patch("baserow.core.user_files.handler.default_storage", new=storage):
+        user_file = handler.upload_user_file(user, "a.txt", ContentFile(b"Hello"))
+        other_user_file = handler.upload_user_file(
+            other_user, "b.txt", ContentFile(b"Hello")
+        )
+        other_extension = handler.upload_user_file(
+            other_user, "b.csv", ContentFile(b"Hello")
+        )
+
+    # The stored file is reused, but every upload keeps its own name and uploader.
+    assert other_user_file.id != user_file.id
+    assert other_user_file.name == user_file.name
+    assert other_user_file.original_name == "b.txt"
+    assert other_user_file.uploaded_by_id == other_user.id
+    assert user_file.original_name == "a.txt"
+    assert other_extension.unique != user_file.unique
+    assert len(tmpdir.join("user_files").listdir()) == 2
+
+    assert UserFile.objects.all().name(user_file.name).get().id == user_file.id
+    assert handler.get_user_file_by_name(other_user_file.name).id == user_file.id
+
+
+@pytest.mark.django_db
+def test_upload_image_generates_thumbnails_in_background(
+    data_fixture, tmpdir, settings, django_capture_on_commit_callbacks
+):
+    user = data_fixture.create_user()
+    storage = FileSystemStorage(location=str(tmpdir), base_url="http://localhost")
+    settings.USER_THUMBNAILS = {"tiny": [21, 21], "wide": [None, 100]}
+    handler = UserFileHandler()
+
+    image = Image.new("RGB", (4000, 2000), color="red")
+    image_bytes = BytesIO()
+    image.save(image_bytes, format="JPEG")
+
+    with patch(
+        "baserow.core.user_files.handler.default_storage", new=storage
+    ), django_capture_on_commit_callbacks(execute=False) as callbacks:
+        user_file = handler.upload_user_file(user, "large.jpg", image_bytes)
+
+        assert user_file.thumbnails_pending is True
+        assert not tmpdir.join("thumbnails", "tiny", user_file.name).isfile()
+
+        for callback in callbacks:
+            callback()
+
+    user_file.refresh_from_db()
+    assert user_file.thumbnails_pending is False
+
+    thumbnail = Image.open(tmpdir.join("thumbnails", "tiny", user_file.name))
+    assert thumbnail.size == (21, 21)
+    thumbnail = Image.open(tmpdir.join("thumbnails", "wide", user_file.name))
+    assert thumbnail.size == (200, 100)
+
+
 @pytest.mark.django_db
 @httpretty.activate(verbose=True, allow_net_connect=False)
 def test_upload_user_file_by_url(data_fixture, tmpdir):
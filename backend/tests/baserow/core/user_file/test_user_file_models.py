@@ -26,6 +26,7 @@ def test_serialize_user_file():
         "image_width": 100,
         "image_height": 100,
         "uploaded_at": user_file.uploaded_at.isoformat(),
+        "thumbnails_pending": False,
     }
 
 
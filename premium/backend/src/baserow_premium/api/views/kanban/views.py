@@ -18,6 +18,7 @@ from baserow.contrib.database.api.rows.serializers import (
 from baserow.contrib.database.views.exceptions import ViewDoesNotExist
 from baserow.contrib.database.views.handler import ViewHandler
 from baserow.contrib.database.views.registries import view_type_registry
+from baserow.core.db_routers import read_replica
 from baserow.core.exceptions import UserNotInGroup
 
 from baserow_premium.views.models import KanbanView
@@ -118,6 +119,7 @@ class KanbanViewView(APIView):
         }
     )
     @allowed_includes("field_options")
+    @read_replica()
     def get(self, request, view_id, field_options):
         """Responds with the rows grouped by the view's select option field value."""
 
@@ -23,6 +23,9 @@ class BaserowPremiumConfig(AppConfig):
         # noinspection PyUnresolvedReferences
         import baserow_premium.row_comments.recievers  # noqa: F401
 
+        # noinspection PyUnresolvedReferences
+        import baserow_premium.license.receivers  # noqa: F401
+
         from .plugins import PremiumPlugin
         from .export.exporter_types import JSONTableExporter, XMLTableExporter
         from .views.view_types import KanbanViewType
@@ -3,7 +3,10 @@ import binascii
 import hashlib
 import json
 import logging
-from typing import Union, List, Dict, Any
+from copy import deepcopy
+from datetime import datetime
+from functools import lru_cache
+from typing import Union, List, Dict, Any, Tuple
 from os.path import dirname, join
 from dateutil import parser
 
@@ -13,6 +16,7 @@ from requests.exceptions import RequestException
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import User as DjangoUser
+from django.core.cache import cache
 from django.utils.timezone import now, make_aware, utc
 from django.db import transaction
 from django.db.models import Q
@@ -52,6 +56,80 @@ from .constants import (
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
+LICENSE_CACHE_VERSION_KEY = "premium_license_cache_version"
+
+# The license periods of a user are cached for this amount of seconds. The cache is
+# also invalidated when a license changes, so this is just to clean up.
+USER_LICENSE_CACHE_TIMEOUT = 60 * 60
+
+# The maximum amount of decoded license payloads that are kept in memory.
+DECODED_LICENSE_CACHE_SIZE = 128
+_decoded_license_cache: Dict[Tuple[str, str], dict] = {}
+
+
+def _get_license_cache_version() -> int:
+    return cache.get(LICENSE_CACHE_VERSION_KEY, 1)
+
+
+def invalidate_license_cache():
+    """
+    Invalidates the cached premium licenses of all the users. Must be called every
+    time a license or the users of a license change.
+    """
+
+    try:
+        cache.incr(LICENSE_CACHE_VERSION_KEY, 1)
+    except ValueError:
+        # No cache key, we create one
+        cache.set(LICENSE_CACHE_VERSION_KEY, 2, timeout=None)
+
+
+def invalidate_license_cache_on_commit():
+    """
+    Invalidates the cached premium licenses right away, so that the current
+    transaction sees the changes, and again when the transaction commits. Until then
+    other requests still see the old licenses and could cache them again.
+    """
+
+    invalidate_license_cache()
+    transaction.on_commit(invalidate_license_cache)
+
+
+def get_premium_license_periods(user: DjangoUser) -> List[Tuple[datetime, datetime]]:
+    """
+    Returns the periods during which the premium licenses of the user are valid.
+    The periods are cached until a license changes, so that checking whether a user
+    has an active license doesn't have to query and decode the licenses every time.
+
+    :param user: The user for whom the license periods must be returned.
+    :return: A list containing the valid from and valid through date of every valid
+        premium license of the user.
+    """
+
+    # The public key, and so which licenses are valid, depends on the debug mode.
+    cache_key = (
+        f"premium_license_periods_{_get_license_cache_version()}_"
+        f"{int(settings.DEBUG)}_{user.id}"
+    )
+    periods = cache.get(cache_key)
+
+    if periods is None:
+        periods = []
+        available_licenses = License.objects.filter(
+            users__user_id__in=[user.id]
+        ).distinct()
+        for available_license in available_licenses:
+            try:
+                if available_license.product_code == "premium":
+                    periods.append(
+                        (available_license.valid_from, available_license.valid_through)
+                    )
+            except InvalidPremiumLicenseError:
+                pass
+        cache.set(cache_key, periods, timeout=USER_LICENSE_CACHE_TIMEOUT)
+
+    return periods
+
 
 def has_active_premium_license(user: DjangoUser) -> bool:
     """
@@ -61,19 +139,11 @@ def has_active_premium_license(user: DjangoUser) -> bool:
     :return: True if the user has an active license to the version.
     """
 
-    available_licenses = License.objects.filter(users__user_id__in=[user.id]).distinct()
-
-    for available_license in available_licenses:
-        try:
-            if (
-                available_license.product_code == "premium"
-                and available_license.is_active
-            ):
-                return True
-        except InvalidPremiumLicenseError:
-            pass
-
-    return False
+    current_time = now()
+    return any(
+        valid_from <= current_time <= valid_through
+        for valid_from, valid_through in get_premium_license_periods(user)
+    )
 
 
 def check_active_premium_license(user: DjangoUser):
@@ -148,15 +218,14 @@ def check_active_premium_license_for_group(user: DjangoUser, group: Group):
     raise NoPremiumLicenseError()
 
 
-def get_public_key():
-    """
-    Returns the public key instance that can be used to verify licenses. A different
-    key file is loaded when Baserow is in debug mode.
-    """
+def _get_public_key_file_name() -> str:
+    return "public_key_debug.pem" if settings.DEBUG else "public_key.pem"
 
+
+@lru_cache(maxsize=None)
+def _load_public_key(file_name: str):
     import baserow_premium
 
-    file_name = "public_key_debug.pem" if settings.DEBUG else "public_key.pem"
     public_key_path = join(dirname(baserow_premium.__file__), file_name)
     with open(public_key_path, "rb") as key_file:
         public_key = serialization.load_pem_public_key(
@@ -165,7 +234,41 @@ def get_public_key():
     return public_key
 
 
+def get_public_key():
+    """
+    Returns the public key instance that can be used to verify licenses. A different
+    key file is loaded when Baserow is in debug mode. The key is only loaded once per
+    process.
+    """
+
+    return _load_public_key(_get_public_key_file_name())
+
+
 def decode_license(license_payload: bytes) -> dict:
+    """
+    Decodes the license and returns its payload. The payloads of the licenses that
+    have been verified are cached by the hash of the license, so the signature of
+    the same license is only verified once per process. See `_decode_license` for
+    the raised exceptions.
+
+    :param license_payload: The raw license that must be decoded.
+    :return: If successful, the decoded license payload is returned.
+    """
+
+    cache_key = (
+        hashlib.sha256(license_payload).hexdigest(),
+        _get_public_key_file_name(),
+    )
+
+    if cache_key not in _decoded_license_cache:
+        if len(_decoded_license_cache) >= DECODED_LICENSE_CACHE_SIZE:
+            _decoded_license_cache.clear()
+        _decoded_license_cache[cache_key] = _decode_license(license_payload)
+
+    return deepcopy(_decoded_license_cache[cache_key])
+
+
+def _decode_license(license_payload: bytes) -> dict:
     """
     Tries to decode the provided license and returns the payload if successful.
 
@@ -561,6 +664,8 @@ def fill_remaining_seats_of_license(
             LicenseUser(license=license_object, user=user) for user in users_to_add
         ]
         LicenseUser.objects.bulk_create(user_licenses)
+        # The `bulk_create` doesn't send the `post_save` signals.
+        invalidate_license_cache_on_commit()
 
         if license_object.is_active:
             transaction.on_commit(
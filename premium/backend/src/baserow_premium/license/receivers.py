@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .handler import invalidate_license_cache_on_commit
+from .models import License, LicenseUser
+
+
+@receiver(post_save, sender=License)
+@receiver(post_delete, sender=License)
+@receiver(post_save, sender=LicenseUser)
+@receiver(post_delete, sender=LicenseUser)
+def invalidate_license_cache_on_change(sender, **kwargs):
+    invalidate_license_cache_on_commit()
@@ -8,11 +8,13 @@ from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric import padding
 
+from django.core.cache import cache
 from django.db import transaction
 from django.test.utils import override_settings
 
 from baserow.core.exceptions import IsNotAdminError
 
+from baserow_premium.license import handler as handler_module
 from baserow_premium.license.handler import (
     has_active_premium_license,
     check_active_premium_license,
@@ -27,6 +29,7 @@ from baserow_premium.license.handler import (
     remove_user_from_license,
     fill_remaining_seats_of_license,
     remove_all_users_from_license,
+    invalidate_license_cache,
 )
 from baserow_premium.license.models import License, LicenseUser
 from baserow_premium.license.exceptions import (
@@ -176,6 +179,70 @@ def test_has_active_premium_license(data_fixture):
     assert not has_active_premium_license(invalid_user)
 
 
+@pytest.mark.django_db
+@override_settings(DEBUG=True)
+def test_has_active_premium_license_is_cached(data_fixture, django_assert_num_queries):
+    user = data_fixture.create_user()
+    license = License.objects.create(license=VALID_TWO_SEAT_LICENSE.decode())
+    license_user = LicenseUser.objects.create(license=license, user=user)
+
+    with freeze_time("2021-09-01 12:00"):
+        assert has_active_premium_license(user)
+        with django_assert_num_queries(0):
+            assert has_active_premium_license(user)
+
+    # The cached validity periods are still checked against the current time.
+    with freeze_time("2021-10-01 12:00"):
+        with django_assert_num_queries(0):
+            assert not has_active_premium_license(user)
+
+    # Removing the user from the license must invalidate the cache.
+    license_user.delete()
+    with freeze_time("2021-09-01 12:00"):
+        assert not has_active_premium_license(user)
+
+    # Adding the user to the license must invalidate the cache.
+    LicenseUser.objects.create(license=license, user=user)
+    with freeze_time("2021-09-01 12:00"):
+        assert has_active_premium_license(user)
+
+    # The license is decoded again using the new payload when it changes.
+    license.license = VALID_INSTANCE_TWO_LICENSE.decode()
+    license.save()
+    with freeze_time("2021-09-01 12:00"):
+        assert has_active_premium_license(user)
+
+    license.delete()
+    with freeze_time("2021-09-01 12:00"):
+        assert not has_active_premium_license(user)
+
+    invalidate_license_cache()
+    with freeze_time("2021-09-01 12:00"):
+        with django_assert_num_queries(1):
+            assert not has_active_premium_license(user)
+
+
+@pytest.mark.django_db
+@override_settings(DEBUG=True)
+def test_license_cache_is_invalidated_again_on_commit(
+    data_fixture, django_capture_on_commit_callbacks
+):
+    user = data_fixture.create_user()
+    license = License.objects.create(license=VALID_TWO_SEAT_LICENSE.decode())
+
+    with freeze_time("2021-09-01 12:00"):
+        with django_capture_on_commit_callbacks(execute=True):
+            LicenseUser.objects.create(license=license, user=user)
+            assert has_active_premium_license(user)
+            # Another request that doesn't see the uncommitted license user yet
+            # caches the old state before the transaction commits.
+            version = handler_module._get_license_cache_version()
+            cache.set(f"premium_license_periods_{version}_1_{user.id}", [])
+            assert not has_active_premium_license(user)
+
+        assert has_active_premium_license(user)
+
+
 @pytest.mark.django_db
 @override_settings(DEBUG=True)
 def test_check_active_premium_license_for_group_with_valid_license(data_fixture):
@@ -512,6 +579,29 @@ def test_invalid_signature_decode_license():
         decode_license(NOT_JSON_PAYLOAD_LICENSE)
 
 
+@override_settings(DEBUG=True)
+def test_decode_license_is_cached():
+    with patch.dict(handler_module._decoded_license_cache, clear=True), patch(
+        "baserow_premium.license.handler._decode_license",
+        wraps=handler_module._decode_license,
+    ) as mock_decode_license:
+        payload = decode_license(VALID_TWO_SEAT_LICENSE)
+        payload["seats"] = 100
+        assert decode_license(VALID_TWO_SEAT_LICENSE)["seats"] == 2
+        assert mock_decode_license.call_count == 1
+
+        # Invalid licenses are not cached.
+        for _ in range(2):
+            with pytest.raises(InvalidPremiumLicenseError):
+                decode_license(INVALID_SIGNATURE_LICENSE)
+        assert mock_decode_license.call_count == 3
+
+    # The production key is used in production mode, so the license isn't valid.
+    with override_settings(DEBUG=False):
+        with pytest.raises(InvalidPremiumLicenseError):
+            decode_license(VALID_TWO_SEAT_LICENSE)
+
+
 @override_settings(DEBUG=True)
 def test_unsupported_version_decode_license():
     with pytest.raises(UnsupportedPremiumLicenseError):